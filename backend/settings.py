@@ -64,6 +64,7 @@ SPECTACULAR_SETTINGS = {
 }
 
 MIDDLEWARE = [
+    "core.middleware.RequestProfilingMiddleware",  # First, so its timings cover the whole stack
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -105,11 +106,42 @@ DATABASES['default']['OPTIONS'] = {
     'sslmode': 'require',
 }
 
+# Connection reuse. Each new connection to Supabase costs a TLS handshake, so by
+# default connections persist for DB_CONN_MAX_AGE seconds and are health-checked
+# before reuse. Under ASGI, request threads change per request and persistent
+# connections are never reused; DB_POOL=true (start.sh sets it for the web
+# server) switches to core.db_backends, which hands connections back to a
+# per-process pool instead of closing them.
+DATABASES['default']['CONN_MAX_AGE'] = env.int("DB_CONN_MAX_AGE", default=60)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = env.bool("DB_CONN_HEALTH_CHECKS", default=True)
+if env.bool("DB_POOL", default=False) and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['ENGINE'] = 'core.db_backends'
+    DATABASES['default']['CONN_MAX_AGE'] = 0  # Closing a pooled connection returns it to the pool
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'max_size': env.int("DB_POOL_MAX_SIZE", default=10),
+        'timeout': env.float("DB_POOL_TIMEOUT", default=30.0),
+        'check_after': env.float("DB_POOL_CHECK_AFTER", default=30.0),  # Idle seconds before a SELECT 1 on checkout
+    }
+
+# Optional read replica. Only views decorated with core.db_routers.read_from_replica
+# (leaderboard, points timeline, partner metrics, admin stats) read from it; reads
+# that depend on a just-committed change stay on the primary for REPLICA_PIN_SECONDS.
+# The pins are rows in the primary database (core.models.ReplicaPin), so a change made
+# in any process (web worker, bot, outbox worker) pins reads in all of them.
+if env("DATABASE_REPLICA_URL", default=""):
+    DATABASES['replica'] = {
+        **env.db("DATABASE_REPLICA_URL"),
+        **{key: DATABASES['default'][key] for key in ('ENGINE', 'OPTIONS', 'CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')},
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['core.db_routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=5)
+
 # Cache Configuration - CRITICAL for performance
 # Optimized for 1000 users with long TTLs and cache invalidation
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'core.cache_backends.LocMemCache',  # LocMem that reports hits/misses to the request profiler
         'LOCATION': 'unique-snowflake',
         'TIMEOUT': 86400,  # 24 hours default - cache invalidation handles updates
         'OPTIONS': {
@@ -118,16 +150,17 @@ CACHES = {
     }
 }
 
-# For production, consider Redis:
-# CACHES = {
-#     'default': {
-#         'BACKEND': 'django_redis.cache.RedisCache',
-#         'LOCATION': env('REDIS_URL', default='redis://127.0.0.1:6379/1'),
-#         'OPTIONS': {
-#             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-#         }
-#     }
-# }
+# CACHE_URL switches to a cache every process shares, which BOT_TRANSPORT=inprocess
+# requires: the bot's purges and data-version bumps must reach the web workers.
+# redis://127.0.0.1:6379/1 (needs the redis package) or dbcache://cache_table (run
+# `python manage.py createcachetable` first)
+if env("CACHE_URL", default=""):
+    _shared_cache = env.cache("CACHE_URL")
+    _shared_cache['BACKEND'] = {
+        'django.core.cache.backends.db.DatabaseCache': 'core.cache_backends.DatabaseCache',
+        'django.core.cache.backends.redis.RedisCache': 'core.cache_backends.RedisCache',
+    }.get(_shared_cache['BACKEND'], _shared_cache['BACKEND'])
+    CACHES['default'] = {**_shared_cache, 'TIMEOUT': CACHES['default']['TIMEOUT']}
 
 
 # Password validation
@@ -206,3 +239,11 @@ FORM_WEBHOOK_SECRET = env("FORM_WEBHOOK_SECRET", default="")
 DISCORD_TOKEN = env("DISCORD_TOKEN", default="")
 DISCORD_GUILD_ID = env("DISCORD_GUILD_ID", default="123456789012345678")  # Default placeholder for testing
 
+# Calendar events for scheduled sessions (core.calendar_client): "google" or "fake" (in-process stub service)
+CALENDAR_CLIENT = env("CALENDAR_CLIENT", default="google")
+
+# Request profiling (core.middleware.RequestProfilingMiddleware)
+REQUEST_METRICS_ENABLED = env.bool("REQUEST_METRICS_ENABLED", default=True)
+PROFILE_SAMPLE_RATE = env.float("PROFILE_SAMPLE_RATE", default=0.0)  # 0.01 = cProfile 1% of matching requests
+PROFILE_PATHS = env.list("PROFILE_PATHS", default=[])  # Path prefixes to profile, e.g. /api/dashboard/,/api/bot/
+PROFILE_DIR = env("PROFILE_DIR", default=str(BASE_DIR / "profiles"))
@@ -1,6 +1,6 @@
 import os
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from dotenv import load_dotenv
 import asyncio
 import logging
@@ -8,7 +8,9 @@ import sys
 from datetime import datetime
 import math
 import json
-import aiohttp
+import uuid
+
+from bot_utils import backend
 
 # Add current directory to Python path for cog imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -27,24 +29,6 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
 
-def get_backend_url():
-    """Smart backend URL selection based on environment"""
-    # Check if BACKEND_API_URL is explicitly set
-    explicit_url = os.getenv('BACKEND_API_URL')
-    if explicit_url:
-        return explicit_url
-    
-    # For Render deployment, use localhost when bot and backend are in same container
-    if os.getenv('RENDER'):
-        port = os.getenv('PORT', '8000')
-        return f'http://127.0.0.1:{port}'
-    
-    # Default to localhost for local development
-    return 'http://localhost:8000'
-
-BACKEND_API_URL = get_backend_url()
-BOT_SHARED_SECRET = os.getenv('BOT_SHARED_SECRET', '')
-
 # Bot setup
 intents = discord.Intents.default()
 intents.message_content = True
@@ -56,38 +40,31 @@ bot.start_time = datetime.utcnow()
 
 # Global variables
 cogs_loaded = False
+members_registered = False  # Bulk registration runs once per process, not on every reconnect
 reconnect_attempts = 0
 max_reconnect_attempts = 5
 
 async def register_user_with_backend(discord_id: str, display_name: str, username: str = None):
     """Register a new user with the backend API when they join Discord"""
     try:
-        async with aiohttp.ClientSession() as session:
-            payload = {
-                "action": "upsert-user",
-                "discord_id": discord_id,
-                "display_name": display_name,
-                "username": username,
-            }
-            
-            async with session.post(
-                f"{BACKEND_API_URL}/api/bot/",
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "X-Bot-Secret": BOT_SHARED_SECRET,
-                }
-            ) as response:
-                if response.status in (200, 201):
-                    logger.info(f"✅ Successfully registered user {display_name} ({discord_id}) with backend")
-                    return True
-                elif response.status == 409:
-                    logger.info(f"ℹ️ User {display_name} ({discord_id}) already exists in backend")
-                    return True
-                else:
-                    error_text = await response.text()
-                    logger.error(f"❌ Failed to register user {display_name} ({discord_id}) with backend: {response.status} - {error_text}")
-                    return False
+        payload = {
+            "action": "upsert-user",
+            "discord_id": discord_id,
+            "display_name": display_name,
+            "username": username,
+        }
+        
+        async with backend.post(payload) as response:
+            if response.status in (200, 201):
+                logger.info(f"✅ Successfully registered user {display_name} ({discord_id}) with backend")
+                return True
+            elif response.status == 409:
+                logger.info(f"ℹ️ User {display_name} ({discord_id}) already exists in backend")
+                return True
+            else:
+                error_text = await response.text()
+                logger.error(f"❌ Failed to register user {display_name} ({discord_id}) with backend: {response.status} - {error_text}")
+                return False
                     
     except Exception as e:
         logger.error(f"❌ Error registering user {display_name} ({discord_id}) with backend: {e}")
@@ -148,47 +125,108 @@ async def validate_discord_username(discord_username: str):
 async def update_user_points_in_backend(discord_id: str, points: int, action: str):
     """Update user points in the backend API"""
     try:
-        async with aiohttp.ClientSession() as session:
-            # Map free-form actions to Activity.activity_type values
-            action_map = {
-                "Message sent": "discord_activity",
-                "Liking/interacting": "like_interaction",
-                "Resume upload": "resume_upload",
-                "Resume review request": "resume_review_request",
-                "Event attendance": "event_attendance",
-                "LinkedIn update": "linkedin_post",
-            }
-            activity_type = action_map.get(action)
-            if activity_type is None:
-                activity_type = "discord_activity"
-
-            payload = {
-                "action": "add-activity",
-                "discord_id": discord_id,
-                "activity_type": activity_type,
-                "details": action,
-            }
-            
-            async with session.post(
-                f"{BACKEND_API_URL}/api/bot/",
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "X-Bot-Secret": BOT_SHARED_SECRET,
-                }
-            ) as response:
-                if response.status in (200, 201):
-                    logger.info(f"✅ Successfully updated points for user {discord_id} in backend")
-                    return True
-                else:
-                    error_text = await response.text()
-                    logger.error(f"❌ Failed to update points for user {discord_id} in backend: {response.status} - {error_text}")
-                    return False
+        # Map free-form actions to Activity.activity_type values
+        action_map = {
+            "Message sent": "discord_activity",
+            "Liking/interacting": "like_interaction",
+            "Resume upload": "resume_upload",
+            "Resume review request": "resume_review_request",
+            "Event attendance": "event_attendance",
+            "LinkedIn update": "linkedin_post",
+        }
+        activity_type = action_map.get(action)
+        if activity_type is None:
+            activity_type = "discord_activity"
+
+        payload = {
+            "action": "add-activity",
+            "discord_id": discord_id,
+            "activity_type": activity_type,
+            "details": action,
+        }
+        
+        async with backend.post(payload) as response:
+            if response.status in (200, 201):
+                logger.info(f"✅ Successfully updated points for user {discord_id} in backend")
+                return True
+            else:
+                error_text = await response.text()
+                logger.error(f"❌ Failed to update points for user {discord_id} in backend: {response.status} - {error_text}")
+                return False
                     
     except Exception as e:
         logger.error(f"❌ Error updating points for user {discord_id} in backend: {e}")
         return False
 
+# Guild member directory: the backend validates usernames against this copy
+# instead of calling Discord's member search on every registration
+GUILD_SNAPSHOT_CHUNK_SIZE = 1000
+GUILD_SNAPSHOT_INTERVAL_HOURS = 6  # Backend falls back to the Discord API after 12h without a sync
+USER_REGISTRATION_CHUNK_SIZE = 2000  # Backend accepts up to 5000 members per bulk-upsert-users call
+
+def member_directory_entry(member):
+    return {
+        "discord_id": str(member.id),
+        "username": member.name,
+        "discriminator": member.discriminator,
+        "display_name": member.display_name,
+    }
+
+async def post_directory_payload(payload):
+    async with backend.post(payload) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            raise RuntimeError(f"{payload['action']} failed: {response.status} - {error_text}")
+        return await response.json()
+
+async def push_guild_snapshot(guild):
+    """Send the full member list to the backend in chunks; the last chunk drops departed members"""
+    members = [member_directory_entry(member) for member in guild.members if not member.bot]
+    snapshot_id = uuid.uuid4().hex
+    chunks = [members[i:i + GUILD_SNAPSHOT_CHUNK_SIZE] for i in range(0, len(members), GUILD_SNAPSHOT_CHUNK_SIZE)] or [[]]
+    try:
+        for index, chunk in enumerate(chunks):
+            await post_directory_payload({
+                "action": "sync-guild-members",
+                "snapshot_id": snapshot_id,
+                "members": chunk,
+                "final": index == len(chunks) - 1,
+            })
+        logger.info(f"✅ Synced {len(members)} members of {guild.name} to the backend directory")
+    except Exception as e:
+        logger.error(f"❌ Error syncing member directory for {guild.name}: {e}")
+
+async def push_member_event(event_type, member):
+    """Send one join/update/leave delta to the backend member directory"""
+    if member.bot:
+        return
+    event = {"type": event_type, **member_directory_entry(member)}
+    try:
+        await post_directory_payload({"action": "guild-member-events", "events": [event]})
+    except Exception as e:
+        logger.error(f"❌ Error sending member {event_type} for {member} to backend: {e}")
+
+async def register_guild_members(guild):
+    """Register every member in bulk so people who joined while the bot was offline get accounts"""
+    members = guild.members if guild.chunked else [member async for member in guild.fetch_members(limit=None)]
+    entries = [member_directory_entry(member) for member in members if not member.bot]
+    created = 0
+    try:
+        for i in range(0, len(entries), USER_REGISTRATION_CHUNK_SIZE):
+            result = await post_directory_payload({
+                "action": "bulk-upsert-users",
+                "members": entries[i:i + USER_REGISTRATION_CHUNK_SIZE],
+            })
+            created += result.get("created", 0)
+        logger.info(f"✅ Registered {created} new of {len(entries)} members of {guild.name} with the backend")
+    except Exception as e:
+        logger.error(f"❌ Error registering members of {guild.name}: {e}")
+
+@tasks.loop(hours=GUILD_SNAPSHOT_INTERVAL_HOURS)
+async def refresh_guild_directory():
+    for guild in bot.guilds:
+        await push_guild_snapshot(guild)
+
 async def load_cogs():
     """Load all cogs with proper error handling"""
     global cogs_loaded
@@ -225,7 +263,7 @@ async def setup_database():
 @bot.event
 async def on_ready():
     """Bot ready event with comprehensive setup"""
-    global reconnect_attempts
+    global reconnect_attempts, members_registered
     
     logger.info(f"🤖 Bot is online as {bot.user}")
     logger.info(f"🆔 Bot ID: {bot.user.id}")
@@ -253,6 +291,16 @@ async def on_ready():
     except Exception as e:
         logger.error(f"❌ Failed to load event_logger cog: {e}")
     
+    # Snapshot the member list now and every few hours (the first loop run is immediate)
+    if not refresh_guild_directory.is_running():
+        refresh_guild_directory.start()
+
+    # Catch up on members who joined while the bot was offline
+    if not members_registered:
+        members_registered = True
+        for guild in bot.guilds:
+            await register_guild_members(guild)
+    
     # Set bot status
     await bot.change_presence(
         activity=discord.Activity(
@@ -300,6 +348,7 @@ async def on_member_join(member):
         
         # Register with backend (this ensures 1:1 mapping between Discord members and backend users)
         backend_success = await register_user_with_backend(discord_id, display_name, username)
+        await push_member_event("join", member)
         
         if not backend_success:
             logger.warning(f"⚠️ Failed to register user {display_name} ({discord_id}) with backend, but continuing with local operations")
@@ -350,6 +399,28 @@ async def on_member_join(member):
         logger.error(f"❌ Error sending welcome DM to {member.display_name}: {e}")
 
 
+@bot.event
+async def on_member_remove(member):
+    """Drop departed members from the backend member directory"""
+    await push_member_event("leave", member)
+
+@bot.event
+async def on_member_update(before, after):
+    """Keep server display names current in the backend member directory"""
+    if before.display_name != after.display_name:
+        await push_member_event("update", after)
+
+@bot.event
+async def on_user_update(before, after):
+    """Username changes arrive as user (not member) updates"""
+    if (before.name, before.discriminator) == (after.name, after.discriminator):
+        return
+    for guild in bot.guilds:
+        member = guild.get_member(after.id)
+        if member is not None:
+            await push_member_event("update", member)
+            break
+
 # Basic commands with error handling
 @bot.command()
 async def ping(ctx):
@@ -771,6 +842,7 @@ async def adminhelp(ctx):
                   "`!review_stats` - Show resume review statistics\n"
                   "`!pending_reviews` - Show pending review requests\n"
                   "`!suggest_matches <user>` - Show professional matches for student\n"
+                  "`!propose_matches [apply]` - Match all pending requests at once\n"
                   "`!schedule_session <user> <professional> <time>` - Schedule review session",
             inline=False
         )
@@ -820,47 +892,39 @@ async def link(ctx, code: str = None):
         await ctx.send("Usage: `!link <6-digit code>`\nGet your code from the website profile page.")
         return
     try:
-        async with aiohttp.ClientSession() as session:
-            # Include Discord username for verification security
-            payload = {
-                "action": "link",
-                "code": code,
-                "discord_id": str(ctx.author.id),
-                "discord_username": f"{ctx.author.name}#{ctx.author.discriminator}"
-            }
-            async with session.post(
-                f"{BACKEND_API_URL}/api/bot/",
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "X-Bot-Secret": BOT_SHARED_SECRET,
-                }
-            ) as response:
-                if response.status in (200, 201):
-                    data = await response.json()
-                    if data.get('verified'):
-                        await ctx.send("✅ Successfully verified and linked your Discord account to your website account!")
-                        await ctx.send("🎉 You can now use all Discord bot features and earn points!")
-                    else:
-                        await ctx.send("✅ Successfully linked your Discord to your website account.")
+        # Include Discord username for verification security
+        payload = {
+            "action": "link",
+            "code": code,
+            "discord_id": str(ctx.author.id),
+            "discord_username": f"{ctx.author.name}#{ctx.author.discriminator}"
+        }
+        async with backend.post(payload) as response:
+            if response.status in (200, 201):
+                data = await response.json()
+                if data.get('verified'):
+                    await ctx.send("✅ Successfully verified and linked your Discord account to your website account!")
+                    await ctx.send("🎉 You can now use all Discord bot features and earn points!")
                 else:
-                    raw = await response.text()
-                    # Log full backend error for diagnostics
-                    logger.error(f"Link failed ({response.status}): {raw[:4000]}")
-                    # Try to show a concise message to user without exceeding Discord limits
-                    short_msg = None
-                    try:
-                        data = json.loads(raw)
-                        short_msg = data.get('error') or data
-                    except Exception:
-                        pass
-                    if not short_msg:
-                        short_msg = f"status {response.status}"
-                    # Ensure under 1800 chars to be safe
-                    short = str(short_msg)
-                    if len(short) > 1800:
-                        short = short[:1800] + "…"
-                    await ctx.send(f"❌ Linking failed: {short}")
+                    await ctx.send("✅ Successfully linked your Discord to your website account.")
+            else:
+                raw = await response.text()
+                # Log full backend error for diagnostics
+                logger.error(f"Link failed ({response.status}): {raw[:4000]}")
+                # Try to show a concise message to user without exceeding Discord limits
+                short_msg = None
+                try:
+                    data = json.loads(raw)
+                    short_msg = data.get('error') or data
+                except Exception:
+                    pass
+                if not short_msg:
+                    short_msg = f"status {response.status}"
+                # Ensure under 1800 chars to be safe
+                short = str(short_msg)
+                if len(short) > 1800:
+                    short = short[:1800] + "…"
+                await ctx.send(f"❌ Linking failed: {short}")
     except Exception as e:
         await ctx.send(f"❌ Linking error: {e}")
 
@@ -873,23 +937,18 @@ async def rank(ctx, member: discord.Member = None):
             member = ctx.author
         page = 1
         while True:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "leaderboard", "page": page, "page_size": 50},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to fetch rank.")
+            async with backend.post({"action": "leaderboard", "page": page, "page_size": 50}) as resp:
+                if resp.status != 200:
+                    await ctx.send("❌ Failed to fetch rank.")
+                    return
+                data = await resp.json()
+                for item in data.get("results", []):
+                    if item.get("discord_id") == str(member.id):
+                        await ctx.send(f"🏅 {member.display_name} is ranked #{item.get('position')} with {item.get('total_points', 0)} points.")
                         return
-                    data = await resp.json()
-                    for item in data.get("results", []):
-                        if item.get("discord_id") == str(member.id):
-                            await ctx.send(f"🏅 {member.display_name} is ranked #{item.get('position')} with {item.get('total_points', 0)} points.")
-                            return
-                    if data.get("page") >= data.get("total_pages"):
-                        break
-                    page += 1
+                if data.get("page") >= data.get("total_pages"):
+                    break
+                page += 1
         await ctx.send(f"{member.display_name} has no points and is not on the leaderboard.")
     except Exception as e:
         logger.error(f"Rank error: {e}")
@@ -924,6 +983,7 @@ async def shutdown():
     """Graceful shutdown function"""
     logger.info("🛑 Shutting down bot...")
     await bot.close()
+    await backend.close()
 
 # Signal handlers for graceful shutdown
 import signal
@@ -0,0 +1,89 @@
+"""
+How the bot reaches the backend's bot actions (/api/bot/).
+
+``HttpTransport`` posts JSON with the shared secret; it is the default and
+works wherever the bot runs. ``InProcessTransport`` is for a bot in the
+backend's container (start.sh): it runs the actions in the bot's own process
+through core.bot_service, with no loopback HTTP request, no shared-secret round
+trip and no web worker tied up per Discord event. Its writes purge caches and
+bump data versions from the bot's process, so it refuses to start unless the
+cache is shared with the web workers (CACHE_URL). BOT_TRANSPORT picks one.
+
+Both return responses with the parts of an aiohttp response the cogs read::
+
+    async with backend.post({"action": "summary", "discord_id": "123"}) as response:
+        if response.status == 200:
+            data = await response.json()
+"""
+import json
+import os
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+
+class HttpTransport:
+    def __init__(self, base_url, shared_secret):
+        self.url = f"{base_url}/api/bot/"
+        self.headers = {"Content-Type": "application/json", "X-Bot-Secret": shared_secret}
+        self._session = None
+
+    def post(self, payload):
+        # One session for the bot's lifetime keeps the backend connection alive between events
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session.post(self.url, json=payload, headers=self.headers)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+class InProcessResponse:
+    def __init__(self, status, data):
+        self.status = status
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+    async def text(self):
+        return json.dumps(self._data)
+
+
+class InProcessTransport:
+    def __init__(self):
+        import django
+        from django.apps import apps
+        from django.core.exceptions import ImproperlyConfigured
+
+        if not apps.ready:
+            os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+            django.setup()
+
+        from core.caching import cache_is_shared
+
+        # Actions purge caches and bump data versions; in a per-process cache only the bot would see that
+        if not cache_is_shared():
+            raise ImproperlyConfigured(
+                "BOT_TRANSPORT=inprocess needs a cache shared with the web workers; set CACHE_URL "
+                "(redis:// or dbcache://) or use BOT_TRANSPORT=http"
+            )
+
+    @asynccontextmanager
+    async def post(self, payload):
+        from core.bot_service import run_action
+
+        status, data = await run_action(payload)
+        yield InProcessResponse(status, data)
+
+    async def close(self):
+        pass
+
+
+def create_transport(name, base_url, shared_secret):
+    if name == "http":
+        return HttpTransport(base_url, shared_secret)
+    if name == "inprocess":
+        return InProcessTransport()
+    raise ValueError(f"Unknown BOT_TRANSPORT: {name}")
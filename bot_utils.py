@@ -0,0 +1,115 @@
+"""
+Backend access and Discord helpers shared by bot.py and the cogs.
+
+bot.py runs as ``__main__``, so ``import bot`` from a cog would execute it a
+second time as a separate module (a second commands.Bot, a second transport
+whose HTTP session is never closed, and module state such as the display-name
+cache split in two). Cogs import ``backend`` and these helpers from here.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+from bot_transport import create_transport
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+
+def get_backend_url():
+    """Smart backend URL selection based on environment"""
+    # Check if BACKEND_API_URL is explicitly set
+    explicit_url = os.getenv('BACKEND_API_URL')
+    if explicit_url:
+        return explicit_url
+    
+    # For Render deployment, use localhost when bot and backend are in same container
+    if os.getenv('RENDER'):
+        port = os.getenv('PORT', '8000')
+        return f'http://127.0.0.1:{port}'
+    
+    # Default to localhost for local development
+    return 'http://localhost:8000'
+
+
+BACKEND_API_URL = get_backend_url()
+BOT_SHARED_SECRET = os.getenv('BOT_SHARED_SECRET', '')
+# 'http' posts to BACKEND_API_URL; 'inprocess' runs the bot actions in this process (bot and backend co-located)
+BOT_TRANSPORT = os.getenv('BOT_TRANSPORT', 'http')
+backend = create_transport(BOT_TRANSPORT, BACKEND_API_URL, BOT_SHARED_SECRET)
+
+
+# Display names for embeds that list many users. Gateway caches first, then a
+# small TTL LRU, and only the remaining misses go to Discord's REST API
+DISPLAY_NAME_CACHE_SIZE = 2000
+DISPLAY_NAME_TTL_SECONDS = 3600
+DISPLAY_NAME_FETCH_CONCURRENCY = 5
+_display_names = OrderedDict()  # user id -> (display name, expires at)
+
+
+def cached_display_name(client, user_id: int):
+    """Display name from the member/user caches or the LRU, without any request; None on a miss"""
+    for guild in client.guilds:
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member.display_name
+    user = client.get_user(user_id)
+    if user is not None:
+        return user.display_name
+    entry = _display_names.get(user_id)
+    if entry is None:
+        return None
+    if entry[1] < time.monotonic():
+        del _display_names[user_id]
+        return None
+    _display_names.move_to_end(user_id)
+    return entry[0]
+
+
+def remember_display_name(user_id: int, name: str):
+    _display_names[user_id] = (name, time.monotonic() + DISPLAY_NAME_TTL_SECONDS)
+    _display_names.move_to_end(user_id)
+    while len(_display_names) > DISPLAY_NAME_CACHE_SIZE:
+        _display_names.popitem(last=False)
+
+
+async def resolve_display_names(client, user_ids):
+    """Map each Discord id to a display name; ids Discord cannot resolve are left out"""
+    names, misses = {}, []
+    for raw_id in user_ids:
+        try:
+            user_id = int(raw_id)
+        except (TypeError, ValueError):
+            continue
+        if str(user_id) in names or user_id in misses:
+            continue
+        name = cached_display_name(client, user_id)
+        if name is None:
+            misses.append(user_id)
+        else:
+            names[str(user_id)] = name
+
+    semaphore = asyncio.Semaphore(DISPLAY_NAME_FETCH_CONCURRENCY)
+
+    async def fetch(user_id):
+        async with semaphore:
+            return await client.fetch_user(user_id)
+
+    results = await asyncio.gather(*(fetch(user_id) for user_id in misses), return_exceptions=True)
+    for user_id, user in zip(misses, results):
+        if isinstance(user, Exception):
+            logger.warning(f"⚠️ Could not resolve Discord user {user_id}: {user}")
+            continue
+        remember_display_name(user_id, user.display_name)
+        names[str(user_id)] = user.display_name
+    return names
+
+
+async def get_or_fetch_user(client, user_id):
+    """User object for DMs: the gateway cache when it has one, else a REST fetch"""
+    return client.get_user(int(user_id)) or await client.fetch_user(int(user_id))
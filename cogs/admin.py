@@ -2,7 +2,7 @@ from discord.ext import commands
 import discord
 from datetime import datetime, timedelta
 import asyncio
-import aiohttp
+from bot_utils import backend, get_or_fetch_user, resolve_display_names
 
 class Admin(commands.Cog):
     def __init__(self, bot):
@@ -11,45 +11,30 @@ class Admin(commands.Cog):
     async def add_points(self, user_id, pts, reason="Admin adjustment"):
         # Always write via backend as source of truth using admin-adjust action
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "action": "admin-adjust",
-                    "discord_id": user_id,
-                    "delta_points": int(pts),
-                    "reason": reason,
-                }
-                
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json=payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-Bot-Secret": BOT_SHARED_SECRET,
-                    }
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return True, data.get("total_points", 0)
-                    else:
-                        error_text = await response.text()
-                        return False, error_text
+            payload = {
+                "action": "admin-adjust",
+                "discord_id": user_id,
+                "delta_points": int(pts),
+                "reason": reason,
+            }
+            
+            async with backend.post(payload) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return True, data.get("total_points", 0)
+                else:
+                    error_text = await response.text()
+                    return False, error_text
                         
         except Exception as e:
             return False, str(e)
 
     async def clear_user_caches(self, user_id):
-        """Clear all caches that could be affected by user point changes"""
+        """Clear the cached API responses of one user after their points change"""
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                # Clear all user-specific caches
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/cache/clear_user/",
-                    json={"user_id": user_id},
-                    headers={"X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    pass  # Don't fail if cache clear fails
+            # Scoped purge: only this user's entries, other dashboards stay warm
+            async with backend.post({"action": "purge-cache", "discord_id": user_id}) as resp:
+                pass  # Don't fail if cache clear fails
         except Exception:
             pass  # Don't fail the main command if cache clearing fails
 
@@ -85,135 +70,133 @@ class Admin(commands.Cog):
         
         return ", ".join(unique_words[:3]) if unique_words else "template, review, coaching"
 
+    async def fetch_rewards(self):
+        """All rewards, active or not, from the backend; None if the request fails"""
+        async with backend.post({"action": "list-incentives"}) as resp:
+            if resp.status != 200:
+                return None
+            data = await resp.json()
+        return data.get('incentives', [])
+
     async def handle_reward_command_bot_api(self, ctx, reward_name, action, action_past_tense):
         """Handle reward enable/disable commands with stock management"""
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                # First find the reward by name using bot API
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "list-incentives"},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to fetch rewards.")
-                        return
-                    data = await resp.json()
-                    if not data.get('success'):
-                        await ctx.send("❌ Failed to fetch rewards.")
-                        return
-                    rewards = data.get('incentives', [])
+            # First find the reward by name using bot API
+            async with backend.post({"action": "list-incentives"}) as resp:
+                if resp.status != 200:
+                    await ctx.send("❌ Failed to fetch rewards.")
+                    return
+                data = await resp.json()
+                if not data.get('success'):
+                    await ctx.send("❌ Failed to fetch rewards.")
+                    return
+                rewards = data.get('incentives', [])
+            
+            # Smart matching
+            matches, match_type = self.find_reward_matches(rewards, reward_name)
+            
+            if not matches:
+                # No matches found - show suggestions
+                embed = discord.Embed(
+                    title="❌ Reward Not Found",
+                    description=f"No rewards found matching: `{reward_name}`",
+                    color=0xff0000
+                )
                 
-                # Smart matching
-                matches, match_type = self.find_reward_matches(rewards, reward_name)
+                # Show similar rewards
+                similar = []
+                for r in rewards:
+                    name_lower = r.get('name', '').lower()
+                    if any(word in name_lower for word in reward_name.lower().split()):
+                        similar.append(r)
                 
-                if not matches:
-                    # No matches found - show suggestions
-                    embed = discord.Embed(
-                        title="❌ Reward Not Found",
-                        description=f"No rewards found matching: `{reward_name}`",
-                        color=0xff0000
-                    )
-                    
-                    # Show similar rewards
-                    similar = []
-                    for r in rewards:
-                        name_lower = r.get('name', '').lower()
-                        if any(word in name_lower for word in reward_name.lower().split()):
-                            similar.append(r)
-                    
-                    if similar:
-                        embed.add_field(
-                            name="💡 Did you mean?",
-                            value="\n".join([f"• {r.get('name')}" for r in similar[:5]]),
-                            inline=False
-                        )
-                    
+                if similar:
                     embed.add_field(
-                        name="💡 Tip",
-                        value="Use `!rewards` to see all available rewards",
+                        name="💡 Did you mean?",
+                        value="\n".join([f"• {r.get('name')}" for r in similar[:5]]),
                         inline=False
                     )
-                    await ctx.send(embed=embed)
-                    return
                 
-                if len(matches) > 1:
-                    # Multiple matches found - show them to admin
-                    embed = discord.Embed(
-                        title="🔍 Multiple Rewards Found",
-                        description=f"Found {len(matches)} rewards matching `{reward_name}`:",
-                        color=0xffaa00
-                    )
-                    
-                    for i, match in enumerate(matches, 1):
-                        stock_status = "In Stock" if match.get('stock_available', 0) > 0 else "Out of Stock"
-                        embed.add_field(
-                            name=f"{i}. {stock_status} {match.get('name')}",
-                            value=f"ID: {match.get('id')} | {match.get('points_required')} pts | Stock: {match.get('stock_available')}",
-                            inline=False
-                        )
-                    
+                embed.add_field(
+                    name="💡 Tip",
+                    value="Use `!rewards` to see all available rewards",
+                    inline=False
+                )
+                await ctx.send(embed=embed)
+                return
+            
+            if len(matches) > 1:
+                # Multiple matches found - show them to admin
+                embed = discord.Embed(
+                    title="🔍 Multiple Rewards Found",
+                    description=f"Found {len(matches)} rewards matching `{reward_name}`:",
+                    color=0xffaa00
+                )
+                
+                for i, match in enumerate(matches, 1):
+                    stock_status = "In Stock" if match.get('stock_available', 0) > 0 else "Out of Stock"
                     embed.add_field(
-                        name="💡 How to Fix",
-                        value=f"Be more specific with the reward name:\n"
-                              f"• Use the full name: `{matches[0].get('name')}`\n"
-                              f"• Use unique words: `{self.get_unique_words(matches)}`\n"
-                              f"• Use quotes for exact match: `\"{reward_name}\"`",
+                        name=f"{i}. {stock_status} {match.get('name')}",
+                        value=f"ID: {match.get('id')} | {match.get('points_required')} pts | Stock: {match.get('stock_available')}",
                         inline=False
                     )
-                    await ctx.send(embed=embed)
-                    return
-                
-                # Single match found - proceed
-                reward = matches[0]
-                current_stock = reward.get('stock_available', 0)
-                
-                # Check current status
-                if action == "enable" and current_stock > 0:
-                    await ctx.send(f"✅ {reward.get('name')} is already in stock!")
-                    return
-                elif action == "disable" and current_stock == 0:
-                    await ctx.send(f"❌ {reward.get('name')} is already out of stock!")
-                    return
-                
-                # Perform the action using stock management
-                new_stock = 10 if action == "enable" else 0  # Default stock when enabling
-                
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={
-                        "action": "update-incentive-stock",
-                        "incentive_id": reward.get('id'),
-                        "stock_count": new_stock
-                    },
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        text = await resp.text()
-                        await ctx.send(f"❌ Failed to {action} reward: {text[:200]}")
-                        return
-                    data = await resp.json()
-                    if not data.get('success'):
-                        await ctx.send(f"❌ Failed to {action} reward: {data.get('error', 'Unknown error')}")
-                        return
-                
-                # Success response
-                status_emoji = "✅" if new_stock > 0 else "❌"
-                status_text = "in stock" if new_stock > 0 else "out of stock"
-                color = 0x00ff00 if new_stock > 0 else 0xff0000
                 
-                embed = discord.Embed(
-                    title=f"{status_emoji} Reward {action_past_tense.title()}",
-                    description=f"**{data.get('name')}** is now {status_text}",
-                    color=color
+                embed.add_field(
+                    name="💡 How to Fix",
+                    value=f"Be more specific with the reward name:\n"
+                          f"• Use the full name: `{matches[0].get('name')}`\n"
+                          f"• Use unique words: `{self.get_unique_words(matches)}`\n"
+                          f"• Use quotes for exact match: `\"{reward_name}\"`",
+                    inline=False
                 )
-                embed.add_field(name="Points Required", value=f"{data.get('points_required')} pts", inline=True)
-                embed.add_field(name="Stock Available", value=f"{new_stock}", inline=True)
-                embed.add_field(name="Previous Stock", value=f"{current_stock}", inline=True)
-                embed.add_field(name="Match Type", value=match_type.title(), inline=True)
-                
                 await ctx.send(embed=embed)
+                return
+            
+            # Single match found - proceed
+            reward = matches[0]
+            current_stock = reward.get('stock_available', 0)
+            
+            # Check current status
+            if action == "enable" and current_stock > 0:
+                await ctx.send(f"✅ {reward.get('name')} is already in stock!")
+                return
+            elif action == "disable" and current_stock == 0:
+                await ctx.send(f"❌ {reward.get('name')} is already out of stock!")
+                return
+            
+            # Perform the action using stock management
+            new_stock = 10 if action == "enable" else 0  # Default stock when enabling
+            
+            async with backend.post({
+                "action": "update-incentive-stock",
+                "incentive_id": reward.get('id'),
+                "stock_count": new_stock
+            }) as resp:
+                if resp.status != 200:
+                    text = await resp.text()
+                    await ctx.send(f"❌ Failed to {action} reward: {text[:200]}")
+                    return
+                data = await resp.json()
+                if not data.get('success'):
+                    await ctx.send(f"❌ Failed to {action} reward: {data.get('error', 'Unknown error')}")
+                    return
+            
+            # Success response
+            status_emoji = "✅" if new_stock > 0 else "❌"
+            status_text = "in stock" if new_stock > 0 else "out of stock"
+            color = 0x00ff00 if new_stock > 0 else 0xff0000
+            
+            embed = discord.Embed(
+                title=f"{status_emoji} Reward {action_past_tense.title()}",
+                description=f"**{data.get('name')}** is now {status_text}",
+                color=color
+            )
+            embed.add_field(name="Points Required", value=f"{data.get('points_required')} pts", inline=True)
+            embed.add_field(name="Stock Available", value=f"{new_stock}", inline=True)
+            embed.add_field(name="Previous Stock", value=f"{current_stock}", inline=True)
+            embed.add_field(name="Match Type", value=match_type.title(), inline=True)
+            
+            await ctx.send(embed=embed)
                 
         except Exception as e:
             await ctx.send(f"❌ Error {action}ing reward: {str(e)}")
@@ -271,31 +254,21 @@ class Admin(commands.Cog):
     async def resetpoints(self, ctx, member: commands.MemberConverter):
         # Implement by admin-adjust negative of current total via backend summary
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                # Fetch current total via summary
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "summary", "discord_id": str(member.id), "limit": 1},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to fetch user points for reset.")
-                        return
-                    data = await resp.json()
-                    total = int(data.get("total_points", 0))
-                # Apply negative delta
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "admin-adjust", "discord_id": str(member.id), "delta_points": -total, "reason": "Reset by admin"},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp2:
-                    if resp2.status != 200:
-                        await ctx.send("❌ Failed to reset points.")
-                        return
-                
-                # Clear all caches that could be affected by point changes
-                await self.clear_user_caches(str(member.id))
+            # Fetch current total via summary
+            async with backend.post({"action": "summary", "discord_id": str(member.id), "limit": 1}) as resp:
+                if resp.status != 200:
+                    await ctx.send("❌ Failed to fetch user points for reset.")
+                    return
+                data = await resp.json()
+                total = int(data.get("total_points", 0))
+            # Apply negative delta
+            async with backend.post({"action": "admin-adjust", "discord_id": str(member.id), "delta_points": -total, "reason": "Reset by admin"}) as resp2:
+                if resp2.status != 200:
+                    await ctx.send("❌ Failed to reset points.")
+                    return
+            
+            # Clear all caches that could be affected by point changes
+            await self.clear_user_caches(str(member.id))
                 
         except Exception:
             await ctx.send("❌ Error resetting points.")
@@ -316,26 +289,22 @@ class Admin(commands.Cog):
         total_points = 0
         today_activity = 0
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "leaderboard", "page": 1, "page_size": 1},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        total_users = data.get("total_users", 0)
-                        if data.get("results"):
-                            total_points = data["results"][0].get("total_points", 0)  # best-effort
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "activitylog", "hours": 24, "limit": 1000},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp2:
-                    if resp2.status == 200:
-                        data2 = await resp2.json()
-                        today_activity = len(data2.get("items", []))
+            async def fetch(payload):
+                async with backend.post(payload) as resp:
+                    return await resp.json() if resp.status == 200 else None
+
+            # Independent lookups - issue them concurrently
+            data, data2 = await asyncio.gather(
+                fetch({"action": "leaderboard", "page": 1, "page_size": 1}),
+                fetch({"action": "activitylog", "hours": 24, "limit": 1000}),
+                return_exceptions=True,
+            )
+            if isinstance(data, dict):
+                total_users = data.get("total_users", 0)
+                if data.get("results"):
+                    total_points = data["results"][0].get("total_points", 0)  # best-effort
+            if isinstance(data2, dict):
+                today_activity = len(data2.get("items", []))
         except Exception:
             pass
         
@@ -362,30 +331,22 @@ class Admin(commands.Cog):
             color=0xffd700
         )
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "leaderboard", "page": 1, "page_size": limit},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to fetch top users.")
-                        return
-                    data = await resp.json()
-                    for item in data.get("results", []):
-                        user_id = item.get("discord_id")
-                        points = item.get("total_points", 0)
-                        try:
-                            user = await self.bot.fetch_user(int(user_id))
-                            username = user.display_name
-                        except Exception:
-                            username = item.get("username") or f"User {user_id}"
-                        embed.add_field(
-                            name=f"#{item.get('position')} {username}",
-                            value=f"{points:,} points",
-                            inline=True
-                        )
+            async with backend.post({"action": "leaderboard", "page": 1, "page_size": limit}) as resp:
+                if resp.status != 200:
+                    await ctx.send("❌ Failed to fetch top users.")
+                    return
+                data = await resp.json()
+                results = data.get("results", [])
+                names = await resolve_display_names(self.bot, [item.get("discord_id") for item in results])
+                for item in results:
+                    user_id = item.get("discord_id")
+                    points = item.get("total_points", 0)
+                    username = names.get(str(user_id)) or item.get("username") or f"User {user_id}"
+                    embed.add_field(
+                        name=f"#{item.get('position')} {username}",
+                        value=f"{points:,} points",
+                        inline=True
+                    )
         except Exception:
             await ctx.send("❌ Error fetching top users.")
             return
@@ -397,16 +358,10 @@ class Admin(commands.Cog):
     async def clearwarnings(self, ctx, member: commands.MemberConverter):
         """Clear warnings for a user"""
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "clear-warnings", "discord_id": str(member.id)},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to clear warnings.")
-                        return
+            async with backend.post({"action": "clear-warnings", "discord_id": str(member.id)}) as resp:
+                if resp.status != 200:
+                    await ctx.send("❌ Failed to clear warnings.")
+                    return
         except Exception:
             await ctx.send("❌ Error clearing warnings.")
             return
@@ -423,16 +378,10 @@ class Admin(commands.Cog):
     async def suspenduser(self, ctx, member: commands.MemberConverter, duration_minutes: int):
         """Suspend a user's ability to earn points"""
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "suspend-user", "discord_id": str(member.id), "duration_minutes": duration_minutes},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to suspend user.")
-                        return
+            async with backend.post({"action": "suspend-user", "discord_id": str(member.id), "duration_minutes": duration_minutes}) as resp:
+                if resp.status != 200:
+                    await ctx.send("❌ Failed to suspend user.")
+                    return
         except Exception:
             await ctx.send("❌ Error suspending user.")
             return
@@ -453,16 +402,10 @@ class Admin(commands.Cog):
     async def unsuspenduser(self, ctx, member: commands.MemberConverter):
         """Remove suspension from a user"""
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "unsuspend-user", "discord_id": str(member.id)},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to unsuspend user.")
-                        return
+            async with backend.post({"action": "unsuspend-user", "discord_id": str(member.id)}) as resp:
+                if resp.status != 200:
+                    await ctx.send("❌ Failed to unsuspend user.")
+                    return
         except Exception:
             await ctx.send("❌ Error unsuspending user.")
             return
@@ -479,21 +422,15 @@ class Admin(commands.Cog):
     async def activitylog(self, ctx, hours: int = 24):
         """Show recent activity log"""
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "activitylog", "hours": hours, "limit": 20},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to fetch activity log.")
-                        return
-                    data = await resp.json()
-                    items = data.get("items", [])
-                    if not items:
-                        await ctx.send(f"No activity in the last {hours} hours.")
-                        return
+            async with backend.post({"action": "activitylog", "hours": hours, "limit": 20}) as resp:
+                if resp.status != 200:
+                    await ctx.send("❌ Failed to fetch activity log.")
+                    return
+                data = await resp.json()
+                items = data.get("items", [])
+                if not items:
+                    await ctx.send(f"No activity in the last {hours} hours.")
+                    return
         except Exception:
             await ctx.send("❌ Error fetching activity log.")
             return
@@ -503,13 +440,10 @@ class Admin(commands.Cog):
             description="Recent point-earning activities",
             color=0x0099ff
         )
+        names = await resolve_display_names(self.bot, [item.get("discord_id") for item in items])
         for item in items:
             user_id = item.get("discord_id")
-            try:
-                user = await self.bot.fetch_user(int(user_id))
-                username = user.display_name
-            except Exception:
-                username = item.get("username") or f"User {user_id}"
+            username = names.get(str(user_id)) or item.get("username") or f"User {user_id}"
             embed.add_field(
                 name=f"{item.get('timestamp', '')[:19]} - {username}",
                 value=f"{item.get('action')} (+{item.get('points', 0)} pts)",
@@ -633,17 +567,11 @@ class Admin(commands.Cog):
             
             # Fetch top contributors from backend
             try:
-                from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{BACKEND_API_URL}/api/bot/",
-                        json={"action": "top-contributors", "period": period, "limit": 5},
-                        headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                    ) as resp:
-                        if resp.status != 200:
-                            await ctx.send("❌ Failed to fetch top contributors.")
-                            return
-                        data = await resp.json()
+                async with backend.post({"action": "top-contributors", "period": period, "limit": 5}) as resp:
+                    if resp.status != 200:
+                        await ctx.send("❌ Failed to fetch top contributors.")
+                        return
+                    data = await resp.json()
             except Exception:
                 await ctx.send("❌ Error connecting to backend.")
                 return
@@ -665,18 +593,12 @@ class Admin(commands.Cog):
                     inline=False
                 )
             else:
+                names = await resolve_display_names(self.bot, [c.get('discord_id') for c in contributors])
                 for i, contributor in enumerate(contributors, 1):
                     user_id = contributor.get('discord_id')
                     points = contributor.get('points', 0)
                     activities = contributor.get('activities', 0)
-                    username = contributor.get('username', f'User {user_id}')
-                    
-                    # Get Discord user if possible
-                    try:
-                        user = await self.bot.fetch_user(int(user_id))
-                        display_name = user.display_name
-                    except:
-                        display_name = username
+                    display_name = names.get(str(user_id)) or contributor.get('username', f'User {user_id}')
                     
                     # Trophy emojis for top 3
                     trophy = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"**#{i}**"
@@ -716,26 +638,20 @@ class Admin(commands.Cog):
         try:
             # Fetch audit logs from backend
             try:
-                from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-                async with aiohttp.ClientSession() as session:
-                    payload = {
-                        "action": "audit-logs",
-                        "hours": hours,
-                        "limit": 50
-                    }
-                    
-                    if user:
-                        payload["discord_id"] = str(user.id)
-                    
-                    async with session.post(
-                        f"{BACKEND_API_URL}/api/bot/",
-                        json=payload,
-                        headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                    ) as resp:
-                        if resp.status != 200:
-                            await ctx.send("❌ Failed to fetch audit logs.")
-                            return
-                        data = await resp.json()
+                payload = {
+                    "action": "audit-logs",
+                    "hours": hours,
+                    "limit": 50
+                }
+                
+                if user:
+                    payload["discord_id"] = str(user.id)
+                
+                async with backend.post(payload) as resp:
+                    if resp.status != 200:
+                        await ctx.send("❌ Failed to fetch audit logs.")
+                        return
+                    data = await resp.json()
             except Exception:
                 await ctx.send("❌ Error connecting to backend.")
                 return
@@ -776,6 +692,7 @@ class Admin(commands.Cog):
             else:
                 # Show recent activities (limit to fit Discord embed)
                 recent_logs = logs[:10]  # Show first 10 logs
+                names = await resolve_display_names(self.bot, [log.get('discord_id') for log in recent_logs])
                 
                 for log in recent_logs:
                     user_id = log.get('discord_id')
@@ -783,13 +700,7 @@ class Admin(commands.Cog):
                     points = log.get('points', 0)
                     timestamp = log.get('timestamp', '')
                     details = log.get('details', '')
-                    
-                    # Get Discord user if possible
-                    try:
-                        user_obj = await self.bot.fetch_user(int(user_id))
-                        username = user_obj.display_name
-                    except:
-                        username = log.get('username', f'User {user_id}')
+                    username = names.get(str(user_id)) or log.get('username', f'User {user_id}')
                     
                     # Format timestamp
                     time_str = timestamp[:19] if timestamp else 'Unknown time'
@@ -833,23 +744,16 @@ class Admin(commands.Cog):
         try:
             # Call backend API to approve event
             try:
-                from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{BACKEND_API_URL}/api/bot/",
-                        json={
-                            "action": "approve-event",
-                            "submission_id": submission_id,
-                            "points": points,
-                            "notes": notes
-                        },
-                        headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                    ) as resp:
-                        if resp.status != 200:
-                            await ctx.send("❌ Failed to approve event.")
-                            return
-                        result = await resp.json()
+                async with backend.post({
+                    "action": "approve-event",
+                    "submission_id": submission_id,
+                    "points": points,
+                    "notes": notes
+                }) as resp:
+                    if resp.status != 200:
+                        await ctx.send("❌ Failed to approve event.")
+                        return
+                    result = await resp.json()
             except Exception as e:
                 await ctx.send(f"❌ Error connecting to backend: {e}")
                 return
@@ -897,7 +801,7 @@ class Admin(commands.Cog):
             try:
                 user_id = result.get('user_id')
                 if user_id:
-                    user = await self.bot.fetch_user(int(user_id))
+                    user = await get_or_fetch_user(self.bot, user_id)
                     user_embed = discord.Embed(
                         title="🎉 Your Event Attendance Was Approved!",
                         description=f"Great news! Your event attendance has been approved by an admin.",
@@ -922,22 +826,15 @@ class Admin(commands.Cog):
         try:
             # Call backend API to reject event
             try:
-                from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{BACKEND_API_URL}/api/bot/",
-                        json={
-                            "action": "reject-event",
-                            "submission_id": submission_id,
-                            "reason": reason
-                        },
-                        headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                    ) as resp:
-                        if resp.status != 200:
-                            await ctx.send("❌ Failed to reject event.")
-                            return
-                        result = await resp.json()
+                async with backend.post({
+                    "action": "reject-event",
+                    "submission_id": submission_id,
+                    "reason": reason
+                }) as resp:
+                    if resp.status != 200:
+                        await ctx.send("❌ Failed to reject event.")
+                        return
+                    result = await resp.json()
             except Exception as e:
                 await ctx.send(f"❌ Error connecting to backend: {e}")
                 return
@@ -972,7 +869,7 @@ class Admin(commands.Cog):
             try:
                 user_id = result.get('user_id')
                 if user_id:
-                    user = await self.bot.fetch_user(int(user_id))
+                    user = await get_or_fetch_user(self.bot, user_id)
                     user_embed = discord.Embed(
                         title="🚫 Your Event Attendance Was Rejected",
                         description=f"Unfortunately, your event attendance submission was not approved.",
@@ -995,23 +892,16 @@ class Admin(commands.Cog):
         try:
             # Call backend API to approve LinkedIn
             try:
-                from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{BACKEND_API_URL}/api/bot/",
-                        json={
-                            "action": "approve-linkedin",
-                            "submission_id": submission_id,
-                            "points": points,
-                            "notes": notes
-                        },
-                        headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                    ) as resp:
-                        if resp.status != 200:
-                            await ctx.send("❌ Failed to approve LinkedIn update.")
-                            return
-                        result = await resp.json()
+                async with backend.post({
+                    "action": "approve-linkedin",
+                    "submission_id": submission_id,
+                    "points": points,
+                    "notes": notes
+                }) as resp:
+                    if resp.status != 200:
+                        await ctx.send("❌ Failed to approve LinkedIn update.")
+                        return
+                    result = await resp.json()
             except Exception as e:
                 await ctx.send(f"❌ Error connecting to backend: {e}")
                 return
@@ -1059,7 +949,7 @@ class Admin(commands.Cog):
             try:
                 user_id = result.get('user_id')
                 if user_id:
-                    user = await self.bot.fetch_user(int(user_id))
+                    user = await get_or_fetch_user(self.bot, user_id)
                     user_embed = discord.Embed(
                         title="🎉 Your LinkedIn Update Was Approved!",
                         description=f"Great news! Your LinkedIn update has been approved by an admin.",
@@ -1084,22 +974,15 @@ class Admin(commands.Cog):
         try:
             # Call backend API to reject LinkedIn
             try:
-                from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{BACKEND_API_URL}/api/bot/",
-                        json={
-                            "action": "reject-linkedin",
-                            "submission_id": submission_id,
-                            "reason": reason
-                        },
-                        headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                    ) as resp:
-                        if resp.status != 200:
-                            await ctx.send("❌ Failed to reject LinkedIn update.")
-                            return
-                        result = await resp.json()
+                async with backend.post({
+                    "action": "reject-linkedin",
+                    "submission_id": submission_id,
+                    "reason": reason
+                }) as resp:
+                    if resp.status != 200:
+                        await ctx.send("❌ Failed to reject LinkedIn update.")
+                        return
+                    result = await resp.json()
             except Exception as e:
                 await ctx.send(f"❌ Error connecting to backend: {e}")
                 return
@@ -1134,7 +1017,7 @@ class Admin(commands.Cog):
             try:
                 user_id = result.get('user_id')
                 if user_id:
-                    user = await self.bot.fetch_user(int(user_id))
+                    user = await get_or_fetch_user(self.bot, user_id)
                     user_embed = discord.Embed(
                         title="🚫 Your LinkedIn Update Was Rejected",
                         description=f"Unfortunately, your LinkedIn update submission was not approved.",
@@ -1155,19 +1038,13 @@ class Admin(commands.Cog):
     async def rewards(self, ctx):
         """Show all rewards with their stock status and usage guide"""
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{BACKEND_API_URL}/api/incentives/admin_list/",
-                    headers={"X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to fetch rewards.")
-                        return
-                    data = await resp.json()
-                    if not data:
-                        await ctx.send("No rewards found.")
-                        return
+            data = await self.fetch_rewards()
+            if data is None:
+                await ctx.send("❌ Failed to fetch rewards.")
+                return
+            if not data:
+                await ctx.send("No rewards found.")
+                return
         except Exception:
             await ctx.send("❌ Error fetching rewards.")
             return
@@ -1227,102 +1104,92 @@ class Admin(commands.Cog):
     async def set_stock(self, ctx, amount: int, *, reward_name: str):
         """Set stock amount for a reward"""
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                # First find the reward by name using bot API
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={"action": "list-incentives"},
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to fetch rewards.")
-                        return
-                    data = await resp.json()
-                    if not data.get('success'):
-                        await ctx.send("❌ Failed to fetch rewards.")
-                        return
-                    rewards = data.get('incentives', [])
-                
-                # Smart matching
-                matches, match_type = self.find_reward_matches(rewards, reward_name)
-                
-                if not matches:
-                    # No matches found - show suggestions
-                    embed = discord.Embed(
-                        title="❌ Reward Not Found",
-                        description=f"No rewards found matching: `{reward_name}`",
-                        color=0xff0000
-                    )
-                    embed.add_field(
-                        name="💡 Tip",
-                        value="Use `!rewards` to see all available rewards",
-                        inline=False
-                    )
-                    await ctx.send(embed=embed)
+            # First find the reward by name using bot API
+            async with backend.post({"action": "list-incentives"}) as resp:
+                if resp.status != 200:
+                    await ctx.send("❌ Failed to fetch rewards.")
+                    return
+                data = await resp.json()
+                if not data.get('success'):
+                    await ctx.send("❌ Failed to fetch rewards.")
                     return
+                rewards = data.get('incentives', [])
+            
+            # Smart matching
+            matches, match_type = self.find_reward_matches(rewards, reward_name)
+            
+            if not matches:
+                # No matches found - show suggestions
+                embed = discord.Embed(
+                    title="❌ Reward Not Found",
+                    description=f"No rewards found matching: `{reward_name}`",
+                    color=0xff0000
+                )
+                embed.add_field(
+                    name="💡 Tip",
+                    value="Use `!rewards` to see all available rewards",
+                    inline=False
+                )
+                await ctx.send(embed=embed)
+                return
+            
+            if len(matches) > 1:
+                # Multiple matches found - show them to admin
+                embed = discord.Embed(
+                    title="🔍 Multiple Rewards Found",
+                    description=f"Found {len(matches)} rewards matching `{reward_name}`:",
+                    color=0xffaa00
+                )
                 
-                if len(matches) > 1:
-                    # Multiple matches found - show them to admin
-                    embed = discord.Embed(
-                        title="🔍 Multiple Rewards Found",
-                        description=f"Found {len(matches)} rewards matching `{reward_name}`:",
-                        color=0xffaa00
-                    )
-                    
-                    for i, match in enumerate(matches, 1):
-                        stock_status = "In Stock" if match.get('stock_available', 0) > 0 else "Out of Stock"
-                        embed.add_field(
-                            name=f"{i}. {stock_status} {match.get('name')}",
-                            value=f"ID: {match.get('id')} | {match.get('points_required')} pts | Stock: {match.get('stock_available')}",
-                            inline=False
-                        )
-                    
+                for i, match in enumerate(matches, 1):
+                    stock_status = "In Stock" if match.get('stock_available', 0) > 0 else "Out of Stock"
                     embed.add_field(
-                        name="💡 How to Fix",
-                        value=f"Be more specific with the reward name:\n"
-                              f"• Use the full name: `{matches[0].get('name')}`\n"
-                              f"• Use unique words: `{self.get_unique_words(matches)}`",
+                        name=f"{i}. {stock_status} {match.get('name')}",
+                        value=f"ID: {match.get('id')} | {match.get('points_required')} pts | Stock: {match.get('stock_available')}",
                         inline=False
                     )
-                    await ctx.send(embed=embed)
-                    return
-                
-                # Single match found - proceed
-                reward = matches[0]
-                old_stock = reward.get('stock_available', 0)
-                
-                # Update the stock using bot API
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={
-                        "action": "update-incentive-stock",
-                        "incentive_id": reward.get('id'),
-                        "stock_count": amount
-                    },
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        text = await resp.text()
-                        await ctx.send(f"❌ Failed to update stock: {text[:200]}")
-                        return
-                    data = await resp.json()
-                    if not data.get('success'):
-                        await ctx.send(f"❌ Failed to update stock: {data.get('error', 'Unknown error')}")
-                        return
                 
-                embed = discord.Embed(
-                    title="📦 Stock Updated",
-                    description=f"Updated stock for **{reward.get('name')}**",
-                    color=0x00ff00
+                embed.add_field(
+                    name="💡 How to Fix",
+                    value=f"Be more specific with the reward name:\n"
+                          f"• Use the full name: `{matches[0].get('name')}`\n"
+                          f"• Use unique words: `{self.get_unique_words(matches)}`",
+                    inline=False
                 )
-                embed.add_field(name="Reward", value=reward.get('name'), inline=True)
-                embed.add_field(name="New Stock", value=str(amount), inline=True)
-                embed.add_field(name="Previous Stock", value=str(old_stock), inline=True)
-                embed.add_field(name="Points Required", value=f"{reward.get('points_required')} pts", inline=True)
-                embed.add_field(name="Match Type", value=match_type.title(), inline=True)
-                
                 await ctx.send(embed=embed)
+                return
+            
+            # Single match found - proceed
+            reward = matches[0]
+            old_stock = reward.get('stock_available', 0)
+            
+            # Update the stock using bot API
+            async with backend.post({
+                "action": "update-incentive-stock",
+                "incentive_id": reward.get('id'),
+                "stock_count": amount
+            }) as resp:
+                if resp.status != 200:
+                    text = await resp.text()
+                    await ctx.send(f"❌ Failed to update stock: {text[:200]}")
+                    return
+                data = await resp.json()
+                if not data.get('success'):
+                    await ctx.send(f"❌ Failed to update stock: {data.get('error', 'Unknown error')}")
+                    return
+            
+            embed = discord.Embed(
+                title="📦 Stock Updated",
+                description=f"Updated stock for **{reward.get('name')}**",
+                color=0x00ff00
+            )
+            embed.add_field(name="Reward", value=reward.get('name'), inline=True)
+            embed.add_field(name="New Stock", value=str(amount), inline=True)
+            embed.add_field(name="Previous Stock", value=str(old_stock), inline=True)
+            embed.add_field(name="Points Required", value=f"{reward.get('points_required')} pts", inline=True)
+            embed.add_field(name="Match Type", value=match_type.title(), inline=True)
+            
+            await ctx.send(embed=embed)
                 
         except Exception as e:
             await ctx.send(f"❌ Error updating stock: {str(e)}")
@@ -1347,43 +1214,37 @@ class Admin(commands.Cog):
             category = parts[2] if len(parts) > 2 else "other"
             sponsor = parts[3] if len(parts) > 3 else "Propel2Excel"
             
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/bot/",
-                    json={
-                        "action": "create-incentive",
-                        "name": name,
-                        "description": description,
-                        "points_required": points,
-                        "stock_available": stock,
-                        "category": category,
-                        "sponsor": sponsor
-                    },
-                    headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        text = await resp.text()
-                        await ctx.send(f"❌ Failed to create reward: {text[:200]}")
-                        return
-                    data = await resp.json()
-                    if not data.get('success'):
-                        await ctx.send(f"❌ Failed to create reward: {data.get('error', 'Unknown error')}")
-                        return
-                
-                embed = discord.Embed(
-                    title="🎁 New Reward Created",
-                    description=f"Successfully created **{name}**",
-                    color=0x00ff00
-                )
-                embed.add_field(name="Name", value=name, inline=True)
-                embed.add_field(name="Description", value=description, inline=False)
-                embed.add_field(name="Points Required", value=f"{points} pts", inline=True)
-                embed.add_field(name="Stock", value=str(stock), inline=True)
-                embed.add_field(name="Category", value=category.title(), inline=True)
-                embed.add_field(name="Sponsor", value=sponsor, inline=True)
-                
-                await ctx.send(embed=embed)
+            async with backend.post({
+                "action": "create-incentive",
+                "name": name,
+                "description": description,
+                "points_required": points,
+                "stock_available": stock,
+                "category": category,
+                "sponsor": sponsor
+            }) as resp:
+                if resp.status != 200:
+                    text = await resp.text()
+                    await ctx.send(f"❌ Failed to create reward: {text[:200]}")
+                    return
+                data = await resp.json()
+                if not data.get('success'):
+                    await ctx.send(f"❌ Failed to create reward: {data.get('error', 'Unknown error')}")
+                    return
+            
+            embed = discord.Embed(
+                title="🎁 New Reward Created",
+                description=f"Successfully created **{name}**",
+                color=0x00ff00
+            )
+            embed.add_field(name="Name", value=name, inline=True)
+            embed.add_field(name="Description", value=description, inline=False)
+            embed.add_field(name="Points Required", value=f"{points} pts", inline=True)
+            embed.add_field(name="Stock", value=str(stock), inline=True)
+            embed.add_field(name="Category", value=category.title(), inline=True)
+            embed.add_field(name="Sponsor", value=sponsor, inline=True)
+            
+            await ctx.send(embed=embed)
                 
         except Exception as e:
             await ctx.send(f"❌ Error creating reward: {str(e)}")
@@ -1397,18 +1258,11 @@ class Admin(commands.Cog):
         Example: !delete_reward "Old T-Shirt"
         """
         try:
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            
             # First, find the reward by name
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{BACKEND_API_URL}/api/incentives/admin_list/",
-                    headers={"X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to fetch rewards.")
-                        return
-                    rewards = await resp.json()
+            rewards = await self.fetch_rewards()
+            if rewards is None:
+                await ctx.send("❌ Failed to fetch rewards.")
+                return
             
             # Find matching reward
             matches = []
@@ -1469,14 +1323,10 @@ class Admin(commands.Cog):
                 
                 if str(reaction.emoji) == "✅":
                     # Proceed with deletion
-                    async with session.post(
-                        f"{BACKEND_API_URL}/api/bot/",
-                        json={
-                            "action": "delete-incentive",
-                            "incentive_id": reward_id
-                        },
-                        headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-                    ) as resp:
+                    async with backend.post({
+                        "action": "delete-incentive",
+                        "incentive_id": reward_id
+                    }) as resp:
                         if resp.status != 200:
                             text = await resp.text()
                             await ctx.send(f"❌ Failed to delete reward: {text[:200]}")
@@ -1526,18 +1376,11 @@ class Admin(commands.Cog):
                 await ctx.send(f"❌ Invalid field. Valid fields: {', '.join(valid_fields)}")
                 return
             
-            from bot import BACKEND_API_URL, BOT_SHARED_SECRET
-            
             # First, find the reward by name
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{BACKEND_API_URL}/api/incentives/admin_list/",
-                    headers={"X-Bot-Secret": BOT_SHARED_SECRET},
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send("❌ Failed to fetch rewards.")
-                        return
-                    rewards = await resp.json()
+            rewards = await self.fetch_rewards()
+            if rewards is None:
+                await ctx.send("❌ Failed to fetch rewards.")
+                return
             
             # Find matching reward
             matches = []
@@ -1598,11 +1441,7 @@ class Admin(commands.Cog):
                 update_payload['sponsor'] = new_value
             
             # Update the reward
-            async with session.post(
-                f"{BACKEND_API_URL}/api/bot/",
-                json=update_payload,
-                headers={"Content-Type": "application/json", "X-Bot-Secret": BOT_SHARED_SECRET},
-            ) as resp:
+            async with backend.post(update_payload) as resp:
                 if resp.status != 200:
                     text = await resp.text()
                     await ctx.send(f"❌ Failed to update reward: {text[:200]}")
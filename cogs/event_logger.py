@@ -7,8 +7,17 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
 from core.models import DiscordEventLog
 
+async def log_event(**fields):
+    # The bot has no request cycle to recycle connections, so drop one that outlived
+    # CONN_MAX_AGE or broke before using it (and health-check it on next use)
+    await sync_to_async(close_old_connections)()
+    await DiscordEventLog.objects.acreate(**fields)
+
 class EventLogger(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -18,7 +27,7 @@ class EventLogger(commands.Cog):
         if message.author.bot:
             return
 
-        await DiscordEventLog.objects.acreate(
+        await log_event(
             event_type='message',
             user_id=str(message.author.id),
             channel_id=str(message.channel.id),
@@ -31,7 +40,7 @@ class EventLogger(commands.Cog):
         if user.bot:
             return
 
-        await DiscordEventLog.objects.acreate(
+        await log_event(
             event_type='reaction_add',
             user_id=str(user.id),
             channel_id=str(reaction.message.channel.id),
@@ -43,7 +52,7 @@ class EventLogger(commands.Cog):
     async def on_voice_state_update(self, member, before, after):
         # Log when a user joins a voice or stage channel
         if not before.channel and after.channel:
-            await DiscordEventLog.objects.acreate(
+            await log_event(
                 event_type='voice_join',
                 user_id=str(member.id),
                 channel_id=str(after.channel.id)
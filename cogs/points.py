@@ -3,8 +3,8 @@ import discord
 import asyncio
 from datetime import datetime, timedelta
 import re
-import aiohttp
 import os
+from bot_utils import backend, resolve_display_names
 
 # Modal classes for admin interactions
 class ApprovalModal(discord.ui.Modal):
@@ -163,35 +163,17 @@ class Points(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.processed_messages = set()  # Track processed messages to prevent duplicates
-        # Use smart backend URL detection (same logic as bot.py)
-        explicit_url = os.getenv('BACKEND_API_URL')
-        if explicit_url:
-            self.backend_api_url = explicit_url
-        elif os.getenv('RENDER'):
-            port = os.getenv('PORT', '8000')
-            self.backend_api_url = f'http://127.0.0.1:{port}'
-        else:
-            self.backend_api_url = 'http://localhost:8000'
-        self.bot_shared_secret = os.getenv('BOT_SHARED_SECRET', '')
 
     async def _backend_request(self, payload):
-        """Make a request to the backend API"""
+        """Make a request to the backend API (over HTTP or in-process, see bot_transport)"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.backend_api_url}/api/bot/",
-                    json=payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-Bot-Secret": self.bot_shared_secret,
-                    }
-                ) as response:
-                    if response.status in (200, 201):  # 200 = OK, 201 = Created
-                        return await response.json()
-                    else:
-                        error_text = await response.text()
-                        print(f"Backend API error: {response.status} - {error_text}")
-                        return None
+            async with backend.post(payload) as response:
+                if response.status in (200, 201):  # 200 = OK, 201 = Created
+                    return await response.json()
+                else:
+                    error_text = await response.text()
+                    print(f"Backend API error: {response.status} - {error_text}")
+                    return None
         except Exception as e:
             print(f"Error calling backend API: {e}")
             return None
@@ -1787,38 +1769,15 @@ class Points(commands.Cog):
             if current_hour < 8 or current_hour >= 20:
                 return
             
-            # Get pending counts from backend
-            pending_counts = {}
-            
-            # Get pending resources count
-            try:
-                response = await self._backend_request({"action": "pending-resources"})
-                if response:
-                    pending_counts['resources'] = response.get("pending_count", 0)
-                else:
-                    pending_counts['resources'] = 0
-            except Exception:
-                pending_counts['resources'] = 0
-            
-            # Get pending events count
+            # Get all pending counts from backend in one call (cached briefly server-side)
+            pending_counts = {'resources': 0, 'events': 0, 'linkedin': 0}
             try:
-                response = await self._backend_request({"action": "pending-events"})
+                response = await self._backend_request({"action": "pending-counts"})
                 if response:
-                    pending_counts['events'] = response.get("pending_count", 0)
-                else:
-                    pending_counts['events'] = 0
+                    for key in pending_counts:
+                        pending_counts[key] = response.get(key, 0)
             except Exception:
-                pending_counts['events'] = 0
-            
-            # Get pending LinkedIn count
-            try:
-                response = await self._backend_request({"action": "pending-linkedin"})
-                if response:
-                    pending_counts['linkedin'] = response.get("pending_count", 0)
-                else:
-                    pending_counts['linkedin'] = 0
-            except Exception:
-                pending_counts['linkedin'] = 0
+                pass
             
             # Calculate total pending
             total_pending = pending_counts['resources'] + pending_counts['events'] + pending_counts['linkedin']
@@ -2162,17 +2121,11 @@ class Points(commands.Cog):
                     inline=False
                 )
             else:
+                names = await resolve_display_names(self.bot, [row.get('discord_id') for row in leaderboard_data])
                 for i, user_data in enumerate(leaderboard_data, 1):
                     user_id = user_data.get('discord_id')
                     points = user_data.get('points', 0)
-                    username = user_data.get('username', f'User {user_id}')
-                    
-                    # Get Discord user if possible
-                    try:
-                        user = await self.bot.fetch_user(int(user_id))
-                        display_name = user.display_name
-                    except:
-                        display_name = username
+                    display_name = names.get(str(user_id)) or user_data.get('username', f'User {user_id}')
                     
                     # Medal emojis for top 3
                     medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"**#{i}**"
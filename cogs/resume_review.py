@@ -1,42 +1,23 @@
 import discord
 from discord.ext import commands
-import aiohttp
 import json
 import asyncio
 from datetime import datetime
-import os
+from bot_utils import backend
 
 class ResumeReview(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        # Use smart backend URL detection (same logic as bot.py)
-        explicit_url = os.getenv('BACKEND_API_URL')
-        if explicit_url:
-            self.backend_url = explicit_url
-        elif os.getenv('RENDER'):
-            port = os.getenv('PORT', '8000')
-            self.backend_url = f'http://127.0.0.1:{port}'
-        else:
-            self.backend_url = 'http://localhost:8000'
-        self.bot_secret = os.getenv('BOT_SHARED_SECRET', '')
         self.form_url = "https://forms.gle/EKHLrqhHwt1bGQjd6"
 
     async def _backend_request(self, payload):
-        """Make backend API request using current pattern"""
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.backend_url}/api/bot/",
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "X-Bot-Secret": self.bot_secret,
-                }
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"Backend error {response.status}: {error_text}")
+        """Make a backend API request (over HTTP or in-process, see bot_transport)"""
+        async with backend.post(payload) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                error_text = await response.text()
+                raise Exception(f"Backend error {response.status}: {error_text}")
 
     @commands.command()
     @commands.cooldown(1, 10, commands.BucketType.user)
@@ -325,6 +306,39 @@ class ResumeReview(commands.Cog):
         except Exception as e:
             await ctx.send(f"❌ Error finding matches: {e}")
 
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def propose_matches(self, ctx, apply: str = ""):
+        """Admin command to match the whole pending queue at once (add 'apply' to book the sessions)"""
+        try:
+            response = await self._backend_request({
+                "action": "propose-matches",
+                "apply": apply.lower() == "apply"
+            })
+
+            proposals = response.get('proposals', [])
+            embed = discord.Embed(
+                title="🗓️ Proposed Review Sessions",
+                description=f"{response.get('total_proposals', 0)} pending requests matched"
+                            + (f", {response.get('matched', 0)} sessions booked" if apply.lower() == "apply" else ""),
+                color=0x0099ff if proposals else 0xff0000
+            )
+
+            for proposal in proposals[:10]:
+                embed.add_field(
+                    name=f"{proposal['student']} ↔ {proposal['professional_name']}",
+                    value=f"**When:** {proposal['proposed_time']}\n**Overlap:** {proposal['overlap_minutes']} min, score {proposal['score']:.2f}",
+                    inline=False
+                )
+
+            if len(proposals) > 10:
+                embed.set_footer(text=f"Showing 10 of {len(proposals)} proposals")
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            await ctx.send(f"❌ Error proposing matches: {e}")
+
     @commands.command()
     @commands.has_permissions(administrator=True)
     async def schedule_session(self, ctx, user: discord.Member, professional_name: str, *, scheduled_time: str):
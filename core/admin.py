@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils import timezone
-from .models import User, Activity, PointsLog, Incentive, Redemption, UserStatus, Professional, ReviewRequest, ScheduledSession, ProfessionalAvailability
+from .models import User, Activity, PointsLog, Incentive, Redemption, UserStatus, Professional, ReviewRequest, ScheduledSession, ProfessionalAvailability, OutboxMessage
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -279,3 +279,18 @@ class ProfessionalAvailabilityAdmin(admin.ModelAdmin):
         updated = queryset.update(is_active=False)
         self.message_user(request, f'{updated} availability records deactivated.')
     deactivate_availability.short_description = "Deactivate selected availability records"
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'attempts', 'available_at', 'created_at', 'processed_at']
+    list_filter = ['status', 'kind']
+    search_fields = ['kind', 'last_error']
+    readonly_fields = ['created_at', 'processed_at']
+
+    actions = ['retry_messages']
+
+    def retry_messages(self, request, queryset):
+        """Queue failed messages for another round of attempts"""
+        updated = queryset.filter(status='failed').update(status='pending', attempts=0, available_at=timezone.now())
+        self.message_user(request, f'{updated} messages queued for retry.')
+    retry_messages.short_description = "Retry selected failed messages"
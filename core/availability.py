@@ -0,0 +1,259 @@
+"""
+Weekly availability slots parsed once from free text.
+
+Students' ``ReviewRequest.preferred_times`` and professionals'
+``ProfessionalAvailability.availability_slots`` arrive as strings such as
+"Monday 2-4 PM" or "weekday evenings". They are parsed when stored into
+AvailabilitySlot rows (weekday, start/end minute, confidence), so matching
+compares integers instead of re-running regexes on every request.
+
+Professional availability additionally keeps a packed week bitmap (7 x 96
+fifteen-minute cells, 84 bytes). AvailabilityIndex stacks those bitmaps into one
+NumPy matrix so a student is scored against every professional with a single
+vectorised AND + popcount.
+"""
+import re
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+MINUTES_PER_DAY = 24 * 60
+DEFAULT_SLOT_MINUTES = 60  # A bare "2 PM" is read as 2-3 PM
+
+CELL_MINUTES = 15
+CELLS_PER_DAY = MINUTES_PER_DAY // CELL_MINUTES
+WEEK_BITMAP_BYTES = 7 * CELLS_PER_DAY // 8
+MAX_SUGGESTED_MATCHES = 25
+# Set bits per byte value, for popcount over packed bitmaps
+POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Whole-word day aliases -> weekdays; single letters are too ambiguous ("m" in "pm")
+DAY_ALIASES = {
+    'monday': (0,), 'mon': (0,),
+    'tuesday': (1,), 'tue': (1,), 'tues': (1,),
+    'wednesday': (2,), 'wed': (2,),
+    'thursday': (3,), 'thu': (3,), 'thur': (3,), 'thurs': (3,),
+    'friday': (4,), 'fri': (4,),
+    'saturday': (5,), 'sat': (5,),
+    'sunday': (6,), 'sun': (6,),
+    'weekday': (0, 1, 2, 3, 4), 'weekdays': (0, 1, 2, 3, 4),
+    'weekend': (5, 6), 'weekends': (5, 6),
+}
+
+# Period -> (start minute, end minute); night wraps past midnight
+TIME_PERIODS = {
+    'morning': (6 * 60, 12 * 60),
+    'afternoon': (12 * 60, 18 * 60),
+    'evening': (18 * 60, 22 * 60),
+    'night': (22 * 60, 6 * 60),
+}
+
+SEGMENT_SPLIT_RE = re.compile(r'[,;]|\sand\s|\sor\s')
+DAY_RE = re.compile(r'\b(' + '|'.join(sorted(DAY_ALIASES, key=len, reverse=True)) + r')\b')
+PERIOD_RE = re.compile(r'\b(' + '|'.join(TIME_PERIODS) + r')s?\b')
+# Most specific first: ranges with AM/PM, 24-hour ranges, then single times
+TIME_RES = [
+    re.compile(r'(?P<h1>\d{1,2})(?::(?P<m1>\d{2}))?\s*(?P<ap1>am|pm)?\s*(?:-|–|to)\s*'
+               r'(?P<h2>\d{1,2})(?::(?P<m2>\d{2}))?\s*(?P<ap2>am|pm)'),
+    re.compile(r'(?P<h1>\d{1,2}):(?P<m1>\d{2})\s*(?:-|–|to)\s*(?P<h2>\d{1,2}):(?P<m2>\d{2})'),
+    re.compile(r'(?P<h1>\d{1,2})(?::(?P<m1>\d{2}))?\s*(?P<ap1>am|pm)'),
+    re.compile(r'(?P<h1>\d{1,2}):(?P<m1>\d{2})'),
+]
+
+
+class ParsedSlot(NamedTuple):
+    weekday: int
+    start_minute: int
+    end_minute: int
+    confidence: float
+
+
+def parse_availability(texts: Iterable[str]) -> List[ParsedSlot]:
+    """
+    Parse free-text availability strings into weekly slots.
+
+    A segment without a day applies to every day, one without a time or period
+    covers the whole day; windows that cross midnight are split at 24:00.
+    Unparseable segments are dropped.
+    """
+    slots = []
+    for text in texts or []:
+        if not isinstance(text, str):
+            continue
+        for segment in SEGMENT_SPLIT_RE.split(text.lower()):
+            segment = segment.strip()
+            if segment:
+                slots.extend(_parse_segment(segment))
+    return slots
+
+
+def _parse_segment(segment: str) -> List[ParsedSlot]:
+    weekdays = sorted({day for alias in DAY_RE.findall(segment) for day in DAY_ALIASES[alias]})
+    window = _extract_window(segment)
+    period = PERIOD_RE.search(segment)
+
+    if not weekdays and window is None and period is None:
+        return []
+
+    start, end = window or (TIME_PERIODS[period.group(1)] if period else (0, MINUTES_PER_DAY))
+    confidence = _confidence(segment, bool(weekdays), window, period is not None)
+
+    slots = []
+    for weekday in weekdays or range(7):
+        if end > start:
+            slots.append(ParsedSlot(weekday, start, end, confidence))
+        else:
+            # Overnight: the tail belongs to the following day
+            slots.append(ParsedSlot(weekday, start, MINUTES_PER_DAY, confidence))
+            if end:
+                slots.append(ParsedSlot((weekday + 1) % 7, 0, end, confidence))
+    return slots
+
+
+def _extract_window(segment: str) -> Optional[Tuple[int, int]]:
+    """(start, end) minutes from the first time expression in ``segment``, if any."""
+    for pattern in TIME_RES:
+        match = pattern.search(segment)
+        if not match:
+            continue
+        groups = match.groupdict()
+        end_meridiem = groups.get('ap2')
+        try:
+            # "2-3 PM": the start borrows the end's meridiem
+            start = _to_minute(groups['h1'], groups['m1'], groups.get('ap1') or end_meridiem)
+            if not groups.get('h2'):
+                return start, min(start + DEFAULT_SLOT_MINUTES, MINUTES_PER_DAY)
+            end = _to_minute(groups['h2'], groups['m2'], end_meridiem)
+        except ValueError:
+            return None
+        if not groups.get('ap1') and end_meridiem == 'pm' and start > end:
+            start = _to_minute(groups['h1'], groups['m1'], 'am')  # "10-2 PM" means 10 AM to 2 PM
+        return start, end
+    return None
+
+
+def _to_minute(hour: str, minute: Optional[str], meridiem: Optional[str]) -> int:
+    hour = int(hour)
+    minute = int(minute) if minute else 0
+    if hour > 23 or minute > 59 or (meridiem and not 1 <= hour <= 12):
+        raise ValueError(f"invalid time {hour}:{minute:02d}")
+    if meridiem == 'pm' and hour != 12:
+        hour += 12
+    elif meridiem == 'am' and hour == 12:
+        hour = 0
+    return hour * 60 + minute
+
+
+def _confidence(segment: str, has_day: bool, window: Optional[Tuple[int, int]], has_period: bool) -> float:
+    """Same weighting as scripts/availability_matcher.py: more recognised parts, higher confidence."""
+    score = 0.0
+    if has_day:
+        score += 0.3
+    if window is not None:
+        score += 0.6
+    if has_period:
+        score += 0.1
+    if len(segment) > 10:
+        score += 0.1
+    return round(min(score, 1.0), 2)
+
+
+def overlapping_windows(student_slots, professional_slots, min_minutes=30):
+    """
+    Shared (weekday, start_minute, end_minute) windows of at least ``min_minutes``.
+
+    Both arguments are iterables of objects with weekday/start_minute/end_minute
+    (AvailabilitySlot rows or ParsedSlot tuples).
+    """
+    by_day = {}
+    for slot in professional_slots:
+        by_day.setdefault(slot.weekday, []).append(slot)
+
+    windows = set()
+    for student in student_slots:
+        for professional in by_day.get(student.weekday, ()):
+            start = max(student.start_minute, professional.start_minute)
+            end = min(student.end_minute, professional.end_minute)
+            if end - start >= min_minutes:
+                windows.add((student.weekday, start, end))
+    return sorted(windows)
+
+
+def week_bitmap(slots) -> bytes:
+    """Packed bitmap of the 15-minute cells fully covered by ``slots`` (any weekday/start/end objects)."""
+    cells = np.zeros(7 * CELLS_PER_DAY, dtype=bool)
+    for slot in slots:
+        offset = slot.weekday * CELLS_PER_DAY
+        cells[offset - (-slot.start_minute // CELL_MINUTES):offset + slot.end_minute // CELL_MINUTES] = True
+    return np.packbits(cells).tobytes()
+
+
+class AvailabilityIndex:
+    """
+    Week bitmaps for many owners (e.g. ProfessionalAvailability ids) stacked into
+    one (n, 84) uint8 matrix.
+    """
+
+    def __init__(self, keys, bitmaps):
+        self.keys = list(keys)
+        matrix = np.zeros((len(self.keys), WEEK_BITMAP_BYTES), dtype=np.uint8)
+        for row, bitmap in enumerate(bitmaps):
+            if bitmap:
+                matrix[row] = np.frombuffer(bytes(bitmap), dtype=np.uint8)
+        self.matrix = matrix
+
+    def overlap_minutes(self, bitmap) -> np.ndarray:
+        """Minutes per week each row shares with ``bitmap``."""
+        student = np.frombuffer(bytes(bitmap), dtype=np.uint8)
+        # Only the bytes the student occupies can contribute; typically a handful of the 84
+        columns = np.flatnonzero(student)
+        shared = self.matrix[:, columns] & student[columns]
+        return POPCOUNT[shared].sum(axis=1, dtype=np.int32) * CELL_MINUTES
+
+    def overlap_matrix(self, bitmaps) -> np.ndarray:
+        """(len(bitmaps), n) minutes shared between each given bitmap and each row, as one matmul."""
+        students = np.zeros((len(bitmaps), WEEK_BITMAP_BYTES), dtype=np.uint8)
+        for row, bitmap in enumerate(bitmaps):
+            if bitmap:
+                students[row] = np.frombuffer(bytes(bitmap), dtype=np.uint8)
+        cells = np.unpackbits(students, axis=1).astype(np.float32) @ np.unpackbits(self.matrix, axis=1).T.astype(np.float32)
+        return cells.astype(np.int32) * CELL_MINUTES
+
+    def rank(self, bitmap, min_minutes=30, limit=None):
+        """[(key, overlap_minutes)] with at least ``min_minutes`` shared, largest overlap first."""
+        if not self.keys or not bitmap:
+            return []
+        minutes = self.overlap_minutes(bitmap)
+        eligible = np.flatnonzero(minutes >= min_minutes)
+        order = eligible[np.argsort(-minutes[eligible], kind='stable')]
+        if limit is not None:
+            order = order[:limit]
+        return [(self.keys[row], int(minutes[row])) for row in order]
+
+
+def format_window(weekday, start_minute, end_minute):
+    """e.g. 'Monday 14:00-15:30'"""
+    return (f"{WEEKDAY_NAMES[weekday]} {start_minute // 60:02d}:{start_minute % 60:02d}"
+            f"-{end_minute // 60:02d}:{end_minute % 60:02d}")
+
+
+def replace_slots(owner, texts):
+    """
+    Re-parse ``texts`` into AvailabilitySlot rows for a ProfessionalAvailability or
+    ReviewRequest; availability also gets its week bitmap refreshed.
+    """
+    from .models import AvailabilitySlot, ProfessionalAvailability
+
+    slots = parse_availability(texts)
+    owner_field = 'availability' if isinstance(owner, ProfessionalAvailability) else 'review_request'
+    AvailabilitySlot.objects.filter(**{owner_field: owner}).delete()
+    AvailabilitySlot.objects.bulk_create([
+        AvailabilitySlot(**{owner_field: owner}, weekday=slot.weekday, start_minute=slot.start_minute,
+                         end_minute=slot.end_minute, confidence=slot.confidence)
+        for slot in slots
+    ])
+    if owner_field == 'availability':
+        owner.week_bitmap = week_bitmap(slots)
+        ProfessionalAvailability.objects.filter(pk=owner.pk).update(week_bitmap=owner.week_bitmap)
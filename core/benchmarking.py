@@ -0,0 +1,93 @@
+"""
+Helpers shared by the benchmark management commands.
+
+Benchmarks never run against the configured database: they build a throwaway
+test database from the current models (like the test runner), seed it, and drop
+it afterwards.
+"""
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def throwaway_database(verbosity=0, keepdb=False, test_name=None):
+    """
+    Create a test database for the default connection and destroy it on exit.
+
+    ``test_name`` overrides the test database name, e.g. a file path so that
+    SQLite benchmarks use a real file (with locking) instead of shared memory.
+    """
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    # Build tables straight from the models; historic data migrations are skipped
+    test_settings['MIGRATE'] = False
+    if test_name:
+        test_settings['NAME'] = test_name
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity, keepdb=keepdb)
+
+
+@contextmanager
+def simulated_network_latency(rtt_ms):
+    """
+    Add ``rtt_ms`` of latency to every query on the current thread's connection,
+    approximating a remote database (e.g. Supabase) from a local one.
+    """
+    delay = rtt_ms / 1000.0
+
+    def add_round_trip(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+
+    if not delay:
+        yield
+        return
+    with connection.execute_wrapper(add_round_trip):
+        yield
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize_latencies(samples_ms):
+    """Mean and tail latencies (milliseconds) of a list of samples."""
+    ordered = sorted(samples_ms)
+    return {
+        'count': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered), 3) if ordered else 0.0,
+        'p50_ms': round(percentile(ordered, 50), 3),
+        'p95_ms': round(percentile(ordered, 95), 3),
+        'p99_ms': round(percentile(ordered, 99), 3),
+        'max_ms': round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+@contextmanager
+def simulated_discord_latency(delay_ms):
+    """
+    Replace the Discord member search with a stand-in that waits ``delay_ms`` and
+    finds nobody, so the API fallback path can be benchmarked offline.
+    """
+    from . import guild_directory
+
+    def slow_search(discord_username):
+        time.sleep(delay_ms / 1000.0)
+        return {'success': True, 'valid': False, 'message': f"User '{discord_username}' not found in Discord server"}
+
+    original = guild_directory.search_discord_api
+    guild_directory.search_discord_api = slow_search
+    try:
+        yield
+    finally:
+        guild_directory.search_discord_api = original
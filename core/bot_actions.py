@@ -0,0 +1,61 @@
+"""
+Declarative specs for the actions served by BotIntegrationView.
+
+Each action names its handler method and declares its input fields, so the
+dispatcher can reject malformed payloads with a 400 before any handler runs.
+Actions that also name an ``async_handler`` are served on the event loop by
+AsyncBotIntegrationView; the rest run in Django's sync thread.
+"""
+from dataclasses import dataclass, field
+
+# Field type names understood by BotAction.validate
+INT = 'int'
+STR = 'str'
+LIST = 'list'
+DICT = 'dict'
+BOOL = 'bool'
+
+
+def _join_fields(names):
+    # Matches the handlers' wording: "a is", "a and b are", "a, b, and c are"
+    if len(names) == 1:
+        return f"{names[0]} is"
+    if len(names) == 2:
+        return f"{names[0]} and {names[1]} are"
+    return f"{', '.join(names[:-1])}, and {names[-1]} are"
+
+
+@dataclass(frozen=True)
+class BotAction:
+    handler: str
+    required: tuple = ()
+    fields: dict = field(default_factory=dict)
+    description: str = ''
+    async_handler: str = ''  # Coroutine method on AsyncBotIntegrationView
+
+    def validate(self, data):
+        """Return an error message for an invalid payload, or None."""
+        missing = [name for name in self.required if data.get(name) in (None, '')]
+        if missing:
+            return f"{_join_fields(missing)} required"
+
+        for name, field_type in self.fields.items():
+            value = data.get(name)
+            if value is None:
+                continue
+            if field_type == INT:
+                if isinstance(value, bool):
+                    return f"{name} must be an integer"
+                try:
+                    int(value)
+                except (TypeError, ValueError):
+                    return f"{name} must be an integer"
+            elif field_type == STR and isinstance(value, (list, dict)):
+                return f"{name} must be a string"
+            elif field_type == LIST and not isinstance(value, list):
+                return f"{name} must be a list"
+            elif field_type == DICT and not isinstance(value, dict):
+                return f"{name} must be an object"
+            elif field_type == BOOL and not isinstance(value, bool):
+                return f"{name} must be a boolean"
+        return None
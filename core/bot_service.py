@@ -0,0 +1,73 @@
+"""
+Bot actions without the HTTP hop, for a bot running next to the backend.
+
+``run_action(payload)`` does what a POST of ``payload`` to /api/bot/ does (the
+same validation, handlers and per-action metrics) and returns
+``(status_code, data)``, where ``data`` is the response body as the bot would
+decode it from JSON. Actions with an async handler run on the caller's event
+loop like AsyncBotIntegrationView; the rest run in Django's sync thread.
+
+There is no shared-secret check: only code in this process can call it.
+"""
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import exception_handler
+
+from .views import AsyncBotIntegrationView, BotIntegrationView
+
+logger = logging.getLogger(__name__)
+
+
+class ActionRequest:
+    """The parts of a DRF request the bot action handlers read."""
+
+    def __init__(self, data):
+        self.data = data
+        self.user = AnonymousUser()
+
+
+async def run_action(payload):
+    action = payload.get("action") if isinstance(payload, dict) else None
+    spec = BotIntegrationView.ACTIONS.get(action)
+    if spec is None:
+        return status.HTTP_400_BAD_REQUEST, {"error": "Unknown action"}
+
+    if spec.async_handler:
+        # Connections outlive a single call here, so do what the request handlers do around each one
+        await sync_to_async(close_old_connections)()
+        try:
+            response = await AsyncBotIntegrationView().dispatch_action(action, spec, payload)
+        except Exception as exc:
+            response = _exception_response(exc)
+        finally:
+            await sync_to_async(close_old_connections)()
+    else:
+        response = await sync_to_async(_run_sync_action)(action, spec, payload)
+    if response is None:
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+    # Rendered and parsed like the HTTP body, so both transports hand the bot identical data
+    return response.status_code, json.loads(JSONRenderer().render(response.data))
+
+
+def _run_sync_action(action, spec, payload):
+    close_old_connections()
+    try:
+        return BotIntegrationView().dispatch_action(action, spec, ActionRequest(payload))
+    except Exception as exc:
+        return _exception_response(exc)
+    finally:
+        close_old_connections()
+
+
+def _exception_response(exc):
+    """The response APIView would send for ``exc``; None (logged) where the view would answer 500."""
+    response = exception_handler(exc, {})
+    if response is None:
+        logger.exception("Bot action failed", exc_info=exc)
+    return response
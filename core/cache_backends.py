@@ -0,0 +1,40 @@
+"""
+Cache backends that report hits and misses to the request profiler.
+
+Use ``core.cache_backends.LocMemCache`` (or the shared DatabaseCache/RedisCache
+below) in CACHES; for another backend, combine InstrumentedCacheMixin with it
+the same way.
+"""
+from django.core.cache.backends import db, locmem, redis
+
+from .metrics import record_cache_lookup
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            record_cache_lookup(hits=0, misses=1)
+            return default
+        record_cache_lookup(hits=1, misses=0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        record_cache_lookup(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+
+class LocMemCache(InstrumentedCacheMixin, locmem.LocMemCache):
+    pass
+
+
+class DatabaseCache(InstrumentedCacheMixin, db.DatabaseCache):
+    pass
+
+
+class RedisCache(InstrumentedCacheMixin, redis.RedisCache):
+    pass
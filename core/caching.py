@@ -0,0 +1,271 @@
+"""
+Scoped cache helpers for per-user API responses.
+
+Django's cache API has no way to enumerate keys (LocMemCache does not implement
+``keys()``), so every per-user response we cache is also recorded in a small
+key index per namespace and user. Purges of one user read that user's indexes
+instead of calling ``cache.clear()``, which means an admin action on one user no
+longer cold-starts every other user's dashboard. Caching a response only touches
+its own user's index, so concurrent requests of different users cannot drop each
+other's keys.
+
+Every key also carries its namespace's generation token (see ``versioned_keys``).
+A purge across users replaces the token instead of visiting every user's index:
+one cache write, after which the old entries are unreachable and simply expire.
+
+Data versions are opaque tokens stored in the cache and replaced whenever the
+underlying data changes (see core.signals). Polling endpoints derive their ETag
+from them, so answering ``If-None-Match`` costs a single cache lookup.
+"""
+import fnmatch
+import hashlib
+import logging
+import re
+import uuid
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .db_routers import pin_to_primary
+
+logger = logging.getLogger(__name__)
+
+# Public namespace name -> cache key prefix used by the views
+CACHE_NAMESPACES = {
+    'dashboard': 'dashboard_stats',
+    'timeline': 'points_timeline',
+    'feed': 'activity_feed',
+    'history': 'points_history',
+    'leaderboard': 'leaderboard',
+    'rewards': 'rewards_available',
+}
+
+# Backends whose entries every process sees (subclasses count too); LocMemCache is per process
+SHARED_CACHE_BACKENDS = {
+    'django.core.cache.backends.db.DatabaseCache',
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+    'django_redis.cache.RedisCache',
+}
+
+# The index must outlive the entries it tracks (longest entry TTL is 24 hours)
+KEY_INDEX_TIMEOUT = 86400 * 2
+GENERATION_TIMEOUT = None  # Never expire; a lost generation only cold-starts its namespace
+GENERATION_SEPARATOR = '@'
+
+
+def cache_is_shared(alias='default'):
+    """Whether a cache write in this process (a purge, a data version bump) is seen by the others."""
+    from django.core.cache import caches
+
+    return any(f"{klass.__module__}.{klass.__qualname__}" in SHARED_CACHE_BACKENDS
+               for klass in type(caches[alias]).__mro__)
+
+
+def _index_key(namespace, user_id):
+    return f"cache_key_index_{namespace}_{user_id}"
+
+
+def _generation_key(namespace):
+    return f"cache_generation_{namespace}"
+
+
+def versioned_keys(entries):
+    """
+    Resolve ``(namespace, key)`` pairs to the keys entries are actually stored under.
+
+    The namespace generations are fetched in one round trip. Read and write with the
+    returned keys; ``set_user_cache`` expects them.
+    """
+    generation_keys = {namespace: _generation_key(namespace) for namespace, _ in entries}
+    generations = cache.get_many(list(generation_keys.values()))
+    for generation_key in generation_keys.values():
+        if generation_key not in generations:
+            # Start a fresh token rather than a fixed one, so an evicted generation cannot revive old entries
+            cache.add(generation_key, uuid.uuid4().hex[:12], GENERATION_TIMEOUT)
+            generations[generation_key] = cache.get(generation_key)
+    return [f"{key}{GENERATION_SEPARATOR}{generations[generation_keys[namespace]]}" for namespace, key in entries]
+
+
+def versioned_key(namespace, key):
+    return versioned_keys([(namespace, key)])[0]
+
+
+def _unversioned_key(key):
+    return key.rsplit(GENERATION_SEPARATOR, 1)[0]
+
+
+def _pattern_may_match(pattern, prefix):
+    """Whether keys starting with ``prefix`` can match ``pattern`` (judged by its literal head)."""
+    literal = re.split(r'[*?\[]', pattern, maxsplit=1)[0]
+    return literal.startswith(prefix) or prefix.startswith(literal)
+
+
+def set_user_cache(namespace, user_id, key, value, timeout):
+    """Cache ``value`` under the versioned ``key`` and record it in the user's key index for ``namespace``."""
+    if namespace not in CACHE_NAMESPACES:
+        raise ValueError(f"Unknown cache namespace: {namespace}")
+
+    cache.set(key, value, timeout)
+
+    index_key = _index_key(namespace, user_id)
+    user_keys = cache.get(index_key) or []
+    if key not in user_keys:
+        user_keys.append(key)
+        cache.set(index_key, user_keys, KEY_INDEX_TIMEOUT)
+
+
+def purge_caches(user_id=None, namespace=None, pattern=None):
+    """
+    Delete cached entries matching every filter that is given.
+
+    With a ``user_id`` the user's key indexes are read and exactly the matching
+    entries are deleted. Without one, every namespace the filters can match gets a
+    new generation instead; a pattern then only selects namespaces, so it may
+    invalidate more than it names, never less.
+
+    Args:
+        user_id: Only purge entries cached for this user
+        namespace: Only purge one namespace (see CACHE_NAMESPACES)
+        pattern: Shell-style key pattern, e.g. ``leaderboard_weekly_*``
+
+    Returns:
+        Number of cache entries that were actually removed for a user purge, or the
+        number of namespaces invalidated for a purge across users
+    """
+    if user_id is None and namespace is None and pattern is None:
+        raise ValueError("At least one of user_id, namespace or pattern is required")
+    if namespace is not None and namespace not in CACHE_NAMESPACES:
+        raise ValueError(f"Unknown cache namespace: {namespace}")
+
+    namespaces = [namespace] if namespace else list(CACHE_NAMESPACES)
+
+    if user_id is None:
+        if pattern is not None:
+            namespaces = [ns for ns in namespaces if _pattern_may_match(pattern, CACHE_NAMESPACES[ns])]
+        if namespaces:
+            cache.set_many({_generation_key(ns): uuid.uuid4().hex[:12] for ns in namespaces}, GENERATION_TIMEOUT)
+        logger.info(
+            f"🧹 CACHE PURGE namespace={namespace} pattern={pattern} - "
+            f"new generation for {', '.join(namespaces) or 'no namespace'}"
+        )
+        return len(namespaces)
+
+    keys_to_delete = []
+    updated_indexes = {}
+    emptied_indexes = []
+    index_keys = [_index_key(ns, user_id) for ns in namespaces]
+    for index_key, user_keys in cache.get_many(index_keys).items():
+        matched = [k for k in user_keys if pattern is None or fnmatch.fnmatchcase(_unversioned_key(k), pattern)]
+        if not matched:
+            continue
+        keys_to_delete.extend(matched)
+        remaining = [k for k in user_keys if k not in matched]
+        if remaining:
+            updated_indexes[index_key] = remaining
+        else:
+            emptied_indexes.append(index_key)
+
+    if not keys_to_delete:
+        return 0
+
+    # Entries may already have expired; only count the ones that were still cached
+    purged_count = len(cache.get_many(keys_to_delete))
+    cache.delete_many(keys_to_delete + emptied_indexes)
+    if updated_indexes:
+        cache.set_many(updated_indexes, KEY_INDEX_TIMEOUT)
+
+    logger.info(
+        f"🧹 CACHE PURGE user={user_id} namespace={namespace} pattern={pattern} - "
+        f"removed {purged_count}/{len(keys_to_delete)} keys"
+    )
+    return purged_count
+
+
+def invalidate_user_caches(user_id):
+    """
+    Invalidate all cached data for a specific user when their points/activities change.
+    This ensures users see updated data immediately after activities are added.
+    
+    Args:
+        user_id: The ID of the user whose caches should be invalidated
+
+    Returns:
+        Number of cache entries removed
+    """
+    try:
+        logger.info(f"🔥 CACHE INVALIDATION START for user {user_id}")
+        
+        # SCOPED: Only this user's indexed entries are removed, whatever params they were cached with
+        deleted_count = purge_caches(user_id=user_id)
+        
+        logger.info(f"🎉 CACHE INVALIDATION COMPLETED for user {user_id} - Deleted {deleted_count} keys")
+        return deleted_count
+        
+    except Exception as e:
+        logger.error(f"❌ CACHE INVALIDATION FAILED for user {user_id}: {str(e)}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        # Don't re-raise the exception to avoid breaking the main flow
+        return 0
+
+
+# Data versions: 'user' is per user (points, redemptions), 'catalog' covers incentives,
+# 'leaderboard' changes whenever anyone's points change
+DATA_VERSION_SCOPES = ('user', 'catalog', 'leaderboard')
+DATA_VERSION_TIMEOUT = None  # Never expire; a lost version simply forces one full response
+
+
+def _data_version_key(scope, user_id=None):
+    if scope == 'user':
+        return f"data_version_user_{user_id}"
+    return f"data_version_{scope}"
+
+
+def bump_data_version(scope, user_id=None, pin=True):
+    """
+    Replace the version token of a scope so every ETag derived from it changes.
+
+    With ``pin``, reads of the scope stay on the primary until the replica has
+    seen the change (see core.db_routers).
+    """
+    if scope not in DATA_VERSION_SCOPES:
+        raise ValueError(f"Unknown data version scope: {scope}")
+    cache.set(_data_version_key(scope, user_id), uuid.uuid4().hex, DATA_VERSION_TIMEOUT)
+    if pin:
+        pin_to_primary(scope, user_id)
+
+
+def get_data_versions(scopes, user_id):
+    """Fetch the current version tokens for ``scopes`` in one cache round trip."""
+    keys = [_data_version_key(scope, user_id) for scope in scopes]
+    versions = cache.get_many(keys)
+
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        # First poll after a restart/eviction: start a fresh version instead of guessing
+        cache.set_many(missing, DATA_VERSION_TIMEOUT)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def data_version_etag(*scopes):
+    """
+    Build an ``etag_func`` for django.views.decorators.http.condition.
+
+    The tag covers the path, the query string, the requesting user, the
+    version tokens of ``scopes`` and today's date, since windows such as "last
+    30 days" move at midnight without any write; it never touches the database.
+    """
+    def etag_func(request, *args, **kwargs):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return None
+
+        versions = get_data_versions(scopes, user.id)
+        query = '&'.join(f"{k}={v}" for k, v in sorted(request.GET.items()))
+        raw = f"{request.path}?{query}|{user.id}|{timezone.localdate().isoformat()}|{'|'.join(versions)}"
+        return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+    return etag_func
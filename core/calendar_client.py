@@ -0,0 +1,204 @@
+"""
+Calendar clients used by the calendar sync (core.calendar_sync).
+
+A client sends a list of CalendarMutation objects to Google Calendar as one batch
+HTTP request and reports a CalendarResult for each. ``settings.CALENDAR_CLIENT``
+selects the service behind it: ``google`` authenticates through
+scripts/calendar_integration.py, ``fake`` uses StubCalendarService, an in-process
+stand-in for the googleapiclient service, so the whole sync path (batching, error
+statuses, retries) runs offline in tests and local development.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+
+# Google accepts up to 1000 calls per batch request but recommends keeping batches small
+BATCH_LIMIT = 50
+
+
+class CalendarError(Exception):
+    """A calendar call failed in a way that is worth retrying."""
+
+
+@dataclass
+class CalendarMutation:
+    op: str  # 'insert', 'patch' or 'delete'
+    event_id: str
+    body: Optional[dict] = None
+
+
+@dataclass
+class CalendarResult:
+    ok: bool
+    status: Optional[int] = None  # HTTP status of a failed call, None when unknown
+    error: str = ''
+
+
+class GoogleCalendarClient:
+    """Sends mutations through a googleapiclient-style service, one batch request per call."""
+
+    def __init__(self, service=None, calendar_id=None):
+        self._service = service
+        self.calendar_id = calendar_id or getattr(settings, 'GOOGLE_CALENDAR_ID', 'primary')
+
+    @property
+    def service(self):
+        if self._service is None:
+            try:
+                from calendar_integration import get_calendar_integration
+            except ImportError:
+                return None
+            # Authenticates once per process; the sync worker reuses it for every batch
+            calendar = get_calendar_integration()
+            self._service = calendar.service if calendar else None
+        return self._service
+
+    def execute(self, mutations):
+        """CalendarResult per mutation, in order; None when calendar integration is not set up."""
+        service = self.service
+        if service is None:
+            return None
+
+        results = [None] * len(mutations)
+
+        def record(request_id, response, exception):
+            if exception is None:
+                results[int(request_id)] = CalendarResult(ok=True)
+            else:
+                results[int(request_id)] = CalendarResult(
+                    ok=False, status=getattr(getattr(exception, 'resp', None), 'status', None), error=str(exception)
+                )
+
+        events = service.events()
+        batch = service.new_batch_http_request(callback=record)
+        for position, mutation in enumerate(mutations):
+            if mutation.op == 'insert':
+                request = events.insert(calendarId=self.calendar_id, body={**mutation.body, 'id': mutation.event_id},
+                                        sendUpdates='all')
+            elif mutation.op == 'patch':
+                request = events.patch(calendarId=self.calendar_id, eventId=mutation.event_id, body=mutation.body,
+                                       sendUpdates='all')
+            elif mutation.op == 'delete':
+                request = events.delete(calendarId=self.calendar_id, eventId=mutation.event_id, sendUpdates='all')
+            else:
+                raise ValueError(f"Unknown calendar mutation: {mutation.op}")
+            batch.add(request, request_id=str(position))
+        try:
+            batch.execute()
+        except Exception as exc:
+            # The batch request itself failed; nothing is known to have been applied
+            raise CalendarError(f"Calendar batch request failed: {exc}") from exc
+        return [result or CalendarResult(ok=False, error='No response in batch') for result in results]
+
+
+class StubHttpError(Exception):
+    """Mimics googleapiclient.errors.HttpError: the status code is on ``resp.status``."""
+
+    def __init__(self, status, message):
+        super().__init__(f"<HttpError {status}: {message}>")
+        self.resp = type('Response', (), {'status': status})()
+
+
+class _StubRequest:
+    def __init__(self, run):
+        self._run = run
+
+    def execute(self):
+        return self._run()
+
+
+class _StubBatch:
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self._requests.append((request, callback or self._callback, request_id or str(len(self._requests))))
+
+    def execute(self):
+        self._service.batch_calls += 1
+        for request, callback, request_id in self._requests:
+            try:
+                response, exception = request.execute(), None
+            except StubHttpError as exc:
+                response, exception = None, exc
+            callback(request_id, response, exception)
+
+
+class _StubEvents:
+    def __init__(self, service):
+        self._service = service
+
+    def insert(self, calendarId, body, **kwargs):
+        def run():
+            self._service._maybe_fail()
+            if body['id'] in self._service.store:
+                raise StubHttpError(409, "The requested identifier already exists.")
+            self._service.store[body['id']] = dict(body)
+            return self._service.store[body['id']]
+        return _StubRequest(run)
+
+    def patch(self, calendarId, eventId, body, **kwargs):
+        def run():
+            self._service._maybe_fail()
+            if eventId not in self._service.store:
+                raise StubHttpError(404, "Not Found")
+            self._service.store[eventId].update(body)
+            return self._service.store[eventId]
+        return _StubRequest(run)
+
+    def delete(self, calendarId, eventId, **kwargs):
+        def run():
+            self._service._maybe_fail()
+            if self._service.store.pop(eventId, None) is None:
+                raise StubHttpError(410, "Resource has been deleted")
+            return ''
+        return _StubRequest(run)
+
+
+class StubCalendarService:
+    """
+    In-memory stand-in for the googleapiclient Calendar service.
+
+    ``store`` maps event id to event body; ``fail_next`` makes the next N calls return
+    503; ``batch_calls`` counts batch requests sent.
+    """
+
+    def __init__(self):
+        self.store = {}
+        self.fail_next = 0
+        self.batch_calls = 0
+
+    def events(self):
+        return _StubEvents(self)
+
+    def new_batch_http_request(self, callback=None):
+        return _StubBatch(self, callback)
+
+    def reset(self):
+        self.store.clear()
+        self.fail_next = 0
+        self.batch_calls = 0
+
+    def _maybe_fail(self):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise StubHttpError(503, "Backend Error")
+
+
+fake_calendar = StubCalendarService()
+
+CALENDAR_CLIENTS = {
+    'google': GoogleCalendarClient,
+    'fake': lambda: GoogleCalendarClient(service=fake_calendar),
+}
+
+
+def get_calendar_client():
+    name = getattr(settings, 'CALENDAR_CLIENT', 'google')
+    try:
+        return CALENDAR_CLIENTS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown CALENDAR_CLIENT: {name}") from None
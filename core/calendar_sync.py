@@ -0,0 +1,173 @@
+"""
+Reconciles ScheduledSession rows with Google Calendar events.
+
+The database is the source of truth. Every session whose calendar state lags
+behind it gets one mutation:
+
+* insert: a scheduled future session without an event
+* patch: a scheduled session whose time moved since the last sync
+* delete: a cancelled session that still has an event
+
+Mutations are sent in batch requests of BATCH_LIMIT calls. Event ids are derived
+from the session id, so retrying an insert that already went through returns 409
+and is recorded as a success instead of creating a duplicate event. Deletes that
+find the event already gone (404/410) count as done for the same reason.
+
+The outbox delivers ``calendar.sync`` messages for sessions as they change; the
+outbox worker also runs a full ``sync_sessions()`` pass periodically to pick up
+rows changed without signals (e.g. queryset updates from the admin).
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .calendar_client import BATCH_LIMIT, CalendarMutation, get_calendar_client
+from .models import ScheduledSession
+
+ALREADY_EXISTS = 409
+ALREADY_GONE = (404, 410)
+
+
+@dataclass
+class SyncResult:
+    inserted: int = 0
+    patched: int = 0
+    deleted: int = 0
+    failed: dict = field(default_factory=dict)  # session id -> error
+
+    def add(self, other):
+        self.inserted += other.inserted
+        self.patched += other.patched
+        self.deleted += other.deleted
+        self.failed.update(other.failed)
+
+
+def session_event_id(session_id):
+    """Deterministic Google event id (base32hex characters only) for a session."""
+    return f"p2esession{session_id}"
+
+
+def needs_sync(session):
+    return _mutation_op(session, timezone.now()) is not None
+
+
+def out_of_sync_sessions(now=None):
+    """Sessions whose calendar event is missing, stale or should no longer exist."""
+    now = now or timezone.now()
+    return ScheduledSession.objects.filter(
+        Q(status='scheduled', calendar_event_id='', scheduled_time__gt=now)
+        | (Q(status='scheduled') & ~Q(calendar_event_id='')
+           & (Q(calendar_synced_time__isnull=True) | ~Q(calendar_synced_time=F('scheduled_time'))))
+        | (Q(status='cancelled') & ~Q(calendar_event_id=''))
+    )
+
+
+def sync_sessions(session_ids=None, client=None):
+    """
+    Bring calendar events in line with the given sessions (all out-of-sync sessions
+    when ``session_ids`` is None). Returns a SyncResult, or None when calendar
+    integration is not configured.
+    """
+    client = client or get_calendar_client()
+    queryset = out_of_sync_sessions().select_related('student', 'professional').order_by('id')
+    if session_ids is not None:
+        queryset = queryset.filter(id__in=session_ids)
+
+    total = SyncResult()
+    last_id = 0
+    while True:
+        # Keyset pages: rows that fail stay out of sync and must not be fetched again this pass
+        batch = list(queryset.filter(id__gt=last_id)[:BATCH_LIMIT])
+        if not batch:
+            return total
+        last_id = batch[-1].id
+        result = _sync_batch(batch, client)
+        if result is None:
+            return None
+        total.add(result)
+
+
+def _sync_batch(sessions, client):
+    now = timezone.now()
+    planned = [(session, _mutation_op(session, now)) for session in sessions]
+    planned = [(session, op) for session, op in planned if op]
+    if not planned:
+        return SyncResult()
+
+    results = client.execute([
+        CalendarMutation(op, session.calendar_event_id or session_event_id(session.id),
+                         None if op == 'delete' else _event_body(session))
+        for session, op in planned
+    ])
+    if results is None:
+        return None
+
+    outcome = SyncResult()
+    updated, inserted = [], []
+    for (session, op), result in zip(planned, results):
+        if op == 'insert' and (result.ok or result.status == ALREADY_EXISTS):
+            session.calendar_event_id = session_event_id(session.id)
+            session.calendar_synced_time = session.scheduled_time
+            outcome.inserted += 1
+            inserted.append(session)
+        elif op == 'patch' and result.ok:
+            session.calendar_synced_time = session.scheduled_time
+            outcome.patched += 1
+        elif op == 'delete' and (result.ok or result.status in ALREADY_GONE):
+            session.calendar_event_id = ''
+            session.calendar_synced_time = None
+            outcome.deleted += 1
+        else:
+            outcome.failed[session.id] = result.error or f"HTTP {result.status}"
+            continue
+        updated.append(session)
+
+    with transaction.atomic():
+        # bulk_update: no post_save, so syncing a session does not enqueue another sync
+        ScheduledSession.objects.bulk_update(updated, ['calendar_event_id', 'calendar_synced_time'])
+        _notify_students(inserted)
+    return outcome
+
+
+def _mutation_op(session, now):
+    if session.status == 'cancelled':
+        return 'delete' if session.calendar_event_id else None
+    if session.status != 'scheduled':
+        return None
+    if not session.calendar_event_id:
+        return 'insert' if session.scheduled_time > now else None
+    if session.calendar_synced_time != session.scheduled_time:
+        return 'patch'
+    return None
+
+
+def _event_body(session):
+    student, professional = session.student, session.professional
+    end_time = session.scheduled_time + timedelta(minutes=session.duration_minutes)
+    return {
+        'summary': f"Resume Review Session - {student.username}",
+        'description': f"Resume review session between {student.username} and {professional.name}",
+        'start': {'dateTime': session.scheduled_time.isoformat(), 'timeZone': 'UTC'},
+        'end': {'dateTime': end_time.isoformat(), 'timeZone': 'UTC'},
+        'attendees': [{'email': student.email or f"{student.username}@example.com"},
+                      {'email': professional.email}],
+        'reminders': {
+            'useDefault': False,
+            'overrides': [{'method': 'email', 'minutes': 24 * 60}, {'method': 'popup', 'minutes': 30}],
+        },
+    }
+
+
+def _notify_students(sessions):
+    from .outbox import enqueue
+
+    for session in sessions:
+        if session.student.discord_id:
+            enqueue('discord.notify', {
+                'discord_id': session.student.discord_id,
+                'content': (f"📅 The calendar invite for your review session with {session.professional.name} on "
+                            f"{session.scheduled_time:%A %Y-%m-%d %H:%M %Z} has been sent to your email."),
+            })
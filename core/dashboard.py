@@ -0,0 +1,594 @@
+"""
+Section builders for the student dashboard.
+
+Each section (stats, timeline, feed, rewards, leaderboard) is built here once and
+used both by its standalone endpoint and by the dashboard bundle endpoint. Both
+paths share the same cache keys, so a section warmed by one is served to the
+other.
+"""
+import bisect
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import models
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .caching import get_data_versions, set_user_cache, versioned_key, versioned_keys
+from .models import Incentive, PointsLog, Redemption, User
+
+# Section name -> (cache namespace, TTL in seconds)
+# Long TTLs since cache invalidation (core.signals) handles real-time updates
+DASHBOARD_SECTIONS = {
+    'stats': ('dashboard', 86400),
+    'timeline': ('timeline', 86400),
+    'feed': ('feed', 86400),
+    'rewards': ('rewards', 86400),
+    # Moderate TTL since leaderboard affects multiple users and changes less frequently
+    'leaderboard': ('leaderboard', 43200),
+}
+
+STATS_PERIOD_DAYS = {'7days': 7, '30days': 30, '90days': 90}
+
+FEED_MAX_LIMIT = 1000
+
+
+def section_cache_key(section, user_id, params):
+    """Cache key of a section; must match what the standalone endpoints used."""
+    # Date-windowed sections are keyed by day too, so a new day's ETag is not answered from yesterday's entry
+    today = timezone.localdate().isoformat()
+    if section == 'stats':
+        return f"dashboard_stats_{user_id}_{params['period']}_{today}"
+    if section == 'timeline':
+        return f"points_timeline_{user_id}_{params['granularity']}_{params['days']}_{today}"
+    if section == 'feed':
+        return f"activity_feed_{user_id}_{params['limit'] or 'lifetime'}"
+    if section == 'rewards':
+        return f"rewards_available_{user_id}"
+    if section == 'leaderboard':
+        # Anyone's points change the leaderboard; keying by its data version keeps the body in step with the ETag
+        version = get_data_versions(['leaderboard'], user_id)[0]
+        if params['period'] == 'all_time':
+            return f"leaderboard_{params['period']}_{params['limit']}_{user_id}_{version}"
+        return f"leaderboard_{params['period']}_{params['limit']}_{user_id}_{today}_{version}"
+    raise ValueError(f"Unknown dashboard section: {section}")
+
+
+def stats_period_bounds(period, now):
+    """Return (current_start, previous_start, previous_end) for a stats period."""
+    days = STATS_PERIOD_DAYS.get(period, 30)  # 30days default
+    current_start = now - timedelta(days=days)
+    previous_start = now - timedelta(days=days * 2)
+    return current_start, previous_start, current_start
+
+
+def calculate_trend(current, previous):
+    if previous == 0:
+        return {
+            'change': current,
+            'percentage': 100.0 if current > 0 else 0.0,
+            'direction': 'up' if current > 0 else 'neutral'
+        }
+
+    change = current - previous
+    percentage = (change / previous) * 100
+    direction = 'up' if change > 0 else 'down' if change < 0 else 'neutral'
+
+    return {
+        'change': change,
+        'percentage': round(percentage, 2),
+        'direction': direction
+    }
+
+
+# (catalog data version, sorted points_required of active incentives), per process
+_reward_thresholds = (None, [])
+
+
+def affordable_reward_count(total_points):
+    """
+    Number of active incentives a balance can afford.
+
+    Answered with a binary search over an in-memory sorted threshold list that is
+    reloaded only when the catalog data version changes.
+    """
+    global _reward_thresholds
+
+    catalog_version = get_data_versions(['catalog'], None)[0]
+    if _reward_thresholds[0] != catalog_version:
+        thresholds = sorted(Incentive.objects.filter(is_active=True).values_list('points_required', flat=True))
+        _reward_thresholds = (catalog_version, thresholds)
+    return bisect.bisect_right(_reward_thresholds[1], total_points)
+
+
+def build_dashboard_stats(user, period, now=None, totals=None):
+    """
+    Dashboard statistics with period-over-period comparison.
+
+    ``totals`` may carry precomputed current/previous points and activity counts
+    (the bundle derives them from its shared pass over the logs); otherwise they
+    are aggregated here.
+    """
+    now = now or timezone.now()
+    current_start, previous_start, previous_end = stats_period_bounds(period, now)
+
+    if totals is None:
+        # OPTIMIZED: One round trip for both periods using conditional aggregation
+        # Uses idx_points_logs_user_timestamp for optimal performance
+        period_stats = PointsLog.objects.filter(
+            user=user,
+            timestamp__gte=previous_start
+        ).aggregate(
+            current_points=Sum('points_earned', filter=Q(timestamp__gte=current_start)),
+            current_activities=Count('id', filter=Q(timestamp__gte=current_start)),
+            previous_points=Sum('points_earned', filter=Q(timestamp__lt=previous_end)),
+            previous_activities=Count('id', filter=Q(timestamp__lt=previous_end)),
+        )
+        totals = {key: value or 0 for key, value in period_stats.items()}
+
+    current_points_earned = totals['current_points']
+    current_activities = totals['current_activities']
+    previous_points_earned = totals['previous_points']
+    previous_activities = totals['previous_activities']
+
+    # Available rewards count
+    available_rewards = affordable_reward_count(user.total_points)
+
+    return {
+        'current_period': {
+            'total_points': user.total_points,
+            'activities_completed': current_activities,
+            'points_earned': current_points_earned,
+            'available_rewards': available_rewards,
+            'start_date': current_start.date().isoformat(),
+            'end_date': now.date().isoformat()
+        },
+        'previous_period': {
+            'total_points': user.total_points - current_points_earned,
+            'activities_completed': previous_activities,
+            'points_earned': previous_points_earned,
+            'start_date': previous_start.date().isoformat(),
+            'end_date': previous_end.date().isoformat()
+        },
+        'trends': {
+            'total_points': calculate_trend(user.total_points, user.total_points - current_points_earned),
+            'activities_completed': calculate_trend(current_activities, previous_activities),
+            'points_earned': calculate_trend(current_points_earned, previous_points_earned)
+        }
+    }
+
+
+def _as_date(value):
+    # DATE() comes back as a date on Postgres but as a string on SQLite
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def build_points_timeline(user, granularity, days, now=None, logs_by_date=None, redemptions_by_date=None):
+    """
+    Historical points data grouped by time periods.
+
+    ``logs_by_date`` / ``redemptions_by_date`` map a date to its daily rollup;
+    when omitted they are aggregated here with one query each.
+    """
+    now = now or timezone.now()
+    start_date = now - timedelta(days=days)
+
+    if logs_by_date is None:
+        # OPTIMIZED: Single query for all points logs in period with aggregation
+        # Uses idx_points_logs_user_timestamp index
+        logs_aggregated = PointsLog.objects.filter(
+            user=user,
+            timestamp__gte=start_date
+        ).extra(
+            select={'date': "DATE(timestamp)"}
+        ).values('date').annotate(
+            points_earned=Sum('points_earned'),
+            activities_count=Sum(1)
+        ).order_by('date')
+        logs_by_date = {_as_date(item['date']): item for item in logs_aggregated}
+
+    if redemptions_by_date is None:
+        # OPTIMIZED: Single query for all redemptions in period with aggregation
+        # Uses idx_redemptions_user_timestamp index
+        redemptions_aggregated = Redemption.objects.filter(
+            user=user,
+            redeemed_at__gte=start_date
+        ).extra(
+            select={'date': "DATE(redeemed_at)"}
+        ).values('date').annotate(
+            points_spent=Sum('points_spent'),
+            redemptions_count=Sum(1)
+        ).order_by('date')
+        redemptions_by_date = {_as_date(item['date']): item for item in redemptions_aggregated}
+
+    # Calculate starting cumulative points
+    period_earned = sum(item['points_earned'] for item in logs_by_date.values())
+    period_redeemed = sum(item['points_spent'] for item in redemptions_by_date.values())
+    cumulative_points = user.total_points - period_earned + period_redeemed
+
+    # Daily, weekly (7-day) or monthly (30-day) buckets
+    bucket_days = {'weekly': 7, 'monthly': 30}.get(granularity, 1)
+
+    # Generate timeline efficiently
+    timeline = []
+    current_date = start_date.date()
+    end_date = now.date()
+
+    while current_date <= end_date:
+        bucket_end = current_date + timedelta(days=bucket_days - 1)
+        points_earned = points_redeemed = activities_count = redemptions_count = 0
+
+        # Collect data for the bucket
+        temp_date = current_date
+        while temp_date <= bucket_end and temp_date <= end_date:
+            if temp_date in logs_by_date:
+                points_earned += logs_by_date[temp_date]['points_earned']
+                activities_count += logs_by_date[temp_date]['activities_count']
+            if temp_date in redemptions_by_date:
+                points_redeemed += redemptions_by_date[temp_date]['points_spent']
+                redemptions_count += redemptions_by_date[temp_date]['redemptions_count']
+            temp_date += timedelta(days=1)
+
+        net_points = points_earned - points_redeemed
+        cumulative_points += net_points
+
+        timeline.append({
+            'date': current_date.isoformat(),
+            'points_earned': points_earned,
+            'points_redeemed': points_redeemed,
+            'net_points': net_points,
+            'cumulative_points': cumulative_points,
+            'activities_count': activities_count,
+            'redemptions_count': redemptions_count
+        })
+
+        current_date += timedelta(days=bucket_days)
+
+    # Calculate summary stats efficiently
+    net_points_change = period_earned - period_redeemed
+    average_daily_points = period_earned / days if days > 0 else 0
+
+    # Find most active date
+    most_active_date = None
+    if timeline:
+        most_active = max(timeline, key=lambda x: x.get('net_points', x['points_earned']))
+        if most_active.get('net_points', most_active['points_earned']) > 0:
+            most_active_date = most_active['date']
+
+    return {
+        'timeline': timeline,
+        'summary': {
+            'total_days': days,
+            'total_points_earned': period_earned,
+            'total_points_redeemed': period_redeemed,
+            'net_points_change': net_points_change,
+            'average_daily_points': round(average_daily_points, 1),
+            'most_active_date': most_active_date
+        }
+    }
+
+
+FEED_ACTIVITY_FIELDS = ('id', 'timestamp', 'points_earned', 'details', 'activity__name', 'activity__category')
+FEED_REDEMPTION_FIELDS = ('id', 'redeemed_at', 'points_spent', 'status', 'incentive__name')
+
+
+def build_activity_feed(user, limit, activities=None, redemptions=None):
+    """
+    Unified activity and redemption feed, most recent first.
+
+    ``activities`` / ``redemptions`` are values() rows ordered newest first;
+    when omitted they are queried here. ``limit`` of None means lifetime data.
+    """
+    # SUPER OPTIMIZED: Use values() to minimize data transfer and memory usage
+    # Uses idx_points_logs_user_timestamp / idx_redemptions_user_timestamp indexes
+    if activities is None:
+        activities = PointsLog.objects.filter(user=user).values(*FEED_ACTIVITY_FIELDS).order_by('-timestamp')
+        if limit:
+            activities = activities[:limit]
+    if redemptions is None:
+        redemptions = Redemption.objects.filter(user=user).values(*FEED_REDEMPTION_FIELDS).order_by('-redeemed_at')
+        if limit:
+            redemptions = redemptions[:limit]
+
+    # OPTIMIZED: Combine and format with minimal processing
+    feed_items = []
+
+    # Add activities - minimal object creation
+    for activity in activities:
+        feed_items.append({
+            'id': f"activity_{activity['id']}",
+            'type': 'activity',
+            'timestamp': activity['timestamp'].isoformat(),
+            'points_change': activity['points_earned'],  # Positive
+            'description': f"Completed: {activity['activity__name']}",
+            'details': {
+                'activity_name': activity['activity__name'],
+                'activity_category': activity['activity__category'],
+                'points_earned': activity['points_earned']
+            }
+        })
+
+    # Add redemptions - minimal object creation
+    for redemption in redemptions:
+        feed_items.append({
+            'id': f"redemption_{redemption['id']}",
+            'type': 'redemption',
+            'timestamp': redemption['redeemed_at'].isoformat(),
+            'points_change': -redemption['points_spent'],  # Negative
+            'description': f"Redeemed: {redemption['incentive__name']}",
+            'details': {
+                'reward_name': redemption['incentive__name'],
+                'points_spent': redemption['points_spent'],
+                'status': redemption['status']
+            }
+        })
+
+    # Sort by timestamp (most recent first)
+    feed_items.sort(key=lambda x: x['timestamp'], reverse=True)
+
+    # Only apply limit if it was specified (for lifetime data, show all)
+    if limit:
+        feed_items = feed_items[:limit]
+
+    return {
+        'feed': feed_items,
+        'total_items': len(feed_items),
+        'is_lifetime_data': limit is None,
+        'limit_applied': limit,
+        'total_activities': len([item for item in feed_items if item['type'] == 'activity']),
+        'total_redemptions': len([item for item in feed_items if item['type'] == 'redemption'])
+    }
+
+
+def build_rewards_available(user):
+    """All rewards with per-user redemption eligibility."""
+    # Get ALL rewards, not just active ones
+    rewards = Incentive.objects.all().order_by('points_required')
+
+    rewards_data = []
+    for reward in rewards:
+        can_redeem = (user.total_points >= reward.points_required and
+                     reward.is_active and
+                     reward.stock_available > 0)
+        rewards_data.append({
+            'id': reward.id,
+            'name': reward.name,
+            'description': reward.description,
+            'points_required': reward.points_required,
+            'image_url': reward.image_url,
+            'category': reward.category,
+            'stock_available': reward.stock_available,
+            'can_redeem': can_redeem,
+            'is_active': reward.is_active,  # Add this field for frontend
+            'sponsor': reward.sponsor
+        })
+
+    return {
+        'rewards': rewards_data
+    }
+
+
+def build_leaderboard(user, period, limit, now=None):
+    """Ranked list of users by points earned, plus the requesting user's rank."""
+    now = now or timezone.now()
+
+    # Base queryset - exclude users without points and ensure they have proper usernames
+    # Calculate total points earned from PointsLog (excluding redemptions)
+    # OPTIMIZED: Privacy settings are denormalised onto User (leaderboard_display_name,
+    # show_in_leaderboard), so opt-outs are filtered in SQL and no preferences join is needed
+    base_queryset = User.objects.filter(show_in_leaderboard=True).exclude(username__startswith='discord_').only(
+        'id', 'username', 'leaderboard_display_name'
+    ).annotate(
+        total_points_earned=Sum('points_logs__points_earned', default=0)
+    ).exclude(total_points_earned=0)
+
+    if period == 'weekly':
+        # Points earned in last 7 days
+        week_ago = now - timedelta(days=7)
+        users_with_monthly_points = base_queryset.annotate(
+            period_points=Sum('points_logs__points_earned',
+                            filter=Q(points_logs__timestamp__gte=week_ago))
+        ).exclude(period_points__isnull=True).order_by('-period_points', '-total_points_earned')
+    elif period == 'monthly':
+        # Points earned in last 30 days
+        month_ago = now - timedelta(days=30)
+        users_with_monthly_points = base_queryset.annotate(
+            period_points=Sum('points_logs__points_earned',
+                            filter=Q(points_logs__timestamp__gte=month_ago))
+        ).exclude(period_points__isnull=True).order_by('-period_points', '-total_points_earned')
+    else:
+        # All time points earned (excluding redemptions)
+        users_with_monthly_points = base_queryset.annotate(
+            period_points=models.F('total_points_earned')
+        ).order_by('-total_points_earned')
+
+    # Get top users
+    top_users = users_with_monthly_points[:limit]
+
+    # Build leaderboard
+    leaderboard = []
+    for rank, ranked_user in enumerate(top_users, 1):
+        # Privacy-safe display name, precomputed from the user's preferences
+        display_name = ranked_user.leaderboard_display_name or ranked_user.username
+
+        leaderboard.append({
+            'rank': rank,
+            'user_id': ranked_user.id,
+            'username': ranked_user.username,
+            'display_name': display_name,
+            'total_points': ranked_user.total_points_earned,  # Use points earned, not current balance
+            'points_this_period': getattr(ranked_user, 'period_points', ranked_user.total_points_earned) or 0,
+            'avatar_url': None,  # Could be added later
+            'is_current_user': ranked_user.id == user.id
+        })
+
+    # Always provide current user's rank information
+    current_user_points_earned = PointsLog.objects.filter(user=user).aggregate(
+        total=Sum('points_earned', default=0)
+    )['total'] or 0
+
+    # Check if current user is already in the leaderboard
+    current_user_in_leaderboard = any(item['is_current_user'] for item in leaderboard)
+
+    if current_user_in_leaderboard:
+        # Find the current user's entry in the leaderboard
+        current_user_entry = next(item for item in leaderboard if item['is_current_user'])
+        current_user_rank = {
+            'rank': current_user_entry['rank'],
+            'user_id': current_user_entry['user_id'],
+            'username': current_user_entry['username'],
+            'display_name': 'You',
+            'total_points': current_user_entry['total_points'],
+            'points_this_period': current_user_entry['points_this_period'],
+            'is_current_user': True
+        }
+    else:
+        # Calculate current user's position if not in top users
+        current_user_position = users_with_monthly_points.filter(
+            Q(total_points_earned__gt=current_user_points_earned) |
+            (Q(total_points_earned=current_user_points_earned) & Q(id__lt=user.id))
+        ).count() + 1
+
+        current_user_rank = {
+            'rank': current_user_position,
+            'user_id': user.id,
+            'username': user.username,
+            'display_name': 'You',
+            'total_points': current_user_points_earned,  # Use points earned, not current balance
+            'points_this_period': getattr(user, 'period_points', current_user_points_earned) or 0,
+            'is_current_user': True
+        }
+
+    total_participants = users_with_monthly_points.count()
+
+    return {
+        'leaderboard': leaderboard,
+        'current_user_rank': current_user_rank,
+        'total_participants': total_participants
+    }
+
+
+def get_cached_section(section, user, params, build):
+    """Serve a section from cache, or build it with ``build()`` and cache it."""
+    namespace, ttl = DASHBOARD_SECTIONS[section]
+    cache_key = versioned_key(namespace, section_cache_key(section, user.id, params))
+    cached_data = cache.get(cache_key)
+    if cached_data:
+        return cached_data
+
+    data = build()
+    set_user_cache(namespace, user.id, cache_key, data, ttl)
+    return data
+
+
+def _recent_rows(queryset, order_field, since, limit):
+    """
+    Rows newer than ``since`` (all rows when ``since`` is None), topped up with
+    older ones when a feed ``limit`` needs more than the window holds.
+    """
+    rows = queryset.order_by(f"-{order_field}")
+    if since is None:
+        return list(rows[:limit] if limit else rows)
+
+    window_rows = list(rows.filter(**{f"{order_field}__gte": since}))
+    if limit and len(window_rows) < limit:
+        window_rows.extend(rows.filter(**{f"{order_field}__lt": since})[:limit - len(window_rows)])
+    return window_rows
+
+
+def build_dashboard_bundle(user, sections, params):
+    """
+    Build the requested dashboard sections in one pass.
+
+    Cached sections are fetched with a single get_many; the remaining
+    stats/timeline/feed sections share one scan of the user's recent points logs
+    and redemptions, rolled up per day in Python.
+    """
+    now = timezone.now()
+    cache_keys = dict(zip(sections, versioned_keys([
+        (DASHBOARD_SECTIONS[section][0], section_cache_key(section, user.id, params[section])) for section in sections
+    ])))
+    cached = cache.get_many(list(cache_keys.values()))
+
+    bundle = {}
+    missing = []
+    for section in sections:
+        if cached.get(cache_keys[section]):
+            bundle[section] = cached[cache_keys[section]]
+        else:
+            missing.append(section)
+
+    log_sections = [section for section in missing if section in ('stats', 'timeline', 'feed')]
+    if log_sections:
+        # Oldest timestamp any of the windowed sections needs
+        window_starts = []
+        if 'stats' in log_sections:
+            window_starts.append(stats_period_bounds(params['stats']['period'], now)[1])
+        if 'timeline' in log_sections:
+            timeline_start = now - timedelta(days=params['timeline']['days'])
+            window_starts.append(timeline_start)
+        since = min(window_starts) if window_starts else None
+
+        feed_limit = params['feed']['limit'] if 'feed' in log_sections else None
+        if 'feed' in log_sections and feed_limit is None:
+            since = None  # Lifetime feed needs every row anyway
+
+        logs = _recent_rows(
+            PointsLog.objects.filter(user=user).values(*FEED_ACTIVITY_FIELDS),
+            'timestamp', since, feed_limit if 'feed' in log_sections else None,
+        )
+        redemptions = []
+        if 'timeline' in log_sections or 'feed' in log_sections:
+            redemptions = _recent_rows(
+                Redemption.objects.filter(user=user).values(*FEED_REDEMPTION_FIELDS),
+                'redeemed_at', since, feed_limit if 'feed' in log_sections else None,
+            )
+
+        if 'stats' in log_sections:
+            current_start, previous_start, previous_end = stats_period_bounds(params['stats']['period'], now)
+            totals = {'current_points': 0, 'current_activities': 0, 'previous_points': 0, 'previous_activities': 0}
+            for row in logs:
+                if row['timestamp'] >= current_start:
+                    totals['current_points'] += row['points_earned']
+                    totals['current_activities'] += 1
+                elif previous_start <= row['timestamp'] < previous_end:
+                    totals['previous_points'] += row['points_earned']
+                    totals['previous_activities'] += 1
+            bundle['stats'] = build_dashboard_stats(user, params['stats']['period'], now=now, totals=totals)
+
+        if 'timeline' in log_sections:
+            logs_by_date = {}
+            for row in logs:
+                if row['timestamp'] >= timeline_start:
+                    day = logs_by_date.setdefault(row['timestamp'].date(), {'points_earned': 0, 'activities_count': 0})
+                    day['points_earned'] += row['points_earned']
+                    day['activities_count'] += 1
+            redemptions_by_date = {}
+            for row in redemptions:
+                if row['redeemed_at'] >= timeline_start:
+                    day = redemptions_by_date.setdefault(row['redeemed_at'].date(), {'points_spent': 0, 'redemptions_count': 0})
+                    day['points_spent'] += row['points_spent']
+                    day['redemptions_count'] += 1
+            bundle['timeline'] = build_points_timeline(
+                user, params['timeline']['granularity'], params['timeline']['days'], now=now,
+                logs_by_date=logs_by_date, redemptions_by_date=redemptions_by_date,
+            )
+
+        if 'feed' in log_sections:
+            bundle['feed'] = build_activity_feed(
+                user, feed_limit,
+                activities=logs[:feed_limit] if feed_limit else logs,
+                redemptions=redemptions[:feed_limit] if feed_limit else redemptions,
+            )
+
+    if 'rewards' in missing:
+        bundle['rewards'] = build_rewards_available(user)
+    if 'leaderboard' in missing:
+        bundle['leaderboard'] = build_leaderboard(user, params['leaderboard']['period'], params['leaderboard']['limit'], now=now)
+
+    # CACHE: Store each freshly built section under its standalone key
+    for section in missing:
+        namespace, ttl = DASHBOARD_SECTIONS[section]
+        set_user_cache(namespace, user.id, cache_keys[section], bundle[section], ttl)
+
+    return bundle
@@ -0,0 +1,141 @@
+"""
+PostgreSQL backend that reuses connections through a per-process pool.
+
+Set ``ENGINE`` to ``core.db_backends`` and configure the pool in
+``OPTIONS['pool']`` (``max_size``, ``timeout``, ``check_after``), the same key
+Django 5.1's built-in pool reads. Closing a connection (at the end of every
+request with CONN_MAX_AGE=0) returns it to the pool instead of tearing down the
+TLS session, so the next request, on whatever thread, checks it out without a
+new handshake. This matters under ASGI, where each request's sync work runs in
+a fresh thread and persistent connections are never reused.
+
+Idle connections that sat in the pool longer than ``check_after`` seconds are
+tested with ``SELECT 1`` on checkout and replaced if the server dropped them.
+"""
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError
+from django.db.backends.postgresql import base, creation
+
+DEFAULT_POOL_OPTIONS = {'max_size': 10, 'timeout': 30.0, 'check_after': 30.0}
+IDLE = 0  # psycopg2's TRANSACTION_STATUS_IDLE, psycopg 3's TransactionStatus.IDLE
+
+
+class ConnectionPool:
+    """Bounded pool of idle DB-API connections; ``get`` blocks up to ``timeout`` when all are checked out."""
+
+    def __init__(self, max_size, timeout, check_after):
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = []  # (connection, returned at)
+        self._lock = threading.Lock()
+        self.timeout = timeout
+        self.check_after = check_after
+        self.connects = 0
+
+    def get(self, connect):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise OperationalError(f"No database connection available within {self.timeout}s (pool exhausted)")
+        try:
+            while True:
+                with self._lock:
+                    connection, returned_at = self._idle.pop() if self._idle else (None, None)
+                if connection is None:
+                    self.connects += 1
+                    return connect()
+                if not connection.closed and (time.monotonic() - returned_at < self.check_after or _is_alive(connection)):
+                    return connection
+                _discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def put(self, connection):
+        try:
+            if connection.closed:
+                return
+            if connection.info.transaction_status != IDLE:
+                connection.rollback()
+        except Exception:
+            _discard(connection)
+        else:
+            with self._lock:
+                self._idle.append((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            _discard(connection)
+
+
+def _is_alive(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return True
+    except Exception:
+        return False
+
+
+def _discard(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would make DROP DATABASE fail
+        DatabaseWrapper.close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    _pools = {}  # connection target -> ConnectionPool, shared by every thread of the process
+    _pools_lock = threading.Lock()
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        return conn_params
+
+    def check_settings(self):
+        super().check_settings()
+        if self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured("core.db_backends pools connections; set CONN_MAX_AGE to 0.")
+
+    @property
+    def pool(self):
+        # Looked up on every use: the test runner renames the database on a live wrapper
+        key = tuple(str(self.settings_dict[name]) for name in ('NAME', 'HOST', 'PORT', 'USER'))
+        with self._pools_lock:
+            if key not in self._pools:
+                options = {**DEFAULT_POOL_OPTIONS, **(self.settings_dict['OPTIONS'].get('pool') or {})}
+                self._pools[key] = ConnectionPool(
+                    max_size=int(options['max_size']),
+                    timeout=float(options['timeout']),
+                    check_after=float(options['check_after']),
+                )
+            return self._pools[key]
+
+    @classmethod
+    def close_pools(cls, name=None):
+        """Close idle pooled connections (to database ``name`` only, if given)."""
+        with cls._pools_lock:
+            pools = [pool for key, pool in cls._pools.items() if name is None or key[0] == name]
+        for pool in pools:
+            pool.close()
+
+    def get_new_connection(self, conn_params):
+        return self.pool.get(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.put(self.connection)
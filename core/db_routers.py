@@ -0,0 +1,113 @@
+"""
+Read replica routing for the analytics endpoints.
+
+Nothing reads from the replica unless a view opts in with ``read_from_replica``;
+every write and every other read stays on ``default``. The replica lags the
+primary, so after a change the reads that depend on it are pinned to the
+primary for REPLICA_PIN_SECONDS:
+
+* ``'user'`` pins only the user whose data changed (read-your-writes)
+* other scopes (``'leaderboard'``, ``'catalog'``, ``'stats'``) pin everyone,
+  because the response built right after the change is cached for all readers
+
+Pins are set where the change is already announced: ``bump_data_version``
+(core.caching) and the counter invalidation in core.stats. Points writes are too
+frequent for a global pin, so they only pin their user; the leaderboard instead
+passes a ``caught_up`` check that compares the newest points log on the primary
+with the replica's (see ``replica_has_latest``). They are ReplicaPin
+rows in the primary database, not cache entries: the default cache is per
+process, and a change made by the bot or another web worker has to pin reads
+in every process. Checking them costs one indexed primary query per
+replica-routed request.
+"""
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+REPLICA_ALIAS = 'replica'
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+class ReplicaRouter:
+    """Sends reads to the alias chosen by ``read_from_replica``; writes always go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.settings
+
+
+def _pin_key(scope, user_id=None):
+    if scope == 'user':
+        return f"replica_pin_user_{user_id}"
+    return f"replica_pin_{scope}"
+
+
+def pin_to_primary(scope, user_id=None):
+    """Keep reads that depend on ``scope`` on the primary until the replica has caught up."""
+    if not replica_configured():
+        return
+    from .models import ReplicaPin
+
+    expires_at = timezone.now() + timedelta(seconds=getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+    # One row per key, moved forward by each change (so the table stays one row per user and scope)
+    ReplicaPin.objects.using(DEFAULT_DB_ALIAS).bulk_create(
+        [ReplicaPin(key=_pin_key(scope, user_id), expires_at=expires_at)],
+        update_conflicts=True, unique_fields=['key'], update_fields=['expires_at'],
+    )
+
+
+def is_pinned(scopes, user_id=None):
+    if not scopes:
+        return False
+    from .models import ReplicaPin
+
+    return ReplicaPin.objects.using(DEFAULT_DB_ALIAS).filter(
+        key__in=[_pin_key(scope, user_id) for scope in scopes], expires_at__gt=timezone.now()
+    ).exists()
+
+
+def replica_has_latest(model):
+    """
+    A ``caught_up`` check: whether the replica has replayed the newest ``model`` row
+    written to the primary. Costs two primary key lookups; only sees inserts.
+    """
+    def caught_up():
+        latest = model.objects.using(DEFAULT_DB_ALIAS).order_by('-pk').values_list('pk', flat=True).first()
+        return latest is None or model.objects.using(REPLICA_ALIAS).filter(pk__gte=latest).exists()
+    return caught_up
+
+
+def read_from_replica(*scopes, caught_up=None):
+    """
+    View decorator: run the view's reads against the replica unless one of
+    ``scopes`` is pinned for the requesting user, or ``caught_up()`` says the
+    replica is behind. Use ``method_decorator`` on class-based views.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if (not replica_configured() or is_pinned(scopes, getattr(request.user, 'id', None))
+                    or (caught_up is not None and not caught_up())):
+                return view_func(request, *args, **kwargs)
+            token = _read_alias.set(REPLICA_ALIAS)
+            try:
+                return view_func(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+        return wrapped
+    return decorator
@@ -0,0 +1,263 @@
+"""
+Local directory of Discord server members for username validation.
+
+The bot pushes a full member snapshot when it connects (and periodically after),
+in chunks, plus join/update/leave deltas as they happen. Validating a username
+is then one indexed lookup on ``username_key`` instead of a blocking call to
+Discord's member search. The Discord API remains as a fallback while the
+directory is empty or has not heard from the bot for DIRECTORY_MAX_AGE.
+``avalidate_discord_username`` is the async variant for ASGI views: the lookups
+use the async ORM and the Discord call runs in a worker thread.
+"""
+import logging
+from datetime import timedelta
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import GuildMember
+
+logger = logging.getLogger(__name__)
+
+# The bot re-sends its snapshot every few hours; after this long without one a
+# local miss may just be a member who joined while the bot was offline
+DIRECTORY_MAX_AGE = timedelta(hours=12)
+UPSERT_BATCH_SIZE = 1000
+
+MEMBER_FIELDS = ('username', 'username_key', 'discriminator', 'display_name', 'synced_at')
+
+
+def apply_member_snapshot(members, snapshot_id, final=False):
+    """
+    Upsert one chunk of a snapshot. On the final chunk, members the snapshot did not
+    confirm (and that no delta touched since it started) are removed.
+    Returns {'upserted': n, 'skipped': n, 'removed': n}.
+    """
+    rows, skipped = _member_rows(members, snapshot_id=snapshot_id)
+    GuildMember.objects.bulk_create(
+        rows, batch_size=UPSERT_BATCH_SIZE, update_conflicts=True, unique_fields=['discord_id'],
+        update_fields=MEMBER_FIELDS + ('snapshot_id',),
+    )
+    removed = 0
+    if final:
+        started = GuildMember.objects.filter(snapshot_id=snapshot_id).aggregate(started=Min('synced_at'))['started']
+        if started is not None:
+            removed, _ = GuildMember.objects.exclude(snapshot_id=snapshot_id).filter(synced_at__lt=started).delete()
+    return {'upserted': len(rows), 'skipped': skipped, 'removed': removed}
+
+
+def apply_member_events(events):
+    """Apply join/update/leave deltas in order; returns {'upserted': n, 'removed': n, 'skipped': n}."""
+    upserts, leaves, skipped = {}, set(), 0
+    for event in events:
+        discord_id = str(event.get('discord_id') or '') if isinstance(event, dict) else ''
+        if not discord_id:
+            skipped += 1
+        elif event.get('type') == 'leave':
+            upserts.pop(discord_id, None)
+            leaves.add(discord_id)
+        elif event.get('type') in ('join', 'update'):
+            leaves.discard(discord_id)
+            upserts[discord_id] = event
+        else:
+            skipped += 1
+
+    rows, invalid = _member_rows(upserts.values())
+    with transaction.atomic():
+        GuildMember.objects.bulk_create(
+            rows, batch_size=UPSERT_BATCH_SIZE, update_conflicts=True, unique_fields=['discord_id'],
+            update_fields=MEMBER_FIELDS,
+        )
+        removed, _ = GuildMember.objects.filter(discord_id__in=leaves).delete() if leaves else (0, None)
+    return {'upserted': len(rows), 'removed': removed, 'skipped': skipped + invalid}
+
+
+def find_member(discord_username):
+    """GuildMember for "name" or legacy "name#1234", matched case-insensitively, or None."""
+    return _member_lookup(discord_username).first()
+
+
+async def afind_member(discord_username):
+    return await _member_lookup(discord_username).afirst()
+
+
+def directory_is_fresh(now=None):
+    last_sync = GuildMember.objects.aggregate(last_sync=Max('synced_at'))['last_sync']
+    return _is_fresh(last_sync, now)
+
+
+async def adirectory_is_fresh(now=None):
+    last_sync = (await GuildMember.objects.aaggregate(last_sync=Max('synced_at')))['last_sync']
+    return _is_fresh(last_sync, now)
+
+
+def validate_discord_username(discord_username):
+    """
+    Check server membership. Returns {'success', 'valid', 'message', 'discord_id',
+    'discord_username'}; success is False when membership could not be determined.
+    """
+    member = find_member(discord_username)
+    if member is not None:
+        return _found(member)
+    if directory_is_fresh():
+        return _not_found(discord_username)
+    return search_discord_api(discord_username)
+
+
+async def avalidate_discord_username(discord_username):
+    member = await afind_member(discord_username)
+    if member is not None:
+        return _found(member)
+    if await adirectory_is_fresh():
+        return _not_found(discord_username)
+    # No database access in the API search, so it need not wait for the request's sync thread
+    return await sync_to_async(search_discord_api, thread_sensitive=False)(discord_username)
+
+
+def search_discord_api(discord_username):
+    """Member search through Discord's REST API; fallback while the directory is stale."""
+    discord_token = getattr(settings, 'DISCORD_TOKEN', '')
+    guild_id = getattr(settings, 'DISCORD_GUILD_ID', '')
+
+    if not discord_token:
+        return {
+            'success': False,
+            'message': 'Discord integration not configured.'
+        }
+
+    if not guild_id:
+        return {
+            'success': False,
+            'message': 'Discord server not configured.'
+        }
+
+    # Search for the user by username (can include discriminator)
+    username_parts = discord_username.split('#')
+    base_username = username_parts[0]
+    discriminator = username_parts[1] if len(username_parts) > 1 else None
+
+    try:
+        headers = {
+            "Authorization": f"Bot {discord_token}",
+            "Content-Type": "application/json"
+        }
+        response = requests.get(
+            f"https://discord.com/api/v10/guilds/{guild_id}/members/search",
+            params={"query": base_username, "limit": 100},
+            headers=headers,
+            timeout=10
+        )
+
+        if response.status_code == 200:
+            for member in response.json():
+                user = member.get('user', {})
+                member_username = user.get('username', '')
+                member_discriminator = user.get('discriminator', '0000')
+
+                # Usernames are unique; a given discriminator must match as well
+                if member_username.lower() == base_username.lower() and (
+                    discriminator is None or member_discriminator == discriminator
+                ):
+                    return {
+                        'success': True,
+                        'valid': True,
+                        'message': "User found in Discord server",
+                        'discord_id': user.get('id'),
+                        'discord_username': f"{member_username}#{member_discriminator}"
+                    }
+
+            return {
+                'success': True,
+                'valid': False,
+                'message': f"User '{discord_username}' not found in Discord server"
+            }
+
+        elif response.status_code == 401:
+            logger.error("Discord API authentication failed - invalid bot token")
+            return {
+                'success': False,
+                'message': 'Discord authentication failed. Please check configuration.'
+            }
+        elif response.status_code == 403:
+            logger.error("Discord API forbidden - bot lacks permissions")
+            return {
+                'success': False,
+                'message': 'Discord bot lacks required permissions.'
+            }
+        else:
+            logger.error(f"Discord API error {response.status_code}: {response.text}")
+            return {
+                'success': False,
+                'message': f'Discord API error (status {response.status_code})'
+            }
+
+    except requests.exceptions.Timeout:
+        logger.error("Discord API validation timed out")
+        return {
+            'success': False,
+            'message': 'Discord validation timed out. Please try again.'
+        }
+    except Exception as e:
+        logger.error(f"Error calling Discord API: {e}")
+        return {
+            'success': False,
+            'message': 'Unable to connect to Discord API.'
+        }
+
+
+def _member_lookup(discord_username):
+    base_username, _, discriminator = discord_username.strip().partition('#')
+    candidates = GuildMember.objects.filter(username_key=base_username.lower())
+    if discriminator:
+        candidates = candidates.filter(discriminator=discriminator)
+    return candidates
+
+
+def _is_fresh(last_sync, now=None):
+    return last_sync is not None and last_sync >= (now or timezone.now()) - DIRECTORY_MAX_AGE
+
+
+def _found(member):
+    return {
+        'success': True,
+        'valid': True,
+        'message': "User found in Discord server",
+        'discord_id': member.discord_id,
+        'discord_username': member.tag,
+    }
+
+
+def _not_found(discord_username):
+    return {
+        'success': True,
+        'valid': False,
+        'message': f"User '{discord_username}' not found in Discord server",
+    }
+
+
+def _member_rows(members, snapshot_id=None):
+    """GuildMember instances for well-formed member dicts, plus the number skipped."""
+    now = timezone.now()
+    rows, skipped = {}, 0
+    for member in members:
+        if not isinstance(member, dict) or not member.get('discord_id') or not member.get('username'):
+            skipped += 1
+            continue
+        username = str(member['username'])[:100]
+        row = GuildMember(
+            discord_id=str(member['discord_id']),
+            username=username,
+            username_key=username.lower(),
+            discriminator=str(member.get('discriminator') or '0')[:4],
+            display_name=str(member.get('display_name') or '')[:100],
+            synced_at=now,
+        )
+        if snapshot_id is not None:
+            row.snapshot_id = snapshot_id
+        # A repeated id in one chunk would make the upsert touch the same row twice
+        rows[row.discord_id] = row
+    return list(rows.values()), skipped
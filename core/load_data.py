@@ -0,0 +1,378 @@
+"""
+Deterministic synthetic data for load tests and benchmarks.
+
+LoadDataGenerator writes users, points logs, redemptions, submissions, review
+requests, professional availability and Discord event traffic in chunks:
+``bulk_create`` everywhere, and COPY ... FROM STDIN on PostgreSQL for the large
+append-only tables. The same seed always produces the same data.
+
+Signals are not fired (bulk writes), so caches and stored streaks are not
+updated; run ``recompute_streaks`` afterwards if streaks matter.
+"""
+import io
+import json
+import math
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .availability import parse_availability, week_bitmap
+from .models import (
+    Activity, AvailabilitySlot, DiscordEventLog, EventSubmission, Incentive, LinkedInSubmission, PointsLog, Professional,
+    ProfessionalAvailability, Redemption, ResourceSubmission, ReviewRequest, User, UserStatus,
+)
+
+# Points per activity type for activity rows the generator has to create itself
+DEFAULT_ACTIVITY_POINTS = {
+    'resume_upload': 25,
+    'resume_review_request': 20,
+    'event_attendance': 15,
+    'resource_share': 10,
+    'like_interaction': 2,
+    'linkedin_post': 10,
+    'discord_activity': 5,
+}
+
+# Relative frequency of each activity type in generated logs (chat dominates, resumes are rare)
+ACTIVITY_WEIGHTS = {
+    'discord_activity': 50,
+    'like_interaction': 25,
+    'resource_share': 8,
+    'linkedin_post': 7,
+    'event_attendance': 6,
+    'resume_upload': 2,
+    'resume_review_request': 2,
+}
+
+DISCORD_EVENT_WEIGHTS = {'message': 70, 'reaction_add': 25, 'voice_join': 5}
+
+# First synthetic Discord snowflake; user i gets DISCORD_ID_BASE + i
+DISCORD_ID_BASE = 700000000000000000
+
+
+def _copy_value(value):
+    """Encode one value for PostgreSQL COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    if isinstance(value, (bytes, memoryview)):
+        value = '\\x' + bytes(value).hex()  # bytea hex format
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+@contextmanager
+def explicit_timestamps(model, *field_names):
+    """Let bulk_create keep generated values for auto_now_add fields."""
+    fields = [model._meta.get_field(name) for name in field_names]
+    try:
+        for field in fields:
+            field.auto_now_add = False
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class LoadDataGenerator:
+    def __init__(self, seed=42, prefix='load_', chunk_size=10000, use_copy=None, history_days=365, now=None,
+                 stdout=None):
+        self.rng = random.Random(seed)
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.use_copy = connection.vendor == 'postgresql' if use_copy is None else use_copy
+        self.history_days = history_days
+        self.now = now or timezone.now()
+        self.stdout = stdout
+        self.counts = {}
+
+    def generate(self, users, logs_per_user, redemptions=0, submissions=0, review_requests=0, professionals=0,
+                 availability=0, discord_events=0, incentives=20):
+        activities = self.ensure_activities()
+        incentive_rows = self.ensure_incentives(incentives)
+        user_ids = self.create_users(users)
+        self.create_points_logs(user_ids, activities, logs_per_user)
+        self.create_redemptions(user_ids, incentive_rows, redemptions)
+        self.create_submissions(user_ids, submissions)
+        professional_ids = self.create_professionals(professionals)
+        self.create_review_requests(user_ids, professional_ids, review_requests)
+        self.create_availability(professional_ids, availability)
+        self.create_availability_slots()
+        self.create_discord_events(users, discord_events)
+        self.refresh_total_points()
+        return self.counts
+
+    # Reference data
+
+    def ensure_activities(self):
+        """(id, points_value, weight) for one active row per activity type, creating missing ones."""
+        existing = {}
+        for activity in Activity.objects.filter(is_active=True).order_by('id'):
+            existing.setdefault(activity.activity_type, activity)
+        rows = []
+        for activity_type, name in Activity.ACTIVITY_TYPES:
+            activity = existing.get(activity_type)
+            if activity is None:
+                activity = Activity.objects.create(name=name, activity_type=activity_type,
+                                                   points_value=DEFAULT_ACTIVITY_POINTS[activity_type])
+            rows.append((activity.id, activity.points_value, ACTIVITY_WEIGHTS[activity_type]))
+        return rows
+
+    def ensure_incentives(self, count):
+        """(id, points_required) of active incentives, topping the catalog up to ``count``."""
+        rows = list(Incentive.objects.filter(is_active=True).values_list('id', 'points_required'))
+        missing = count - len(rows)
+        if missing > 0:
+            created = Incentive.objects.bulk_create([
+                Incentive(name=f"{self.prefix}reward_{i}", description='Generated load-test reward',
+                          points_required=self.rng.choice([50, 100, 250, 500, 1000, 2500]),
+                          stock_available=self.rng.randint(0, 500),
+                          category=self.rng.choice([c for c, _ in Incentive.CATEGORY_CHOICES]))
+                for i in range(missing)
+            ])
+            rows.extend((incentive.id, incentive.points_required) for incentive in created)
+        return rows
+
+    # Users
+
+    def create_users(self, count):
+        """Create ``count`` students with status rows; returns their ids in creation order."""
+        password = make_password(None)  # Unusable password, hashed once instead of per user
+        joined_range = self.history_days * 24 * 60
+        user_ids = []
+        for start in range(0, count, self.chunk_size):
+            batch = [
+                User(username=f"{self.prefix}user_{i}", password=password, role='student',
+                     first_name=f"Load{i}", last_name=f"User{i % 997}",
+                     email=f"{self.prefix}user_{i}@example.com", discord_id=str(DISCORD_ID_BASE + i),
+                     leaderboard_display_name=f"Load{i} U.",
+                     date_joined=self.now - timedelta(minutes=self.rng.randint(0, joined_range)))
+                for i in range(start, min(start + self.chunk_size, count))
+            ]
+            created = User.objects.bulk_create(batch)
+            if created and created[0].pk is None:
+                # Backends without RETURNING: look the ids up by username
+                created = User.objects.filter(username__in=[u.username for u in batch]).order_by('id')
+            ids = [user.pk for user in created]
+            UserStatus.objects.bulk_create([UserStatus(user_id=user_id) for user_id in ids])
+            user_ids.extend(ids)
+            self._progress('users', len(ids))
+        return user_ids
+
+    def refresh_total_points(self):
+        """total_points = earned - spent for generated users, in one UPDATE."""
+        earned = PointsLog.objects.filter(user=OuterRef('pk')).values('user').annotate(total=Sum('points_earned'))
+        spent = Redemption.objects.filter(user=OuterRef('pk')).values('user').annotate(total=Sum('points_spent'))
+        User.objects.filter(username__startswith=f"{self.prefix}user_").update(
+            total_points=Coalesce(Subquery(earned.values('total')), Value(0))
+            - Coalesce(Subquery(spent.values('total')), Value(0))
+        )
+
+    # Activity traffic
+
+    def activity_timestamp(self):
+        """
+        Recent-weighted timestamp within the history window: exponential decay
+        over days, fewer weekend events, and a daytime peak around 14:00.
+        """
+        rng = self.rng
+        days_ago = min(rng.expovariate(3.0 / self.history_days), self.history_days - 1)
+        moment = self.now - timedelta(days=int(days_ago))
+        if moment.weekday() >= 5 and rng.random() < 0.6:
+            moment -= timedelta(days=moment.weekday() - rng.randint(0, 4))  # Move to a weekday of the same week
+        hour = min(23, max(0, int(rng.gauss(14, 4))))
+        moment = moment.replace(hour=hour, minute=rng.randint(0, 59), second=rng.randint(0, 59), microsecond=0)
+        return min(moment, self.now)
+
+    def logs_for_user(self, mean):
+        """Heavy-tailed per-user activity count (log-normal with the requested mean)."""
+        if mean <= 0:
+            return 0
+        return int(self.rng.lognormvariate(math.log(mean) - 0.5, 1.0))
+
+    def create_points_logs(self, user_ids, activities, logs_per_user):
+        population = [(activity_id, points) for activity_id, points, _ in activities]
+        weights = [weight for _, _, weight in activities]
+
+        def rows():
+            for user_id in user_ids:
+                count = self.logs_for_user(logs_per_user)
+                for activity_id, points in self.rng.choices(population, weights, k=count):
+                    yield (user_id, activity_id, points, '', self.activity_timestamp())
+
+        self._write(PointsLog, ['user_id', 'activity_id', 'points_earned', 'details', 'timestamp'], rows())
+
+    def create_redemptions(self, user_ids, incentives, count):
+        if not count or not incentives or not user_ids:
+            return
+        statuses = [s for s, _ in Redemption.STATUS_CHOICES]
+
+        def rows():
+            for _ in range(count):
+                incentive_id, points_required = self.rng.choice(incentives)
+                yield (self.rng.choice(user_ids), incentive_id, points_required, self.rng.choice(statuses), {}, '',
+                       self.activity_timestamp())
+
+        with explicit_timestamps(Redemption, 'redeemed_at'):
+            self._write(Redemption, ['user_id', 'incentive_id', 'points_spent', 'status', 'delivery_details',
+                                     'admin_notes', 'redeemed_at'], rows())
+
+    def create_submissions(self, user_ids, count):
+        """``count`` submissions each of resources, events and LinkedIn posts, mostly reviewed."""
+        if not count or not user_ids:
+            return
+        for model, text_field in ((ResourceSubmission, 'description'), (EventSubmission, 'event_details'),
+                                  (LinkedInSubmission, 'linkedin_url')):
+            def rows():
+                for i in range(count):
+                    status = self.rng.choices(['approved', 'rejected', 'pending'], [70, 10, 20])[0]
+                    yield (self.rng.choice(user_ids), f"Generated submission {i}", status,
+                           10 if status == 'approved' else 0, self.activity_timestamp())
+
+            with explicit_timestamps(model, 'submitted_at'):
+                self._write(model, ['user_id', text_field, 'status', 'points_awarded', 'submitted_at'], rows())
+
+    # Resume reviews
+
+    def create_professionals(self, count):
+        if not count:
+            return list(Professional.objects.filter(is_active=True).values_list('id', flat=True))
+        specialties = ['Tech', 'Finance', 'Consulting', 'Marketing', 'Healthcare']
+        created = Professional.objects.bulk_create([
+            Professional(name=f"{self.prefix}pro_{i}", email=f"{self.prefix}pro_{i}@example.com",
+                         specialties=', '.join(self.rng.sample(specialties, 2)))
+            for i in range(count)
+        ])
+        if created and created[0].pk is None:
+            created = Professional.objects.filter(name__startswith=f"{self.prefix}pro_")
+        self._progress('professionals', len(created))
+        return [professional.pk for professional in created]
+
+    def create_review_requests(self, user_ids, professional_ids, count):
+        if not count or not user_ids:
+            return
+        industries = ['Tech', 'Finance', 'Consulting', 'Marketing']
+        preferred_times = [['Weekday evenings'], ['Monday 2-4 PM', 'Wednesday afternoon'], ['Tuesday 10am-12pm'],
+                           ['Thursday 6pm-8pm', 'Friday morning']]
+
+        def rows():
+            for _ in range(count):
+                status = self.rng.choices(['pending', 'matched', 'completed', 'cancelled'], [30, 20, 45, 5])[0]
+                professional_id = self.rng.choice(professional_ids) if status != 'pending' and professional_ids else None
+                rating = self.rng.randint(3, 5) if status == 'completed' else None
+                yield (self.rng.choice(user_ids), professional_id, status, 'medium', {},
+                       self.rng.choice(industries), self.rng.choice(preferred_times), rating, self.activity_timestamp())
+
+        with explicit_timestamps(ReviewRequest, 'submission_date'):
+            self._write(ReviewRequest, ['student_id', 'professional_id', 'status', 'priority', 'form_data',
+                                        'target_industry', 'preferred_times', 'rating', 'submission_date'], rows())
+
+    def create_availability(self, professional_ids, count):
+        if not count or not professional_ids:
+            return
+        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+        token = self.rng.getrandbits(32)
+
+        def rows():
+            for i in range(count):
+                start = (self.now - timedelta(days=self.rng.randint(0, 60))).date()
+                slot_days = self.rng.sample(days, 2)
+                slots = [f"{day} {self.rng.choice(['9am-12pm', '1pm-5pm', '6pm-8pm'])}" for day in slot_days]
+                yield (self.rng.choice(professional_ids), f"{self.prefix}{token:08x}_{i}", {}, slots, slot_days,
+                       'UTC', week_bitmap(parse_availability(slots)), start, start + timedelta(days=60), True, '',
+                       self.activity_timestamp())
+
+        with explicit_timestamps(ProfessionalAvailability, 'submission_date'):
+            self._write(ProfessionalAvailability, ['professional_id', 'form_response_id', 'form_data',
+                                                   'availability_slots', 'preferred_days', 'time_zone', 'week_bitmap',
+                                                   'start_date', 'end_date', 'is_active', 'notes', 'submission_date'],
+                        rows())
+
+    def create_availability_slots(self):
+        """Parse slots for review requests and availability written without them (bulk writes skip the views)."""
+        sources = [
+            ('availability_id', ProfessionalAvailability.objects.filter(slots__isnull=True)
+             .values_list('id', 'availability_slots')),
+            ('review_request_id', ReviewRequest.objects.filter(slots__isnull=True).values_list('id', 'preferred_times')),
+        ]
+
+        def rows():
+            for owner_field, owners in sources:
+                for owner_id, texts in owners.iterator(chunk_size=self.chunk_size):
+                    for slot in parse_availability(texts):
+                        yield (owner_id if owner_field == 'availability_id' else None,
+                               owner_id if owner_field == 'review_request_id' else None,
+                               slot.weekday, slot.start_minute, slot.end_minute, slot.confidence)
+
+        # Materialised first so the reads are not interleaved with COPY on the same connection
+        self._write(AvailabilitySlot, ['availability_id', 'review_request_id', 'weekday', 'start_minute',
+                                       'end_minute', 'confidence'], list(rows()))
+
+    # Discord traffic
+
+    def create_discord_events(self, user_count, count):
+        if not count or not user_count:
+            return
+        event_types = list(DISCORD_EVENT_WEIGHTS)
+        weights = list(DISCORD_EVENT_WEIGHTS.values())
+        channels = [str(DISCORD_ID_BASE - 1000 + i) for i in range(20)]
+
+        def rows():
+            for i in range(count):
+                event_type = self.rng.choices(event_types, weights)[0]
+                # Pareto-ish author choice: a small core of users sends most messages
+                author = min(int(self.rng.paretovariate(1.2)) - 1, user_count - 1)
+                yield (event_type, str(DISCORD_ID_BASE + author), self.rng.choice(channels),
+                       str(DISCORD_ID_BASE * 2 + i), '👍' if event_type == 'reaction_add' else None,
+                       self.activity_timestamp())
+
+        with explicit_timestamps(DiscordEventLog, 'timestamp'):
+            self._write(DiscordEventLog, ['event_type', 'user_id', 'channel_id', 'message_id', 'emoji', 'timestamp'],
+                        rows())
+
+    # Writers
+
+    def _write(self, model, fields, rows):
+        """Write an iterable of row tuples in chunks via COPY (PostgreSQL) or bulk_create."""
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                self._write_chunk(model, fields, chunk)
+                chunk = []
+        if chunk:
+            self._write_chunk(model, fields, chunk)
+
+    def _write_chunk(self, model, fields, chunk):
+        objs = [model(**dict(zip(fields, row))) for row in chunk]
+        if self.use_copy:
+            # Every concrete column is written so model-level defaults apply, as with bulk_create
+            concrete = [field for field in model._meta.concrete_fields if not field.primary_key]
+            columns = ', '.join(connection.ops.quote_name(field.column) for field in concrete)
+            buffer = io.StringIO()
+            buffer.writelines(
+                '\t'.join(_copy_value(field.pre_save(obj, True)) for field in concrete) + '\n' for obj in objs
+            )
+            buffer.seek(0)
+            with connection.cursor() as cursor:
+                cursor.copy_expert(f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN",
+                                   buffer)
+        else:
+            model.objects.bulk_create(objs, batch_size=self.chunk_size)
+        self._progress(model._meta.db_table, len(chunk))
+
+    def _progress(self, table, rows):
+        total = self.counts[table] = self.counts.get(table, 0) + rows
+        if self.stdout is not None:
+            self.stdout.write(f"  {table}: {total:,} rows", ending='\r')
+            self.stdout.flush()
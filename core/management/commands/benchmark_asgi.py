@@ -0,0 +1,151 @@
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from asgiref.sync import ThreadSensitiveContext
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+
+from core.benchmarking import simulated_discord_latency, summarize_latencies, throwaway_database
+from core.load_data import LoadDataGenerator
+from core.models import User
+
+BOT_SECRET = 'benchmark-secret'
+
+# Bot payload per scenario; validate-discord-user misses the (empty) member
+# directory and waits on the simulated Discord search
+SCENARIOS = {
+    'validate-discord-user': lambda user, rng: {'action': 'validate-discord-user', 'discord_username': user.username},
+    'summary': lambda user, rng: {'action': 'summary', 'discord_id': user.discord_id},
+    'leaderboard': lambda user, rng: {'action': 'leaderboard', 'page': rng.randint(1, 5), 'page_size': 10},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares /api/bot/ under sync (WSGI) and async (ASGI) request handling at the same worker count. '
+        'Sync workers serve one request at a time, so clients queue behind slow ones; each async worker runs '
+        'an event loop that keeps serving while a request waits on Discord. Runs in-process against a '
+        'throwaway database; --upstream-ms simulates the Discord member search latency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', default='validate-discord-user', choices=sorted(SCENARIOS))
+        parser.add_argument('--workers', type=int, default=2, help='Workers (sync slots or event loops) per mode')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per mode')
+        parser.add_argument('--upstream-ms', type=float, default=200.0, help='Simulated Discord API latency (ms)')
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        if min(options['workers'], options['concurrency'], options['requests']) < 1:
+            raise CommandError('--workers, --concurrency and --requests must be positive')
+
+        test_name = None
+        if connection.vendor == 'sqlite':
+            # A file database so every worker thread gets its own real connection
+            test_name = os.path.join(tempfile.gettempdir(), f"benchmark_asgi_{os.getpid()}.sqlite3")
+
+        report = {
+            'meta': {
+                'scenario': options['scenario'],
+                'workers': options['workers'],
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+                'upstream_ms': options['upstream_ms'],
+                'vendor': connection.vendor,
+            },
+        }
+        with throwaway_database(test_name=test_name), simulated_discord_latency(options['upstream_ms']), \
+                override_settings(BOT_SHARED_SECRET=BOT_SECRET, ALLOWED_HOSTS=['*'], REQUEST_METRICS_ENABLED=False):
+            LoadDataGenerator(seed=options['seed'], prefix='bench_').generate(options['users'], 5, incentives=5)
+            users = list(User.objects.filter(username__startswith='bench_user_').order_by('id'))
+            for mode in ('wsgi', 'asgi'):
+                self.stdout.write(f"⏱️ {mode} ({options['workers']} workers, {options['concurrency']} clients)...")
+                report[mode] = self._run(mode, users, options)
+
+        wsgi, asgi = report['wsgi'], report['asgi']
+        report['throughput_ratio'] = round(asgi['throughput_rps'] / wsgi['throughput_rps'], 2) if wsgi['throughput_rps'] else None
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+        self.stdout.write(self.style.SUCCESS(
+            f"ASGI vs WSGI at {options['workers']} workers: {report['throughput_ratio']}x throughput, "
+            f"p95 {wsgi['latency_ms']['p95']}ms -> {asgi['latency_ms']['p95']}ms"
+        ))
+
+    def _run(self, mode, users, options):
+        scenario = SCENARIOS[options['scenario']]
+        concurrency = options['concurrency']
+        per_client = [options['requests'] // concurrency + (1 if i < options['requests'] % concurrency else 0)
+                      for i in range(concurrency)]
+        samples, status_codes = [], {}
+        lock = threading.Lock()
+
+        def record(started, code):
+            with lock:
+                samples.append((time.perf_counter() - started) * 1000)
+                status_codes[str(code)] = status_codes.get(str(code), 0) + 1
+
+        if mode == 'wsgi':
+            # A sync worker holds its slot for the whole request; latency includes the wait for a free one
+            slots = threading.Semaphore(options['workers'])
+
+            def client_thread(index):
+                rng = random.Random(options['seed'] * 1000 + index)
+                client = Client()
+                try:
+                    for _ in range(per_client[index]):
+                        started = time.perf_counter()
+                        with slots:
+                            response = client.post('/api/bot/', scenario(rng.choice(users), rng),
+                                                   content_type='application/json', HTTP_X_BOT_SECRET=BOT_SECRET)
+                        record(started, response.status_code)
+                finally:
+                    connection.close()
+
+            threads = [threading.Thread(target=client_thread, args=(i,)) for i in range(concurrency)]
+        else:
+            # One event loop per worker, each serving its share of the clients concurrently
+            async def client_task(index):
+                rng = random.Random(options['seed'] * 1000 + index)
+                client = AsyncClient()
+                for _ in range(per_client[index]):
+                    started = time.perf_counter()
+                    # Like Django's ASGIHandler: the request's sync work gets its own thread
+                    async with ThreadSensitiveContext():
+                        response = await client.post('/api/bot/', scenario(rng.choice(users), rng),
+                                                     content_type='application/json', headers={'X-Bot-Secret': BOT_SECRET})
+                    record(started, response.status_code)
+
+            async def worker_loop(worker):
+                await asyncio.gather(*(client_task(i) for i in range(worker, concurrency, options['workers'])))
+
+            threads = [threading.Thread(target=asyncio.run, args=(worker_loop(w),)) for w in range(options['workers'])]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_seconds = time.perf_counter() - started
+
+        latency = summarize_latencies(samples)
+        return {
+            'requests': len(samples),
+            'status_codes': status_codes,
+            'throughput_rps': round(len(samples) / wall_seconds, 2) if wall_seconds else 0.0,
+            'latency_ms': {key[:-3]: value for key, value in latency.items() if key.endswith('_ms')},
+        }
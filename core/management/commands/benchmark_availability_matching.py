@@ -0,0 +1,85 @@
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.availability import (
+    CELL_MINUTES, AvailabilityIndex, ParsedSlot, overlapping_windows, week_bitmap,
+)
+from core.benchmarking import summarize_latencies
+
+
+def random_week(rng, max_slots=4):
+    """Random windows on 15-minute boundaries, at most one per weekday."""
+    slots = []
+    for weekday in rng.sample(range(7), rng.randint(1, max_slots)):
+        start = rng.randrange(6 * 60, 20 * 60, CELL_MINUTES)
+        end = min(start + rng.choice([60, 120, 180, 240]), 24 * 60)
+        slots.append(ParsedSlot(weekday, start, end, 1.0))
+    return slots
+
+
+def pairwise_rank(student_slots, professionals, min_minutes=30):
+    """Reference path: interval intersection against every professional in a Python loop."""
+    ranked = []
+    for key, slots in professionals:
+        minutes = sum(end - start for _, start, end in overlapping_windows(student_slots, slots, CELL_MINUTES))
+        if minutes >= min_minutes:
+            ranked.append((key, minutes))
+    ranked.sort(key=lambda item: -item[1])
+    return ranked
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks ranking one student against N professionals: pairwise intervals vs. the bitmap index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--professionals', type=int, default=10000)
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        professionals = [(i, random_week(rng)) for i in range(options['professionals'])]
+        students = [random_week(rng) for _ in range(options['iterations'])]
+
+        started = time.perf_counter()
+        index = AvailabilityIndex([key for key, _ in professionals], [week_bitmap(slots) for _, slots in professionals])
+        build_ms = (time.perf_counter() - started) * 1000
+
+        results = {
+            'professionals': options['professionals'],
+            'iterations': options['iterations'],
+            'index_build_ms': round(build_ms, 3),
+            'pairwise': self._measure(lambda slots: pairwise_rank(slots, professionals), students),
+            'bitmap': self._measure(lambda slots: index.rank(week_bitmap(slots)), students),
+        }
+
+        # Both paths count the same 15-minute-aligned minutes, so rankings must agree
+        for slots in students[:5]:
+            if sorted(pairwise_rank(slots, professionals)) != sorted(index.rank(week_bitmap(slots))):
+                self.stderr.write(self.style.ERROR('Bitmap ranking disagrees with the pairwise reference'))
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name in ('pairwise', 'bitmap'):
+            stats = results[name]
+            self.stdout.write(f"{name:>8}: mean {stats['mean_ms']}ms, p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms")
+        self.stdout.write(self.style.SUCCESS(
+            f"Speedup at {options['professionals']:,} professionals: "
+            f"{results['pairwise']['mean_ms'] / max(results['bitmap']['mean_ms'], 0.001):.1f}x "
+            f"(index built once in {results['index_build_ms']}ms)"
+        ))
+
+    def _measure(self, run, students):
+        run(students[0])  # Warm-up
+        samples = []
+        for slots in students:
+            started = time.perf_counter()
+            run(slots)
+            samples.append((time.perf_counter() - started) * 1000)
+        return summarize_latencies(samples)
@@ -0,0 +1,100 @@
+import json
+import random
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count, Sum
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.benchmarking import simulated_network_latency, summarize_latencies, throwaway_database
+from core.dashboard import build_dashboard_stats, stats_period_bounds
+from core.models import Activity, Incentive, PointsLog, User
+
+
+def legacy_dashboard_stats_queries(user, period):
+    """The pre-optimisation cache-miss path: two period aggregates plus an affordable-reward COUNT."""
+    now = timezone.now()
+    current_start, previous_start, previous_end = stats_period_bounds(period, now)
+    PointsLog.objects.filter(user=user, timestamp__gte=current_start).aggregate(
+        points_earned=Sum('points_earned'), activity_count=Count('id')
+    )
+    PointsLog.objects.filter(user=user, timestamp__gte=previous_start, timestamp__lt=previous_end).aggregate(
+        points_earned=Sum('points_earned'), activity_count=Count('id')
+    )
+    Incentive.objects.filter(is_active=True, points_required__lte=user.total_points).count()
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the dashboard stats cache-miss path (legacy vs. current) with simulated database RTT.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rtt-ms', type=float, default=20.0, help='Simulated round trip per query (ms)')
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--logs', type=int, default=2000, help='Points logs seeded for the benchmark user')
+        parser.add_argument('--incentives', type=int, default=50)
+        parser.add_argument('--period', default='30days', choices=['7days', '30days', '90days'])
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            user = self._seed(options)
+            results = {
+                'rtt_ms': options['rtt_ms'],
+                'iterations': options['iterations'],
+                'period': options['period'],
+                'legacy': self._measure(lambda: legacy_dashboard_stats_queries(user, options['period']), options),
+                'current': self._measure(lambda: build_dashboard_stats(user, options['period']), options),
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name in ('legacy', 'current'):
+            stats = results[name]
+            self.stdout.write(
+                f"{name:>8}: {stats['queries']} queries/miss, mean {stats['mean_ms']}ms, "
+                f"p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Cache-miss speedup at {options['rtt_ms']}ms RTT: "
+            f"{results['legacy']['mean_ms'] / max(results['current']['mean_ms'], 0.001):.2f}x"
+        ))
+
+    def _seed(self, options):
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+        activity = Activity.objects.create(name='Benchmark Activity', activity_type='benchmark', points_value=10)
+        user = User.objects.create(username='benchmark_user', total_points=options['logs'] * 5)
+        PointsLog.objects.bulk_create([
+            PointsLog(user=user, activity=activity, points_earned=rng.randint(1, 20),
+                      timestamp=now - timedelta(minutes=rng.randint(0, 180 * 24 * 60)))
+            for _ in range(options['logs'])
+        ], batch_size=1000)
+        Incentive.objects.bulk_create([
+            Incentive(name=f'Benchmark Reward {i}', description='', points_required=rng.randint(10, 20000),
+                      is_active=rng.random() > 0.2)
+            for i in range(options['incentives'])
+        ])
+        return user
+
+    def _measure(self, run, options):
+        cache.clear()
+        run()  # Warm-up: connection setup and the in-process reward thresholds
+
+        samples = []
+        with CaptureQueriesContext(connection) as queries:
+            with simulated_network_latency(options['rtt_ms']):
+                for _ in range(options['iterations']):
+                    started = time.perf_counter()
+                    run()
+                    samples.append((time.perf_counter() - started) * 1000)
+
+        result = summarize_latencies(samples)
+        result['queries'] = len(queries) // options['iterations']
+        return result
@@ -0,0 +1,110 @@
+import copy
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.utils import load_backend
+
+from core.benchmarking import summarize_latencies
+
+BENCHMARK_ALIAS = 'connection_benchmark'
+
+# Connection settings per mode, applied on top of the configured database
+MODES = {
+    'fresh': {'CONN_MAX_AGE': 0},
+    'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+    'pooled': {'CONN_MAX_AGE': 0, 'ENGINE': 'core.db_backends'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures the per-request database overhead of fresh, persistent and pooled connections against the '
+        'configured database (read-only: SELECT 1). The sync lifecycle reuses one connection object like a '
+        'gunicorn sync worker; the asgi lifecycle starts each request with a new one, like the per-request '
+        'threads of an ASGI server. Pooling needs PostgreSQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default=','.join(MODES), help='Comma-separated modes')
+        parser.add_argument('--lifecycles', default='sync,asgi', help='Comma-separated: sync, asgi')
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--queries', type=int, default=3, help='Queries per request')
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        modes = [name.strip() for name in options['modes'].split(',') if name.strip()]
+        lifecycles = [name.strip() for name in options['lifecycles'].split(',') if name.strip()]
+        unknown = [name for name in modes if name not in MODES] + [name for name in lifecycles if name not in ('sync', 'asgi')]
+        if unknown:
+            raise CommandError(f"Unknown modes or lifecycles: {', '.join(unknown)}")
+        base_settings = connections.settings[options['database']]
+        if 'pooled' in modes and not base_settings['ENGINE'].endswith(('postgresql', 'db_backends')):
+            self.stderr.write("⚠️ Skipping pooled mode: it needs PostgreSQL")
+            modes.remove('pooled')
+
+        results = {}
+        for mode in modes:
+            settings_dict = copy.deepcopy(base_settings)
+            settings_dict.update(MODES[mode])
+            if mode != 'pooled' and settings_dict['ENGINE'] == 'core.db_backends':
+                settings_dict['ENGINE'] = 'django.db.backends.postgresql'
+            for lifecycle in lifecycles:
+                results[f"{mode}/{lifecycle}"] = self._measure(settings_dict, lifecycle, options)
+        if 'pooled' in modes:
+            load_backend('core.db_backends').DatabaseWrapper.close_pools()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, stats in results.items():
+            self.stdout.write(
+                f"{name:>18}: {stats['connects_per_request']} connects/request, mean {stats['mean_ms']}ms, "
+                f"p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms"
+            )
+
+    def _measure(self, settings_dict, lifecycle, options):
+        backend = load_backend(settings_dict['ENGINE'])
+        pooled = settings_dict['ENGINE'] == 'core.db_backends'
+        connects = []
+
+        def count_connect(sender, connection, **kwargs):
+            if connection.alias == BENCHMARK_ALIAS:
+                connects.append(1)
+
+        def connects_so_far():
+            # connection_created also fires for every pool checkout; only the pool knows real connects
+            return wrapper.pool.connects if pooled else len(connects)
+
+        connection_created.connect(count_connect)
+        wrapper = None
+        samples = []
+        warm_connects = 0
+        try:
+            for _ in range(options['requests'] + 1):  # The first request warms up
+                if wrapper is None or lifecycle == 'asgi':
+                    if wrapper is not None:
+                        wrapper.close()
+                    wrapper = backend.DatabaseWrapper(settings_dict, alias=BENCHMARK_ALIAS)
+                started = time.perf_counter()
+                # What close_old_connections does on request_started / request_finished
+                wrapper.close_if_unusable_or_obsolete()
+                for _ in range(options['queries']):
+                    with wrapper.cursor() as cursor:
+                        cursor.execute('SELECT 1')
+                wrapper.close_if_unusable_or_obsolete()
+                samples.append((time.perf_counter() - started) * 1000)
+                if len(samples) == 1:
+                    warm_connects = connects_so_far()
+            total_connects = connects_so_far()
+        finally:
+            if wrapper is not None:
+                wrapper.close()
+            connection_created.disconnect(count_connect)
+
+        stats = summarize_latencies(samples[1:])
+        stats['connects_per_request'] = round((total_connects - warm_connects) / options['requests'], 2)
+        return stats
@@ -0,0 +1,98 @@
+import time
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.load_data import LoadDataGenerator
+from core.models import DiscordEventLog, Incentive, Professional, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates a deterministic synthetic dataset (users, points logs, redemptions, submissions, reviews, '
+        'availability, Discord events) for load testing. Writes to the configured database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--logs-per-user', type=int, default=20, help='Mean points logs per user (heavy-tailed)')
+        parser.add_argument('--redemptions', type=int, default=None, help='Default: 10%% of users')
+        parser.add_argument('--submissions', type=int, default=None, help='Per submission type. Default: 5%% of users')
+        parser.add_argument('--review-requests', type=int, default=None, help='Default: 5%% of users')
+        parser.add_argument('--professionals', type=int, default=None, help='Default: 1 per 200 users (min 5)')
+        parser.add_argument('--availability', type=int, default=None, help='Default: 2 per professional')
+        parser.add_argument('--discord-events', type=int, default=None, help='Default: 2x the points logs mean')
+        parser.add_argument('--incentives', type=int, default=20, help='Top the active catalog up to this many')
+        parser.add_argument('--history-days', type=int, default=365)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='load_', help='Prefix for generated usernames/emails')
+        parser.add_argument('--chunk-size', type=int, default=10000, help='Rows per bulk_create/COPY chunk')
+        parser.add_argument('--no-copy', action='store_true', help='Use bulk_create even on PostgreSQL')
+        parser.add_argument('--clear', action='store_true', help='Delete data from a previous run with this prefix')
+        parser.add_argument('--streaks', action='store_true', help='Run recompute_streaks afterwards')
+
+    def handle(self, *args, **options):
+        users = options['users']
+        if users < 1 or options['logs_per_user'] < 0:
+            raise CommandError('--users must be positive and --logs-per-user non-negative')
+
+        prefix = options['prefix']
+        if options['clear']:
+            self._clear(prefix)
+        elif User.objects.filter(username__startswith=f"{prefix}user_").exists():
+            raise CommandError(f"Users with prefix '{prefix}' already exist; use --clear or another --prefix")
+
+        professionals = options['professionals']
+        if professionals is None:
+            professionals = max(5, users // 200)
+        counts = {
+            'redemptions': options['redemptions'] if options['redemptions'] is not None else users // 10,
+            'submissions': options['submissions'] if options['submissions'] is not None else users // 20,
+            'review_requests': options['review_requests'] if options['review_requests'] is not None else users // 20,
+            'professionals': professionals,
+            'availability': options['availability'] if options['availability'] is not None else professionals * 2,
+            'discord_events': (options['discord_events'] if options['discord_events'] is not None
+                               else users * options['logs_per_user'] * 2),
+        }
+
+        generator = LoadDataGenerator(
+            seed=options['seed'],
+            prefix=prefix,
+            chunk_size=options['chunk_size'],
+            use_copy=False if options['no_copy'] else None,
+            history_days=options['history_days'],
+            stdout=self.stdout,
+        )
+        self.stdout.write(
+            f"🏗️ Generating {users:,} users on {connection.vendor} "
+            f"({'COPY' if generator.use_copy else 'bulk_create'}, seed {options['seed']})"
+        )
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            written = generator.generate(users, options['logs_per_user'], incentives=options['incentives'], **counts)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write('')
+        for table, rows in written.items():
+            self.stdout.write(f"  {table}: {rows:,}")
+        total = sum(written.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Wrote {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 0.001):,.0f} rows/s)"
+        ))
+
+        if options['streaks']:
+            call_command('recompute_streaks', stdout=self.stdout)
+        # Cached dashboards/leaderboards predate the new rows (bulk writes skip the invalidation signals)
+        cache.clear()
+
+    def _clear(self, prefix):
+        users = User.objects.filter(username__startswith=f"{prefix}user_")
+        discord_ids = users.values_list('discord_id', flat=True)
+        DiscordEventLog.objects.filter(user_id__in=discord_ids).delete()
+        deleted, _ = users.delete()
+        Professional.objects.filter(name__startswith=f"{prefix}pro_").delete()
+        Incentive.objects.filter(name__startswith=f"{prefix}reward_").delete()
+        self.stdout.write(f"🧹 Removed {deleted:,} rows from a previous '{prefix}' run")
@@ -0,0 +1,36 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.review_matching import DEFAULT_CAPACITY, apply_assignments, propose_assignments
+
+
+class Command(BaseCommand):
+    help = 'Proposes professionals and session times for every pending review request in one assignment pass.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY,
+                            help='Open (matched or scheduled) requests allowed per professional')
+        parser.add_argument('--apply', action='store_true', help='Book the proposed sessions')
+        parser.add_argument('--json', action='store_true', help='Print proposals as JSON')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        proposals = propose_assignments(capacity=options['capacity'])
+        elapsed = time.perf_counter() - started
+
+        if options['json']:
+            self.stdout.write(json.dumps([proposal.as_dict() for proposal in proposals], indent=2))
+        else:
+            for proposal in proposals:
+                self.stdout.write(
+                    f"{proposal.student} -> {proposal.professional_name} at "
+                    f"{proposal.proposed_time:%a %Y-%m-%d %H:%M} UTC "
+                    f"(overlap {proposal.overlap_minutes}min, score {proposal.score})"
+                )
+            self.stdout.write(f"{len(proposals)} proposals in {elapsed:.2f}s")
+
+        if options['apply']:
+            booked = apply_assignments(proposals)
+            self.stdout.write(self.style.SUCCESS(f"Booked {booked} sessions"))
@@ -0,0 +1,57 @@
+from itertools import groupby
+
+from django.core.management.base import BaseCommand
+from django.db.models.functions import TruncDate
+
+from core.models import PointsLog, UserStatus
+from core.streaks import advance_streak
+
+STREAK_FIELDS = ['current_streak', 'longest_streak', 'last_active_date']
+
+
+class Command(BaseCommand):
+    help = 'Recomputes stored streak state on UserStatus from the full points log (backfill/repair).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk update/create')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # One pass over distinct (user, day) pairs, streamed in user/date order
+        active_days = (
+            PointsLog.objects.annotate(day=TruncDate('timestamp'))
+            .values_list('user_id', 'day')
+            .distinct()
+            .order_by('user_id', 'day')
+            .iterator(chunk_size=5000)
+        )
+
+        streaks = {}
+        for user_id, rows in groupby(active_days, key=lambda row: row[0]):
+            state = (0, 0, None)
+            for _, day in rows:
+                state = advance_streak(*state, day)
+            streaks[user_id] = state
+
+        statuses = UserStatus.objects.in_bulk(field_name='user_id')
+
+        to_update = []
+        for user_id, status_row in statuses.items():
+            state = streaks.pop(user_id, (0, 0, None))
+            if state != (status_row.current_streak, status_row.longest_streak, status_row.last_active_date):
+                status_row.current_streak, status_row.longest_streak, status_row.last_active_date = state
+                to_update.append(status_row)
+
+        # Users with activity but no status row yet
+        to_create = [
+            UserStatus(user_id=user_id, current_streak=current, longest_streak=longest, last_active_date=last)
+            for user_id, (current, longest, last) in streaks.items()
+        ]
+
+        UserStatus.objects.bulk_update(to_update, STREAK_FIELDS, batch_size=batch_size)
+        UserStatus.objects.bulk_create(to_create, batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Recomputed streaks: {len(to_update)} statuses updated, {len(to_create)} created."
+        ))
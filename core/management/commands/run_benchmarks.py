@@ -0,0 +1,273 @@
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import F
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.benchmarking import simulated_network_latency, summarize_latencies, throwaway_database
+from core.load_data import LoadDataGenerator
+from core.metrics import QueryCounter
+from core.models import Incentive, User
+
+# Dataset sizes per tier (users, mean points logs per user); other tables scale with users
+TIERS = {
+    'small': {'users': 500, 'logs_per_user': 20},
+    'medium': {'users': 5000, 'logs_per_user': 50},
+    'large': {'users': 50000, 'logs_per_user': 100},
+}
+
+BOT_SECRET = 'benchmark-secret'
+
+# Cheapest in-stock rewards the redeem-reward scenario picks from
+REDEEMABLE_INCENTIVES = 5
+
+# A scenario whose responses are mostly non-2xx is measuring the error path, not the endpoint
+NON_2XX_FLAG_RATIO = 0.5
+
+
+def _bot(client, payload):
+    return client.post('/api/bot/', payload, format='json', HTTP_X_BOT_SECRET=BOT_SECRET)
+
+
+# Each scenario issues one request as ``user`` through the full middleware/DRF stack
+SCENARIOS = {
+    'add-activity': lambda client, user, ctx: _bot(
+        client, {'action': 'add-activity', 'discord_id': user.discord_id, 'activity_type': 'discord_activity'}
+    ),
+    'summary': lambda client, user, ctx: _bot(client, {'action': 'summary', 'discord_id': user.discord_id}),
+    'leaderboard': lambda client, user, ctx: _bot(
+        client, {'action': 'leaderboard', 'page': ctx['rng'].randint(1, 5), 'page_size': 10}
+    ),
+    'points-timeline': lambda client, user, ctx: client.get('/api/points/timeline/', {'days': 30}),
+    'dashboard-stats': lambda client, user, ctx: client.get('/api/dashboard/stats/', {'period': '30days'}),
+    'activity-feed': lambda client, user, ctx: client.get('/api/activity/feed/', {'limit': 20}),
+    'redeem-reward': lambda client, user, ctx: client.post(
+        '/api/rewards/redeem/', {'reward_id': ctx['rng'].choice(ctx['incentive_ids'])}, format='json'
+    ),
+}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              timeout=5, check=True).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a throwaway database at a data tier and benchmarks the key bot/API paths with concurrent clients, '
+        'reporting p50/p95/p99 latency, throughput and queries per request as JSON. On SQLite, concurrent '
+        'write scenarios (add-activity, redeem-reward) report "database is locked" errors; use PostgreSQL or '
+        '--concurrency 1 for those. Scenarios whose responses are mostly non-2xx are flagged in the report and '
+        'left out of --compare.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tier', default='small', choices=sorted(TIERS))
+        parser.add_argument('--users', type=int, help='Override the tier user count')
+        parser.add_argument('--logs-per-user', type=int, help='Override the tier mean logs per user')
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenario names')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=4, help='Concurrent client threads')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per scenario')
+        parser.add_argument('--active-users', type=int, default=200, help='Users the clients act as')
+        parser.add_argument('--rtt-ms', type=float, default=0.0, help='Simulated round trip per query (ms)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--compare', help='Previous JSON report to diff against')
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = [name for name in scenarios if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(unknown)}. Available: {', '.join(SCENARIOS)}")
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency and --requests must be positive')
+
+        tier = dict(TIERS[options['tier']])
+        tier['users'] = options['users'] or tier['users']
+        tier['logs_per_user'] = options['logs_per_user'] if options['logs_per_user'] is not None else tier['logs_per_user']
+
+        test_name = None
+        if connection.vendor == 'sqlite':
+            # A file database so concurrent clients get real connections (and real locking)
+            test_name = os.path.join(tempfile.gettempdir(), f"benchmark_{os.getpid()}.sqlite3")
+
+        report = {
+            'meta': {
+                'commit': _git_commit(),
+                'timestamp': timezone.now().isoformat(),
+                'vendor': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'tier': options['tier'],
+                'dataset': tier,
+                'concurrency': options['concurrency'],
+                'requests_per_scenario': options['requests'],
+                'rtt_ms': options['rtt_ms'],
+                'seed': options['seed'],
+            },
+            'scenarios': {},
+        }
+
+        with throwaway_database(test_name=test_name), \
+                override_settings(BOT_SHARED_SECRET=BOT_SECRET, ALLOWED_HOSTS=['*'], REQUEST_METRICS_ENABLED=False):
+            self.stdout.write(f"🏗️ Seeding {options['tier']} tier: {tier['users']:,} users, "
+                              f"~{tier['logs_per_user']} logs/user ({connection.vendor})")
+            seed_started = time.perf_counter()
+            LoadDataGenerator(seed=options['seed'], prefix='bench_').generate(
+                tier['users'], tier['logs_per_user'], redemptions=tier['users'] // 10, incentives=20,
+            )
+            report['meta']['seed_seconds'] = round(time.perf_counter() - seed_started, 2)
+
+            users = list(User.objects.filter(username__startswith='bench_user_').order_by('id')[:options['active_users']])
+            incentive_ids = list(Incentive.objects.filter(is_active=True).values_list('id', flat=True))
+            for name in scenarios:
+                if name == 'redeem-reward':
+                    users, incentive_ids = self._fund_redemptions(users, options)
+                self.stdout.write(f"⏱️ {name}...")
+                result = report['scenarios'][name] = self._run_scenario(name, users, incentive_ids, options)
+                if result['flagged']:
+                    self.stderr.write(self.style.WARNING(
+                        f"⚠️ {name}: {result['non_2xx']}/{result['requests']} responses were not 2xx "
+                        f"({result['status_codes']}); its latencies describe the error path"
+                    ))
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"✅ Report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            self._compare(options['compare'], report)
+
+    def _fund_redemptions(self, users, options):
+        """
+        Make every redeem-reward request succeed: restrict it to the cheapest
+        in-stock rewards, stock them for every request, and credit each active
+        user enough points to win every draw. Returns the reloaded users and
+        the reward ids to pick from.
+        """
+        incentives = list(Incentive.objects.filter(is_active=True, stock_available__gt=0)
+                          .order_by('points_required', 'id')[:REDEEMABLE_INCENTIVES])
+        if not incentives:
+            raise CommandError('redeem-reward needs at least one active, in-stock incentive')
+        budget = options['requests'] + options['warmup']
+        Incentive.objects.filter(id__in=[i.id for i in incentives]).update(
+            stock_available=F('stock_available') + budget
+        )
+        # Worst case one user is drawn for every request, at the dearest of the picked rewards
+        User.objects.filter(id__in=[u.id for u in users]).update(
+            total_points=F('total_points') + incentives[-1].points_required * budget
+        )
+        users = list(User.objects.filter(id__in=[u.id for u in users]).order_by('id'))
+        return users, [i.id for i in incentives]
+
+    def _run_scenario(self, name, users, incentive_ids, options):
+        scenario = SCENARIOS[name]
+        cache.clear()
+
+        warmup_client = APIClient()
+        warmup_rng = random.Random(options['seed'])
+        for _ in range(options['warmup']):
+            user = warmup_rng.choice(users)
+            warmup_client.force_authenticate(user=user)
+            scenario(warmup_client, user, {'rng': warmup_rng, 'incentive_ids': incentive_ids})
+
+        concurrency = options['concurrency']
+        per_worker = [options['requests'] // concurrency + (1 if i < options['requests'] % concurrency else 0)
+                      for i in range(concurrency)]
+        samples, queries, status_codes = [], [], {}
+        failures = []
+        lock = threading.Lock()
+
+        def worker(index):
+            rng = random.Random(options['seed'] * 1000 + index)
+            ctx = {'rng': rng, 'incentive_ids': incentive_ids}
+            client = APIClient()
+            try:
+                with simulated_network_latency(options['rtt_ms']):
+                    for _ in range(per_worker[index]):
+                        user = rng.choice(users)
+                        client.force_authenticate(user=user)
+                        started = time.perf_counter()
+                        try:
+                            with QueryCounter() as counter:
+                                response = scenario(client, user, ctx)
+                            code = response.status_code
+                        except Exception as e:
+                            code = 'exception'
+                            with lock:
+                                failures.append(repr(e))
+                        elapsed_ms = (time.perf_counter() - started) * 1000
+                        with lock:
+                            samples.append(elapsed_ms)
+                            queries.append(counter.queries)
+                            status_codes[str(code)] = status_codes.get(str(code), 0) + 1
+            finally:
+                connection.close()  # Each thread opened its own connection
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(worker, range(concurrency)))
+        wall_seconds = time.perf_counter() - started
+
+        latency = summarize_latencies(samples)
+        errors = sum(count for code, count in status_codes.items() if code == 'exception' or int(code) >= 500)
+        non_2xx = sum(count for code, count in status_codes.items() if code == 'exception' or not 200 <= int(code) < 300)
+        return {
+            'requests': len(samples),
+            'errors': errors,
+            'non_2xx': non_2xx,
+            'flagged': bool(samples) and non_2xx / len(samples) > NON_2XX_FLAG_RATIO,
+            'status_codes': status_codes,
+            'throughput_rps': round(len(samples) / wall_seconds, 2) if wall_seconds else 0.0,
+            'latency_ms': {key[:-3]: value for key, value in latency.items() if key.endswith('_ms')},
+            'queries_per_request': {
+                'mean': round(sum(queries) / len(queries), 2) if queries else 0.0,
+                'max': max(queries, default=0),
+            },
+            'sample_failures': failures[:5],
+        }
+
+    def _compare(self, path, report):
+        try:
+            with open(path) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read baseline report {path}: {e}")
+
+        self.stdout.write(f"\n📊 vs {baseline.get('meta', {}).get('commit') or path}")
+        for name, current in report['scenarios'].items():
+            previous = baseline.get('scenarios', {}).get(name)
+            if not previous:
+                self.stdout.write(f"  {name}: no baseline")
+                continue
+            if current.get('flagged') or previous.get('flagged'):
+                self.stdout.write(f"  {name}: mostly non-2xx responses in one of the runs, not compared")
+                continue
+            p95_before, p95_after = previous['latency_ms']['p95'], current['latency_ms']['p95']
+            change = (p95_after - p95_before) / p95_before * 100 if p95_before else 0.0
+            self.stdout.write(
+                f"  {name:<16} p95 {p95_before:>8.2f} -> {p95_after:>8.2f}ms ({change:+.1f}%)  "
+                f"rps {previous['throughput_rps']:>8.2f} -> {current['throughput_rps']:>8.2f}  "
+                f"queries {previous['queries_per_request']['mean']} -> {current['queries_per_request']['mean']}"
+            )
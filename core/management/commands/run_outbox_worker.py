@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.calendar_sync import sync_sessions
+from core.outbox import DEFAULT_BATCH_SIZE, RETENTION_DAYS, drain, purge_delivered
+
+RETENTION_SWEEP_SECONDS = 3600
+
+
+class Command(BaseCommand):
+    help = 'Delivers outbox messages (calendar events, unlocks, Discord notifications) with retries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain what is due and exit')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to sleep when nothing is due')
+        parser.add_argument('--calendar-interval', type=float, default=300.0,
+                            help='Seconds between full calendar reconciliation passes (0 disables)')
+        parser.add_argument('--retention-days', type=float, default=RETENTION_DAYS,
+                            help='Delete delivered messages older than this, hourly (0 keeps them)')
+
+    def handle(self, *args, **options):
+        next_calendar_sync = next_retention_sweep = time.monotonic()
+        while True:
+            close_old_connections()
+            counts = drain(batch_size=options['batch_size'])
+            if any(counts.values()):
+                self.stdout.write(
+                    f"done {counts['done']}, retrying {counts['retrying']}, failed {counts['failed']}"
+                )
+            if options['calendar_interval'] and time.monotonic() >= next_calendar_sync:
+                self._sync_calendar()
+                next_calendar_sync = time.monotonic() + options['calendar_interval']
+            if options['retention_days'] and time.monotonic() >= next_retention_sweep:
+                self._sweep(options['retention_days'])
+                next_retention_sweep = time.monotonic() + RETENTION_SWEEP_SECONDS
+            if options['once']:
+                if sum(counts.values()) < options['batch_size']:
+                    return
+                continue
+            if not any(counts.values()):
+                time.sleep(options['poll_interval'])
+
+    def _sweep(self, retention_days):
+        try:
+            deleted = purge_delivered(retention_days)
+        except Exception as exc:
+            self.stderr.write(f"Outbox retention sweep failed: {exc}")
+            return
+        if deleted:
+            self.stdout.write(f"retention: deleted {deleted} delivered messages")
+
+    def _sync_calendar(self):
+        try:
+            result = sync_sessions()
+        except Exception as exc:
+            self.stderr.write(f"Calendar reconciliation failed: {exc}")
+            return
+        if result and (result.inserted or result.patched or result.deleted or result.failed):
+            self.stdout.write(
+                f"calendar: inserted {result.inserted}, patched {result.patched}, deleted {result.deleted}, "
+                f"failed {len(result.failed)}"
+            )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from core.calendar_sync import out_of_sync_sessions, sync_sessions
+
+
+class Command(BaseCommand):
+    help = 'Reconciles scheduled sessions with Google Calendar in batch requests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='List out-of-sync sessions without calling Google')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            for session_id, status, event_id in out_of_sync_sessions().order_by('id').values_list(
+                'id', 'status', 'calendar_event_id'
+            ):
+                self.stdout.write(f"session {session_id}: {status}, event {event_id or '-'}")
+            return
+
+        result = sync_sessions()
+        if result is None:
+            self.stderr.write(self.style.WARNING('Calendar integration is not configured'))
+            return
+        for session_id, error in result.failed.items():
+            self.stderr.write(f"session {session_id}: {error}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Inserted {result.inserted}, patched {result.patched}, deleted {result.deleted}, "
+            f"failed {len(result.failed)}"
+        ))
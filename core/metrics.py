@@ -0,0 +1,155 @@
+"""
+In-process request metrics.
+
+Metrics are kept per worker process (like the LocMem cache), so with several
+gunicorn workers each admin metrics call reports the worker that served it.
+"""
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+from .benchmarking import summarize_latencies
+
+# Latency percentiles are computed over this many most recent samples per name
+RECENT_SAMPLES = 1000
+
+# Cache lookups made while profiling the current request, see RequestProfilingMiddleware
+_cache_lookups = ContextVar('cache_lookups', default=None)
+
+
+class CacheLookups:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+
+def track_cache_lookups():
+    """Start counting cache hits/misses for the current request (or task)."""
+    lookups = CacheLookups()
+    return lookups, _cache_lookups.set(lookups)
+
+
+def stop_tracking_cache_lookups(token):
+    _cache_lookups.reset(token)
+
+
+def record_cache_lookup(hits, misses):
+    lookups = _cache_lookups.get()
+    if lookups is not None:
+        lookups.hits += hits
+        lookups.misses += misses
+
+
+class QueryCounter:
+    """Count queries and database time on the current thread's connection."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - started) * 1000
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+        return False
+
+    # Async ORM queries run on the request's sync thread, so the wrapper is installed there
+    async def __aenter__(self):
+        return await sync_to_async(self.__enter__)()
+
+    async def __aexit__(self, *exc_info):
+        return await sync_to_async(self.__exit__)(*exc_info)
+
+
+class MetricsRegistry:
+    """Thread-safe aggregates (count, status codes, latency, queries) keyed by name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name, duration_ms, status_code, queries=0, db_ms=0.0, **counters):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = {
+                    'count': 0,
+                    'errors': 0,
+                    'status_codes': {},
+                    'total_ms': 0.0,
+                    'queries': 0,
+                    'max_queries': 0,
+                    'db_ms': 0.0,
+                    'counters': {},
+                    'samples': deque(maxlen=RECENT_SAMPLES),
+                }
+            stats['count'] += 1
+            if status_code >= 500:
+                stats['errors'] += 1
+            stats['status_codes'][status_code] = stats['status_codes'].get(status_code, 0) + 1
+            stats['total_ms'] += duration_ms
+            stats['queries'] += queries
+            stats['max_queries'] = max(stats['max_queries'], queries)
+            stats['db_ms'] += db_ms
+            for counter, value in counters.items():
+                stats['counters'][counter] = stats['counters'].get(counter, 0) + value
+            stats['samples'].append(duration_ms)
+
+    def snapshot(self):
+        """JSON-ready copy of every aggregate, busiest first."""
+        with self._lock:
+            items = [(name, dict(stats, samples=list(stats['samples']))) for name, stats in self._stats.items()]
+
+        result = []
+        for name, stats in sorted(items, key=lambda item: item[1]['count'], reverse=True):
+            count = stats['count']
+            latency = summarize_latencies(stats['samples'])
+            entry = {
+                'name': name,
+                'count': count,
+                'errors': stats['errors'],
+                'status_codes': {str(code): n for code, n in sorted(stats['status_codes'].items())},
+                'latency_ms': {
+                    'mean': round(stats['total_ms'] / count, 3),
+                    'p50': latency['p50_ms'],
+                    'p95': latency['p95_ms'],
+                    'p99': latency['p99_ms'],
+                    'max': latency['max_ms'],
+                },
+                'queries': {
+                    'mean': round(stats['queries'] / count, 2),
+                    'max': stats['max_queries'],
+                },
+                'db_ms_mean': round(stats['db_ms'] / count, 3),
+            }
+            for counter, value in stats['counters'].items():
+                entry[counter] = {'total': value, 'mean': round(value / count, 2)}
+            result.append(entry)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+# Per bot action (see BotIntegrationView)
+bot_action_metrics = MetricsRegistry()
+
+# Per "METHOD route" (see RequestProfilingMiddleware)
+request_metrics = MetricsRegistry()
@@ -0,0 +1,141 @@
+"""
+Request profiling middleware.
+
+Every request is timed and its query count, database time, cache hits/misses and
+response size are aggregated per route into core.metrics.request_metrics
+(served by RequestMetricsView). A sample of requests under PROFILE_PATHS can
+also be run under cProfile, with the stats dumped to PROFILE_DIR for
+``python -m pstats`` / snakeviz.
+
+The middleware supports both sync and async requests, so under ASGI async
+views stay on the event loop. An async request is profiled on the event loop
+thread, so its dump also contains whatever other coroutines ran meanwhile, and
+work handed to sync_to_async threads is missing; only one async request per
+process is profiled at a time, since a thread can only run one profiler.
+"""
+import cProfile
+import logging
+import os
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+from .metrics import QueryCounter, request_metrics, stop_tracking_cache_lookups, track_cache_lookups
+
+logger = logging.getLogger(__name__)
+
+
+def route_name(request):
+    """"GET api/dashboard/stats/" style label; unresolved paths share one bucket."""
+    match = getattr(request, 'resolver_match', None)
+    route = match.route if match and match.route else 'unmatched'
+    return f"{request.method} {route}"
+
+
+def response_size(response):
+    if response.streaming:
+        return 0
+    return len(response.content)
+
+
+class RequestProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.sample_rate = getattr(settings, 'PROFILE_SAMPLE_RATE', 0.0)
+        self.profile_paths = tuple(getattr(settings, 'PROFILE_PATHS', ()))
+        self.profile_dir = getattr(settings, 'PROFILE_DIR', None)
+        self._async_profile_running = False
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        lookups, token = track_cache_lookups()
+        started = time.perf_counter()
+        try:
+            with QueryCounter() as queries:
+                if self._should_profile(request):
+                    response = self._profiled(request)
+                else:
+                    response = self.get_response(request)
+        finally:
+            stop_tracking_cache_lookups(token)
+
+        self._record(request, response, started, queries, lookups)
+        return response
+
+    async def __acall__(self, request):
+        lookups, token = track_cache_lookups()
+        started = time.perf_counter()
+        try:
+            async with QueryCounter() as queries:
+                if not self._async_profile_running and self._should_profile(request):
+                    response = await self._aprofiled(request)
+                else:
+                    response = await self.get_response(request)
+        finally:
+            stop_tracking_cache_lookups(token)
+
+        self._record(request, response, started, queries, lookups)
+        return response
+
+    def _record(self, request, response, started, queries, lookups):
+        request_metrics.record(
+            route_name(request),
+            (time.perf_counter() - started) * 1000,
+            response.status_code,
+            queries=queries.queries,
+            db_ms=queries.db_ms,
+            cache_hits=lookups.hits,
+            cache_misses=lookups.misses,
+            response_bytes=response_size(response),
+        )
+
+    def _should_profile(self, request):
+        if not self.sample_rate or not self.profile_dir:
+            return False
+        if self.profile_paths and not request.path.startswith(self.profile_paths):
+            return False
+        return random.random() < self.sample_rate
+
+    def _profiled(self, request):
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(self.get_response, request)
+        finally:
+            # Dump even when the view raised: the failing request is usually the interesting one
+            self._dump(profiler, request)
+
+    async def _aprofiled(self, request):
+        self._async_profile_running = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return await self.get_response(request)
+        finally:
+            profiler.disable()
+            self._async_profile_running = False
+            self._dump(profiler, request)
+
+    def _dump(self, profiler, request):
+        filename = "{}_{}_{}.prof".format(
+            timezone.now().strftime('%Y%m%dT%H%M%S%f'),
+            request.method,
+            request.path.strip('/').replace('/', '_') or 'root',
+        )
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.profile_dir, filename))
+            logger.info(f"📈 Profile written: {filename}")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write profile {filename}: {e}")
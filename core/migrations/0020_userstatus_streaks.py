@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_partnermetrics_remove_eventsubmission_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstatus',
+            name='current_streak',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userstatus',
+            name='longest_streak',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userstatus',
+            name='last_active_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+
+def leaderboard_display_name(user, privacy_settings):
+    """Frozen copy of core.models.leaderboard_display_name as of this migration."""
+    preference = (privacy_settings or {}).get('display_name_preference')
+    if preference == 'first_name_only':
+        return user.first_name or user.username
+    if preference == 'username':
+        return user.username
+    if user.first_name and user.last_name:
+        return f"{user.first_name} {user.last_name[0]}."
+    return user.username
+
+
+def backfill_leaderboard_fields(apps, schema_editor):
+    """Populate the denormalised leaderboard fields from existing preferences."""
+    User = apps.get_model('core', 'User')
+    UserPreferences = apps.get_model('core', 'UserPreferences')
+
+    privacy_by_user = dict(UserPreferences.objects.values_list('user_id', 'privacy_settings'))
+    batch = []
+    for user in User.objects.only('id', 'username', 'first_name', 'last_name').iterator(chunk_size=2000):
+        privacy_settings = privacy_by_user.get(user.id) or {}
+        user.leaderboard_display_name = leaderboard_display_name(user, privacy_settings)
+        user.show_in_leaderboard = privacy_settings.get('show_in_leaderboard', True) is not False
+        batch.append(user)
+        if len(batch) >= 2000:
+            User.objects.bulk_update(batch, ['leaderboard_display_name', 'show_in_leaderboard'])
+            batch = []
+    if batch:
+        User.objects.bulk_update(batch, ['leaderboard_display_name', 'show_in_leaderboard'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_userstatus_streaks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='leaderboard_display_name',
+            field=models.CharField(blank=True, help_text='Privacy-safe name shown on leaderboards', max_length=150),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='show_in_leaderboard',
+            field=models.BooleanField(default=True, help_text='Whether the user appears on leaderboards'),
+        ),
+        migrations.RunPython(backfill_leaderboard_fields, migrations.RunPython.noop),
+    ]
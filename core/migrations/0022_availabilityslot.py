@@ -0,0 +1,169 @@
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of the core.availability parser as of this migration
+MINUTES_PER_DAY = 24 * 60
+DEFAULT_SLOT_MINUTES = 60
+
+DAY_ALIASES = {
+    'monday': (0,), 'mon': (0,),
+    'tuesday': (1,), 'tue': (1,), 'tues': (1,),
+    'wednesday': (2,), 'wed': (2,),
+    'thursday': (3,), 'thu': (3,), 'thur': (3,), 'thurs': (3,),
+    'friday': (4,), 'fri': (4,),
+    'saturday': (5,), 'sat': (5,),
+    'sunday': (6,), 'sun': (6,),
+    'weekday': (0, 1, 2, 3, 4), 'weekdays': (0, 1, 2, 3, 4),
+    'weekend': (5, 6), 'weekends': (5, 6),
+}
+
+TIME_PERIODS = {
+    'morning': (6 * 60, 12 * 60),
+    'afternoon': (12 * 60, 18 * 60),
+    'evening': (18 * 60, 22 * 60),
+    'night': (22 * 60, 6 * 60),
+}
+
+SEGMENT_SPLIT_RE = re.compile(r'[,;]|\sand\s|\sor\s')
+DAY_RE = re.compile(r'\b(' + '|'.join(sorted(DAY_ALIASES, key=len, reverse=True)) + r')\b')
+PERIOD_RE = re.compile(r'\b(' + '|'.join(TIME_PERIODS) + r')s?\b')
+TIME_RES = [
+    re.compile(r'(?P<h1>\d{1,2})(?::(?P<m1>\d{2}))?\s*(?P<ap1>am|pm)?\s*(?:-|–|to)\s*'
+               r'(?P<h2>\d{1,2})(?::(?P<m2>\d{2}))?\s*(?P<ap2>am|pm)'),
+    re.compile(r'(?P<h1>\d{1,2}):(?P<m1>\d{2})\s*(?:-|–|to)\s*(?P<h2>\d{1,2}):(?P<m2>\d{2})'),
+    re.compile(r'(?P<h1>\d{1,2})(?::(?P<m1>\d{2}))?\s*(?P<ap1>am|pm)'),
+    re.compile(r'(?P<h1>\d{1,2}):(?P<m1>\d{2})'),
+]
+
+
+def parse_availability(texts):
+    """Frozen copy of core.availability.parse_availability; yields (weekday, start, end, confidence)."""
+    for text in texts or []:
+        if not isinstance(text, str):
+            continue
+        for segment in SEGMENT_SPLIT_RE.split(text.lower()):
+            segment = segment.strip()
+            if segment:
+                yield from _parse_segment(segment)
+
+
+def _parse_segment(segment):
+    weekdays = sorted({day for alias in DAY_RE.findall(segment) for day in DAY_ALIASES[alias]})
+    window = _extract_window(segment)
+    period = PERIOD_RE.search(segment)
+
+    if not weekdays and window is None and period is None:
+        return []
+
+    start, end = window or (TIME_PERIODS[period.group(1)] if period else (0, MINUTES_PER_DAY))
+    confidence = _confidence(segment, bool(weekdays), window, period is not None)
+
+    slots = []
+    for weekday in weekdays or range(7):
+        if end > start:
+            slots.append((weekday, start, end, confidence))
+        else:
+            slots.append((weekday, start, MINUTES_PER_DAY, confidence))
+            if end:
+                slots.append(((weekday + 1) % 7, 0, end, confidence))
+    return slots
+
+
+def _extract_window(segment):
+    for pattern in TIME_RES:
+        match = pattern.search(segment)
+        if not match:
+            continue
+        groups = match.groupdict()
+        end_meridiem = groups.get('ap2')
+        try:
+            start = _to_minute(groups['h1'], groups['m1'], groups.get('ap1') or end_meridiem)
+            if not groups.get('h2'):
+                return start, min(start + DEFAULT_SLOT_MINUTES, MINUTES_PER_DAY)
+            end = _to_minute(groups['h2'], groups['m2'], end_meridiem)
+        except ValueError:
+            return None
+        if not groups.get('ap1') and end_meridiem == 'pm' and start > end:
+            start = _to_minute(groups['h1'], groups['m1'], 'am')
+        return start, end
+    return None
+
+
+def _to_minute(hour, minute, meridiem):
+    hour = int(hour)
+    minute = int(minute) if minute else 0
+    if hour > 23 or minute > 59 or (meridiem and not 1 <= hour <= 12):
+        raise ValueError(f"invalid time {hour}:{minute:02d}")
+    if meridiem == 'pm' and hour != 12:
+        hour += 12
+    elif meridiem == 'am' and hour == 12:
+        hour = 0
+    return hour * 60 + minute
+
+
+def _confidence(segment, has_day, window, has_period):
+    score = 0.0
+    if has_day:
+        score += 0.3
+    if window is not None:
+        score += 0.6
+    if has_period:
+        score += 0.1
+    if len(segment) > 10:
+        score += 0.1
+    return round(min(score, 1.0), 2)
+
+
+def backfill_availability_slots(apps, schema_editor):
+    """Parse existing review requests and professional availability into slots."""
+    AvailabilitySlot = apps.get_model('core', 'AvailabilitySlot')
+    ProfessionalAvailability = apps.get_model('core', 'ProfessionalAvailability')
+    ReviewRequest = apps.get_model('core', 'ReviewRequest')
+
+    batch = []
+    sources = [
+        ('availability_id', ProfessionalAvailability.objects.values_list('id', 'availability_slots')),
+        ('review_request_id', ReviewRequest.objects.values_list('id', 'preferred_times')),
+    ]
+    for owner_field, rows in sources:
+        for owner_id, texts in rows.iterator(chunk_size=2000):
+            batch.extend(
+                AvailabilitySlot(**{owner_field: owner_id}, weekday=weekday, start_minute=start,
+                                 end_minute=end, confidence=confidence)
+                for weekday, start, end, confidence in parse_availability(texts)
+            )
+            if len(batch) >= 2000:
+                AvailabilitySlot.objects.bulk_create(batch)
+                batch = []
+    if batch:
+        AvailabilitySlot.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_user_leaderboard_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvailabilitySlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('start_minute', models.PositiveSmallIntegerField(help_text='Minutes after midnight')),
+                ('end_minute', models.PositiveSmallIntegerField(help_text='Minutes after midnight (exclusive, at most 1440)')),
+                ('confidence', models.FloatField(default=1.0, help_text='Parsing confidence (0-1)')),
+                ('availability', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='core.professionalavailability')),
+                ('review_request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='core.reviewrequest')),
+            ],
+            options={
+                'db_table': 'availability_slots',
+                'ordering': ['weekday', 'start_minute'],
+                'indexes': [models.Index(fields=['weekday', 'start_minute', 'end_minute'], name='idx_slot_week_window')],
+            },
+        ),
+        migrations.RunPython(backfill_availability_slots, migrations.RunPython.noop),
+    ]
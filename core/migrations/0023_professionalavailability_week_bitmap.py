@@ -0,0 +1,50 @@
+import numpy as np
+from django.db import migrations, models
+
+CELL_MINUTES = 15
+CELLS_PER_DAY = 24 * 60 // CELL_MINUTES
+
+
+def week_bitmap(slots):
+    """Frozen copy of core.availability.week_bitmap as of this migration."""
+    cells = np.zeros(7 * CELLS_PER_DAY, dtype=bool)
+    for slot in slots:
+        offset = slot.weekday * CELLS_PER_DAY
+        cells[offset - (-slot.start_minute // CELL_MINUTES):offset + slot.end_minute // CELL_MINUTES] = True
+    return np.packbits(cells).tobytes()
+
+
+def backfill_week_bitmaps(apps, schema_editor):
+    """Build week bitmaps from the slots parsed in 0022."""
+    AvailabilitySlot = apps.get_model('core', 'AvailabilitySlot')
+    ProfessionalAvailability = apps.get_model('core', 'ProfessionalAvailability')
+
+    slots_by_owner = {}
+    for slot in AvailabilitySlot.objects.filter(availability__isnull=False).iterator(chunk_size=2000):
+        slots_by_owner.setdefault(slot.availability_id, []).append(slot)
+
+    batch = []
+    for availability in ProfessionalAvailability.objects.only('id').iterator(chunk_size=2000):
+        availability.week_bitmap = week_bitmap(slots_by_owner.get(availability.id, []))
+        batch.append(availability)
+        if len(batch) >= 2000:
+            ProfessionalAvailability.objects.bulk_update(batch, ['week_bitmap'])
+            batch = []
+    if batch:
+        ProfessionalAvailability.objects.bulk_update(batch, ['week_bitmap'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_availabilityslot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='professionalavailability',
+            name='week_bitmap',
+            field=models.BinaryField(default=b'', help_text='Packed 15-minute week bitmap of the parsed slots'),
+        ),
+        migrations.RunPython(backfill_week_bitmaps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+def mark_existing_events_synced(apps, schema_editor):
+    """Events created before this field existed were created with the session's time."""
+    ScheduledSession = apps.get_model('core', 'ScheduledSession')
+    ScheduledSession.objects.exclude(calendar_event_id='').update(calendar_synced_time=models.F('scheduled_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledsession',
+            name='calendar_synced_time',
+            field=models.DateTimeField(blank=True, help_text='scheduled_time the calendar event was last synced with', null=True),
+        ),
+        migrations.RunPython(mark_existing_events_synced, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_scheduledsession_calendar_synced_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GuildMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('discord_id', models.CharField(max_length=50, unique=True)),
+                ('username', models.CharField(help_text='Unique Discord username', max_length=100)),
+                ('username_key', models.CharField(help_text='Lower-cased username for case-insensitive lookups', max_length=100)),
+                ('discriminator', models.CharField(default='0', help_text="Legacy #1234 tag, '0' for migrated accounts", max_length=4)),
+                ('display_name', models.CharField(blank=True, max_length=100)),
+                ('snapshot_id', models.CharField(blank=True, help_text='Bot snapshot that last confirmed this member', max_length=64)),
+                ('synced_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'guild_members',
+                'indexes': [
+                    models.Index(fields=['username_key'], name='idx_guild_member_username'),
+                    models.Index(fields=['synced_at'], name='idx_guild_member_synced'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_discord_ids(apps, schema_editor):
+    """Fail with the offending ids rather than an opaque IntegrityError from the constraint."""
+    User = apps.get_model('core', 'User')
+    duplicates = list(
+        User.objects.exclude(discord_id__isnull=True).exclude(discord_id='')
+        .values('discord_id').annotate(count=Count('id')).filter(count__gt=1)
+        .values_list('discord_id', flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Several users share a discord_id; merge or clear them before migrating: " + ", ".join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_guildmember'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_discord_ids, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(condition=models.Q(('discord_id', ''), _negated=True), fields=('discord_id',), name='uniq_user_discord_id'),
+        ),
+    ]
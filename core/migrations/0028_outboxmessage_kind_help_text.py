@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+def drop_cache_purge_messages(apps, schema_editor):
+    """Cache purges now run on commit in the writing process; the worker has no handler left for them."""
+    OutboxMessage = apps.get_model('core', 'OutboxMessage')
+    OutboxMessage.objects.filter(kind='cache.purge').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_user_uniq_user_discord_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxmessage',
+            name='kind',
+            field=models.CharField(help_text='Handler name, e.g. calendar.sync', max_length=50),
+        ),
+        migrations.RunPython(drop_cache_purge_messages, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_outboxmessage_kind_help_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReplicaPin',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Scope, or scope and user, e.g. replica_pin_user_42', max_length=100, unique=True)),
+                ('expires_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'replica_pins',
+            },
+        ),
+    ]
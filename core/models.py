@@ -97,11 +97,85 @@ class User(AbstractUser):
         help_text="Date when onboarding was completed"
     )
     
+    # Leaderboard fields denormalised from UserPreferences.privacy_settings so the
+    # leaderboard needs no join (kept in sync by save() and core.signals)
+    leaderboard_display_name = models.CharField(
+        max_length=150,
+        blank=True,
+        help_text="Privacy-safe name shown on leaderboards"
+    )
+    show_in_leaderboard = models.BooleanField(
+        default=True,
+        help_text="Whether the user appears on leaderboards"
+    )
+    
     class Meta:
         db_table = 'users'
+        constraints = [
+            # One account per Discord user; lets bulk member sync insert with ON CONFLICT DO NOTHING
+            models.UniqueConstraint(fields=['discord_id'], condition=~models.Q(discord_id=''),
+                                    name='uniq_user_discord_id'),
+        ]
     
     def __str__(self):
         return f"{self.username} ({self.role})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The names the stored leaderboard fields were computed from (unknown if any was deferred)
+        if LEADERBOARD_NAME_FIELDS.issubset(field_names):
+            instance._synced_names = instance._leaderboard_names()
+        return instance
+
+    def _leaderboard_names(self):
+        return tuple(getattr(self, field) for field in sorted(LEADERBOARD_NAME_FIELDS))
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        names = self._leaderboard_names()
+        # Only a name change needs the preferences read; privacy changes are synced by core.signals
+        if (update_fields is None or LEADERBOARD_NAME_FIELDS.intersection(update_fields)) \
+                and names != getattr(self, '_synced_names', None):
+            previous = (self.leaderboard_display_name, self.show_in_leaderboard)
+            self.sync_leaderboard_fields()
+            # Read by the post_save handler in core.signals to refresh cached leaderboards
+            self._leaderboard_changed = self.pk is not None and previous != (
+                self.leaderboard_display_name, self.show_in_leaderboard
+            )
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'leaderboard_display_name', 'show_in_leaderboard'}
+            super().save(*args, **kwargs)
+            self._synced_names = names
+            return
+        super().save(*args, **kwargs)
+    
+    def sync_leaderboard_fields(self, privacy_settings=None):
+        """Recompute the denormalised leaderboard fields (reads preferences unless given)"""
+        if privacy_settings is None:
+            privacy_settings = {}
+            if self.pk is not None:
+                privacy_settings = UserPreferences.objects.filter(user_id=self.pk).values_list(
+                    'privacy_settings', flat=True
+                ).first() or {}
+        self.leaderboard_display_name = leaderboard_display_name(self, privacy_settings)
+        self.show_in_leaderboard = privacy_settings.get('show_in_leaderboard', True) is not False
+
+
+# Changing any of these can change User.leaderboard_display_name
+LEADERBOARD_NAME_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+def leaderboard_display_name(user, privacy_settings):
+    """Privacy-safe display name according to privacy_settings['display_name_preference']"""
+    preference = (privacy_settings or {}).get('display_name_preference')
+    if preference == 'first_name_only':
+        return user.first_name or user.username
+    if preference == 'username':
+        return user.username
+    if user.first_name and user.last_name:
+        return f"{user.first_name} {user.last_name[0]}."
+    return user.username
 
 class Activity(models.Model):
     """Points-earning activities"""
@@ -224,6 +298,10 @@ class UserStatus(models.Model):
     points_suspended = models.BooleanField(default=False)
     suspension_end = models.DateTimeField(blank=True, null=True)
     last_activity = models.DateTimeField(auto_now=True)
+    # Daily streak state, maintained incrementally on PointsLog writes (see core.streaks)
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    last_active_date = models.DateField(blank=True, null=True)
     
     class Meta:
         db_table = 'user_status'
@@ -375,6 +453,8 @@ class ScheduledSession(models.Model):
     duration_minutes = models.IntegerField(default=30, help_text="Session duration in minutes")
     meeting_link = models.URLField(blank=True, help_text="Video call link (Zoom, Google Meet, etc.)")
     calendar_event_id = models.CharField(max_length=255, blank=True, help_text="Google Calendar event ID")
+    calendar_synced_time = models.DateTimeField(null=True, blank=True,
+                                                help_text="scheduled_time the calendar event was last synced with")
     
     # Status and notes
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='scheduled')
@@ -411,6 +491,7 @@ class ProfessionalAvailability(models.Model):
     availability_slots = models.JSONField(default=list, help_text="Parsed availability time slots")
     preferred_days = models.JSONField(default=list, help_text="Preferred days of week")
     time_zone = models.CharField(max_length=50, default='UTC', help_text="Professional's timezone")
+    week_bitmap = models.BinaryField(default=b'', help_text="Packed 15-minute week bitmap of the parsed slots")
     
     # Availability periods
     start_date = models.DateField(help_text="Start of availability period")
@@ -428,6 +509,36 @@ class ProfessionalAvailability(models.Model):
     def __str__(self):
         return f"{self.professional.name} - {self.start_date} to {self.end_date}"
 
+class AvailabilitySlot(models.Model):
+    """Weekly availability window parsed once from free text (see core.availability)"""
+    WEEKDAY_CHOICES = [
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday'),
+    ]
+
+    # Exactly one owner: a professional's availability response or a student's review request
+    availability = models.ForeignKey(ProfessionalAvailability, on_delete=models.CASCADE, null=True, blank=True, related_name='slots')
+    review_request = models.ForeignKey(ReviewRequest, on_delete=models.CASCADE, null=True, blank=True, related_name='slots')
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    start_minute = models.PositiveSmallIntegerField(help_text="Minutes after midnight")
+    end_minute = models.PositiveSmallIntegerField(help_text="Minutes after midnight (exclusive, at most 1440)")
+    confidence = models.FloatField(default=1.0, help_text="Parsing confidence (0-1)")
+
+    class Meta:
+        db_table = 'availability_slots'
+        ordering = ['weekday', 'start_minute']
+        indexes = [
+            models.Index(fields=['weekday', 'start_minute', 'end_minute'], name='idx_slot_week_window'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_weekday_display()} {self.start_minute // 60:02d}:{self.start_minute % 60:02d}-{self.end_minute // 60:02d}:{self.end_minute % 60:02d}"
+
 class ResourceSubmission(models.Model):
     """User-submitted resources for admin review and potential points"""
     STATUS_CHOICES = [
@@ -590,3 +701,68 @@ class PartnerMetrics(models.Model):
 
     def __str__(self):
         return f"Metrics for {self.date}"
+
+
+class OutboxMessage(models.Model):
+    """Side effect recorded in the writing transaction and carried out later by the outbox worker (see core.outbox)"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50, help_text="Handler name, e.g. calendar.sync")
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now, help_text="Not picked up before this time (backoff/lease)")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'outbox_messages'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='idx_outbox_due'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
+
+
+class GuildMember(models.Model):
+    """Local copy of the Discord server's member list, pushed by the bot (see core.guild_directory)"""
+    discord_id = models.CharField(max_length=50, unique=True)
+    username = models.CharField(max_length=100, help_text="Unique Discord username")
+    username_key = models.CharField(max_length=100, help_text="Lower-cased username for case-insensitive lookups")
+    discriminator = models.CharField(max_length=4, default='0', help_text="Legacy #1234 tag, '0' for migrated accounts")
+    display_name = models.CharField(max_length=100, blank=True)
+    snapshot_id = models.CharField(max_length=64, blank=True, help_text="Bot snapshot that last confirmed this member")
+    synced_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'guild_members'
+        indexes = [
+            models.Index(fields=['username_key'], name='idx_guild_member_username'),
+            models.Index(fields=['synced_at'], name='idx_guild_member_synced'),
+        ]
+
+    def __str__(self):
+        return f"{self.username} ({self.discord_id})"
+
+    @property
+    def tag(self):
+        return f"{self.username}#{self.discriminator}"
+
+
+class ReplicaPin(models.Model):
+    """Reads of a scope that stay on the primary until expires_at, after a change (see core.db_routers)"""
+    key = models.CharField(max_length=100, unique=True, help_text="Scope, or scope and user, e.g. replica_pin_user_42")
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'replica_pins'
+
+    def __str__(self):
+        return f"{self.key} until {self.expires_at}"
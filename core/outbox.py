@@ -0,0 +1,219 @@
+"""
+Transactional outbox for side effects of database writes.
+
+Views and signal handlers call ``enqueue()`` inside the transaction that makes
+the change, so the message exists exactly when the change does. The
+``run_outbox_worker`` command drains due messages outside any transaction and
+retries failures with exponential backoff, which keeps slow or flaky external
+calls (Google Calendar, Discord) out of request transactions. Batch handlers get
+every due message of their kind at once, so calendar changes go to Google as one
+batch request (core.calendar_sync).
+
+Cheap local effects (unlock records) are enqueued with ``eager=True``: they
+are delivered right after commit in the request process and the worker only
+picks them up if that attempt fails. Handlers must be idempotent because a
+message can be delivered more than once. Cache purges are not outbox messages:
+core.signals runs them on commit in the writing process, where they cost one or
+two cache writes (a per-user index purge or a namespace generation bump). An
+outbox row would add an insert to every write and leave readers on stale entries
+until the worker polls; with the per-process LocMemCache, the worker could not
+reach the entries at all.
+
+Delivered messages are kept for RETENTION_DAYS for inspection, then deleted by
+``purge_delivered()``, which the worker runs periodically.
+"""
+import logging
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .calendar_client import CalendarError
+from .calendar_sync import sync_sessions
+from .models import Incentive, OutboxMessage, User, UserIncentiveUnlock
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 30  # 30s, 1m, 2m, ... capped at BACKOFF_MAX_SECONDS
+BACKOFF_MAX_SECONDS = 3600
+LEASE_SECONDS = 300  # Claimed messages are hidden from other workers this long
+EAGER_GRACE_SECONDS = 60  # Worker leaves eager messages to the request process this long
+DEFAULT_BATCH_SIZE = 50
+RETENTION_DAYS = 7  # Delivered messages are deleted after this long; failed ones are kept
+PURGE_BATCH_SIZE = 5000
+
+HANDLERS = {}  # kind -> (function, batch)
+
+
+def handler(kind, batch=False):
+    """
+    Register the function that delivers messages of ``kind``. It receives the payload
+    dict, or with ``batch=True`` the list of payloads of every due message of that kind
+    and returns one exception (or None for success) per payload.
+    """
+    def register(func):
+        HANDLERS[kind] = (func, batch)
+        return func
+    return register
+
+
+def enqueue(kind, payload, eager=False):
+    """Record a message in the current transaction; ``eager`` also delivers it right after commit."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown outbox message kind: {kind}")
+    delay = EAGER_GRACE_SECONDS if eager else 0
+    message = OutboxMessage.objects.create(
+        kind=kind, payload=payload, available_at=timezone.now() + timedelta(seconds=delay)
+    )
+    if eager:
+        transaction.on_commit(lambda: deliver([message]))
+    return message
+
+
+def drain(batch_size=DEFAULT_BATCH_SIZE):
+    """Deliver up to ``batch_size`` due messages; returns {'done': n, 'retrying': n, 'failed': n}."""
+    now = timezone.now()
+    with transaction.atomic():
+        # SKIP LOCKED lets several workers drain concurrently; the lease keeps a claimed
+        # message away from them after this transaction ends and while it is delivered
+        claimed = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', available_at__lte=now)
+            .order_by('available_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboxMessage.objects.filter(id__in=claimed).update(available_at=now + timedelta(seconds=LEASE_SECONDS))
+
+    by_kind = {}
+    for message in OutboxMessage.objects.filter(id__in=claimed).order_by('id'):
+        by_kind.setdefault(message.kind, []).append(message)
+    counts = {'done': 0, 'retrying': 0, 'failed': 0}
+    for messages in by_kind.values():
+        for outcome in deliver(messages):
+            counts[outcome] += 1
+    return counts
+
+
+def deliver(messages):
+    """Run the handler for messages of one kind and record each outcome: 'done', 'retrying' or 'failed'."""
+    func, batch = HANDLERS.get(messages[0].kind, (None, False))
+    if func is None:
+        errors = [LookupError(f"No handler for {messages[0].kind}")] * len(messages)
+    elif batch:
+        try:
+            errors = func([message.payload for message in messages])
+        except Exception as exc:
+            errors = [exc] * len(messages)
+    else:
+        errors = []
+        for message in messages:
+            try:
+                func(message.payload)
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+
+    done = [message.pk for message, error in zip(messages, errors) if error is None]
+    if done:
+        OutboxMessage.objects.filter(pk__in=done).update(
+            status='done', attempts=F('attempts') + 1, processed_at=timezone.now(), last_error=''
+        )
+    return [
+        'done' if error is None else _record_failure(message, error, retry=func is not None)
+        for message, error in zip(messages, errors)
+    ]
+
+
+def purge_delivered(retention_days=RETENTION_DAYS):
+    """Delete messages delivered more than ``retention_days`` ago, in batches; returns the number deleted."""
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    deleted = 0
+    while True:
+        # Bounded deletes keep each statement's locks short on a large backlog
+        ids = list(OutboxMessage.objects.filter(status='done', processed_at__lt=cutoff)
+                   .values_list('id', flat=True)[:PURGE_BATCH_SIZE])
+        if not ids:
+            return deleted
+        deleted += OutboxMessage.objects.filter(id__in=ids).delete()[0]
+
+
+def backoff_seconds(attempts):
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+def _record_failure(message, exc, retry=True):
+    attempts = message.attempts + 1
+    error = f"{type(exc).__name__}: {exc}"
+    if retry and attempts < MAX_ATTEMPTS:
+        outcome = 'retrying'
+        OutboxMessage.objects.filter(pk=message.pk).update(
+            attempts=attempts, last_error=error,
+            available_at=timezone.now() + timedelta(seconds=backoff_seconds(attempts)),
+        )
+        logger.warning("Outbox %s #%s failed (attempt %s), retrying: %s", message.kind, message.pk, attempts, error)
+    else:
+        outcome = 'failed'
+        OutboxMessage.objects.filter(pk=message.pk).update(
+            status='failed', attempts=attempts, last_error=error, processed_at=timezone.now()
+        )
+        logger.error("Outbox %s #%s failed permanently after %s attempts: %s", message.kind, message.pk, attempts, error)
+    return outcome
+
+
+@handler('unlocks.record')
+def _record_unlocks(payload):
+    """Create UserIncentiveUnlock records for any incentives the user qualifies for."""
+    total_points = User.objects.filter(pk=payload['user_id']).values_list('total_points', flat=True).first()
+    if total_points is None:
+        return
+    qualifying = Incentive.objects.filter(is_active=True, points_required__lte=total_points)
+    existing = set(UserIncentiveUnlock.objects.filter(
+        user_id=payload['user_id'], incentive__in=qualifying
+    ).values_list('incentive_id', flat=True))
+    to_create = [
+        UserIncentiveUnlock(user_id=payload['user_id'], incentive_id=incentive_id)
+        for incentive_id in qualifying.values_list('id', flat=True) if incentive_id not in existing
+    ]
+    if to_create:
+        # ignore_conflicts: unique_together makes a repeated delivery a no-op
+        UserIncentiveUnlock.objects.bulk_create(to_create, ignore_conflicts=True)
+
+
+@handler('calendar.sync', batch=True)
+def _sync_calendar(payloads):
+    result = sync_sessions([payload['session_id'] for payload in payloads])
+    failed = result.failed if result else {}
+    return [
+        CalendarError(failed[payload['session_id']]) if payload['session_id'] in failed else None
+        for payload in payloads
+    ]
+
+
+@handler('discord.notify')
+def _notify_discord_user(payload):
+    """DM a Discord user through the bot's REST credentials."""
+    token = getattr(settings, 'DISCORD_TOKEN', '')
+    if not token:
+        logger.info("DISCORD_TOKEN not configured; dropping notification for %s", payload['discord_id'])
+        return
+
+    headers = {"Authorization": f"Bot {token}", "Content-Type": "application/json"}
+    channel = requests.post(
+        "https://discord.com/api/v10/users/@me/channels",
+        json={"recipient_id": payload['discord_id']}, headers=headers, timeout=10,
+    )
+    channel.raise_for_status()
+    response = requests.post(
+        f"https://discord.com/api/v10/channels/{channel.json()['id']}/messages",
+        json={"content": payload['content']}, headers=headers, timeout=10,
+    )
+    if response.status_code == 403:
+        # The user does not accept DMs from server members; retrying will not help
+        logger.info("Discord user %s does not accept DMs", payload['discord_id'])
+        return
+    response.raise_for_status()
@@ -0,0 +1,260 @@
+"""
+Batch matching of every pending review request to professionals.
+
+The whole pending queue is solved at once as a capacity-constrained assignment
+problem: each professional contributes one column per free session slot, every
+(request, column) pair gets a score from weekly availability overlap, rating and
+specialty fit, and the Hungarian algorithm (scipy's linear_sum_assignment) picks
+the assignment with the highest total score. Each accepted pair then books the
+earliest shared 30-minute window in the professional's free cells (cells taken by
+their upcoming scheduled sessions are not free); pairs left without a window are
+solved again against what is still free, for a few rounds. Applying the proposals
+creates the ScheduledSession rows at the proposed times.
+"""
+from dataclasses import asdict, dataclass
+from datetime import datetime, time as dt_time, timedelta, timezone as dt_timezone
+
+import math
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from scipy.optimize import linear_sum_assignment
+
+from .availability import CELL_MINUTES, CELLS_PER_DAY, WEEK_BITMAP_BYTES, AvailabilityIndex, week_bitmap
+from .models import AvailabilitySlot, ProfessionalAvailability, ReviewRequest, ScheduledSession
+from .outbox import enqueue
+from .stats import clear_review_request_stats
+
+DEFAULT_CAPACITY = 3  # Open (matched or scheduled) requests per professional
+MIN_OVERLAP_MINUTES = 30
+SESSION_MINUTES = 30
+FULL_OVERLAP_MINUTES = 120  # Overlap beyond this earns no extra score
+
+# Score weights; overlap, rating and specialty each contribute a 0-1 component
+WEIGHTS = {'overlap': 0.5, 'rating': 0.3, 'specialty': 0.2}
+PRIORITY_BONUS = {'low': 0.0, 'medium': 0.05, 'high': 0.1, 'urgent': 0.2}
+
+# Cost for pairs that must not be matched; large enough that the solver only uses
+# them when a row has no feasible column left, and such pairs are dropped afterwards
+INFEASIBLE_COST = 1e6
+MAX_ROUNDS = 10
+
+
+@dataclass
+class ProposedSession:
+    review_request_id: int
+    student: str
+    professional_id: int
+    professional_name: str
+    score: float
+    overlap_minutes: int
+    proposed_time: datetime
+
+    def as_dict(self):
+        data = asdict(self)
+        data['proposed_time'] = self.proposed_time.isoformat()
+        return data
+
+
+def propose_assignments(capacity=DEFAULT_CAPACITY, now=None):
+    """Best capacity-respecting professional for each pending request, as ProposedSession rows."""
+    now = now or timezone.now()
+    professionals = _load_professionals(capacity, now)
+    requests = list(ReviewRequest.objects.filter(status='pending').order_by('submission_date').values_list(
+        'id', 'student__username', 'target_industry', 'priority'
+    ))
+    if not professionals or not requests:
+        return []
+
+    slots_by_request = {}
+    for slot in AvailabilitySlot.objects.filter(review_request__status='pending').only(
+        'review_request_id', 'weekday', 'start_minute', 'end_minute'
+    ):
+        slots_by_request.setdefault(slot.review_request_id, []).append(slot)
+    request_bitmaps = [week_bitmap(slots_by_request.get(request_id, [])) for request_id, *_ in requests]
+
+    # Session times are picked after each solve; requests whose professional has no free
+    # shared window left are re-solved against the remaining free cells in the next round
+    proposals = []
+    remaining = list(range(len(requests)))
+    for _ in range(MAX_ROUNDS):
+        accepted = _solve_round([requests[row] for row in remaining], [request_bitmaps[row] for row in remaining],
+                                professionals, now)
+        if not accepted:
+            break
+        proposals.extend(proposal for _, proposal in accepted)
+        done = {remaining[row] for row, _ in accepted}
+        remaining = [row for row in remaining if row not in done]
+    proposals.sort(key=lambda proposal: proposal.proposed_time)
+    return proposals
+
+
+def apply_assignments(proposals):
+    """
+    Book a ScheduledSession at each proposed time and mark its request scheduled;
+    requests no longer pending are skipped. Returns the number booked.
+    """
+    by_id = {proposal.review_request_id: proposal for proposal in proposals}
+    matched_at = timezone.now()
+    with transaction.atomic():
+        requests = list(ReviewRequest.objects.select_for_update().filter(id__in=by_id, status='pending'))
+        for review_request in requests:
+            proposal = by_id[review_request.id]
+            review_request.professional_id = proposal.professional_id
+            review_request.status = 'scheduled'
+            review_request.matched_date = matched_at
+            review_request.scheduled_time = proposal.proposed_time
+        ReviewRequest.objects.bulk_update(requests, ['professional', 'status', 'matched_date', 'scheduled_time'],
+                                          batch_size=500)
+        sessions = ScheduledSession.objects.bulk_create([
+            ScheduledSession(review_request_id=review_request.id, student_id=review_request.student_id,
+                             professional_id=review_request.professional_id,
+                             scheduled_time=review_request.scheduled_time, duration_minutes=SESSION_MINUTES)
+            for review_request in requests
+        ], batch_size=500)
+        # bulk_create and bulk_update skip the post_save handlers that normally do these
+        for session in sessions:
+            if session.pk is not None:
+                enqueue('calendar.sync', {'session_id': session.pk})
+        transaction.on_commit(clear_review_request_stats)
+    return len(requests)
+
+
+def _solve_round(requests, request_bitmaps, professionals, now):
+    """One Hungarian solve over professionals with free capacity; returns [(request row, ProposedSession)]."""
+    available = [p for p in professionals if p['free']]
+    if not requests or not available:
+        return []
+    index = AvailabilityIndex([p['id'] for p in available], [np.packbits(p['cells']).tobytes() for p in available])
+    overlap = index.overlap_matrix(request_bitmaps)
+    feasible = overlap >= MIN_OVERLAP_MINUTES
+    # Requests nobody can take and professionals nobody fits stay out of the solver
+    request_rows = np.flatnonzero(feasible.any(axis=1))
+    professional_cols = np.flatnonzero(feasible.any(axis=0))
+    if not len(request_rows) or not len(professional_cols):
+        return []
+    overlap = overlap[np.ix_(request_rows, professional_cols)]
+    feasible = feasible[np.ix_(request_rows, professional_cols)]
+    available = [available[col] for col in professional_cols]
+    score = _score_matrix([requests[row] for row in request_rows], available, overlap)
+
+    # One column per free session slot
+    columns = np.repeat(np.arange(len(available)), [p['free'] for p in available])
+    cost = np.where(feasible, -score, INFEASIBLE_COST)[:, columns]
+    rows, picked = linear_sum_assignment(cost)
+
+    accepted = []
+    for row, column in zip(rows, picked):
+        if cost[row, column] >= INFEASIBLE_COST:
+            continue
+        request_row = request_rows[row]
+        professional = available[columns[column]]
+        proposed_time = _book_first_free_time(request_bitmaps[request_row], professional, now)
+        if proposed_time is None:
+            continue
+        professional['free'] -= 1
+        request_id, username = requests[request_row][:2]
+        accepted.append((request_row, ProposedSession(
+            review_request_id=request_id,
+            student=username,
+            professional_id=professional['id'],
+            professional_name=professional['name'],
+            score=round(float(score[row, columns[column]]), 3),
+            overlap_minutes=int(overlap[row, columns[column]]),
+            proposed_time=proposed_time,
+        )))
+    return accepted
+
+
+def _load_professionals(capacity, now):
+    """Active professionals with live availability and free capacity: id, name, rating, specialties, cells, free."""
+    professionals = {}
+    for professional_id, name, rating, specialties, bitmap in ProfessionalAvailability.objects.filter(
+        is_active=True, professional__is_active=True, end_date__gte=now.date()
+    ).values_list('professional_id', 'professional__name', 'professional__rating', 'professional__specialties',
+                  'week_bitmap'):
+        entry = professionals.setdefault(professional_id, {
+            'id': professional_id, 'name': name, 'rating': float(rating or 0),
+            'specialties': (specialties or '').lower(), 'bitmap': np.zeros(WEEK_BITMAP_BYTES, dtype=np.uint8),
+        })
+        if bitmap:
+            # Several availability responses per professional: union of their weeks
+            entry['bitmap'] |= np.frombuffer(bytes(bitmap), dtype=np.uint8)
+
+    open_counts = dict(ReviewRequest.objects.filter(
+        professional_id__in=professionals, status__in=('matched', 'scheduled')
+    ).values_list('professional_id').annotate(open_count=Count('id')).order_by())
+
+    result = []
+    for professional_id, entry in professionals.items():
+        entry['free'] = max(capacity - open_counts.get(professional_id, 0), 0)
+        if entry['free']:
+            # Unbooked cells of the week; proposals clear the cells they take
+            entry['cells'] = np.unpackbits(entry.pop('bitmap')).astype(bool)
+            result.append(entry)
+    _clear_booked_cells({entry['id']: entry for entry in result}, now)
+    return result
+
+
+def _clear_booked_cells(professionals, now):
+    """Take the cells of professionals' scheduled sessions in the week proposals are searched in."""
+    first_day = now.date() + timedelta(days=1)
+    week_start = datetime.combine(first_day, dt_time(0, 0), tzinfo=dt_timezone.utc)
+    for professional_id, scheduled_time, duration_minutes in ScheduledSession.objects.filter(
+        professional_id__in=professionals, status='scheduled',
+        scheduled_time__gte=week_start, scheduled_time__lt=week_start + timedelta(days=7),
+    ).values_list('professional_id', 'scheduled_time', 'duration_minutes'):
+        start = scheduled_time.astimezone(dt_timezone.utc)
+        minute = start.hour * 60 + start.minute
+        first_cell = start.weekday() * CELLS_PER_DAY + minute // CELL_MINUTES
+        last_cell = start.weekday() * CELLS_PER_DAY + math.ceil((minute + (duration_minutes or 0)) / CELL_MINUTES)
+        cells = professionals[professional_id]['cells']
+        # A session running past Sunday midnight continues at the start of the week
+        cells[np.arange(first_cell, max(last_cell, first_cell + 1)) % len(cells)] = False
+
+
+def _score_matrix(requests, professionals, overlap):
+    """(requests, professionals) scores in roughly 0-1.2."""
+    ratings = np.array([p['rating'] for p in professionals], dtype=np.float32) / 5.0
+    specialty = np.zeros(overlap.shape, dtype=np.float32)
+    by_industry = {}
+    for row, (_, _, industry, _) in enumerate(requests):
+        industry = (industry or '').strip().lower()
+        if industry:
+            by_industry.setdefault(industry, []).append(row)
+    for industry, rows in by_industry.items():
+        specialty[rows] = [industry in p['specialties'] for p in professionals]
+    priority = np.array([PRIORITY_BONUS.get(request[3], 0.0) for request in requests], dtype=np.float32)
+
+    return (WEIGHTS['overlap'] * np.minimum(overlap, FULL_OVERLAP_MINUTES) / FULL_OVERLAP_MINUTES
+            + WEIGHTS['rating'] * ratings[np.newaxis, :]
+            + WEIGHTS['specialty'] * specialty
+            + priority[:, np.newaxis])
+
+
+def _book_first_free_time(request_bitmap, professional, now):
+    """
+    Earliest window of SESSION_MINUTES from tomorrow on that is free for both sides;
+    the professional's cells for it are marked taken.
+    """
+    cells = professional['cells']
+    shared = np.unpackbits(np.frombuffer(request_bitmap, dtype=np.uint8)).astype(bool) & cells
+    needed = SESSION_MINUTES // CELL_MINUTES
+
+    # Days in search order, starting tomorrow; a window may not run past midnight
+    first_day = now.date() + timedelta(days=1)
+    weekdays = [(first_day.weekday() + offset) % 7 for offset in range(7)]
+    starts = np.lib.stride_tricks.sliding_window_view(
+        shared.reshape(7, CELLS_PER_DAY)[weekdays], needed, axis=1
+    ).all(axis=2)
+    if not starts.any():
+        return None
+
+    day_offset, cell = divmod(int(np.argmax(starts)), starts.shape[1])
+    first_cell = weekdays[day_offset] * CELLS_PER_DAY + cell
+    cells[first_cell:first_cell + needed] = False
+    minute = cell * CELL_MINUTES
+    return datetime.combine(first_day + timedelta(days=day_offset), dt_time(minute // 60, minute % 60),
+                            tzinfo=dt_timezone.utc)
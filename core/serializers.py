@@ -80,14 +80,23 @@ class IncentiveSerializer(serializers.ModelSerializer):
         # an unlock row hasn't been created yet.
         if getattr(request.user, 'total_points', 0) >= obj.points_required:
             return True
-        return UserIncentiveUnlock.objects.filter(user=request.user, incentive=obj).exists()
+        return obj.id in self._unlocks(request.user)
 
     def get_unlocked_at(self, obj):
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             return None
-        uiu = UserIncentiveUnlock.objects.filter(user=request.user, incentive=obj).first()
-        return uiu.unlocked_at if uiu else None
+        return self._unlocks(request.user).get(obj.id)
+
+    def _unlocks(self, user):
+        # OPTIMIZED: One query for all of the user's unlocks, shared by every row of a list
+        # (the list serializer's children share this context dict)
+        unlocks = self.context.get('_unlocks')
+        if unlocks is None:
+            unlocks = self.context['_unlocks'] = dict(
+                UserIncentiveUnlock.objects.filter(user=user).values_list('incentive_id', 'unlocked_at')
+            )
+        return unlocks
     
     def get_can_redeem(self, obj):
         request = self.context.get('request')
@@ -142,6 +151,9 @@ class ProfessionalSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'total_reviews', 'rating', 'created_at', 'updated_at']
     
     def get_review_count(self, obj):
+        # OPTIMIZED: ProfessionalViewSet annotates the count; fall back to a query for single objects
+        if hasattr(obj, 'completed_review_count'):
+            return obj.completed_review_count
         return obj.assigned_reviews.filter(status='completed').count()
 
 class ReviewRequestSerializer(serializers.ModelSerializer):
@@ -0,0 +1,137 @@
+"""
+Model signal handlers that keep cached API responses and data versions in sync.
+
+Cache and data-version handlers defer their work with transaction.on_commit so
+readers never see a new version (or an empty cache) before the write that caused
+it is visible. Calendar changes for scheduled sessions go through the outbox
+(core.outbox). Streak state is updated inside the writing transaction.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import bump_data_version, invalidate_user_caches, purge_caches
+from .calendar_sync import needs_sync
+from .models import (
+    EventSubmission, Incentive, LinkedInSubmission, PointsLog, Professional, Redemption, ResourceSubmission,
+    ReviewRequest, ScheduledSession, User, UserPreferences, UserStatus,
+)
+from .outbox import enqueue
+from .stats import clear_pending_submission_counts, clear_review_request_stats
+from .streaks import advance_streak
+
+logger = logging.getLogger(__name__)
+
+
+def _user_data_changed(user_id):
+    bump_data_version('user', user_id)
+    # No global pin: LeaderboardView checks that the replica has the newest points log instead
+    bump_data_version('leaderboard', pin=False)
+    invalidate_user_caches(user_id)
+
+
+def _purge_namespaces(*namespaces):
+    for namespace in namespaces:
+        purge_caches(namespace=namespace)
+
+
+def _catalog_changed():
+    transaction.on_commit(lambda: bump_data_version('catalog'))
+    # Rewards list stock/availability, dashboard stats count affordable rewards
+    transaction.on_commit(lambda: _purge_namespaces('rewards', 'dashboard'))
+
+
+@receiver(post_save, sender=PointsLog)
+@receiver(post_delete, sender=PointsLog)
+@receiver(post_save, sender=Redemption)
+@receiver(post_delete, sender=Redemption)
+def points_or_redemption_changed(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: _user_data_changed(user_id))
+
+
+def _leaderboard_changed():
+    # Leaderboard cache keys carry the version, so the bump also retires the cached bodies
+    transaction.on_commit(lambda: bump_data_version('leaderboard'))
+
+
+@receiver(post_save, sender=UserPreferences)
+@receiver(post_delete, sender=UserPreferences)
+def leaderboard_preferences_changed(sender, instance, **kwargs):
+    """Copy the privacy settings onto the user's denormalised leaderboard fields."""
+    privacy_settings = {} if kwargs['signal'] is post_delete else instance.privacy_settings or {}
+    if UserPreferences._meta.get_field('user').is_cached(instance):
+        user = instance.user  # e.g. get_or_create(user=request.user) in UserPreferencesViewSet
+    else:
+        user = User.objects.filter(pk=instance.user_id).only(
+            'username', 'first_name', 'last_name', 'leaderboard_display_name', 'show_in_leaderboard'
+        ).first()
+        if user is None:  # Cascade delete of the user itself
+            return
+
+    previous = (user.leaderboard_display_name, user.show_in_leaderboard)
+    user.sync_leaderboard_fields(privacy_settings)
+    if (user.leaderboard_display_name, user.show_in_leaderboard) != previous:
+        # update() rather than save(): no updated_at bump, no second preferences read
+        User.objects.filter(pk=user.pk).update(
+            leaderboard_display_name=user.leaderboard_display_name, show_in_leaderboard=user.show_in_leaderboard
+        )
+        _leaderboard_changed()
+
+
+@receiver(post_save, sender=User)
+def user_leaderboard_fields_changed(sender, instance, **kwargs):
+    if getattr(instance, '_leaderboard_changed', False):
+        instance._leaderboard_changed = False
+        _leaderboard_changed()
+
+
+@receiver(post_save, sender=Incentive)
+@receiver(post_delete, sender=Incentive)
+def incentive_changed(sender, instance, **kwargs):
+    _catalog_changed()
+
+
+@receiver(post_save, sender=ResourceSubmission)
+@receiver(post_delete, sender=ResourceSubmission)
+@receiver(post_save, sender=EventSubmission)
+@receiver(post_delete, sender=EventSubmission)
+@receiver(post_save, sender=LinkedInSubmission)
+@receiver(post_delete, sender=LinkedInSubmission)
+def submission_changed(sender, instance, **kwargs):
+    transaction.on_commit(clear_pending_submission_counts)
+
+
+@receiver(post_save, sender=ReviewRequest)
+@receiver(post_delete, sender=ReviewRequest)
+@receiver(post_save, sender=Professional)
+@receiver(post_delete, sender=Professional)
+def review_data_changed(sender, instance, **kwargs):
+    transaction.on_commit(clear_review_request_stats)
+
+
+@receiver(post_save, sender=ScheduledSession)
+def session_calendar_changed(sender, instance, **kwargs):
+    """New, moved and cancelled sessions are synced to Google Calendar by the outbox worker."""
+    if needs_sync(instance):
+        enqueue('calendar.sync', {'session_id': instance.pk})
+
+
+@receiver(post_save, sender=PointsLog)
+def update_streak(sender, instance, created, **kwargs):
+    """Advance the user's streak in the same transaction as the new log."""
+    if not created:
+        return
+
+    activity_date = timezone.localdate(instance.timestamp)
+    with transaction.atomic():
+        status_row, _ = UserStatus.objects.select_for_update().get_or_create(user_id=instance.user_id)
+        new_state = advance_streak(
+            status_row.current_streak, status_row.longest_streak, status_row.last_active_date, activity_date
+        )
+        if new_state != (status_row.current_streak, status_row.longest_streak, status_row.last_active_date):
+            status_row.current_streak, status_row.longest_streak, status_row.last_active_date = new_state
+            status_row.save(update_fields=['current_streak', 'longest_streak', 'last_active_date'])
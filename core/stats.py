@@ -0,0 +1,85 @@
+"""
+Cached admin counters shared by the REST views and the bot actions.
+
+Each counter is computed with as few queries as possible and cached briefly; the signal
+handlers in core.signals delete the cached value when the underlying rows change.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Avg, CharField, Count, Q, Value
+from django.utils import timezone
+
+from .db_routers import pin_to_primary
+from .models import EventSubmission, LinkedInSubmission, Professional, ResourceSubmission, ReviewRequest
+
+PENDING_COUNTS_CACHE_KEY = 'pending_submission_counts'
+PENDING_COUNTS_TTL = 30  # Seconds; admin reports poll this
+
+REVIEW_STATS_CACHE_KEY = 'review_request_stats'
+REVIEW_STATS_TTL = 300  # Seconds; also bounds how stale the 7-day "recent" window can get
+REVIEW_STATS_RECENT_DAYS = 7
+
+# Response key -> submission model
+PENDING_SUBMISSION_MODELS = {
+    'resources': ResourceSubmission,
+    'events': EventSubmission,
+    'linkedin': LinkedInSubmission,
+}
+
+
+def pending_submission_counts():
+    """Pending resource/event/LinkedIn submission counts, e.g. {'resources': 2, 'events': 0, 'linkedin': 1}."""
+    counts = cache.get(PENDING_COUNTS_CACHE_KEY)
+    if counts is not None:
+        return counts
+
+    # OPTIMIZED: One UNION ALL of three index-only counts (idx_*_status_submitted) instead
+    # of three requests that each serialise the full pending list
+    per_model = [
+        model.objects.filter(status='pending').order_by()
+        .annotate(kind=Value(kind, output_field=CharField()))
+        .values('kind')
+        .annotate(count=Count('id'))
+        .values_list('kind', 'count')
+        for kind, model in PENDING_SUBMISSION_MODELS.items()
+    ]
+    counts = dict.fromkeys(PENDING_SUBMISSION_MODELS, 0)
+    counts.update(per_model[0].union(*per_model[1:], all=True))
+    cache.set(PENDING_COUNTS_CACHE_KEY, counts, PENDING_COUNTS_TTL)
+    return counts
+
+
+def clear_pending_submission_counts():
+    cache.delete(PENDING_COUNTS_CACHE_KEY)
+    pin_to_primary('stats')
+
+
+def review_request_stats():
+    """Resume review program statistics (status counts, average rating, recent activity)."""
+    stats = cache.get(REVIEW_STATS_CACHE_KEY)
+    if stats is not None:
+        return stats
+
+    recent_date = timezone.now() - timedelta(days=REVIEW_STATS_RECENT_DAYS)
+    # OPTIMIZED: One pass over review_requests with conditional aggregation instead of
+    # one COUNT/AVG query per figure
+    stats = ReviewRequest.objects.aggregate(
+        total_requests=Count('id'),
+        pending_requests=Count('id', filter=Q(status='pending')),
+        matched_requests=Count('id', filter=Q(status='matched')),
+        completed_requests=Count('id', filter=Q(status='completed')),
+        cancelled_requests=Count('id', filter=Q(status='cancelled')),
+        average_rating=Avg('rating'),
+        recent_requests=Count('id', filter=Q(submission_date__gte=recent_date)),
+        recent_completions=Count('id', filter=Q(completed_date__gte=recent_date)),
+    )
+    stats['average_rating'] = stats['average_rating'] or 0
+    stats['total_professionals'] = Professional.objects.filter(is_active=True).count()
+    cache.set(REVIEW_STATS_CACHE_KEY, stats, REVIEW_STATS_TTL)
+    return stats
+
+
+def clear_review_request_stats():
+    cache.delete(REVIEW_STATS_CACHE_KEY)
+    pin_to_primary('stats')
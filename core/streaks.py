@@ -0,0 +1,52 @@
+"""
+Daily engagement streaks.
+
+Streak state lives on UserStatus (current_streak, longest_streak,
+last_active_date) and is advanced one activity date at a time, both by the
+PointsLog post_save handler and by the recompute_streaks backfill command.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+# Allow for 1 day gap (weekend, etc.) between active days
+STREAK_GRACE_DAYS = 1
+MAX_STREAK_GAP = timedelta(days=1 + STREAK_GRACE_DAYS)
+
+
+def advance_streak(current_streak, longest_streak, last_active_date, activity_date):
+    """
+    Fold one activity date into the streak state.
+
+    Returns the new (current_streak, longest_streak, last_active_date). Dates at or
+    before ``last_active_date`` leave the state unchanged; out-of-order backdated
+    logs are picked up by the recompute command instead.
+    """
+    if last_active_date is not None and activity_date <= last_active_date:
+        return current_streak, longest_streak, last_active_date
+
+    if last_active_date is not None and activity_date - last_active_date <= MAX_STREAK_GAP:
+        current_streak += 1
+    else:
+        current_streak = 1
+
+    return current_streak, max(longest_streak, current_streak), activity_date
+
+
+def effective_current_streak(current_streak, last_active_date, today=None):
+    """The stored streak only counts while the user has been active recently enough."""
+    if last_active_date is None:
+        return 0
+    today = today or timezone.localdate()
+    if today - last_active_date > MAX_STREAK_GAP:
+        return 0
+    return current_streak
+
+
+def streak_bonus(current_streak):
+    """Calculate streak bonus (bonus points for streaks)"""
+    if current_streak >= 7:
+        return 5  # 5 bonus points for 7+ day streak
+    if current_streak >= 3:
+        return 2  # 2 bonus points for 3+ day streak
+    return 0
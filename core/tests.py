@@ -1,9 +1,11 @@
-from django.test import TestCase
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
-from .models import User, Activity, PointsLog, Incentive, Redemption, UserStatus
+from .models import User, Track, Activity, PointsLog, Incentive, Redemption, UserStatus
+from .caching import purge_caches, set_user_cache, versioned_key
 
 User = get_user_model()
 
@@ -152,6 +154,1398 @@ class PointsSystemTestCase(APITestCase):
         # Should have at least our 1 test incentive plus any existing ones
         self.assertGreaterEqual(len(response.data), 1)
 
+class CachePurgeTestCase(APITestCase):
+    def setUp(self):
+        """Warm a few per-user caches for two users"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="cacheuser", password="testpass123", discord_id="111")
+        self.other = User.objects.create_user(username="otheruser", password="testpass123", discord_id="222")
+
+        for user in (self.user, self.other):
+            for namespace, key in self._keys(user):
+                set_user_cache(namespace, user.id, versioned_key(namespace, key), {'ok': True}, 60)
+
+    def _keys(self, user):
+        return [
+            ('dashboard', f"dashboard_stats_{user.id}_30days"),
+            ('feed', f"activity_feed_{user.id}_10"),
+            ('leaderboard', f"leaderboard_weekly_10_{user.id}"),
+        ]
+
+    def _cached(self, namespace, key):
+        return cache.get(versioned_key(namespace, key))
+
+    def test_purge_by_user_keeps_other_users_warm(self):
+        """Purging one user must not touch another user's entries"""
+        self.assertEqual(purge_caches(user_id=self.user.id), 3)
+        self.assertIsNone(self._cached('dashboard', f"dashboard_stats_{self.user.id}_30days"))
+        self.assertIsNotNone(self._cached('dashboard', f"dashboard_stats_{self.other.id}_30days"))
+
+    def test_purge_by_user_and_pattern(self):
+        """A user purge with a pattern only removes that user's matching keys"""
+        self.assertEqual(purge_caches(user_id=self.user.id, pattern="activity_feed_*"), 1)
+        self.assertIsNone(self._cached('feed', f"activity_feed_{self.user.id}_10"))
+        self.assertIsNotNone(self._cached('dashboard', f"dashboard_stats_{self.user.id}_30days"))
+        # Already purged entries are not counted twice
+        self.assertEqual(purge_caches(user_id=self.user.id, pattern="activity_feed_*"), 0)
+
+    def test_purge_across_users_bumps_generation_without_scanning(self):
+        """Namespace and pattern purges across users are one generation bump, not a read per user"""
+        from unittest import mock
+
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            self.assertEqual(purge_caches(namespace='leaderboard'), 1)
+            self.assertEqual(purge_caches(pattern="activity_feed_*"), 1)
+        get_many.assert_not_called()
+
+        for user in (self.user, self.other):
+            self.assertIsNone(self._cached('leaderboard', f"leaderboard_weekly_10_{user.id}"))
+            self.assertIsNone(self._cached('feed', f"activity_feed_{user.id}_10"))
+            self.assertIsNotNone(self._cached('dashboard', f"dashboard_stats_{user.id}_30days"))
+
+        # A pattern no namespace can match invalidates nothing
+        self.assertEqual(purge_caches(pattern="unknown_*"), 0)
+
+    def test_clear_user_caches_endpoint_reports_count(self):
+        """The REST purge endpoint returns how many entries were removed"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse('clear-user-caches')
+
+        response = self.client.post(url, {'user_id': self.other.id, 'namespace': 'dashboard'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['cleared'], 1)
+        self.assertIsNotNone(self._cached('feed', f"activity_feed_{self.other.id}_10"))
+
+        response = self.client.post(url, {'namespace': 'bogus'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bot_purge_cache_action(self):
+        """The bot purges by discord_id through the shared-secret endpoint"""
+        with override_settings(BOT_SHARED_SECRET='test-secret'):
+            response = self.client.post(
+                reverse('bot-integration'),
+                {'action': 'purge-cache', 'discord_id': '111'},
+                format='json',
+                HTTP_X_BOT_SECRET='test-secret',
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['cleared'], 3)
+        self.assertIsNotNone(self._cached('leaderboard', f"leaderboard_weekly_10_{self.other.id}"))
+
+class ConditionalGetTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="etaguser", password="testpass123")
+        self.activity = Activity.objects.create(
+            name="Test ETag Activity",
+            activity_type="test_etag",
+            points_value=10
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_unchanged_poll_returns_304(self):
+        """A repeated poll with the returned ETag is answered with 304"""
+        url = reverse('dashboard-stats')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_new_day_changes_etag(self):
+        """Date windows move at midnight, so an unchanged poll on the next day gets a fresh response"""
+        from datetime import timedelta
+        from unittest import mock
+        from django.utils import timezone
+
+        url = reverse('dashboard-stats')
+        etag = self.client.get(url)['ETag']
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(days=1)):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+                             status.HTTP_304_NOT_MODIFIED)
+
+    def test_points_write_changes_etag(self):
+        """Writing points bumps the user's data version once the transaction commits"""
+        url = reverse('unified-activity-feed')
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PointsLog.objects.create(user=self.user, activity=self.activity, points_earned=10)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['total_activities'], 1)
+
+    def test_catalog_write_changes_rewards_etag(self):
+        """Incentive changes invalidate the rewards ETag for every user"""
+        url = reverse('rewards-available')
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Incentive.objects.create(name="New Reward", description="New", points_required=5)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['rewards']), 1)
+
+    def test_other_users_points_refresh_cached_leaderboard(self):
+        """A points write by someone else changes both the leaderboard ETag and the cached body"""
+        other = User.objects.create_user(username="climber", password="testpass123")
+        url = reverse('leaderboard')
+        response = self.client.get(url)
+        self.assertEqual(response.data['leaderboard'], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PointsLog.objects.create(user=other, activity=self.activity, points_earned=10)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['username'] for row in response.data['leaderboard']], ['climber'])
+
+class DashboardBundleTestCase(APITestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="bundleuser", password="testpass123", total_points=70)
+        activity = Activity.objects.create(name="Test Bundle Activity", activity_type="test_bundle", points_value=10)
+        now = timezone.now()
+        # Spread logs over current, previous and older periods
+        for days_ago, points in [(1, 10), (3, 20), (40, 15), (75, 25)]:
+            PointsLog.objects.create(user=self.user, activity=activity, points_earned=points,
+                                     timestamp=now - timedelta(days=days_ago))
+        self.client.force_authenticate(user=self.user)
+
+    def test_bundle_matches_standalone_endpoints(self):
+        """Every bundle section equals the response of its standalone endpoint"""
+        bundle = self.client.get(reverse('dashboard-bundle'), {'limit': 3}).data
+        cache.clear()
+
+        self.assertEqual(bundle['stats'], self.client.get(reverse('dashboard-stats')).data)
+        self.assertEqual(bundle['timeline'], self.client.get(reverse('points-timeline')).data)
+        self.assertEqual(bundle['feed'], self.client.get(reverse('unified-activity-feed'), {'limit': 3}).data)
+        self.assertEqual(bundle['rewards'], self.client.get(reverse('rewards-available')).data)
+        self.assertEqual(bundle['leaderboard'], self.client.get(reverse('leaderboard')).data)
+        self.assertEqual(bundle['stats']['current_period']['points_earned'], 30)
+        self.assertEqual(bundle['stats']['previous_period']['points_earned'], 15)
+
+    def test_bundle_sections_and_shared_cache(self):
+        """Only requested sections are returned and each is cached under its standalone key"""
+        response = self.client.get(reverse('dashboard-bundle'), {'sections': 'stats,feed'})
+        self.assertEqual(set(response.data), {'stats', 'feed'})
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('dashboard-stats'))
+            self.client.get(reverse('unified-activity-feed'))
+
+        response = self.client.get(reverse('dashboard-bundle'), {'sections': 'stats,bogus'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stats_cache_miss_is_one_query(self):
+        """Both periods come from one aggregate; affordable rewards come from the threshold list"""
+        from .dashboard import build_dashboard_stats
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for points_required in (50, 70, 71, 500):
+                Incentive.objects.create(name=f"Reward {points_required}", description="", points_required=points_required)
+        build_dashboard_stats(self.user, '30days')  # Load thresholds for this catalog version
+
+        with self.assertNumQueries(1):
+            stats = build_dashboard_stats(self.user, '30days')
+        self.assertEqual(stats['current_period']['available_rewards'], 2)
+        self.assertEqual(stats['current_period']['activities_completed'], 2)
+        self.assertEqual(stats['previous_period']['activities_completed'], 1)
+
+class StreakTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="streakuser", password="testpass123", discord_id="333")
+        self.activity = Activity.objects.create(name="Test Streak Activity", activity_type="test_streak", points_value=5)
+
+    def _log_days_ago(self, *days_ago):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        for days in days_ago:
+            PointsLog.objects.create(user=self.user, activity=self.activity, points_earned=5,
+                                     timestamp=timezone.now() - timedelta(days=days))
+
+    def test_streak_updated_on_write(self):
+        """Consecutive days extend the streak, one missed day is tolerated, longer gaps reset it"""
+        self._log_days_ago(10, 9, 8, 4, 3, 1, 0, 0)
+        status_row = UserStatus.objects.get(user=self.user)
+        # 10-9-8 is a 3 day run; the 3 day gap restarts it: 4-3-(skip)-1-0
+        self.assertEqual(status_row.current_streak, 4)
+        self.assertEqual(status_row.longest_streak, 4)
+
+    def test_recompute_command_handles_backdated_logs(self):
+        """Backdated logs are ignored incrementally but counted by the backfill command"""
+        from django.core.management import call_command
+        from io import StringIO
+
+        self._log_days_ago(0, 2, 1)
+        self.assertEqual(UserStatus.objects.get(user=self.user).current_streak, 1)
+
+        call_command('recompute_streaks', stdout=StringIO())
+        status_row = UserStatus.objects.get(user=self.user)
+        self.assertEqual((status_row.current_streak, status_row.longest_streak), (3, 3))
+
+    @override_settings(BOT_SHARED_SECRET='test-secret')
+    def test_get_streak_is_single_query(self):
+        """get-streak reads the stored state in one query"""
+        self._log_days_ago(2, 1, 0)
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('bot-integration'), {'action': 'get-streak', 'discord_id': '333'},
+                                        format='json', HTTP_X_BOT_SECRET='test-secret')
+        self.assertEqual(response.data['current_streak'], 3)
+        self.assertEqual(response.data['streak_bonus'], 2)
+
+class LeaderboardPrivacyTestCase(APITestCase):
+    def setUp(self):
+        from .models import UserPreferences
+
+        self.activity = Activity.objects.create(name="Chat", activity_type="discord_activity", points_value=10)
+        self.viewer = User.objects.create_user(username="viewer", password="testpass123")
+        self.alice = User.objects.create_user(username="alice", password="testpass123", first_name="Alice",
+                                              last_name="Smith")
+        self.bob = User.objects.create_user(username="bob", password="testpass123", first_name="Bob", last_name="Jones")
+        for user in (self.alice, self.bob):
+            PointsLog.objects.create(user=user, activity=self.activity, points_earned=10)
+        self.bob_preferences = UserPreferences.objects.create(
+            user=self.bob, privacy_settings={'display_name_preference': 'username'}
+        )
+        self.client.force_authenticate(user=self.viewer)
+
+    def _names(self):
+        cache.clear()
+        return [row['display_name'] for row in self.client.get(reverse('leaderboard')).data['leaderboard']]
+
+    def test_display_names_follow_preferences_and_profile(self):
+        """Denormalised names track preference and profile changes"""
+        self.assertEqual(sorted(self._names()), ['Alice S.', 'bob'])
+
+        self.alice.first_name = 'Alicia'
+        self.alice.save()
+        self.bob_preferences.privacy_settings = {'display_name_preference': 'first_name_only'}
+        self.bob_preferences.save()
+        self.assertEqual(sorted(self._names()), ['Alicia S.', 'Bob'])
+
+        self.bob_preferences.delete()
+        self.assertEqual(sorted(self._names()), ['Alicia S.', 'Bob J.'])
+
+    def test_saves_without_name_changes_skip_preferences(self):
+        """Only username/first/last name changes re-read preferences on save"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        bob = User.objects.get(pk=self.bob.pk)
+        bob.total_points = 50
+        with CaptureQueriesContext(connection) as queries:
+            bob.save()
+        self.assertFalse([q for q in queries.captured_queries if 'user_preferences' in q['sql']])
+
+        bob.first_name = 'Robert'
+        with CaptureQueriesContext(connection) as queries:
+            bob.save()
+        self.assertTrue([q for q in queries.captured_queries if 'user_preferences' in q['sql']])
+        self.assertEqual(User.objects.get(pk=bob.pk).leaderboard_display_name, 'bob')
+
+    def test_opted_out_users_are_excluded_in_sql(self):
+        """show_in_leaderboard=False removes the user from rankings and totals"""
+        self.bob_preferences.privacy_settings = {'show_in_leaderboard': False}
+        self.bob_preferences.save()
+
+        cache.clear()
+        data = self.client.get(reverse('leaderboard')).data
+        self.assertEqual([row['username'] for row in data['leaderboard']], ['alice'])
+        self.assertEqual(data['total_participants'], 1)
+
+@override_settings(BOT_SHARED_SECRET='test-secret')
+class BotDispatchTestCase(APITestCase):
+    def setUp(self):
+        from .metrics import bot_action_metrics
+
+        bot_action_metrics.reset()
+        self.admin = User.objects.create_user(username="adminuser", password="testpass123", role="admin")
+        User.objects.create_user(username="botuser", password="testpass123", discord_id="444")
+
+    def _bot(self, payload):
+        return self.client.post(reverse('bot-integration'), payload, format='json', HTTP_X_BOT_SECRET='test-secret')
+
+    def test_schema_rejects_bad_payloads(self):
+        """Missing and mistyped fields are rejected before the handler runs"""
+        response = self._bot({'action': 'add-activity', 'discord_id': '444'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'activity_type is required')
+
+        response = self._bot({'action': 'summary', 'discord_id': '444', 'limit': 'ten'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'limit must be an integer')
+
+        response = self._bot({'action': 'no-such-action'})
+        self.assertEqual(response.data['error'], 'Unknown action')
+
+    def test_list_incentives_includes_inactive(self):
+        """The admin reward commands see every incentive through the bot transport"""
+        Incentive.objects.create(name="Hoodie", points_required=200, is_active=False)
+        Incentive.objects.create(name="Sticker", points_required=5)
+
+        response = self._bot({'action': 'list-incentives'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([(i['name'], i['is_active']) for i in response.data['incentives']],
+                         [("Sticker", True), ("Hoodie", False)])
+
+    def test_metrics_endpoint_reports_actions(self):
+        """Dispatches are recorded per action and exposed to admins only"""
+        self._bot({'action': 'summary', 'discord_id': '444'})
+        self._bot({'action': 'summary', 'discord_id': 'missing'})
+
+        self.client.force_authenticate(user=User.objects.get(username='botuser'))
+        self.assertEqual(self.client.get(reverse('bot-action-metrics')).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        actions = {a['name']: a for a in self.client.get(reverse('bot-action-metrics')).data['actions']}
+        self.assertEqual(actions['summary']['count'], 2)
+        self.assertEqual(actions['summary']['status_codes'], {'200': 1, '404': 1})
+        self.assertGreater(actions['summary']['queries']['max'], 0)
+
+@override_settings(BOT_SHARED_SECRET='test-secret')
+class PendingCountsTestCase(APITestCase):
+    def test_counts_are_cached_and_cleared_on_submission_changes(self):
+        """pending-counts answers from cache until a submission changes"""
+        from .models import EventSubmission, ResourceSubmission
+
+        cache.clear()
+        user = User.objects.create_user(username="submitter", password="testpass123", discord_id="555")
+        ResourceSubmission.objects.create(user=user, description="A link")
+        EventSubmission.objects.create(user=user, status='approved')
+
+        def pending_counts():
+            return self.client.post(reverse('bot-integration'), {'action': 'pending-counts'}, format='json',
+                                    HTTP_X_BOT_SECRET='test-secret').data
+
+        with self.assertNumQueries(1):
+            data = pending_counts()
+        self.assertEqual((data['resources'], data['events'], data['linkedin'], data['total']), (1, 0, 0, 1))
+        with self.assertNumQueries(0):
+            pending_counts()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EventSubmission.objects.create(user=user)
+        self.assertEqual(pending_counts()['events'], 1)
+
+class ReviewStatsTestCase(APITestCase):
+    def test_stats_cached_and_invalidated(self):
+        """Both entry points share one cached aggregate that ReviewRequest saves invalidate"""
+        from .models import Professional, ReviewRequest
+
+        cache.clear()
+        admin = User.objects.create_user(username="statsadmin", password="testpass123", role="admin")
+        student = User.objects.create_user(username="statsstudent", password="testpass123")
+        Professional.objects.create(name="Pro", email="pro@example.com", specialties="Tech")
+        ReviewRequest.objects.create(student=student, status='completed', rating=4)
+        ReviewRequest.objects.create(student=student)
+        self.client.force_authenticate(user=admin)
+
+        # One aggregate over review requests plus the active professional count
+        with self.assertNumQueries(2):
+            stats = self.client.get(reverse('reviewrequest-statistics')).data
+        self.assertEqual((stats['total_requests'], stats['pending_requests'], stats['completed_requests']), (2, 1, 1))
+        self.assertEqual((stats['average_rating'], stats['total_professionals'], stats['recent_requests']), (4, 1, 2))
+
+        with self.settings(BOT_SHARED_SECRET='test-secret'), self.assertNumQueries(0):
+            bot_stats = self.client.post(reverse('bot-integration'), {'action': 'review-stats'}, format='json',
+                                         HTTP_X_BOT_SECRET='test-secret').data
+        self.assertEqual(bot_stats, stats)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReviewRequest.objects.create(student=student, status='cancelled')
+        self.assertEqual(self.client.get(reverse('reviewrequest-statistics')).data['cancelled_requests'], 1)
+
+class RequestProfilingTestCase(APITestCase):
+    def setUp(self):
+        from .metrics import request_metrics
+
+        request_metrics.reset()
+        cache.clear()
+        self.admin = User.objects.create_user(username="adminuser", password="testpass123", role="admin")
+        self.client.force_authenticate(user=self.admin)
+
+    def test_routes_are_aggregated_with_cache_and_db_counters(self):
+        """Requests are grouped by route with query, cache and response size counters"""
+        self.client.get(reverse('dashboard-stats'))
+        self.client.get(reverse('dashboard-stats'))
+
+        routes = {r['name']: r for r in self.client.get(reverse('request-metrics')).data['routes']}
+        stats = routes['GET api/dashboard/stats/']
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['status_codes'], {'200': 2})
+        self.assertGreater(stats['queries']['max'], 0)
+        self.assertGreaterEqual(stats['cache_hits']['total'], 1)  # Second call is served from cache
+        self.assertGreaterEqual(stats['cache_misses']['total'], 1)
+        self.assertGreater(stats['response_bytes']['total'], 0)
+
+        self.assertEqual(self.client.delete(reverse('request-metrics')).status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_sampled_profiles_are_dumped_for_matching_paths(self):
+        """With a sample rate of 1 only requests under PROFILE_PATHS are profiled"""
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as profile_dir:
+            with self.settings(PROFILE_SAMPLE_RATE=1.0, PROFILE_PATHS=['/api/dashboard/'], PROFILE_DIR=profile_dir):
+                self.client.get(reverse('dashboard-stats'))
+                self.client.get(reverse('rewards-available'))
+            dumps = os.listdir(profile_dir)
+        self.assertEqual(len(dumps), 1)
+        self.assertIn('api_dashboard_stats', dumps[0])
+
+    def test_async_requests_are_profiled(self):
+        """Under ASGI the sampled profile wraps the awaited view too"""
+        import os
+        import tempfile
+        from asgiref.sync import async_to_sync
+
+        async def post():
+            return await self.async_client.post(reverse('bot-integration'), {'action': 'summary'},
+                                                content_type='application/json', headers={'X-Bot-Secret': 'test-secret'})
+
+        with tempfile.TemporaryDirectory() as profile_dir:
+            with self.settings(PROFILE_SAMPLE_RATE=1.0, PROFILE_PATHS=['/api/bot/'], PROFILE_DIR=profile_dir,
+                               BOT_SHARED_SECRET='test-secret'):
+                response = async_to_sync(post)()
+            dumps = os.listdir(profile_dir)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(dumps), 1)
+        self.assertIn('api_bot', dumps[0])
+
+@override_settings(BOT_SHARED_SECRET='test-secret', REQUEST_METRICS_ENABLED=False, DISCORD_TOKEN='')
+class QueryBudgetTestCase(APITestCase):
+    """
+    Query-count and latency budgets for every REST list route and bot action.
+
+    The dataset is large enough that a per-row query (N+1) blows the budget, so
+    budgets are flat numbers that must not grow with the data. On failure the
+    captured SQL is printed to make the offending query obvious.
+    """
+    USERS = 40
+    LOGS_PER_USER = 5
+    LATENCY_BUDGET_MS = 1500  # Generous: catches pathological slowness, not CI noise
+
+    # Routes not listed here are held to DEFAULT_ROUTE_BUDGET
+    DEFAULT_ROUTE_BUDGET = 3
+    ROUTE_BUDGETS = {
+        'userpreferences-activity-preferences': 4,
+        'leaderboard': 4,
+        'dashboard-bundle': 8,
+    }
+
+    # Every BotIntegrationView action must appear here; None skips actions that
+    # depend on an external service rather than the database
+    BOT_ACTION_BUDGETS = {
+        "upsert-user": 8,
+        "bulk-upsert-users": 8,
+        "add-activity": 16,
+        "link": 3,
+        "summary": 4,
+        "leaderboard": 2,
+        "admin-adjust": 13,
+        "redeem": 6,
+        "clear-warnings": 3,
+        "suspend-user": 3,
+        "unsuspend-user": 3,
+        "activitylog": 1,
+        "get-streak": 1,
+        "validate-discord-user": 2,
+        "sync-guild-members": 3,
+        "guild-member-events": 4,
+        "purge-cache": 1,
+        "review-status": 2,
+        "add-professional": 1,
+        "list-professionals": 1,
+        "match-review": 5,
+        "review-stats": 2,
+        "pending-reviews": 1,
+        "suggest-matches": 6,
+        "propose-matches": 4,
+        "schedule-session": 11,
+        "add-professional-availability": 10,
+        "submit-resource": 2,
+        "approve-resource": 14,
+        "reject-resource": 3,
+        "pending-resources": 1,
+        "submit-event": 2,
+        "approve-event": 13,
+        "reject-event": 3,
+        "pending-events": 1,
+        "submit-linkedin": 2,
+        "approve-linkedin": 13,
+        "reject-linkedin": 3,
+        "pending-linkedin": 1,
+        "pending-counts": 1,
+        "create-incentive": 2,
+        "delete-incentive": 6,
+        "update-incentive": 3,
+        "update-incentive-stock": 3,
+        "list-incentives": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import (
+            EventSubmission, LinkedInSubmission, Professional, ProfessionalAvailability, ResourceSubmission,
+            ReviewRequest, ScheduledSession, Track, UserPreferences,
+        )
+
+        now = timezone.now()
+        cls.admin = User.objects.create_user(username="budget_admin", password="testpass123", role="admin",
+                                             discord_id="900000")
+        track = Track.objects.create(name='tech', display_name='Tech')
+        activities = [
+            Activity.objects.create(name=name, activity_type=activity_type, points_value=10)
+            for activity_type, name in Activity.ACTIVITY_TYPES
+        ]
+        incentives = [
+            Incentive.objects.create(name=f"Budget Reward {i}", description="", points_required=25 * (i + 1),
+                                     stock_available=5)
+            for i in range(10)
+        ]
+        professionals = [
+            Professional.objects.create(name=f"Budget Pro {i}", email=f"pro{i}@example.com", specialties="Tech, Finance")
+            for i in range(5)
+        ]
+
+        users = User.objects.bulk_create([
+            User(username=f"budget_user_{i}", first_name=f"First{i}", last_name=f"Last{i}",
+                 discord_id=str(900001 + i), total_points=500, track=track)
+            for i in range(cls.USERS)
+        ])
+        UserStatus.objects.bulk_create([UserStatus(user=user) for user in users])
+        UserPreferences.objects.bulk_create([
+            UserPreferences(user=user, privacy_settings={'display_name_preference': 'first_name_only'})
+            for user in users[::2]
+        ])
+        PointsLog.objects.bulk_create([
+            PointsLog(user=user, activity=activities[j % len(activities)], points_earned=10,
+                      timestamp=now - timedelta(days=j))
+            for user in users for j in range(cls.LOGS_PER_USER)
+        ])
+        Redemption.objects.bulk_create([
+            Redemption(user=user, incentive=incentives[i % len(incentives)], points_spent=25)
+            for i, user in enumerate(users)
+        ])
+        review_requests = ReviewRequest.objects.bulk_create([
+            ReviewRequest(student=user, professional=None if i % 2 else professionals[i % len(professionals)],
+                          status='pending' if i % 2 else 'matched', rating=(i % 5) + 1)
+            for i, user in enumerate(users)
+        ])
+        for i, review_request in enumerate(review_requests[:10:2]):
+            ScheduledSession.objects.create(review_request=review_request, student=review_request.student,
+                                            professional=professionals[i % len(professionals)],
+                                            scheduled_time=now + timedelta(days=i + 1))
+        ProfessionalAvailability.objects.bulk_create([
+            ProfessionalAvailability(professional=professional, form_response_id=f"budget-{i}",
+                                     availability_slots=["Monday 9am-5pm"], start_date=now.date(),
+                                     end_date=(now + timedelta(days=30)).date())
+            for i, professional in enumerate(professionals)
+        ])
+        for model in (ResourceSubmission, EventSubmission, LinkedInSubmission):
+            model.objects.bulk_create([model(user=user) for user in users[:10]])
+
+        cls.users = users
+        cls.incentive = incentives[0]
+        cls.professional = professionals[0]
+
+    def setUp(self):
+        cache.clear()
+
+    def _assert_within_budget(self, label, max_queries, call):
+        from time import perf_counter
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = perf_counter()
+            response = call()
+            elapsed_ms = (perf_counter() - started) * 1000
+
+        self.assertLess(response.status_code, 500, f"{label} failed: {getattr(response, 'data', '')}")
+        if len(captured) > max_queries:
+            statements = "\n".join(f"  {i}. {query['sql']}" for i, query in enumerate(captured.captured_queries, 1))
+            self.fail(f"{label} ran {len(captured)} queries (budget {max_queries}):\n{statements}")
+        self.assertLess(elapsed_ms, self.LATENCY_BUDGET_MS, f"{label} took {elapsed_ms:.0f}ms")
+        return response
+
+    def _rest_routes(self):
+        """(name, url) for every GET list route, list-level action and standalone GET view."""
+        from .urls import router
+
+        routes = []
+        for prefix, viewset, basename in router.registry:
+            routes.append((f"{basename}-list", reverse(f"{basename}-list")))
+            for extra in viewset.get_extra_actions():
+                if not extra.detail and 'get' in extra.mapping:
+                    name = f"{basename}-{extra.url_name}"
+                    routes.append((name, reverse(name)))
+        for name in ('dashboard-stats', 'dashboard-bundle', 'points-timeline', 'leaderboard', 'rewards-available',
+                     'redemption-history', 'unified-activity-feed', 'link-status'):
+            routes.append((name, reverse(name)))
+        return routes
+
+    def test_rest_routes_within_budget(self):
+        """Every GET list route stays within its query budget for admins and students"""
+        for user in (self.admin, self.users[0]):
+            self.client.force_authenticate(user=user)
+            for name, url in self._rest_routes():
+                budget = self.ROUTE_BUDGETS.get(name, self.DEFAULT_ROUTE_BUDGET)
+                with self.subTest(route=name, role=user.role):
+                    self._assert_within_budget(f"GET {url} as {user.role}", budget, lambda: self.client.get(url))
+
+    def _bot_payloads(self):
+        """One representative payload per bot action, built against the seeded data."""
+        from .models import EventSubmission, LinkedInSubmission, ResourceSubmission
+
+        user = self.users[1]
+        pending = {
+            model: list(model.objects.filter(status='pending').values_list('id', flat=True)[:2])
+            for model in (ResourceSubmission, EventSubmission, LinkedInSubmission)
+        }
+        return {
+            "upsert-user": {"discord_id": "999999", "display_name": "Budget Newcomer"},
+            "bulk-upsert-users": {"members": [
+                {"discord_id": u.discord_id, "username": u.username} for u in self.users[:10]
+            ] + [{"discord_id": str(800000 + i), "username": f"bulk_member{i}"} for i in range(20)]},
+            "add-activity": {"discord_id": user.discord_id, "activity_type": "discord_activity"},
+            "link": {"code": "000000", "discord_id": "999998"},
+            "summary": {"discord_id": user.discord_id},
+            "leaderboard": {"page": 1, "page_size": 10},
+            "admin-adjust": {"discord_id": user.discord_id, "delta_points": 5, "reason": "budget"},
+            "redeem": {"discord_id": user.discord_id, "incentive_id": self.incentive.id},
+            "clear-warnings": {"discord_id": user.discord_id},
+            "suspend-user": {"discord_id": self.users[2].discord_id, "duration_minutes": 5},
+            "unsuspend-user": {"discord_id": self.users[2].discord_id},
+            "activitylog": {"hours": 24 * 7, "limit": 50},
+            "get-streak": {"discord_id": user.discord_id},
+            "validate-discord-user": {"discord_username": "budget_user"},
+            "sync-guild-members": {"snapshot_id": "budget", "final": True, "members": [
+                {"discord_id": str(900 + i), "username": f"member{i}"} for i in range(20)
+            ]},
+            "guild-member-events": {"events": [
+                {"type": "join", "discord_id": "999", "username": "newcomer"},
+                {"type": "leave", "discord_id": "900"},
+            ]},
+            "purge-cache": {"discord_id": user.discord_id},
+            "review-status": {"discord_id": user.discord_id},
+            "add-professional": {"name": "Budget Newcomer Pro", "email": "newpro@example.com", "specialties": "Tech"},
+            "list-professionals": {},
+            "match-review": {"discord_id": user.discord_id, "professional_id": self.professional.id},
+            "review-stats": {},
+            "pending-reviews": {},
+            "suggest-matches": {"discord_id": self.users[3].discord_id},
+            "propose-matches": {"capacity": 2},
+            "schedule-session": {"discord_id": self.users[5].discord_id, "professional_name": self.professional.name,
+                                 "scheduled_time": "2030-01-01T10:00:00Z"},
+            "add-professional-availability": {"professional_id": self.professional.id, "form_response_id": "budget-new",
+                                              "availability_slots": ["Tuesday 9am-12pm"],
+                                              "start_date": "2030-01-01", "end_date": "2030-02-01"},
+            "submit-resource": {"discord_id": user.discord_id, "description": "A useful link"},
+            "approve-resource": {"submission_id": pending[ResourceSubmission][0], "points": 10},
+            "reject-resource": {"submission_id": pending[ResourceSubmission][1], "reason": "duplicate"},
+            "pending-resources": {},
+            "submit-event": {"discord_id": user.discord_id, "event_name": "Budget Mixer"},
+            "approve-event": {"submission_id": pending[EventSubmission][0], "points": 10},
+            "reject-event": {"submission_id": pending[EventSubmission][1], "reason": "no proof"},
+            "pending-events": {},
+            "submit-linkedin": {"discord_id": user.discord_id, "description": "Posted an update"},
+            "approve-linkedin": {"submission_id": pending[LinkedInSubmission][0], "points": 10},
+            "reject-linkedin": {"submission_id": pending[LinkedInSubmission][1], "reason": "no link"},
+            "pending-linkedin": {},
+            "pending-counts": {},
+            "create-incentive": {"name": "Budget Hoodie", "description": "Warm", "points_required": 300},
+            "update-incentive": {"incentive_id": self.incentive.id, "points_required": 30},
+            "update-incentive-stock": {"incentive_id": self.incentive.id, "stock_count": 9},
+            "delete-incentive": {"incentive_id": self.incentive.id},
+            "list-incentives": {},
+        }
+
+    def test_every_bot_action_has_a_budget(self):
+        """New bot actions must declare a query budget"""
+        from .views import BotIntegrationView
+
+        self.assertEqual(set(BotIntegrationView.ACTIONS), set(self.BOT_ACTION_BUDGETS))
+        self.assertEqual(set(BotIntegrationView.ACTIONS), set(self._bot_payloads()))
+
+    def test_bot_actions_within_budget(self):
+        """Every bot action stays within its query budget"""
+        # Deletion last so the other actions still see the incentive
+        for action, payload in sorted(self._bot_payloads().items(), key=lambda item: item[0] == "delete-incentive"):
+            budget = self.BOT_ACTION_BUDGETS.get(action)
+            if budget is None:
+                continue
+            with self.subTest(action=action):
+                self._assert_within_budget(
+                    f"bot action {action}", budget,
+                    lambda: self.client.post(reverse('bot-integration'), {"action": action, **payload}, format='json',
+                                             HTTP_X_BOT_SECRET='test-secret'),
+                )
+
+@override_settings(BOT_SHARED_SECRET='test-secret')
+class AvailabilitySlotTestCase(APITestCase):
+    def test_parse_availability(self):
+        """Free text is normalised to weekday and minute windows"""
+        from .availability import parse_availability
+
+        self.assertEqual([tuple(slot)[:3] for slot in parse_availability(["Monday 2-4 PM", "wed 10 AM - 2 PM"])],
+                         [(0, 840, 960), (2, 600, 840)])
+        self.assertEqual([tuple(slot)[:3] for slot in parse_availability(["Friday evening"])], [(4, 1080, 1320)])
+        self.assertEqual([slot.weekday for slot in parse_availability(["weekday mornings"])], [0, 1, 2, 3, 4])
+        # "pm" must not read as Monday, and overnight windows split at midnight
+        self.assertEqual([tuple(slot)[:3] for slot in parse_availability(["Sunday 11pm-1am"])],
+                         [(6, 1380, 1440), (0, 0, 60)])
+        self.assertEqual(parse_availability(["whenever works", None]), [])
+
+    def test_bitmap_index_ranks_by_overlap(self):
+        """Week bitmaps count shared 15-minute cells; rows below the minimum are dropped"""
+        from .availability import AvailabilityIndex, parse_availability, week_bitmap
+
+        bitmaps = {
+            'afternoon': week_bitmap(parse_availability(["Monday 1pm-5pm"])),
+            'hour': week_bitmap(parse_availability(["Monday 3pm-6pm"])),
+            'sliver': week_bitmap(parse_availability(["Monday 4:45pm-6pm"])),
+            'empty': b'',
+        }
+        index = AvailabilityIndex(bitmaps.keys(), bitmaps.values())
+        student = week_bitmap(parse_availability(["Monday 2-4 PM"]))
+
+        self.assertEqual(index.rank(student), [('afternoon', 120), ('hour', 60)])
+        self.assertEqual(index.rank(student, min_minutes=0, limit=1), [('afternoon', 120)])
+        self.assertEqual(index.rank(b''), [])
+
+    def test_slots_stored_on_ingest_and_matched(self):
+        """Availability is parsed when stored and suggest-matches overlaps the stored slots"""
+        from datetime import date, timedelta
+        from .availability import replace_slots
+        from .models import AvailabilitySlot, Professional, ReviewRequest
+
+        def bot(payload):
+            return self.client.post(reverse('bot-integration'), payload, format='json', HTTP_X_BOT_SECRET='test-secret')
+
+        student = User.objects.create_user(username="slotstudent", password="testpass123", discord_id="777")
+        review_request = ReviewRequest.objects.create(student=student, preferred_times=["Monday 2-4 PM"])
+        replace_slots(review_request, review_request.preferred_times)
+        pro = Professional.objects.create(name="Slot Pro", email="slotpro@example.com", specialties="Tech")
+        busy_pro = Professional.objects.create(name="Busy Pro", email="busypro@example.com", specialties="Tech")
+
+        start, end = date.today().isoformat(), (date.today() + timedelta(days=30)).isoformat()
+        response = bot({'action': 'add-professional-availability', 'professional_id': pro.id, 'form_response_id': 'r1',
+                        'availability_slots': ["Monday 3pm-6pm", "Tuesday morning"],
+                        'start_date': start, 'end_date': end})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AvailabilitySlot.objects.filter(availability__professional=pro).count(), 2)
+        bot({'action': 'add-professional-availability', 'professional_id': busy_pro.id, 'form_response_id': 'r2',
+             'availability_slots': ["Friday 9am-11am"], 'start_date': start, 'end_date': end})
+
+        data = bot({'action': 'suggest-matches', 'discord_id': '777'}).data
+        self.assertEqual(data['total_matches'], 1)
+        self.assertEqual(data['matches'][0]['professional_name'], "Slot Pro")
+        self.assertEqual(data['matches'][0]['overlapping_times'], ["Monday 15:00-16:00"])
+        self.assertEqual(data['matches'][0]['overlap_minutes'], 60)
+
+class ReviewMatchingTestCase(TestCase):
+    def setUp(self):
+        from datetime import date, timedelta
+        from .availability import replace_slots
+        from .models import Professional, ProfessionalAvailability, ReviewRequest
+
+        end = date.today() + timedelta(days=30)
+        self.finance = Professional.objects.create(name="Finance Pro", email="fin@example.com",
+                                                   specialties="Finance, Consulting", rating=4)
+        self.tech = Professional.objects.create(name="Tech Pro", email="tech@example.com", specialties="Tech", rating=5)
+        for professional, texts in ((self.finance, ["Monday 9am-5pm"]), (self.tech, ["Monday 9am-12pm"])):
+            availability = ProfessionalAvailability.objects.create(
+                professional=professional, form_response_id=f"match-{professional.id}", start_date=date.today(),
+                end_date=end,
+            )
+            replace_slots(availability, texts)
+
+        self.requests = {}
+        for name, industry, times in (("fin_student", "Finance", ["Monday 10am-12pm"]),
+                                      ("tech_student", "Tech", ["Monday 10am-12pm"]),
+                                      ("late_student", "Tech", ["Monday 3pm-5pm"]),
+                                      ("sunday_student", "Tech", ["Sunday morning"])):
+            student = User.objects.create_user(username=name, password="testpass123")
+            review_request = ReviewRequest.objects.create(student=student, target_industry=industry,
+                                                          preferred_times=times)
+            replace_slots(review_request, times)
+            self.requests[name] = review_request
+
+    def test_assignment_respects_capacity_and_fit(self):
+        """Each professional takes at most `capacity` requests, by specialty and overlap, at distinct times"""
+        from .review_matching import propose_assignments
+
+        proposals = {p.student: p for p in propose_assignments(capacity=1)}
+
+        self.assertEqual(set(proposals), {"fin_student", "tech_student"})
+        self.assertEqual(proposals["fin_student"].professional_name, "Finance Pro")
+        self.assertEqual(proposals["tech_student"].professional_name, "Tech Pro")
+        self.assertEqual(proposals["tech_student"].proposed_time.weekday(), 0)
+        self.assertEqual(proposals["tech_student"].proposed_time.hour, 10)
+
+        proposals = propose_assignments(capacity=2)
+        self.assertEqual({p.student for p in proposals}, {"fin_student", "tech_student", "late_student"})
+        finance_times = [p.proposed_time for p in proposals if p.professional_name == "Finance Pro"]
+        self.assertEqual(len(finance_times), len(set(finance_times)))
+
+    def test_scheduled_sessions_block_their_cells(self):
+        """A professional's upcoming sessions are not offered again"""
+        from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+        from .models import ReviewRequest, ScheduledSession
+        from .review_matching import propose_assignments
+
+        tomorrow = date.today() + timedelta(days=1)
+        monday = tomorrow + timedelta(days=-tomorrow.weekday() % 7)
+        booked = User.objects.create_user(username="booked_student", password="testpass123")
+        ScheduledSession.objects.create(
+            review_request=ReviewRequest.objects.create(student=booked, professional=self.tech),
+            student=booked, professional=self.tech,
+            scheduled_time=datetime.combine(monday, time(10, 0), tzinfo=dt_timezone.utc),
+        )
+
+        proposals = {p.student: p for p in propose_assignments(capacity=2)}
+        self.assertEqual(proposals["tech_student"].professional_name, "Tech Pro")
+        self.assertEqual(proposals["tech_student"].proposed_time,
+                         datetime.combine(monday, time(10, 30), tzinfo=dt_timezone.utc))
+
+    def test_apply_books_sessions(self):
+        """Applying proposals books sessions at the proposed times for still-pending requests only"""
+        from .models import OutboxMessage, ScheduledSession
+        from .review_matching import apply_assignments, propose_assignments
+
+        proposals = propose_assignments(capacity=1)
+        self.requests["fin_student"].status = 'cancelled'
+        self.requests["fin_student"].save()
+
+        self.assertEqual(apply_assignments(proposals), 1)
+        self.requests["tech_student"].refresh_from_db()
+        self.assertEqual((self.requests["tech_student"].status, self.requests["tech_student"].professional),
+                         ('scheduled', self.tech))
+        session = ScheduledSession.objects.get()
+        proposed = next(p for p in proposals if p.student == "tech_student")
+        self.assertEqual((session.review_request_id, session.professional, session.scheduled_time),
+                         (self.requests["tech_student"].id, self.tech, proposed.proposed_time))
+        self.assertEqual(self.requests["tech_student"].scheduled_time, proposed.proposed_time)
+        self.assertTrue(OutboxMessage.objects.filter(kind='calendar.sync', payload={'session_id': session.id}).exists())
+        # Tech Pro is now at capacity; the freed Finance Pro takes the afternoon student
+        self.assertEqual([(p.student, p.professional_name) for p in propose_assignments(capacity=1)],
+                         [("late_student", "Finance Pro")])
+
+@override_settings(BOT_SHARED_SECRET='test-secret', CALENDAR_CLIENT='fake', DISCORD_TOKEN='')
+class OutboxTestCase(APITestCase):
+    def setUp(self):
+        from .calendar_client import fake_calendar
+        from .models import Professional, ReviewRequest
+
+        fake_calendar.reset()
+        self.calendar = fake_calendar
+        self.student = User.objects.create_user(username="outbox_student", password="testpass123",
+                                                discord_id="555", email="student@example.com")
+        self.professional = Professional.objects.create(name="Calendar Pro", email="pro@example.com")
+        ReviewRequest.objects.create(student=self.student, target_industry="Tech")
+
+    def _schedule(self):
+        return self.client.post(reverse('bot-integration'), {
+            'action': 'schedule-session', 'discord_id': '555', 'professional_name': 'Calendar Pro',
+            'scheduled_time': '2030-01-07T10:00:00Z',
+        }, format='json', HTTP_X_BOT_SECRET='test-secret')
+
+    def test_schedule_session_defers_calendar_event(self):
+        """Scheduling only records a message; the worker creates the event once, then notifies the student"""
+        from .models import OutboxMessage, ScheduledSession
+        from .outbox import drain
+
+        response = self._schedule()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.calendar.store, {})
+        message = OutboxMessage.objects.get(kind='calendar.sync')
+        self.assertEqual(message.payload, {'session_id': response.data['session_id']})
+
+        self.assertEqual(drain(), {'done': 1, 'retrying': 0, 'failed': 0})
+        session = ScheduledSession.objects.get(pk=response.data['session_id'])
+        self.assertEqual(list(self.calendar.store), [session.calendar_event_id])
+        self.assertEqual(session.calendar_synced_time, session.scheduled_time)
+        self.assertEqual(self.calendar.store[session.calendar_event_id]['attendees'],
+                         [{'email': "student@example.com"}, {'email': "pro@example.com"}])
+        # The follow-up DM is dropped without a token
+        self.assertEqual(drain(), {'done': 1, 'retrying': 0, 'failed': 0})
+
+        # A retried insert whose first response was lost hits 409 and is recorded, not duplicated
+        ScheduledSession.objects.filter(pk=session.pk).update(calendar_event_id='', calendar_synced_time=None)
+        OutboxMessage.objects.filter(pk=message.pk).update(status='pending', available_at=message.available_at)
+        self.assertEqual(drain()['done'], 1)
+        session.refresh_from_db()
+        self.assertEqual(len(self.calendar.store), 1)
+        self.assertEqual(list(self.calendar.store), [session.calendar_event_id])
+
+    def test_calendar_changes_are_batched_and_reconciled(self):
+        """Inserts, moves and cancellations go out as one batch request; drift is found by reconciliation"""
+        from datetime import timedelta
+        from .calendar_sync import out_of_sync_sessions, session_event_id, sync_sessions
+        from .models import ReviewRequest, ScheduledSession
+        from .outbox import drain
+
+        session_ids = [self._schedule().data['session_id']]
+        first_time = ScheduledSession.objects.get(pk=session_ids[0]).scheduled_time
+        for index in range(3):
+            student = User.objects.create_user(username=f"batch_student{index}", password="testpass123")
+            review_request = ReviewRequest.objects.create(student=student, target_industry="Tech")
+            session_ids.append(ScheduledSession.objects.create(
+                review_request=review_request, student=student, professional=self.professional,
+                scheduled_time=first_time + timedelta(hours=index + 1),
+            ).id)
+        drain()
+        self.assertEqual(self.calendar.batch_calls, 1)
+        self.assertEqual(set(self.calendar.store), {session_event_id(session_id) for session_id in session_ids})
+
+        moved, cancelled = ScheduledSession.objects.filter(pk__in=session_ids[:2]).order_by('id')
+        moved.scheduled_time += timedelta(days=1)
+        moved.save()
+        cancelled.status = 'cancelled'
+        cancelled.save()
+        drain()
+        self.assertEqual(self.calendar.batch_calls, 2)
+        self.assertNotIn(cancelled.calendar_event_id, self.calendar.store)
+        self.assertEqual(self.calendar.store[moved.calendar_event_id]['start']['dateTime'],
+                         moved.scheduled_time.isoformat())
+
+        # Queryset updates skip signals; the periodic pass still deletes the event
+        ScheduledSession.objects.filter(pk=session_ids[2]).update(status='cancelled')
+        self.assertEqual(list(out_of_sync_sessions().values_list('id', flat=True)), [session_ids[2]])
+        result = sync_sessions()
+        self.assertEqual((result.deleted, result.failed), (1, {}))
+        self.assertFalse(out_of_sync_sessions().exists())
+
+    def test_failures_back_off_then_give_up(self):
+        """Failed deliveries are retried with growing delays and marked failed after MAX_ATTEMPTS"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import OutboxMessage
+        from .outbox import MAX_ATTEMPTS, backoff_seconds, drain
+
+        self._schedule()
+        self.calendar.fail_next = MAX_ATTEMPTS
+        message = OutboxMessage.objects.get()
+
+        with self.assertLogs('core.outbox', 'WARNING'):
+            self.assertEqual(drain(), {'done': 0, 'retrying': 1, 'failed': 0})
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('pending', 1))
+        self.assertIn("HttpError 503", message.last_error)
+        self.assertGreater(message.available_at, timezone.now() + timedelta(seconds=backoff_seconds(1) - 5))
+        self.assertEqual(drain(), {'done': 0, 'retrying': 0, 'failed': 0})  # Not due yet
+        self.assertLess(backoff_seconds(1), backoff_seconds(2))
+
+        with self.assertLogs('core.outbox', 'WARNING') as logs:
+            for _ in range(MAX_ATTEMPTS - 1):
+                OutboxMessage.objects.filter(pk=message.pk).update(available_at=timezone.now())
+                drain()
+        self.assertIn("failed permanently", logs.output[-1])
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('failed', MAX_ATTEMPTS))
+        self.assertEqual(self.calendar.store, {})
+
+    def test_retention_sweep_deletes_old_delivered_messages(self):
+        """Delivered messages past the retention window are deleted; recent, pending and failed ones stay"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import OutboxMessage
+        from .outbox import RETENTION_DAYS, purge_delivered
+
+        old = timezone.now() - timedelta(days=RETENTION_DAYS + 1)
+        kept = [
+            OutboxMessage.objects.create(kind='unlocks.record', status='done', processed_at=timezone.now()),
+            OutboxMessage.objects.create(kind='unlocks.record', status='failed', processed_at=old),
+            OutboxMessage.objects.create(kind='unlocks.record', status='pending'),
+        ]
+        OutboxMessage.objects.create(kind='unlocks.record', status='done', processed_at=old)
+
+        self.assertEqual(purge_delivered(), 1)
+        self.assertEqual(set(OutboxMessage.objects.values_list('id', flat=True)), {message.id for message in kept})
+
+    def test_eager_messages_deliver_on_commit(self):
+        """Unlocks are recorded right after commit without waiting for the worker"""
+        from .models import OutboxMessage, UserIncentiveUnlock
+
+        Activity.objects.create(name="Discord Activity", activity_type="discord_activity", points_value=5)
+        reward = Incentive.objects.create(name="Sticker", points_required=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('bot-integration'), {
+                'action': 'add-activity', 'discord_id': '555', 'activity_type': 'discord_activity',
+            }, format='json', HTTP_X_BOT_SECRET='test-secret')
+
+        self.assertTrue(UserIncentiveUnlock.objects.filter(user=self.student, incentive=reward).exists())
+        self.assertFalse(OutboxMessage.objects.filter(kind='unlocks.record').exclude(status='done').exists())
+
+@override_settings(BOT_SHARED_SECRET='test-secret', DISCORD_TOKEN='')
+class GuildDirectoryTestCase(APITestCase):
+    def _bot(self, payload):
+        return self.client.post(reverse('bot-integration'), payload, format='json', HTTP_X_BOT_SECRET='test-secret')
+
+    def test_snapshot_and_deltas_drive_validation(self):
+        """Validation is a local case-insensitive lookup once the bot has pushed its member list"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import GuildMember
+
+        self.assertFalse(self._bot({'action': 'validate-discord-user', 'discord_username': 'Alice'}).data['valid'])
+
+        self._bot({'action': 'sync-guild-members', 'snapshot_id': 's1', 'members': [
+            {'discord_id': '1', 'username': 'alice', 'display_name': 'Alice A'},
+            {'discord_id': '2', 'username': 'bob', 'discriminator': '1234'},
+        ]})
+        response = self._bot({'action': 'sync-guild-members', 'snapshot_id': 's1', 'final': True, 'members': [
+            {'discord_id': '3', 'username': 'carol'}, {'username': 'no-id'},
+        ]})
+        self.assertEqual(response.data, {'upserted': 1, 'skipped': 1, 'removed': 0})
+
+        response = self._bot({'action': 'validate-discord-user', 'discord_username': 'ALICE'})
+        self.assertEqual((response.data['valid'], response.data['discord_id']), (True, '1'))
+        self.assertTrue(self._bot({'action': 'validate-discord-user', 'discord_username': 'bob#1234'}).data['valid'])
+        self.assertFalse(self._bot({'action': 'validate-discord-user', 'discord_username': 'bob#9999'}).data['valid'])
+        # A fresh directory answers misses itself instead of asking Discord
+        response = self.client.post(reverse('discord-validation'), {'discord_username': 'mallory'}, format='json')
+        self.assertEqual(response.data['message'], "User 'mallory' not found in Discord server")
+
+        self._bot({'action': 'guild-member-events', 'events': [
+            {'type': 'update', 'discord_id': '1', 'username': 'alice_renamed'},
+            {'type': 'leave', 'discord_id': '2'},
+            {'type': 'join', 'discord_id': '4', 'username': 'dave'},
+        ]})
+        self.assertEqual(set(GuildMember.objects.values_list('username', flat=True)), {'alice_renamed', 'carol', 'dave'})
+
+        # The next snapshot drops members it no longer lists, but not ones who joined during it
+        GuildMember.objects.update(synced_at=timezone.now() - timedelta(minutes=5))
+        self._bot({'action': 'sync-guild-members', 'snapshot_id': 's2', 'members': [
+            {'discord_id': '1', 'username': 'alice_renamed'},
+        ]})
+        self._bot({'action': 'guild-member-events', 'events': [{'type': 'join', 'discord_id': '5', 'username': 'erin'}]})
+        response = self._bot({'action': 'sync-guild-members', 'snapshot_id': 's2', 'final': True, 'members': []})
+        self.assertEqual(response.data['removed'], 2)
+        self.assertEqual(set(GuildMember.objects.values_list('discord_id', flat=True)), {'1', '5'})
+
+@override_settings(BOT_SHARED_SECRET='test-secret')
+class BulkUpsertUsersTestCase(APITestCase):
+    def test_creates_missing_members_only(self):
+        """New members get a user and status row; existing users and taken usernames are handled"""
+        existing = User.objects.create_user(username="already_here", password="testpass123", discord_id="100")
+        User.objects.create_user(username="taken_name", password="testpass123")
+
+        response = self.client.post(reverse('bot-integration'), {'action': 'bulk-upsert-users', 'members': [
+            {'discord_id': '100', 'username': 'renamed_on_discord'},
+            {'discord_id': '101', 'username': 'taken_name'},
+            {'discord_id': '102', 'display_name': 'Only Display'},
+            {'discord_id': '102', 'username': 'duplicate_in_chunk'},
+            {'username': 'no_id'},
+        ]}, format='json', HTTP_X_BOT_SECRET='test-secret')
+
+        self.assertEqual(response.data, {'received': 3, 'created': 2, 'existing': 1, 'failed': []})
+        existing.refresh_from_db()
+        self.assertEqual(existing.username, "already_here")
+        self.assertEqual(User.objects.get(discord_id='101').username, "taken_name_101")
+        self.assertEqual(User.objects.get(discord_id='102').username, "duplicate_in_chunk")
+        self.assertEqual(UserStatus.objects.filter(user__discord_id__in=['100', '101', '102']).count(), 3)
+        self.assertEqual(User.objects.get(discord_id='101').leaderboard_display_name, "taken_name_101")
+
+@override_settings(BOT_SHARED_SECRET='test-secret', DISCORD_TOKEN='')
+class AsyncBotIntegrationTestCase(APITestCase):
+    def setUp(self):
+        activity = Activity.objects.create(name="Discord Activity", activity_type="discord_activity", points_value=5)
+        for index in range(3):
+            user = User.objects.create_user(username=f"async_user{index}", password="testpass123",
+                                            discord_id=f"90{index}", total_points=10 * (index + 1))
+            UserStatus.objects.create(user=user, current_streak=index)
+            PointsLog.objects.create(user=user, activity=activity, points_earned=10 * (index + 1), details="seed")
+        Incentive.objects.create(name="Sticker", points_required=15)
+
+    def test_async_actions_match_sync_view(self):
+        """Actions served on the event loop answer exactly like BotIntegrationView"""
+        from rest_framework.test import APIRequestFactory
+        from .views import BotIntegrationView
+
+        payloads = [
+            {'action': 'summary', 'discord_id': '902', 'limit': 5},
+            {'action': 'summary', 'discord_id': 'missing'},
+            {'action': 'summary'},
+            {'action': 'leaderboard', 'page': 1, 'page_size': 2},
+            {'action': 'leaderboard', 'page': 9, 'page_size': 2},
+            {'action': 'get-streak', 'discord_id': '901'},
+            {'action': 'validate-discord-user', 'discord_username': 'nobody'},
+            {'action': 'upsert-user', 'discord_id': '901', 'username': 'ignored'},
+        ]
+        sync_view = BotIntegrationView.as_view()
+        factory = APIRequestFactory()
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                expected = sync_view(factory.post('/api/bot/', payload, format='json', HTTP_X_BOT_SECRET='test-secret'))
+                response = self.client.post(reverse('bot-integration'), payload, format='json',
+                                            HTTP_X_BOT_SECRET='test-secret')
+                self.assertEqual((response.status_code, response.data), (expected.status_code, expected.data))
+
+        response = self.client.post(reverse('bot-integration'), {'action': 'upsert-user', 'discord_id': '999'},
+                                    format='json', HTTP_X_BOT_SECRET='test-secret')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(UserStatus.objects.filter(user__discord_id='999').exists())
+        self.assertEqual(self.client.post(reverse('bot-integration'), {'action': 'summary', 'discord_id': '900'},
+                                          format='json').status_code, 401)
+
+class ConnectionPoolTestCase(TestCase):
+    class FakeConnection:
+        """Just enough of a psycopg2 connection for the pool"""
+        def __init__(self):
+            self.closed = False
+            self.alive = True
+            self.rollbacks = 0
+            self.info = type('Info', (), {'transaction_status': 0})()
+
+        def rollback(self):
+            self.rollbacks += 1
+            self.info.transaction_status = 0
+
+        def cursor(self):
+            from contextlib import nullcontext
+            if not self.alive:
+                raise ConnectionError("server closed the connection")
+            return nullcontext(type('Cursor', (), {'execute': lambda cursor, sql: None})())
+
+        def close(self):
+            self.closed = True
+
+    def test_reuses_checks_and_bounds_connections(self):
+        """Returned connections are reused, dead ones replaced, and checkouts wait for a free slot"""
+        from django.db import OperationalError
+        from .db_backends.base import ConnectionPool
+
+        pool = ConnectionPool(max_size=2, timeout=0.05, check_after=0)
+        first = pool.get(self.FakeConnection)
+        first.info.transaction_status = 2  # INTRANS: left open by a failed request
+        pool.put(first)
+        self.assertEqual(first.rollbacks, 1)
+        self.assertIs(pool.get(self.FakeConnection), first)
+
+        second = pool.get(self.FakeConnection)
+        with self.assertRaises(OperationalError):
+            pool.get(self.FakeConnection)
+        self.assertEqual(pool.connects, 2)
+
+        # A connection the server dropped while idle fails the check and is replaced
+        first.alive = False
+        pool.put(first)
+        replacement = pool.get(self.FakeConnection)
+        self.assertIsNot(replacement, first)
+        self.assertTrue(first.closed)
+        pool.put(second)
+        pool.put(replacement)
+        pool.close()
+        self.assertTrue(second.closed and replacement.closed)
+
+@override_settings(BOT_SHARED_SECRET='test-secret', CACHES={
+    'default': {'BACKEND': 'core.cache_backends.DatabaseCache', 'LOCATION': 'bot_transport_cache'},
+})
+class BotTransportTestCase(LiveServerTestCase):
+    """The bot's backend calls give the same results over HTTP and in-process"""
+
+    def setUp(self):
+        from django.core.management import call_command
+
+        call_command('createcachetable', verbosity=0)
+
+    def test_actions_behave_the_same_on_both_transports(self):
+        from asgiref.sync import async_to_sync
+        from bot_transport import HttpTransport, InProcessTransport
+
+        Activity.objects.create(name="Chat", activity_type="discord_activity", points_value=10)
+        transports = [HttpTransport(self.live_server_url, 'test-secret'), InProcessTransport()]
+        for discord_id, transport in enumerate(transports, 1000):
+            with self.subTest(transport=type(transport).__name__):
+                async_to_sync(self._exercise)(transport, str(discord_id))
+
+    async def _exercise(self, transport, discord_id):
+        async def call(payload):
+            async with transport.post(payload) as response:
+                return response.status, await response.json()
+
+        try:
+            # These actions run in Django's sync thread on both transports
+            status_code, data = await call({"action": "upsert-user", "discord_id": discord_id,
+                                            "display_name": f"member{discord_id}"})
+            self.assertEqual((status_code, data["created"]), (201, True))
+            status_code, data = await call({"action": "add-activity", "discord_id": discord_id,
+                                            "activity_type": "discord_activity"})
+            self.assertEqual(status_code, 200)
+            status_code, data = await call({"action": "summary", "discord_id": discord_id})
+            self.assertEqual((status_code, data["total_points"]), (200, 10))
+            self.assertIsInstance(data["recent_logs"][0]["timestamp"], str)
+
+            self.assertEqual(await call({"action": "summary"}), (400, {"error": "discord_id is required"}))
+            self.assertEqual(await call({"action": "summary", "discord_id": "404"}), (404, {"error": "User not found"}))
+            self.assertEqual(await call({"action": "no-such-action"}), (400, {"error": "Unknown action"}))
+        finally:
+            await transport.close()
+
+    def test_inprocess_writes_reach_other_processes(self):
+        """Purges and data-version bumps made by the bot's process are seen through another cache client"""
+        from asgiref.sync import async_to_sync
+        from django.core.cache.backends.db import DatabaseCache
+        from bot_transport import InProcessTransport
+        from .caching import bump_data_version
+
+        Activity.objects.create(name="Chat", activity_type="discord_activity", points_value=10)
+        user = User.objects.create_user(username="cached_member", password="testpass123", discord_id="2000")
+        # What a web worker has cached for this user, read through its own client of the shared cache
+        web_cache = DatabaseCache('bot_transport_cache', {})
+        set_user_cache('dashboard', user.id, f"dashboard_stats_{user.id}_7days", {'total_points': 0}, 300)
+        bump_data_version('user', user.id)
+        version = web_cache.get(f"data_version_user_{user.id}")
+        self.assertIsNotNone(web_cache.get(f"dashboard_stats_{user.id}_7days"))
+
+        async def add_activity(transport):
+            async with transport.post({"action": "add-activity", "discord_id": "2000",
+                                       "activity_type": "discord_activity"}) as response:
+                return response.status
+
+        self.assertEqual(async_to_sync(add_activity)(InProcessTransport()), 200)
+        self.assertIsNone(web_cache.get(f"dashboard_stats_{user.id}_7days"))
+        self.assertNotEqual(web_cache.get(f"data_version_user_{user.id}"), version)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'core.cache_backends.LocMemCache'}})
+    def test_inprocess_refuses_per_process_cache(self):
+        """A bot with its own LocMem cache would leave the web workers serving stale data"""
+        from django.core.exceptions import ImproperlyConfigured
+        from bot_transport import InProcessTransport
+
+        with self.assertRaises(ImproperlyConfigured):
+            InProcessTransport()
+
+class ReplicaRoutingTestCase(APITestCase):
+    """Runs against a second SQLite database standing in for a lagging replica"""
+
+    @classmethod
+    def setUpClass(cls):
+        import tempfile
+        from django.db import connections
+
+        cls.replica_dir = tempfile.TemporaryDirectory()
+        connections.settings['replica'] = connections.configure_settings({
+            'default': dict(connections.settings['default']),
+            'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': f"{cls.replica_dir.name}/replica.sqlite3"},
+        })['replica']
+        with connections['replica'].schema_editor() as editor:
+            for model in (Track, User, Activity, PointsLog):
+                editor.create_model(model)
+        # Only the replica has this user, so a response listing them was read from the replica
+        activity = Activity.objects.using('replica').create(name="Chat", activity_type="discord_activity", points_value=10)
+        replica_user = User.objects.using('replica').create(username="replica_only")
+        # bulk_create: no signals, whose side effects would be written to the primary. The id is below
+        # any primary id, so this row never counts as the replica having replayed the primary's newest log
+        PointsLog.objects.using('replica').bulk_create([
+            PointsLog(pk=0, user=replica_user, activity=activity, points_earned=10)
+        ])
+        # Declared here rather than on the class so the test runner does not try to create the alias
+        cls.databases = {'default', 'replica'}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        from django.db import connections
+
+        super().tearDownClass()
+        connections['replica'].close()
+        delattr(connections._connections, 'replica')
+        del connections.settings['replica']
+        cls.replica_dir.cleanup()
+
+    def setUp(self):
+        cache.clear()
+        self.activity = Activity.objects.create(name="Chat", activity_type="discord_activity", points_value=10)
+        self.viewer = User.objects.create_user(username="viewer", password="testpass123")
+        self.client.force_authenticate(user=self.viewer)
+
+    def _leaderboard_usernames(self):
+        purge_caches(namespace='leaderboard')
+        return [row['username'] for row in self.client.get(reverse('leaderboard')).data['leaderboard']]
+
+    def test_analytics_reads_use_replica_and_writes_pin_primary(self):
+        """Leaderboard reads hit the replica unless the reader is pinned or the replica lacks the newest points"""
+        from .db_routers import is_pinned
+
+        self.assertEqual(self._leaderboard_usernames(), ['replica_only'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            log = PointsLog.objects.create(user=self.viewer, activity=self.activity, points_earned=10)
+        self.assertFalse(PointsLog.objects.using('replica').filter(user__username='viewer').exists())
+        self.assertEqual(self._leaderboard_usernames(), ['viewer'])
+
+        # The viewer's own data is pinned for them only; points writes never pin everyone
+        self.assertTrue(is_pinned(['user'], self.viewer.id))
+        self.assertFalse(is_pinned(['user'], self.viewer.id + 1))
+        self.assertFalse(is_pinned(['leaderboard']))
+        # Pins are in the primary database, so processes with their own (empty) cache see them too
+        cache.clear()
+        self.assertTrue(is_pinned(['user'], self.viewer.id))
+
+        # Another reader stays on the primary until the replica has replayed the newest points log
+        self.client.force_authenticate(user=User.objects.create_user(username="bystander", password="testpass123"))
+        self.assertEqual(self._leaderboard_usernames(), ['viewer'])
+        replica_user = User.objects.using('replica').get(username='replica_only')
+        PointsLog.objects.using('replica').bulk_create([
+            PointsLog(pk=log.pk, user=replica_user, activity=Activity.objects.using('replica').get(), points_earned=10)
+        ])
+        self.assertEqual(self._leaderboard_usernames(), ['replica_only'])
+
+class LoadDataGeneratorTestCase(TestCase):
+    def test_generates_consistent_dataset(self):
+        """Generated users, logs and balances line up, and rows are written in chunks"""
+        from django.db.models import Sum
+        from .load_data import LoadDataGenerator
+        from .models import DiscordEventLog, ReviewRequest
+
+        generator = LoadDataGenerator(seed=7, chunk_size=25)
+        counts = generator.generate(users=30, logs_per_user=4, redemptions=10, submissions=3, review_requests=5,
+                                    professionals=2, availability=2, discord_events=40)
+
+        self.assertEqual(User.objects.filter(username__startswith='load_user_').count(), 30)
+        self.assertEqual(UserStatus.objects.count(), 30)
+        self.assertEqual(counts['points_log'], PointsLog.objects.count())
+        self.assertEqual(DiscordEventLog.objects.count(), 40)
+        self.assertEqual(ReviewRequest.objects.count(), 5)
+
+        user = User.objects.filter(username__startswith='load_user_', points_logs__isnull=False).first()
+        earned = user.points_logs.aggregate(total=Sum('points_earned'))['total'] or 0
+        spent = user.redemptions.aggregate(total=Sum('points_spent'))['total'] or 0
+        self.assertEqual(user.total_points, earned - spent)
+        # auto_now_add fields keep the generated (historic) timestamps
+        self.assertLess(DiscordEventLog.objects.order_by('timestamp').first().timestamp, generator.now)
+
+    def test_copy_value_escaping(self):
+        """Values are encoded for PostgreSQL COPY text format"""
+        from .load_data import _copy_value
+
+        self.assertEqual(_copy_value(None), '\\N')
+        self.assertEqual(_copy_value(True), 't')
+        self.assertEqual(_copy_value('a\tb\nc\\'), 'a\\tb\\nc\\\\')
+        self.assertEqual(_copy_value({'k': [1]}), '{"k": [1]}')
+
 class ModelTestCase(TestCase):
     def test_user_creation(self):
         """Test user model creation"""
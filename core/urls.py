@@ -1,8 +1,9 @@
 from django.urls import path, include
 from .views import (
-    BotIntegrationView, LinkView, FormSubmissionView, ProfessionalAvailabilityFormView, DiscordValidationView,
-    DashboardStatsView, PointsTimelineView, LeaderboardView, RewardsAvailableView, RedeemRewardView, RedemptionHistoryView,
-    UnifiedActivityFeedView, ClearRewardsCacheView, ClearUserCachesView, health_check
+    AsyncBotIntegrationView, LinkView, FormSubmissionView, ProfessionalAvailabilityFormView, DiscordValidationView,
+    DashboardStatsView, DashboardBundleView, PointsTimelineView, LeaderboardView, RewardsAvailableView, RedeemRewardView, RedemptionHistoryView,
+    UnifiedActivityFeedView, ClearRewardsCacheView, ClearUserCachesView, BotActionMetricsView, RequestMetricsView,
+    health_check
 )
 from rest_framework.routers import DefaultRouter
 from .views import (
@@ -35,6 +36,7 @@ urlpatterns = [
     
     # New frontend API endpoints
     path('api/dashboard/stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('api/dashboard/bundle/', DashboardBundleView.as_view(), name='dashboard-bundle'),
     path('api/points/timeline/', PointsTimelineView.as_view(), name='points-timeline'),
     path('api/leaderboard/', LeaderboardView.as_view(), name='leaderboard'),
     path('api/rewards/available/', RewardsAvailableView.as_view(), name='rewards-available'),
@@ -45,7 +47,9 @@ urlpatterns = [
     path('api/activity/feed/', UnifiedActivityFeedView.as_view(), name='unified-activity-feed'),
     
     # Existing endpoints
-    path('api/bot/', BotIntegrationView.as_view(), name='bot-integration'),
+    path('api/bot/', AsyncBotIntegrationView.as_view(), name='bot-integration'),
+    path('api/metrics/requests/', RequestMetricsView.as_view(), name='request-metrics'),
+    path('api/metrics/bot-actions/', BotActionMetricsView.as_view(), name='bot-action-metrics'),
     path('api/validate-discord-user/', DiscordValidationView.as_view(), name='discord-validation'),
     path('api/link/start', LinkView.as_view(), name='link-start'),
     path('api/link/status', LinkView.as_view(), name='link-status'),
@@ -1,5 +1,6 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -8,12 +9,36 @@ from django.db import transaction, models
 from django.utils import timezone
 from django.core.cache import cache
 from django.views.decorators.cache import cache_page
+from django.views.decorators.http import condition
 from django.utils.decorators import method_decorator
+from django.views import View
+from asgiref.sync import sync_to_async
+import json
 import logging
 import requests
+import time
 
 logger = logging.getLogger(__name__)
 from .models import User, Track, Activity, PointsLog, Incentive, Redemption, UserStatus, UserIncentiveUnlock, DiscordLinkCode, Professional, ReviewRequest, ScheduledSession, ProfessionalAvailability, ResourceSubmission, EventSubmission, LinkedInSubmission, UserPreferences, PartnerMetrics
+from .availability import (
+    CELL_MINUTES, MAX_SUGGESTED_MATCHES, AvailabilityIndex, format_window, overlapping_windows, replace_slots,
+    week_bitmap,
+)
+from .caching import CACHE_NAMESPACES, data_version_etag, purge_caches, set_user_cache, versioned_key
+from .db_routers import read_from_replica, replica_has_latest
+from .dashboard import (
+    DASHBOARD_SECTIONS, FEED_MAX_LIMIT, build_activity_feed, build_dashboard_bundle, build_dashboard_stats,
+    build_leaderboard, build_points_timeline, build_rewards_available, get_cached_section
+)
+from .guild_directory import (
+    apply_member_events, apply_member_snapshot, avalidate_discord_username, validate_discord_username,
+)
+from .review_matching import DEFAULT_CAPACITY as DEFAULT_MATCH_CAPACITY, apply_assignments, propose_assignments
+from .stats import pending_submission_counts, review_request_stats
+from .streaks import effective_current_streak, streak_bonus
+from .bot_actions import BotAction, BOOL, DICT, INT, LIST, STR
+from .outbox import enqueue
+from .metrics import QueryCounter, bot_action_metrics, request_metrics
 from .serializers import (
     UserSerializer, TrackSerializer, ActivitySerializer, PointsLogSerializer,
     IncentiveSerializer, RedemptionSerializer, UserStatusSerializer, DiscordLinkCodeSerializer,
@@ -23,65 +48,6 @@ from .serializers import (
     PartnerMetricsSerializer
 )
 
-def invalidate_user_caches(user_id):
-    """
-    Invalidate all cached data for a specific user when their points/activities change.
-    This ensures users see updated data immediately after activities are added.
-    
-    Args:
-        user_id: The ID of the user whose caches should be invalidated
-    """
-    try:
-        logger.info(f"🔥 CACHE INVALIDATION START for user {user_id}")
-        
-        # Count successful deletions for debugging
-        deleted_count = 0
-        
-        # Activity-related caches - these change most frequently
-        keys_to_delete = [
-            f"activity_feed_{user_id}_lifetime",
-            f"points_history_{user_id}_lifetime",
-            f"rewards_available_{user_id}",
-        ]
-        
-        # Dashboard stats caches - invalidate all periods
-        for period in ['7days', '30days', '90days']:
-            keys_to_delete.append(f"dashboard_stats_{user_id}_{period}")
-        
-        # Points timeline caches - invalidate common configurations
-        for granularity in ['daily', 'weekly', 'monthly']:
-            for days in [7, 30, 90, 365]:
-                keys_to_delete.append(f"points_timeline_{user_id}_{granularity}_{days}")
-        
-        # Limited/paginated caches - invalidate common limits
-        common_limits = [10, 20, 50, 100, 500, 1000]
-        for limit in common_limits:
-            keys_to_delete.append(f"activity_feed_{user_id}_{limit}")
-            keys_to_delete.append(f"points_history_{user_id}_{limit}")
-        
-        # Leaderboard caches - invalidate for all periods and common limits
-        leaderboard_periods = ['all_time', 'weekly', 'monthly']
-        leaderboard_limits = [10, 20, 50, 100]
-        for period in leaderboard_periods:
-            for limit in leaderboard_limits:
-                keys_to_delete.append(f"leaderboard_{period}_{limit}_{user_id}")
-        
-        # Delete all keys and count successes
-        for key in keys_to_delete:
-            if cache.delete(key):
-                deleted_count += 1
-                logger.info(f"✅ Deleted cache key: {key}")
-            else:
-                logger.info(f"⚪ Cache key not found (already expired): {key}")
-        
-        logger.info(f"🎉 CACHE INVALIDATION COMPLETED for user {user_id} - Deleted {deleted_count}/{len(keys_to_delete)} keys")
-        
-    except Exception as e:
-        logger.error(f"❌ CACHE INVALIDATION FAILED for user {user_id}: {str(e)}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        # Don't re-raise the exception to avoid breaking the main flow
-
 class TrackViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet for managing career tracks"""
     queryset = Track.objects.filter(is_active=True)
@@ -96,7 +62,7 @@ class TrackViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 class UserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all()
+    queryset = User.objects.select_related('track')
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -344,9 +310,7 @@ class UserViewSet(viewsets.ModelViewSet):
             user_status.last_activity = timezone.now()
             user_status.save()
         
-            # CACHE INVALIDATION: Clear user's cached data after transaction commits
-            # This ensures immediate updates in the frontend
-            invalidate_user_caches(user.id)
+            # CACHE INVALIDATION: core.signals purges this user's caches and bumps their data version on commit
             
             return Response({
                 'message': f'Added {activity.points_value} points for {activity.name}',
@@ -438,6 +402,7 @@ class PointsLogViewSet(viewsets.ReadOnlyModelViewSet):
         else:
             limit = None
             cache_key = f"points_history_{request.user.id}_lifetime"
+        cache_key = versioned_key('history', cache_key)
         
         cached_data = cache.get(cache_key)
         if cached_data:
@@ -467,7 +432,7 @@ class PointsLogViewSet(viewsets.ReadOnlyModelViewSet):
         
         # CACHE: Store results for 24 hours (86400 seconds) - Points history with cache invalidation
         # Long TTL since cache invalidation handles real-time updates
-        cache.set(cache_key, response_data, 86400)
+        set_user_cache('history', request.user.id, cache_key, response_data, 86400)
         
         return Response(response_data)
 
@@ -521,10 +486,6 @@ class IncentiveViewSet(viewsets.ModelViewSet):
         incentive.is_active = not incentive.is_active
         incentive.save()
         
-        # Clear cache for all users since rewards changed
-        from django.core.cache import cache
-        cache.delete_many(cache.keys('rewards_available_*'))
-        
         return Response({
             'success': True,
             'incentive_id': incentive.id,
@@ -549,9 +510,11 @@ class RedemptionViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Users can only see their own redemptions, admins see all"""
+        # OPTIMIZED: Serializer reads user.username and incentive name/image per row
+        queryset = Redemption.objects.select_related('user', 'incentive')
         if self.request.user.role == 'admin':
-            return Redemption.objects.all()
-        return Redemption.objects.filter(user=self.request.user)
+            return queryset
+        return queryset.filter(user=self.request.user)
     
     @action(detail=False, methods=['post'])
     def redeem(self, request):
@@ -601,9 +564,7 @@ class RedemptionViewSet(viewsets.ModelViewSet):
         redemption.admin_notes = request.data.get('notes', '')
         redemption.save()
         
-        # CACHE INVALIDATION: Clear user's cached data after redemption status change
-        # This ensures immediate updates in the frontend
-        invalidate_user_caches(redemption.user.id)
+        # CACHE INVALIDATION: core.signals purges this user's caches and bumps their data version on commit
         
         return Response({'message': 'Redemption approved'})
     
@@ -627,9 +588,7 @@ class RedemptionViewSet(viewsets.ModelViewSet):
             redemption.admin_notes = request.data.get('notes', '')
             redemption.save()
         
-        # CACHE INVALIDATION: Clear user's cached data after points refund
-        # This ensures immediate updates in the frontend
-        invalidate_user_caches(redemption.user.id)
+        # CACHE INVALIDATION: core.signals purges this user's caches and bumps their data version on commit
         
         return Response({'message': 'Redemption rejected and points refunded'})
 
@@ -639,9 +598,10 @@ class UserStatusViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_queryset(self):
         """Users can only see their own status, admins see all"""
+        queryset = UserStatus.objects.select_related('user')
         if self.request.user.role == 'admin':
-            return UserStatus.objects.all()
-        return UserStatus.objects.filter(user=self.request.user)
+            return queryset
+        return queryset.filter(user=self.request.user)
 
 class ProfessionalViewSet(viewsets.ModelViewSet):
     queryset = Professional.objects.all()
@@ -650,10 +610,14 @@ class ProfessionalViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter based on user role"""
+        # OPTIMIZED: review_count annotated in the same query instead of one COUNT per professional
+        queryset = Professional.objects.annotate(
+            completed_review_count=models.Count('assigned_reviews', filter=models.Q(assigned_reviews__status='completed'))
+        )
         if self.request.user.role == 'admin':
-            return Professional.objects.all()
+            return queryset
         # Non-admin users can only view active professionals
-        return Professional.objects.filter(is_active=True)
+        return queryset.filter(is_active=True)
     
     def perform_create(self, serializer):
         """Only admins can create professionals"""
@@ -679,13 +643,20 @@ class ReviewRequestViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Users can only see their own requests, admins see all"""
+        queryset = ReviewRequest.objects.select_related('student', 'professional')
         if self.request.user.role == 'admin':
-            return ReviewRequest.objects.all()
-        return ReviewRequest.objects.filter(student=self.request.user)
+            return queryset
+        return queryset.filter(student=self.request.user)
     
     def perform_create(self, serializer):
         """Set the student to current user"""
-        serializer.save(student=self.request.user)
+        review_request = serializer.save(student=self.request.user)
+        replace_slots(review_request, review_request.preferred_times)
+    
+    def perform_update(self, serializer):
+        review_request = serializer.save()
+        if 'preferred_times' in serializer.validated_data:
+            replace_slots(review_request, review_request.preferred_times)
     
     @action(detail=True, methods=['post'])
     def assign_professional(self, request, pk=None):
@@ -739,27 +710,21 @@ class ReviewRequestViewSet(viewsets.ModelViewSet):
         if request.user.role != 'admin':
             return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
         
-        pending_requests = ReviewRequest.objects.filter(status='pending').order_by('-submission_date')
+        # OPTIMIZED: select_related - the serializer reads student.username and professional.name per row
+        pending_requests = ReviewRequest.objects.filter(status='pending').select_related(
+            'student', 'professional'
+        ).order_by('-submission_date')
         serializer = ReviewRequestSerializer(pending_requests, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @method_decorator(read_from_replica('stats'))
     def statistics(self, request):
         """Get review request statistics (admin only)"""
         if request.user.role != 'admin':
             return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
         
-        from django.db.models import Count, Avg
-        
-        stats = {
-            'total_requests': ReviewRequest.objects.count(),
-            'pending_requests': ReviewRequest.objects.filter(status='pending').count(),
-            'matched_requests': ReviewRequest.objects.filter(status='matched').count(),
-            'completed_requests': ReviewRequest.objects.filter(status='completed').count(),
-            'cancelled_requests': ReviewRequest.objects.filter(status='cancelled').count(),
-            'average_rating': ReviewRequest.objects.filter(rating__isnull=False).aggregate(Avg('rating'))['rating__avg'] or 0,
-            'total_professionals': Professional.objects.filter(is_active=True).count(),
-        }
+        stats = review_request_stats()
         
         return Response(stats)
 
@@ -769,9 +734,10 @@ class ScheduledSessionViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Users can only see their own sessions, admins see all"""
+        queryset = ScheduledSession.objects.select_related('student', 'professional', 'review_request')
         if self.request.user.role == 'admin':
-            return ScheduledSession.objects.all()
-        return ScheduledSession.objects.filter(
+            return queryset
+        return queryset.filter(
             models.Q(student=self.request.user) | 
             models.Q(professional__email=self.request.user.email)
         )
@@ -849,16 +815,23 @@ class ProfessionalAvailabilityViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter based on user role"""
+        queryset = ProfessionalAvailability.objects.select_related('professional')
         if self.request.user.role == 'admin':
-            return ProfessionalAvailability.objects.all()
+            return queryset
         # Professionals can only see their own availability
-        return ProfessionalAvailability.objects.filter(professional__email=self.request.user.email)
+        return queryset.filter(professional__email=self.request.user.email)
     
     def perform_create(self, serializer):
         """Only admins and professionals can create availability records"""
         if self.request.user.role not in ['admin'] and not Professional.objects.filter(email=self.request.user.email).exists():
             raise permissions.PermissionDenied("Only admins and professionals can create availability records")
-        serializer.save()
+        availability = serializer.save()
+        replace_slots(availability, availability.availability_slots)
+    
+    def perform_update(self, serializer):
+        availability = serializer.save()
+        if 'availability_slots' in serializer.validated_data:
+            replace_slots(availability, availability.availability_slots)
     
     @action(detail=False, methods=['get'])
     def active_availability(self, request):
@@ -884,114 +857,14 @@ class DashboardStatsView(APIView):
     """Dashboard statistics with trends endpoint - HIGHLY OPTIMIZED with CACHING"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @method_decorator(condition(etag_func=data_version_etag('user', 'catalog')))
     def get(self, request):
         """Get dashboard statistics with period-over-period comparison - CACHED"""
-        from datetime import datetime, timedelta
-        from django.db.models import Count, Sum
-        
-        # CACHING: Check for cached dashboard stats first
-        period = request.GET.get('period', '30days')
-        cache_key = f"dashboard_stats_{request.user.id}_{period}"
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return Response(cached_data)
-        
-        period = request.GET.get('period', '30days')
-        
-        # Calculate date ranges
-        now = timezone.now()
-        if period == '7days':
-            current_start = now - timedelta(days=7)
-            previous_start = now - timedelta(days=14)
-            previous_end = current_start
-        elif period == '90days':
-            current_start = now - timedelta(days=90)
-            previous_start = now - timedelta(days=180)
-            previous_end = current_start
-        else:  # 30days default
-            current_start = now - timedelta(days=30)
-            previous_start = now - timedelta(days=60)
-            previous_end = current_start
-        
-        user = request.user
-        
-        # OPTIMIZED: Single query for current period stats using index
-        # Uses idx_points_logs_user_timestamp for optimal performance
-        current_stats = PointsLog.objects.filter(
-            user=user,
-            timestamp__gte=current_start
-        ).aggregate(
-            points_earned=Sum('points_earned'),
-            activity_count=Count('id')
+        params = {'period': request.GET.get('period', '30days')}
+        response_data = get_cached_section(
+            'stats', request.user, params,
+            lambda: build_dashboard_stats(request.user, params['period'])
         )
-        current_points_earned = current_stats['points_earned'] or 0
-        current_activities = current_stats['activity_count'] or 0
-        
-        # OPTIMIZED: Single query for previous period stats
-        previous_stats = PointsLog.objects.filter(
-            user=user,
-            timestamp__gte=previous_start,
-            timestamp__lt=previous_end
-        ).aggregate(
-            points_earned=Sum('points_earned'),
-            activity_count=Count('id')
-        )
-        previous_points_earned = previous_stats['points_earned'] or 0
-        previous_activities = previous_stats['activity_count'] or 0
-        
-        # Calculate trends
-        def calculate_trend(current, previous):
-            if previous == 0:
-                return {
-                    'change': current,
-                    'percentage': 100.0 if current > 0 else 0.0,
-                    'direction': 'up' if current > 0 else 'neutral'
-                }
-            
-            change = current - previous
-            percentage = (change / previous) * 100
-            direction = 'up' if change > 0 else 'down' if change < 0 else 'neutral'
-            
-            return {
-                'change': change,
-                'percentage': round(percentage, 2),
-                'direction': direction
-            }
-        
-        # Available rewards count
-        available_rewards = Incentive.objects.filter(
-            is_active=True,
-            points_required__lte=user.total_points
-        ).count()
-        
-        # CACHING: Prepare response data
-        response_data = {
-            'current_period': {
-                'total_points': user.total_points,
-                'activities_completed': current_activities,
-                'points_earned': current_points_earned,
-                'start_date': current_start.date().isoformat(),
-                'end_date': now.date().isoformat()
-            },
-            'previous_period': {
-                'total_points': user.total_points - current_points_earned,
-                'activities_completed': previous_activities,
-                'points_earned': previous_points_earned,
-                'start_date': previous_start.date().isoformat(),
-                'end_date': previous_end.date().isoformat()
-            },
-            'trends': {
-                'total_points': calculate_trend(user.total_points, user.total_points - current_points_earned),
-                'activities_completed': calculate_trend(current_activities, previous_activities),
-                'points_earned': calculate_trend(current_points_earned, previous_points_earned)
-            }
-        }
-        
-        # CACHE: Store results for 24 hours (86400 seconds) - Dashboard stats with cache invalidation
-        # Long TTL since cache invalidation handles real-time updates
-        cache.set(cache_key, response_data, 86400)
-        
         return Response(response_data)
 
 
@@ -999,188 +872,18 @@ class PointsTimelineView(APIView):
     """Points timeline chart endpoint - HIGHLY OPTIMIZED"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @method_decorator(condition(etag_func=data_version_etag('user')))
+    @method_decorator(read_from_replica('user'))
     def get(self, request):
         """Get historical points data grouped by time periods - OPTIMIZED"""
-        from datetime import datetime, timedelta, date
-        from django.db.models import Sum, Q
-        from django.db import connection
-        
-        granularity = request.GET.get('granularity', 'daily')
-        days = int(request.GET.get('days', 30))
-        
-        user = request.user
-        start_date = timezone.now() - timedelta(days=days)
-        
-        # CACHE: Check for cached timeline data
-        cache_key = f"points_timeline_{user.id}_{granularity}_{days}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-        
-        # OPTIMIZED: Single query for all points logs in period with aggregation
-        # Uses idx_points_logs_user_timestamp index
-        logs_aggregated = PointsLog.objects.filter(
-            user=user,
-            timestamp__gte=start_date
-        ).extra(
-            select={'date': "DATE(timestamp)"}
-        ).values('date').annotate(
-            points_earned=Sum('points_earned'),
-            activities_count=Sum(1)
-        ).order_by('date')
-        
-        # OPTIMIZED: Single query for all redemptions in period with aggregation
-        # Uses idx_redemptions_user_timestamp index
-        redemptions_aggregated = Redemption.objects.filter(
-            user=user,
-            redeemed_at__gte=start_date
-        ).extra(
-            select={'date': "DATE(redeemed_at)"}
-        ).values('date').annotate(
-            points_spent=Sum('points_spent'),
-            redemptions_count=Sum(1)
-        ).order_by('date')
-        
-        # Convert to dictionaries for fast lookup
-        logs_dict = {item['date']: item for item in logs_aggregated}
-        redemptions_dict = {item['date']: item for item in redemptions_aggregated}
-        
-        # Calculate starting cumulative points
-        period_earned = sum(item['points_earned'] for item in logs_aggregated)
-        period_redeemed = sum(item['points_spent'] for item in redemptions_aggregated)
-        cumulative_points = user.total_points - period_earned + period_redeemed
-        
-        # Generate timeline efficiently
-        timeline = []
-        current_date = start_date.date()
-        end_date = timezone.now().date()
-        
-        if granularity == 'daily':
-            while current_date <= end_date:
-                date_str = current_date.isoformat()
-                
-                # Get data for this date (default to 0 if no data)
-                day_logs = logs_dict.get(current_date, {'points_earned': 0, 'activities_count': 0})
-                day_redemptions = redemptions_dict.get(current_date, {'points_spent': 0, 'redemptions_count': 0})
-                
-                points_earned = day_logs['points_earned']
-                points_redeemed = day_redemptions['points_spent']
-                net_points = points_earned - points_redeemed
-                cumulative_points += net_points
-                
-                timeline.append({
-                    'date': date_str,
-                    'points_earned': points_earned,
-                    'points_redeemed': points_redeemed,
-                    'net_points': net_points,
-                    'cumulative_points': cumulative_points,
-                    'activities_count': day_logs['activities_count'],
-                    'redemptions_count': day_redemptions['redemptions_count']
-                })
-                
-                current_date += timedelta(days=1)
-                
-        elif granularity == 'weekly':
-            while current_date <= end_date:
-                week_end = current_date + timedelta(days=6)
-                week_logs = []
-                week_redemptions = []
-                
-                # Collect data for the week
-                temp_date = current_date
-                while temp_date <= week_end and temp_date <= end_date:
-                    if temp_date in logs_dict:
-                        week_logs.append(logs_dict[temp_date])
-                    if temp_date in redemptions_dict:
-                        week_redemptions.append(redemptions_dict[temp_date])
-                    temp_date += timedelta(days=1)
-                
-                # Aggregate week data
-                points_earned = sum(item['points_earned'] for item in week_logs)
-                points_redeemed = sum(item['points_spent'] for item in week_redemptions)
-                activities_count = sum(item['activities_count'] for item in week_logs)
-                redemptions_count = sum(item['redemptions_count'] for item in week_redemptions)
-                
-                net_points = points_earned - points_redeemed
-                cumulative_points += net_points
-                
-                timeline.append({
-                    'date': current_date.isoformat(),
-                    'points_earned': points_earned,
-                    'points_redeemed': points_redeemed,
-                    'net_points': net_points,
-                    'cumulative_points': cumulative_points,
-                    'activities_count': activities_count,
-                    'redemptions_count': redemptions_count
-                })
-                
-                current_date += timedelta(days=7)
-                
-        elif granularity == 'monthly':
-            while current_date <= end_date:
-                month_end = current_date + timedelta(days=29)
-                month_logs = []
-                month_redemptions = []
-                
-                # Collect data for the month
-                temp_date = current_date
-                while temp_date <= month_end and temp_date <= end_date:
-                    if temp_date in logs_dict:
-                        month_logs.append(logs_dict[temp_date])
-                    if temp_date in redemptions_dict:
-                        month_redemptions.append(redemptions_dict[temp_date])
-                    temp_date += timedelta(days=1)
-                
-                # Aggregate month data
-                points_earned = sum(item['points_earned'] for item in month_logs)
-                points_redeemed = sum(item['points_spent'] for item in month_redemptions)
-                activities_count = sum(item['activities_count'] for item in month_logs)
-                redemptions_count = sum(item['redemptions_count'] for item in month_redemptions)
-                
-                net_points = points_earned - points_redeemed
-                cumulative_points += net_points
-                
-                timeline.append({
-                    'date': current_date.isoformat(),
-                    'points_earned': points_earned,
-                    'points_redeemed': points_redeemed,
-                    'net_points': net_points,
-                    'cumulative_points': cumulative_points,
-                    'activities_count': activities_count,
-                    'redemptions_count': redemptions_count
-                })
-                
-                current_date += timedelta(days=30)
-        
-        # Calculate summary stats efficiently
-        total_points_earned = period_earned
-        total_points_redeemed = period_redeemed
-        net_points_change = total_points_earned - total_points_redeemed
-        average_daily_points = total_points_earned / days if days > 0 else 0
-        
-        # Find most active date
-        most_active_date = None
-        if timeline:
-            most_active = max(timeline, key=lambda x: x.get('net_points', x['points_earned']))
-            if most_active.get('net_points', most_active['points_earned']) > 0:
-                most_active_date = most_active['date']
-        
-        response_data = {
-            'timeline': timeline,
-            'summary': {
-                'total_days': days,
-                'total_points_earned': total_points_earned,
-                'total_points_redeemed': total_points_redeemed,
-                'net_points_change': net_points_change,
-                'average_daily_points': round(average_daily_points, 1),
-                'most_active_date': most_active_date
-            }
+        params = {
+            'granularity': request.GET.get('granularity', 'daily'),
+            'days': int(request.GET.get('days', 30)),
         }
-        
-        # CACHE: Store results for 24 hours (86400 seconds) - Timeline data with cache invalidation
-        # Long TTL since cache invalidation handles real-time updates
-        cache.set(cache_key, response_data, 86400)
-        
+        response_data = get_cached_section(
+            'timeline', request.user, params,
+            lambda: build_points_timeline(request.user, params['granularity'], params['days'])
+        )
         return Response(response_data)
 
 
@@ -1188,120 +891,18 @@ class LeaderboardView(APIView):
     """Leaderboard system endpoint"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @method_decorator(condition(etag_func=data_version_etag('leaderboard')))
+    @method_decorator(read_from_replica('user', 'leaderboard', caught_up=replica_has_latest(PointsLog)))
     def get(self, request):
         """Get ranked list of users by points - CACHED"""
-        from datetime import datetime, timedelta
-        from django.db.models import Sum, Q
-        
-        limit = int(request.GET.get('limit', 10))
-        period = request.GET.get('period', 'all_time')
-        
-        # CACHE: Check for cached leaderboard data first
-        cache_key = f"leaderboard_{period}_{limit}_{request.user.id}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-        
-        # Base queryset - exclude users without points and ensure they have proper usernames
-        # Calculate total points earned from PointsLog (excluding redemptions)
-        base_queryset = User.objects.exclude(username__startswith='discord_').annotate(
-            total_points_earned=Sum('points_logs__points_earned', default=0)
-        ).exclude(total_points_earned=0)
-        
-        if period == 'weekly':
-            # Points earned in last 7 days
-            week_ago = timezone.now() - timedelta(days=7)
-            users_with_monthly_points = base_queryset.annotate(
-                period_points=Sum('points_logs__points_earned', 
-                                filter=Q(points_logs__timestamp__gte=week_ago))
-            ).exclude(period_points__isnull=True).order_by('-period_points', '-total_points_earned')
-        elif period == 'monthly':
-            # Points earned in last 30 days
-            month_ago = timezone.now() - timedelta(days=30)
-            users_with_monthly_points = base_queryset.annotate(
-                period_points=Sum('points_logs__points_earned', 
-                                filter=Q(points_logs__timestamp__gte=month_ago))
-            ).exclude(period_points__isnull=True).order_by('-period_points', '-total_points_earned')
-        else:
-            # All time points earned (excluding redemptions)
-            users_with_monthly_points = base_queryset.annotate(
-                period_points=models.F('total_points_earned')
-            ).order_by('-total_points_earned')
-        
-        # Get top users
-        top_users = users_with_monthly_points[:limit]
-        
-        # Build leaderboard
-        leaderboard = []
-        for rank, user in enumerate(top_users, 1):
-            # Create privacy-safe display name
-            if hasattr(user, 'preferences') and user.preferences and user.preferences.privacy_settings.get('display_name_preference') == 'first_name_only':
-                display_name = user.first_name or user.username
-            elif hasattr(user, 'preferences') and user.preferences and user.preferences.privacy_settings.get('display_name_preference') == 'username':
-                display_name = user.username
-            else:
-                display_name = f"{user.first_name} {user.last_name[0]}." if user.first_name and user.last_name else user.username
-            
-            leaderboard.append({
-                'rank': rank,
-                'user_id': user.id,
-                'username': user.username,
-                'display_name': display_name,
-                'total_points': user.total_points_earned,  # Use points earned, not current balance
-                'points_this_period': getattr(user, 'period_points', user.total_points_earned) or 0,
-                'avatar_url': None,  # Could be added later
-                'is_current_user': user.id == request.user.id
-            })
-        
-        # Always provide current user's rank information
-        current_user_points_earned = PointsLog.objects.filter(user=request.user).aggregate(
-            total=Sum('points_earned', default=0)
-        )['total'] or 0
-        
-        # Check if current user is already in the leaderboard
-        current_user_in_leaderboard = any(item['is_current_user'] for item in leaderboard)
-        
-        if current_user_in_leaderboard:
-            # Find the current user's entry in the leaderboard
-            current_user_entry = next(item for item in leaderboard if item['is_current_user'])
-            current_user_rank = {
-                'rank': current_user_entry['rank'],
-                'user_id': current_user_entry['user_id'],
-                'username': current_user_entry['username'],
-                'display_name': 'You',
-                'total_points': current_user_entry['total_points'],
-                'points_this_period': current_user_entry['points_this_period'],
-                'is_current_user': True
-            }
-        else:
-            # Calculate current user's position if not in top users
-            current_user_position = users_with_monthly_points.filter(
-                Q(total_points_earned__gt=current_user_points_earned) |
-                (Q(total_points_earned=current_user_points_earned) & Q(id__lt=request.user.id))
-            ).count() + 1
-            
-            current_user_rank = {
-                'rank': current_user_position,
-                'user_id': request.user.id,
-                'username': request.user.username,
-                'display_name': 'You',
-                'total_points': current_user_points_earned,  # Use points earned, not current balance
-                'points_this_period': getattr(request.user, 'period_points', current_user_points_earned) or 0,
-                'is_current_user': True
-            }
-        
-        total_participants = users_with_monthly_points.count()
-        
-        response_data = {
-            'leaderboard': leaderboard,
-            'current_user_rank': current_user_rank,
-            'total_participants': total_participants
+        params = {
+            'limit': int(request.GET.get('limit', 10)),
+            'period': request.GET.get('period', 'all_time'),
         }
-        
-        # CACHE: Store results for 12 hours (43200 seconds) - Leaderboard with cache invalidation
-        # Moderate TTL since leaderboard affects multiple users and changes less frequently
-        cache.set(cache_key, response_data, 43200)
-        
+        response_data = get_cached_section(
+            'leaderboard', request.user, params,
+            lambda: build_leaderboard(request.user, params['period'], params['limit'])
+        )
         return Response(response_data)
 
 
@@ -1309,46 +910,58 @@ class RewardsAvailableView(APIView):
     """Enhanced rewards system - available rewards with CACHING"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @method_decorator(condition(etag_func=data_version_etag('user', 'catalog')))
     def get(self, request):
         """Get available rewards with redemption info - CACHED"""
-        user = request.user
-        
-        # CACHE: Check for cached rewards data
-        cache_key = f"rewards_available_{user.id}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-        
-        # Get ALL rewards, not just active ones
-        rewards = Incentive.objects.all().order_by('points_required')
-        
-        rewards_data = []
-        for reward in rewards:
-            can_redeem = (user.total_points >= reward.points_required and 
-                         reward.is_active and 
-                         reward.stock_available > 0)
-            rewards_data.append({
-                'id': reward.id,
-                'name': reward.name,
-                'description': reward.description,
-                'points_required': reward.points_required,
-                'image_url': reward.image_url,
-                'category': reward.category,
-                'stock_available': reward.stock_available,
-                'can_redeem': can_redeem,
-                'is_active': reward.is_active,  # Add this field for frontend
-                'sponsor': reward.sponsor
-            })
-        
-        response_data = {
-            'rewards': rewards_data
-        }
+        response_data = get_cached_section(
+            'rewards', request.user, {},
+            lambda: build_rewards_available(request.user)
+        )
+        return Response(response_data)
+
+
+class DashboardBundleView(APIView):
+    """All dashboard sections in one response, built from one pass over the user's logs"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @method_decorator(condition(etag_func=data_version_etag('user', 'catalog', 'leaderboard')))
+    def get(self, request):
+        """
+        Query params:
+          - sections: comma-separated subset of stats,timeline,feed,rewards,leaderboard (default: all)
+          - period: stats period (7days, 30days, 90days)
+          - granularity, days: timeline options
+          - limit: feed limit (omit for lifetime feed)
+          - leaderboard_period, leaderboard_limit: leaderboard options
+        """
+        sections_param = request.GET.get('sections')
+        sections = [s.strip() for s in sections_param.split(',') if s.strip()] if sections_param else list(DASHBOARD_SECTIONS)
+        unknown = [s for s in sections if s not in DASHBOARD_SECTIONS]
+        if unknown:
+            return Response({
+                'error': f"Unknown sections: {', '.join(unknown)}. Choose from: {', '.join(DASHBOARD_SECTIONS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        # CACHE: Store results for 24 hours (86400 seconds) - Rewards change infrequently
-        # Long TTL since rewards are mostly static, admin changes are rare
-        cache.set(cache_key, response_data, 86400)
+        try:
+            feed_limit = request.GET.get('limit')
+            params = {
+                'stats': {'period': request.GET.get('period', '30days')},
+                'timeline': {
+                    'granularity': request.GET.get('granularity', 'daily'),
+                    'days': int(request.GET.get('days', 30)),
+                },
+                'feed': {'limit': min(int(feed_limit), FEED_MAX_LIMIT) if feed_limit else None},
+                'rewards': {},
+                'leaderboard': {
+                    'period': request.GET.get('leaderboard_period', 'all_time'),
+                    'limit': int(request.GET.get('leaderboard_limit', 10)),
+                },
+            }
+        except ValueError:
+            return Response({'error': 'days, limit and leaderboard_limit must be integers'},
+                          status=status.HTTP_400_BAD_REQUEST)
         
-        return Response(response_data)
+        return Response(build_dashboard_bundle(request.user, list(dict.fromkeys(sections)), params))
 
 
 class ClearRewardsCacheView(APIView):
@@ -1358,13 +971,11 @@ class ClearRewardsCacheView(APIView):
     def post(self, request):
         """Clear all rewards cache entries"""
         try:
-            from django.core.cache import cache
-            
-            # Clear all cache keys that start with 'rewards_available_'
-            cache.clear()
+            cleared = purge_caches(namespace='rewards')
             
             return Response({
                 'success': True,
+                'cleared': cleared,
                 'message': 'Rewards cache cleared successfully'
             })
         except Exception as e:
@@ -1375,55 +986,47 @@ class ClearRewardsCacheView(APIView):
 
 
 class ClearUserCachesView(APIView):
-    """Clear all caches for a specific user"""
+    """Scoped cache purge by user, namespace and/or key pattern"""
     permission_classes = [permissions.IsAuthenticated]
     
     def post(self, request):
-        """Clear all caches that could be affected by user data changes"""
+        """
+        Purge only the cache entries matching the given filters.
+
+        Body (at least one filter is required, filters are combined):
+          - user_id: backend user id
+          - namespace: one of dashboard, timeline, feed, history, leaderboard, rewards
+          - pattern: shell-style key pattern, e.g. "leaderboard_weekly_*"
+        """
+        user_id = request.data.get('user_id')
+        namespace = request.data.get('namespace')
+        pattern = request.data.get('pattern')
+        
+        if not any([user_id, namespace, pattern]):
+            return Response({
+                'success': False,
+                'error': 'user_id, namespace or pattern is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if namespace and namespace not in CACHE_NAMESPACES:
+            return Response({
+                'success': False,
+                'error': f"Unknown namespace. Choose from: {', '.join(CACHE_NAMESPACES)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if user_id and not User.objects.filter(id=user_id).exists():
+            return Response({
+                'success': False,
+                'error': 'User not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
         try:
-            from django.core.cache import cache
-            from django.contrib.auth import get_user_model
-            import json
-            
-            User = get_user_model()
-            
-            # Handle both DRF request.data and raw request body
-            if hasattr(request, 'data'):
-                user_id = request.data.get('user_id')
-            else:
-                body = json.loads(request.body.decode('utf-8'))
-                user_id = body.get('user_id')
-            
-            if not user_id:
-                return Response({
-                    'success': False,
-                    'error': 'user_id is required'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            try:
-                user = User.objects.get(id=user_id)
-            except User.DoesNotExist:
-                return Response({
-                    'success': False,
-                    'error': 'User not found'
-                }, status=status.HTTP_404_NOT_FOUND)
-            
-            # Clear all cache types that could be affected by user changes
-            cache_patterns = [
-                f"dashboard_stats_{user_id}_*",
-                f"points_timeline_{user_id}_*", 
-                f"leaderboard_*_{user_id}",
-                f"activity_feed_{user_id}_*",
-                f"rewards_available_{user_id}"
-            ]
-            
-            # Since Django cache doesn't support pattern deletion easily, clear all cache
-            # This is the most reliable approach for ensuring all user caches are cleared
-            cache.clear()
+            cleared = purge_caches(user_id=user_id or None, namespace=namespace or None, pattern=pattern or None)
             
             return Response({
                 'success': True,
-                'message': f'All caches cleared for user {user_id}'
+                'cleared': cleared,
+                'message': f'Cleared {cleared} cache entries' if user_id else f'Invalidated {cleared} cache namespaces'
             })
         except Exception as e:
             return Response({
@@ -1505,9 +1108,7 @@ class RedeemRewardView(APIView):
             reward.stock_available -= 1
             reward.save()
         
-        # CACHE INVALIDATION: Clear user's cached data after transaction commits
-        # This ensures immediate updates in the frontend
-        invalidate_user_caches(user.id)
+        # CACHE INVALIDATION: core.signals purges this user's caches and bumps their data version on commit
         
         return Response({
             'success': True,
@@ -1556,106 +1157,16 @@ class UnifiedActivityFeedView(APIView):
     """PHASE 1 FIX: Combined activity and redemption feed for recent activity"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @method_decorator(condition(etag_func=data_version_etag('user')))
     def get(self, request):
         """HIGHLY OPTIMIZED with CACHING: Get unified activity feed with minimal database queries"""
-        user = request.user
-        
         # FLEXIBLE LIMITING: Optional pagination for lifetime data access
         limit_param = request.GET.get('limit')
-        if limit_param:
-            limit = min(int(limit_param), 1000)  # Higher cap for lifetime view
-            cache_key = f"activity_feed_{request.user.id}_{limit}"
-        else:
-            limit = None
-            cache_key = f"activity_feed_{request.user.id}_lifetime"
-        
-        # CACHING: Check for cached data first
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-        
-        # SUPER OPTIMIZED: Use values() to minimize data transfer and memory usage
-        # Uses idx_points_logs_user_timestamp index for optimal performance
-        if limit:
-            activities_data = PointsLog.objects.filter(user=user).values(
-                'id', 'timestamp', 'points_earned', 'details',
-                'activity__name', 'activity__category'
-            ).order_by('-timestamp')[:limit]
-        else:
-            # No limit = full lifetime data
-            activities_data = PointsLog.objects.filter(user=user).values(
-                'id', 'timestamp', 'points_earned', 'details',
-                'activity__name', 'activity__category'
-            ).order_by('-timestamp')
-        
-        # SUPER OPTIMIZED: Use values() for redemptions
-        # Uses idx_redemptions_user_timestamp index
-        if limit:
-            redemptions_data = Redemption.objects.filter(user=user).values(
-                'id', 'redeemed_at', 'points_spent', 'status',
-                'incentive__name'
-            ).order_by('-redeemed_at')[:limit]
-        else:
-            # No limit = full lifetime redemptions
-            redemptions_data = Redemption.objects.filter(user=user).values(
-                'id', 'redeemed_at', 'points_spent', 'status',
-                'incentive__name'
-            ).order_by('-redeemed_at')
-        
-        # OPTIMIZED: Combine and format with minimal processing
-        feed_items = []
-        
-        # Add activities - minimal object creation
-        for activity in activities_data:
-            feed_items.append({
-                'id': f"activity_{activity['id']}",
-                'type': 'activity',
-                'timestamp': activity['timestamp'].isoformat(),
-                'points_change': activity['points_earned'],  # Positive
-                'description': f"Completed: {activity['activity__name']}",
-                'details': {
-                    'activity_name': activity['activity__name'],
-                    'activity_category': activity['activity__category'],
-                    'points_earned': activity['points_earned']
-                }
-            })
-        
-        # Add redemptions - minimal object creation
-        for redemption in redemptions_data:
-            feed_items.append({
-                'id': f"redemption_{redemption['id']}",
-                'type': 'redemption', 
-                'timestamp': redemption['redeemed_at'].isoformat(),
-                'points_change': -redemption['points_spent'],  # Negative
-                'description': f"Redeemed: {redemption['incentive__name']}",
-                'details': {
-                    'reward_name': redemption['incentive__name'],
-                    'points_spent': redemption['points_spent'],
-                    'status': redemption['status']
-                }
-            })
-        
-        # Sort by timestamp (most recent first)
-        feed_items.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        # Only apply limit if it was specified (for lifetime data, show all)
-        if limit:
-            feed_items = feed_items[:limit]
-        
-        # CACHING: Prepare response data
-        response_data = {
-            'feed': feed_items,
-            'total_items': len(feed_items),
-            'is_lifetime_data': limit is None,
-            'limit_applied': limit,
-            'total_activities': len([item for item in feed_items if item['type'] == 'activity']),
-            'total_redemptions': len([item for item in feed_items if item['type'] == 'redemption'])
-        }
-        
-        # CACHE: Store results for 24 hours (86400 seconds) - Activity feed with cache invalidation
-        # Long TTL since cache invalidation handles real-time updates
-        cache.set(cache_key, response_data, 86400)
-        
+        params = {'limit': min(int(limit_param), FEED_MAX_LIMIT) if limit_param else None}  # Higher cap for lifetime view
+        response_data = get_cached_section(
+            'feed', request.user, params,
+            lambda: build_activity_feed(request.user, params['limit'])
+        )
         return Response(response_data)
 
 
@@ -1705,6 +1216,8 @@ class UserPreferencesViewSet(viewsets.ModelViewSet):
         })
 
 
+@method_decorator(read_from_replica(), name='list')
+@method_decorator(read_from_replica(), name='retrieve')
 class PartnerMetricsViewSet(viewsets.ReadOnlyModelViewSet):
     """Read-only ViewSet for partner metrics."""
     queryset = PartnerMetrics.objects.all().order_by('-date')
@@ -1716,37 +1229,96 @@ class BotIntegrationView(APIView):
     """Minimal secured endpoints for Discord bot integration.
 
     Security: requires X-Bot-Secret header that matches settings.BOT_SHARED_SECRET.
-    Supported actions via JSON body:
-      - { "action": "upsert-user", "discord_id": str, "display_name"?: str, "username"?: str }
-      - { "action": "add-activity", "discord_id": str, "activity_type": str, "details"?: str }
-      - { "action": "summary", "discord_id": str, "limit"?: int }
-      - { "action": "leaderboard", "page"?: int, "page_size"?: int }
-      - { "action": "admin-adjust", "discord_id": str, "delta_points": int, "reason"?: str }
-      - { "action": "redeem", "discord_id": str, "incentive_id": int }
-      - { "action": "clear-warnings", "discord_id": str }
-      - { "action": "suspend-user", "discord_id": str, "duration_minutes": int }
-      - { "action": "unsuspend-user", "discord_id": str }
-      - { "action": "activitylog", "hours"?: int, "limit"?: int }
-      - { "action": "submit-resource", "discord_id": str, "description": str }
-      - { "action": "approve-resource", "submission_id": int, "points": int, "notes"?: str }
-      - { "action": "reject-resource", "submission_id": int, "reason"?: str }
-      - { "action": "pending-resources" }
-      - { "action": "submit-event", "discord_id": str, "event_name"?: str, "description"?: str }
-      - { "action": "approve-event", "submission_id": int, "points": int, "notes"?: str }
-      - { "action": "reject-event", "submission_id": int, "reason"?: str }
-      - { "action": "pending-events" }
-      - { "action": "submit-linkedin", "discord_id": str, "description"?: str }
-      - { "action": "approve-linkedin", "submission_id": int, "points": int, "notes"?: str }
-      - { "action": "reject-linkedin", "submission_id": int, "reason"?: str }
-      - { "action": "pending-linkedin" }
-      - { "action": "create-incentive", "name": str, "description": str, "points_required": int, "stock_available"?: int, "category"?: str, "sponsor"?: str }
-      - { "action": "delete-incentive", "incentive_id": int }
-      - { "action": "update-incentive", "incentive_id": int, "name"?: str, "description"?: str, "points_required"?: int, "category"?: str, "sponsor"?: str }
-      - { "action": "update-incentive-stock", "incentive_id": int, "stock_count": int }
+    The JSON body carries an "action" plus that action's fields. Supported actions
+    and their input schemas are declared in ACTIONS; payloads failing the schema
+    get a 400 before the handler runs. Every dispatch records latency, query count
+    and status code in core.metrics.bot_action_metrics.
     """
 
     permission_classes = [permissions.AllowAny]
 
+    BULK_UPSERT_LIMIT = 5000  # Members per bulk-upsert-users request
+
+    ACTIONS = {
+        # Users & points
+        "upsert-user": BotAction("_upsert_user", ("discord_id",), {"discord_id": STR, "display_name": STR, "username": STR}),
+        "bulk-upsert-users": BotAction(
+            "_bulk_upsert_users", ("members",), {"members": LIST},
+            description=f"Register up to {BULK_UPSERT_LIMIT} guild members ({{discord_id, username, display_name}}) at once",
+        ),
+        "add-activity": BotAction("_add_activity", ("discord_id", "activity_type"), {"discord_id": STR, "activity_type": STR, "details": STR}),
+        "link": BotAction("_link_discord", ("code", "discord_id"), {"code": STR, "discord_id": STR, "discord_username": STR}),
+        "summary": BotAction("_summary", ("discord_id",), {"discord_id": STR, "limit": INT}),
+        "leaderboard": BotAction("_leaderboard", (), {"page": INT, "page_size": INT}),
+        "admin-adjust": BotAction("_admin_adjust", ("discord_id",), {"discord_id": STR, "delta_points": INT, "reason": STR}),
+        "redeem": BotAction("_redeem", ("discord_id", "incentive_id"), {"discord_id": STR, "incentive_id": INT}),
+        "clear-warnings": BotAction("_clear_warnings", ("discord_id",), {"discord_id": STR}),
+        "suspend-user": BotAction("_suspend_user", ("discord_id",), {"discord_id": STR, "duration_minutes": INT}),
+        "unsuspend-user": BotAction("_unsuspend_user", ("discord_id",), {"discord_id": STR}),
+        "activitylog": BotAction("_activitylog", (), {"hours": INT, "limit": INT}),
+        "get-streak": BotAction("_get_streak", (), {"discord_id": STR}),
+        "validate-discord-user": BotAction(
+            "_validate_discord_user", ("discord_username",), {"discord_username": STR},
+            async_handler="_validate_discord_user",
+        ),
+        "sync-guild-members": BotAction(
+            "_sync_guild_members", ("snapshot_id", "members"), {"snapshot_id": STR, "members": LIST, "final": BOOL},
+            description="One chunk of the bot's guild member snapshot; final=true drops members it did not list",
+        ),
+        "guild-member-events": BotAction(
+            "_guild_member_events", ("events",), {"events": LIST},
+            description="Join/update/leave deltas for the guild member directory",
+        ),
+        "purge-cache": BotAction("_purge_cache", (), {"discord_id": STR, "namespace": STR, "pattern": STR}),
+        # Resume reviews & scheduling
+        "review-status": BotAction("_review_status", ("discord_id",), {"discord_id": STR}),
+        "add-professional": BotAction("_add_professional", ("name", "email"), {"name": STR, "email": STR, "specialties": STR}),
+        "list-professionals": BotAction("_list_professionals"),
+        "match-review": BotAction("_match_review", ("discord_id", "professional_id"), {"discord_id": STR, "professional_id": INT}),
+        "review-stats": BotAction("_review_stats"),
+        "pending-reviews": BotAction("_pending_reviews"),
+        "suggest-matches": BotAction("_suggest_matches", ("discord_id",), {"discord_id": STR}),
+        "propose-matches": BotAction(
+            "_propose_matches", (), {"capacity": INT, "apply": BOOL},
+            description="Assign every pending review request at once; apply=true books the proposed sessions",
+        ),
+        "schedule-session": BotAction(
+            "_schedule_session", ("discord_id", "professional_name", "scheduled_time"),
+            {"discord_id": STR, "professional_name": STR, "scheduled_time": STR, "duration_minutes": INT},
+        ),
+        "add-professional-availability": BotAction(
+            "_add_professional_availability", ("professional_id", "form_response_id", "start_date", "end_date"),
+            {"professional_id": INT, "form_response_id": STR, "form_data": DICT, "availability_slots": LIST,
+             "start_date": STR, "end_date": STR},
+        ),
+        # Submissions
+        "submit-resource": BotAction("_submit_resource", ("discord_id", "description"), {"discord_id": STR, "description": STR}),
+        "approve-resource": BotAction("_approve_resource", ("submission_id",), {"submission_id": INT, "points": INT, "notes": STR}),
+        "reject-resource": BotAction("_reject_resource", ("submission_id",), {"submission_id": INT, "reason": STR}),
+        "pending-resources": BotAction("_pending_resources"),
+        "submit-event": BotAction("_submit_event", ("discord_id",), {"discord_id": STR, "event_name": STR, "description": STR}),
+        "approve-event": BotAction("_approve_event", ("submission_id",), {"submission_id": INT, "points": INT, "notes": STR}),
+        "reject-event": BotAction("_reject_event", ("submission_id",), {"submission_id": INT, "reason": STR}),
+        "pending-events": BotAction("_pending_events"),
+        "submit-linkedin": BotAction("_submit_linkedin", ("discord_id",), {"discord_id": STR, "description": STR}),
+        "approve-linkedin": BotAction("_approve_linkedin", ("submission_id",), {"submission_id": INT, "points": INT, "notes": STR}),
+        "reject-linkedin": BotAction("_reject_linkedin", ("submission_id",), {"submission_id": INT, "reason": STR}),
+        "pending-linkedin": BotAction("_pending_linkedin"),
+        "pending-counts": BotAction("_pending_counts", description="Pending submission counts per type (cached 30s)"),
+        # Incentive catalog
+        "create-incentive": BotAction(
+            "_create_incentive", ("name", "description", "points_required"),
+            {"name": STR, "description": STR, "points_required": INT, "stock_available": INT, "category": STR, "sponsor": STR},
+        ),
+        "delete-incentive": BotAction("_delete_incentive", ("incentive_id",), {"incentive_id": INT}),
+        "update-incentive": BotAction(
+            "_update_incentive", ("incentive_id",),
+            {"incentive_id": INT, "name": STR, "description": STR, "points_required": INT, "category": STR, "sponsor": STR},
+        ),
+        "update-incentive-stock": BotAction("_update_incentive_stock", ("incentive_id", "stock_count"), {"incentive_id": INT, "stock_count": INT}),
+        "list-incentives": BotAction("_list_incentives", description="Every incentive, active or not, for the admin reward commands"),
+    }
+
     def post(self, request):
         from django.conf import settings
 
@@ -1755,84 +1327,33 @@ class BotIntegrationView(APIView):
             return Response({"error": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
 
         action = request.data.get("action")
-        if action == "upsert-user":
-            return self._upsert_user(request)
-        if action == "add-activity":
-            return self._add_activity(request)
-        if action == "link":
-            return self._link_discord(request)
-        if action == "summary":
-            return self._summary(request)
-        if action == "leaderboard":
-            return self._leaderboard(request)
-        if action == "admin-adjust":
-            return self._admin_adjust(request)
-        if action == "redeem":
-            return self._redeem(request)
-        if action == "clear-warnings":
-            return self._clear_warnings(request)
-        if action == "suspend-user":
-            return self._suspend_user(request)
-        if action == "unsuspend-user":
-            return self._unsuspend_user(request)
-        if action == "activitylog":
-            return self._activitylog(request)
-        if action == "review-status":
-            return self._review_status(request)
-        if action == "add-professional":
-            return self._add_professional(request)
-        if action == "list-professionals":
-            return self._list_professionals(request)
-        if action == "match-review":
-            return self._match_review(request)
-        if action == "review-stats":
-            return self._review_stats(request)
-        if action == "pending-reviews":
-            return self._pending_reviews(request)
-        if action == "suggest-matches":
-            return self._suggest_matches(request)
-        if action == "schedule-session":
-            return self._schedule_session(request)
-        if action == "add-professional-availability":
-            return self._add_professional_availability(request)
-        if action == "validate-discord-user":
-            return self._validate_discord_user(request)
-        if action == "submit-resource":
-            return self._submit_resource(request)
-        if action == "approve-resource":
-            return self._approve_resource(request)
-        if action == "reject-resource":
-            return self._reject_resource(request)
-        if action == "pending-resources":
-            return self._pending_resources(request)
-        if action == "submit-event":
-            return self._submit_event(request)
-        if action == "approve-event":
-            return self._approve_event(request)
-        if action == "reject-event":
-            return self._reject_event(request)
-        if action == "pending-events":
-            return self._pending_events(request)
-        if action == "submit-linkedin":
-            return self._submit_linkedin(request)
-        if action == "approve-linkedin":
-            return self._approve_linkedin(request)
-        if action == "reject-linkedin":
-            return self._reject_linkedin(request)
-        if action == "pending-linkedin":
-            return self._pending_linkedin(request)
-        if action == "get-streak":
-            return self._get_streak(request)
-        if action == "create-incentive":
-            return self._create_incentive(request)
-        if action == "delete-incentive":
-            return self._delete_incentive(request)
-        if action == "update-incentive":
-            return self._update_incentive(request)
-        if action == "update-incentive-stock":
-            return self._update_incentive_stock(request)
-
-        return Response({"error": "Unknown action"}, status=status.HTTP_400_BAD_REQUEST)
+        spec = self.ACTIONS.get(action)
+        if spec is None:
+            return Response({"error": "Unknown action"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return self.dispatch_action(action, spec, request)
+
+    def dispatch_action(self, action, spec, request):
+        """Validate the payload, run the handler and record per-action metrics."""
+        started = time.perf_counter()
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        with QueryCounter() as counter:
+            try:
+                error = spec.validate(request.data)
+                if error:
+                    response = Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+                else:
+                    response = getattr(self, spec.handler)(request)
+                status_code = response.status_code
+                return response
+            finally:
+                bot_action_metrics.record(
+                    action,
+                    (time.perf_counter() - started) * 1000,
+                    status_code,
+                    queries=counter.queries,
+                    db_ms=counter.db_ms,
+                )
 
     def _upsert_user(self, request):
         discord_id = request.data.get("discord_id")
@@ -1860,6 +1381,48 @@ class BotIntegrationView(APIView):
             "username": user.username,
         }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
+    def _bulk_upsert_users(self, request):
+        """Create missing users (and their status rows) for a chunk of guild members; existing users are left as is"""
+        members = {}
+        for member in request.data["members"]:
+            if isinstance(member, dict) and member.get("discord_id"):
+                members[str(member["discord_id"])] = member
+        if len(members) > self.BULK_UPSERT_LIMIT:
+            return Response({"error": f"At most {self.BULK_UPSERT_LIMIT} members per request"}, status=400)
+
+        existing = set(User.objects.filter(discord_id__in=members).values_list("discord_id", flat=True))
+        wanted = {
+            discord_id: ((member.get("username") or member.get("display_name") or f"discord_{discord_id}")[:150])
+            for discord_id, member in members.items() if discord_id not in existing
+        }
+        # Usernames are unique too; a member whose name is already taken gets it suffixed with their Discord id
+        taken = set(User.objects.filter(username__in=wanted.values()).values_list("username", flat=True))
+        seen = set()
+        new_users = []
+        for discord_id, username in wanted.items():
+            if username in taken or username in seen:
+                username = f"{username[:150 - len(discord_id) - 1]}_{discord_id}"
+            seen.add(username)
+            user = User(discord_id=discord_id, username=username, role="student")
+            user.sync_leaderboard_fields({})  # bulk_create skips save(), which normally fills these
+            new_users.append(user)
+
+        with transaction.atomic():
+            # ON CONFLICT DO NOTHING: a concurrent upsert-user for the same member is not an error
+            User.objects.bulk_create(new_users, batch_size=1000, ignore_conflicts=True)
+            user_ids = dict(User.objects.filter(discord_id__in=members).values_list("discord_id", "id"))
+            missing_status = User.objects.filter(id__in=user_ids.values(), status__isnull=True).values_list("id", flat=True)
+            UserStatus.objects.bulk_create(
+                [UserStatus(user_id=user_id) for user_id in missing_status], batch_size=1000, ignore_conflicts=True
+            )
+
+        return Response({
+            "received": len(members),
+            "created": len(user_ids) - len(existing),
+            "existing": len(existing),
+            "failed": sorted(set(members) - set(user_ids)),
+        })
+
     def _add_activity(self, request):
         discord_id = request.data.get("discord_id")
         activity_type = request.data.get("activity_type")
@@ -1916,15 +1479,9 @@ class BotIntegrationView(APIView):
             user.save(update_fields=["total_points"])
             user_status.last_activity = timezone.now()
             user_status.save(update_fields=["last_activity"])
+            enqueue('unlocks.record', {'user_id': user.id}, eager=True)
 
-        # Check for unlocks after commit
-        _check_and_record_unlocks(user)
-
-        # CACHE INVALIDATION: Clear user's cached data after transaction commits
-        # This ensures immediate updates in the frontend
-        logger.info(f"🚀 About to invalidate caches for user {user.id} after adding activity")
-        invalidate_user_caches(user.id)
-        logger.info(f"🎯 Cache invalidation call completed for user {user.id}")
+        # CACHE INVALIDATION: core.signals purges this user's caches and bumps their data version on commit
 
         return Response({
             "message": f"Added {activity.points_value} points for {activity.name}",
@@ -2041,19 +1598,22 @@ class BotIntegrationView(APIView):
             "unlocks": unlocks,
         })
 
+    @staticmethod
+    def leaderboard_queryset():
+        from django.db.models import Sum
+
+        # Calculate total points earned from PointsLog (excluding redemptions)
+        return User.objects.filter(show_in_leaderboard=True).exclude(discord_id__isnull=True).exclude(discord_id="").annotate(
+            total_points_earned=Sum('points_logs__points_earned', default=0)
+        ).exclude(total_points_earned=0).order_by('-total_points_earned')
+
     def _leaderboard(self, request):
         from django.core.paginator import Paginator
-        from django.db.models import Sum
         
         page = int(request.data.get("page", 1))
         page_size = int(request.data.get("page_size", 10))
         
-        # Calculate total points earned from PointsLog (excluding redemptions)
-        qs = User.objects.exclude(discord_id__isnull=True).exclude(discord_id="").annotate(
-            total_points_earned=Sum('points_logs__points_earned', default=0)
-        ).exclude(total_points_earned=0).order_by('-total_points_earned')
-        
-        paginator = Paginator(qs, page_size)
+        paginator = Paginator(self.leaderboard_queryset(), page_size)
         page_obj = paginator.get_page(page)
         items = [
             {
@@ -2097,7 +1657,7 @@ class BotIntegrationView(APIView):
             status_row, _ = UserStatus.objects.get_or_create(user=user)
             status_row.last_activity = timezone.now()
             status_row.save(update_fields=["last_activity"])
-        _check_and_record_unlocks(user)
+            enqueue('unlocks.record', {'user_id': user.id}, eager=True)
         return Response({
             "discord_id": str(discord_id),
             "total_points": user.total_points,
@@ -2311,27 +1871,10 @@ class BotIntegrationView(APIView):
             "status": review_request.status
         })
 
+    @method_decorator(read_from_replica('stats'))
     def _review_stats(self, request):
-        """Get resume review program statistics"""
-        from django.db.models import Count, Avg
-        
-        stats = {
-            "total_requests": ReviewRequest.objects.count(),
-            "pending_requests": ReviewRequest.objects.filter(status='pending').count(),
-            "matched_requests": ReviewRequest.objects.filter(status='matched').count(),
-            "completed_requests": ReviewRequest.objects.filter(status='completed').count(),
-            "cancelled_requests": ReviewRequest.objects.filter(status='cancelled').count(),
-            "total_professionals": Professional.objects.filter(is_active=True).count(),
-            "average_rating": ReviewRequest.objects.filter(rating__isnull=False).aggregate(Avg('rating'))['rating__avg'] or 0,
-        }
-        
-        # Recent activity (last 7 days)
-        from datetime import timedelta
-        recent_date = timezone.now() - timedelta(days=7)
-        stats["recent_requests"] = ReviewRequest.objects.filter(submission_date__gte=recent_date).count()
-        stats["recent_completions"] = ReviewRequest.objects.filter(completed_date__gte=recent_date).count()
-        
-        return Response(stats)
+        """Get resume review program statistics (cached, see core.stats)"""
+        return Response(review_request_stats())
 
     def _pending_reviews(self, request):
         """Get pending review requests with availability data"""
@@ -2376,54 +1919,65 @@ class BotIntegrationView(APIView):
         if not review_request:
             return Response({"error": "No pending review request found for this student"}, status=404)
         
-        # Get all active professionals with their availability
-        from datetime import datetime, timedelta
+        # Slots and week bitmaps were built when the request and availability were stored
+        # (core.availability): one vectorised pass ranks every active availability, and only
+        # the top rows load their slots to describe the shared windows
         today = timezone.now().date()
+        student_times = review_request.preferred_times or []
+        student_slots = list(review_request.slots.all())
         
-        professionals_with_availability = ProfessionalAvailability.objects.filter(
+        active = list(ProfessionalAvailability.objects.filter(
             is_active=True,
+            professional__is_active=True,
             end_date__gte=today
-        ).select_related('professional')
+        ).order_by('-professional__rating', '-professional__total_reviews').values_list('id', 'week_bitmap'))
+        index = AvailabilityIndex([row[0] for row in active], [row[1] for row in active])
+        ranked = index.rank(week_bitmap(student_slots))
+        top = ranked[:MAX_SUGGESTED_MATCHES]
         
-        matches = []
-        student_times = review_request.preferred_times or []
+        availabilities = ProfessionalAvailability.objects.select_related('professional').prefetch_related(
+            'slots'
+        ).in_bulk([availability_id for availability_id, _ in top])
         
-        for prof_avail in professionals_with_availability:
+        # Largest weekly overlap first; ties keep rating/total_reviews order
+        matches = []
+        for availability_id, overlap_minutes in top:
+            prof_avail = availabilities[availability_id]
             professional = prof_avail.professional
-            if not professional.is_active:
-                continue
-                
-            # Enhanced overlap detection using sophisticated matching algorithm
-            try:
-                from availability_matcher import find_availability_matches
-                matches = find_availability_matches(student_times, prof_avail.availability_slots)
-                overlapping_times = [match['student_availability'] + " ↔ " + match['professional_availability'] 
-                                   for match in matches if match['match_score'] > 0.3]
-            except ImportError:
-                # Fallback to simple matching if enhanced matcher not available
-                overlapping_times = self._find_time_overlaps(student_times, prof_avail.availability_slots)
-            
-            if overlapping_times:
-                matches.append({
-                    "professional_id": professional.id,
-                    "professional_name": professional.name,
-                    "specialties": professional.specialties,
-                    "total_reviews": professional.total_reviews,
-                    "rating": float(professional.rating) if professional.rating else 0.0,
-                    "overlapping_times": overlapping_times,
-                    "availability_valid_until": prof_avail.end_date.isoformat(),
-                })
-        
-        # Sort by rating and total reviews
-        matches.sort(key=lambda x: (x['rating'], x['total_reviews']), reverse=True)
+            windows = overlapping_windows(student_slots, prof_avail.slots.all(), min_minutes=CELL_MINUTES)
+            matches.append({
+                "professional_id": professional.id,
+                "professional_name": professional.name,
+                "specialties": professional.specialties,
+                "total_reviews": professional.total_reviews,
+                "rating": float(professional.rating) if professional.rating else 0.0,
+                "overlap_minutes": overlap_minutes,
+                "overlapping_times": [format_window(*window) for window in windows],
+                "availability_valid_until": prof_avail.end_date.isoformat(),
+            })
         
         return Response({
             "student": user.username,
             "matches": matches,
-            "total_matches": len(matches),
+            "total_matches": len(ranked),
             "student_preferred_times": student_times
         })
     
+    def _propose_matches(self, request):
+        """Solve the whole pending queue as one capacity-constrained assignment (see core.review_matching)"""
+        capacity = int(request.data.get("capacity", DEFAULT_MATCH_CAPACITY))
+        if capacity < 1:
+            return Response({"error": "capacity must be at least 1"}, status=400)
+        
+        proposals = propose_assignments(capacity=capacity)
+        matched = apply_assignments(proposals) if request.data.get("apply") else 0
+        
+        return Response({
+            "proposals": [proposal.as_dict() for proposal in proposals],
+            "total_proposals": len(proposals),
+            "matched": matched,
+        })
+    
     def _schedule_session(self, request):
         """Schedule a session between student and professional"""
         discord_id = request.data.get("discord_id")
@@ -2478,38 +2032,8 @@ class BotIntegrationView(APIView):
             review_request.scheduled_time = scheduled_time
             review_request.matched_date = timezone.now()
             review_request.save()
-            
-            # Create calendar event if calendar integration is available
-            try:
-                from calendar_integration import create_review_session_event
-                
-                # Get email addresses
-                student_email = user.email or f"{user.username}@example.com"
-                professional_email = professional.email
-                
-                # Create calendar event
-                event_id = create_review_session_event(
-                    student_email=student_email,
-                    professional_email=professional_email,
-                    start_time=scheduled_time,
-                    duration_minutes=duration_minutes,
-                    meeting_title=f"Resume Review Session - {user.username}",
-                    meeting_description=f"Resume review session between {user.username} and {professional.name}"
-                )
-                
-                if event_id:
-                    session.calendar_event_id = event_id
-                    session.save()
-                    
-            except ImportError:
-                # Calendar integration not available
-                pass
-            except Exception as e:
-                # Log calendar error but don't fail the session creation
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to create calendar event: {e}")
-        
+            # CALENDAR: core.signals queues the event for the outbox worker (core.calendar_sync)
+
         return Response({
             "message": f"Session scheduled between {user.username} and {professional.name}",
             "session_id": session.id,
@@ -2557,6 +2081,7 @@ class BotIntegrationView(APIView):
                 'is_active': True
             }
         )
+        replace_slots(availability, availability_slots)
         
         return Response({
             "message": f"Availability {'created' if created else 'updated'} for {professional.name}",
@@ -2566,34 +2091,16 @@ class BotIntegrationView(APIView):
             "slots_count": len(availability_slots)
         })
     
-    def _find_time_overlaps(self, student_times, professional_times):
-        """Simple time overlap detection - can be enhanced with better parsing"""
-        overlaps = []
-        
-        # Convert to lowercase for easier matching
-        student_times_lower = [t.lower() for t in student_times if t]
-        professional_times_lower = [t.lower() for t in professional_times if t]
-        
-        # Look for common days/times
-        days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        times = ['morning', 'afternoon', 'evening', '9', '10', '11', '12', '1', '2', '3', '4', '5']
-        
-        for student_time in student_times_lower:
-            for professional_time in professional_times_lower:
-                # Check for exact matches or partial matches
-                if student_time == professional_time:
-                    overlaps.append(student_time)
-                else:
-                    # Check for day/time component matches
-                    for day in days:
-                        if day in student_time and day in professional_time:
-                            for time in times:
-                                if time in student_time and time in professional_time:
-                                    overlap = f"{day} {time}"
-                                    if overlap not in overlaps:
-                                        overlaps.append(overlap)
-        
-        return overlaps
+    def _sync_guild_members(self, request):
+        """Store one chunk of the guild member snapshot"""
+        counts = apply_member_snapshot(
+            request.data["members"], request.data["snapshot_id"], final=request.data.get("final", False)
+        )
+        return Response(counts)
+
+    def _guild_member_events(self, request):
+        """Apply member join/update/leave deltas"""
+        return Response(apply_member_events(request.data["events"]))
 
     def _validate_discord_user(self, request):
         """Validate Discord username against server membership (called by bot)"""
@@ -2602,8 +2109,7 @@ class BotIntegrationView(APIView):
         if not discord_username:
             return Response({"error": "discord_username is required"}, status=400)
         
-        # Use the same Discord API validation logic
-        validation_result = self._validate_with_discord_api(discord_username)
+        validation_result = validate_discord_username(discord_username)
         
         if validation_result['success']:
             return Response({
@@ -2745,6 +2251,16 @@ class BotIntegrationView(APIView):
             "submissions": submissions_data
         })
 
+    @method_decorator(read_from_replica('stats'))
+    def _pending_counts(self, request):
+        """Pending resource/event/LinkedIn counts without serialising the lists"""
+        counts = pending_submission_counts()
+        return Response({
+            "success": True,
+            **counts,
+            "total": sum(counts.values()),
+        })
+
     def _submit_event(self, request):
         """Submit an event attendance for admin review"""
         discord_id = request.data.get("discord_id")
@@ -2999,68 +2515,22 @@ class BotIntegrationView(APIView):
         """Get user's engagement streak data"""
         discord_id = request.data.get("discord_id")
         
-        try:
-            user = User.objects.get(discord_id=discord_id)
-        except User.DoesNotExist:
+        # OPTIMIZED: Streak state is maintained on write, so this is a single-row read
+        row = User.objects.filter(discord_id=discord_id).values(
+            "status__current_streak", "status__longest_streak", "status__last_active_date"
+        ).first()
+        if row is None:
             return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
         
-        from datetime import datetime, timedelta
-        from django.db.models import Count
-        
-        # Calculate current streak
-        current_streak = 0
-        longest_streak = 0
-        last_activity = "Never"
-        
-        # Get user's activity logs ordered by date
-        activity_logs = PointsLog.objects.filter(
-            user=user
-        ).extra(
-            select={'date': "DATE(timestamp)"}
-        ).values('date').annotate(
-            count=Count('id')
-        ).order_by('-date')
-        
-        if activity_logs:
-            # Calculate current streak
-            today = timezone.now().date()
-            consecutive_days = 0
-            
-            for log in activity_logs:
-                log_date = log['date']
-                days_diff = (today - log_date).days
-                
-                if days_diff == consecutive_days:
-                    consecutive_days += 1
-                elif days_diff == consecutive_days + 1:
-                    # Allow for 1 day gap (weekend, etc.)
-                    consecutive_days += 1
-                else:
-                    break
-            
-            current_streak = consecutive_days
-            
-            # Calculate longest streak (simplified - could be more sophisticated)
-            longest_streak = max(current_streak, len(activity_logs))
-            
-            # Get last activity date
-            last_log = activity_logs.first()
-            if last_log:
-                last_activity = last_log['date'].strftime("%Y-%m-%d")
-        
-        # Calculate streak bonus (bonus points for streaks)
-        streak_bonus = 0
-        if current_streak >= 7:
-            streak_bonus = 5  # 5 bonus points for 7+ day streak
-        elif current_streak >= 3:
-            streak_bonus = 2  # 2 bonus points for 3+ day streak
+        last_active_date = row["status__last_active_date"]
+        current_streak = effective_current_streak(row["status__current_streak"] or 0, last_active_date)
         
         return Response({
             "current_streak": current_streak,
-            "longest_streak": longest_streak,
+            "longest_streak": row["status__longest_streak"] or 0,
             "streak_type": "daily",
-            "last_activity": last_activity,
-            "streak_bonus": streak_bonus
+            "last_activity": last_active_date.strftime("%Y-%m-%d") if last_active_date else "Never",
+            "streak_bonus": streak_bonus(current_streak)
         })
 
     def _create_incentive(self, request):
@@ -3087,10 +2557,6 @@ class BotIntegrationView(APIView):
                 is_active=True
             )
             
-            # Clear rewards cache for all users
-            from django.core.cache import cache
-            cache.delete_many(cache.keys('rewards_available_*'))
-            
             return Response({
                 "success": True,
                 "incentive_id": incentive.id,
@@ -3115,10 +2581,6 @@ class BotIntegrationView(APIView):
             incentive_name = incentive.name
             incentive.delete()
             
-            # Clear rewards cache for all users
-            from django.core.cache import cache
-            cache.delete_many(cache.keys('rewards_available_*'))
-            
             return Response({
                 "success": True,
                 "message": f"Incentive '{incentive_name}' deleted successfully"
@@ -3156,10 +2618,6 @@ class BotIntegrationView(APIView):
             
             incentive.save()
             
-            # Clear rewards cache for all users
-            from django.core.cache import cache
-            cache.delete_many(cache.keys('rewards_available_*'))
-            
             return Response({
                 "success": True,
                 "incentive_id": incentive.id,
@@ -3189,10 +2647,6 @@ class BotIntegrationView(APIView):
             incentive.stock_available = int(stock_count)
             incentive.save()
             
-            # Clear rewards cache for all users
-            from django.core.cache import cache
-            cache.delete_many(cache.keys('rewards_available_*'))
-            
             return Response({
                 "success": True,
                 "incentive_id": incentive.id,
@@ -3209,6 +2663,156 @@ class BotIntegrationView(APIView):
             return Response({"error": f"Failed to update stock: {str(e)}"}, 
                           status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def _list_incentives(self, request):
+        """List all incentives for the admin reward commands"""
+        incentives = list(Incentive.objects.order_by('points_required', 'id').values(
+            'id', 'name', 'description', 'points_required', 'stock_available', 'category', 'sponsor', 'status',
+            'is_active',
+        ))
+
+        return Response({
+            "success": True,
+            "incentives": incentives,
+            "total_count": len(incentives)
+        })
+
+    def _purge_cache(self, request):
+        """Purge cached API responses for a Discord user, a namespace and/or a key pattern"""
+        discord_id = request.data.get("discord_id")
+        namespace = request.data.get("namespace")
+        pattern = request.data.get("pattern")
+
+        if not any([discord_id, namespace, pattern]):
+            return Response({"error": "discord_id, namespace or pattern is required"},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if namespace and namespace not in CACHE_NAMESPACES:
+            return Response({"error": f"Unknown namespace. Choose from: {', '.join(CACHE_NAMESPACES)}"},
+                          status=status.HTTP_400_BAD_REQUEST)
+
+        user_id = None
+        if discord_id:
+            user_id = User.objects.filter(discord_id=str(discord_id)).values_list("id", flat=True).first()
+            if user_id is None:
+                return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        cleared = purge_caches(user_id=user_id, namespace=namespace or None, pattern=pattern or None)
+        return Response({"success": True, "cleared": cleared})
+
+
+class AsyncBotIntegrationView(View):
+    """ASGI entry point for /api/bot/.
+
+    Actions whose BotAction names an ``async_handler`` are served here on the event
+    loop with the async ORM, so a slow Discord lookup holds neither a worker nor
+    Django's sync thread. Every other action, and any body that is not a JSON
+    object, is handed to BotIntegrationView unchanged. Responses and metrics match
+    the sync view.
+    """
+
+    sync_view = staticmethod(BotIntegrationView.as_view())
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True  # Authenticated by the shared secret, like the DRF view
+        return view
+
+    async def post(self, request):
+        from django.conf import settings
+
+        shared_secret = request.headers.get("X-Bot-Secret", "")
+        if not settings.BOT_SHARED_SECRET or shared_secret != settings.BOT_SHARED_SECRET:
+            return self._response({"error": "Unauthorized"}, status.HTTP_401_UNAUTHORIZED)
+
+        data = None
+        if request.content_type == "application/json":
+            try:
+                data = json.loads(request.body or b"{}")
+            except ValueError:
+                pass
+        spec = BotIntegrationView.ACTIONS.get(data.get("action")) if isinstance(data, dict) else None
+        if spec is None or not spec.async_handler:
+            return await sync_to_async(self.sync_view)(request)
+        return await self.dispatch_action(data["action"], spec, data)
+
+    async def dispatch_action(self, action, spec, data):
+        started = time.perf_counter()
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        async with QueryCounter() as counter:
+            try:
+                error = spec.validate(data)
+                if error:
+                    response = self._response({"error": error}, status.HTTP_400_BAD_REQUEST)
+                else:
+                    response = await getattr(self, spec.async_handler)(data)
+                status_code = response.status_code
+                return response
+            finally:
+                bot_action_metrics.record(
+                    action,
+                    (time.perf_counter() - started) * 1000,
+                    status_code,
+                    queries=counter.queries,
+                    db_ms=counter.db_ms,
+                )
+
+    @staticmethod
+    def _response(data, status_code=status.HTTP_200_OK):
+        """DRF Response rendered as JSON without content negotiation, as the sync view would send it."""
+        response = Response(data, status=status_code)
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = "application/json"
+        response.renderer_context = {}
+        return response
+
+    async def _validate_discord_user(self, data):
+        result = await avalidate_discord_username(data["discord_username"])
+        if result['success']:
+            return self._response({
+                "valid": result['valid'],
+                "message": result['message'],
+                "discord_id": result.get('discord_id'),
+                "discord_username": result.get('discord_username'),
+            })
+        return self._response({"valid": False, "message": result['message']})
+
+
+class MetricsRegistryView(APIView):
+    """Admin-only read (GET) and reset (DELETE) of an in-process MetricsRegistry"""
+    permission_classes = [permissions.IsAuthenticated]
+    registry = None
+    result_key = 'metrics'
+    
+    def get(self, request):
+        """Latency percentiles, query counts and status codes per entry"""
+        if request.user.role != 'admin':
+            return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+        
+        return Response({
+            self.result_key: self.registry.snapshot(),
+            'generated_at': timezone.now().isoformat()
+        })
+    
+    def delete(self, request):
+        """Reset the collected metrics"""
+        if request.user.role != 'admin':
+            return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+        
+        self.registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class BotActionMetricsView(MetricsRegistryView):
+    """Per-action bot dispatch metrics for this worker process (admin only)"""
+    registry = bot_action_metrics
+    result_key = 'actions'
+
+
+class RequestMetricsView(MetricsRegistryView):
+    """Per-route request metrics from RequestProfilingMiddleware for this worker process (admin only)"""
+    registry = request_metrics
+    result_key = 'routes'
+
 
 class LinkView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -3237,17 +2841,6 @@ class LinkView(APIView):
     pass
 
 
-def _check_and_record_unlocks(user: User):
-    """Create UserIncentiveUnlock records for any incentives the user just qualified for.
-    Idempotent: uses unique_together to avoid duplicates.
-    """
-    qualifying = Incentive.objects.filter(is_active=True, points_required__lte=user.total_points)
-    existing = set(UserIncentiveUnlock.objects.filter(user=user, incentive__in=qualifying).values_list('incentive_id', flat=True))
-    to_create = [UserIncentiveUnlock(user=user, incentive=inc) for inc in qualifying if inc.id not in existing]
-    if to_create:
-        UserIncentiveUnlock.objects.bulk_create(to_create, ignore_conflicts=True)
-
-
 class FormSubmissionView(APIView):
     """Endpoint to receive Google Form submissions via Apps Script webhook"""
     permission_classes = [permissions.AllowAny]
@@ -3321,6 +2914,7 @@ class FormSubmissionView(APIView):
                 review_request.experience_level = responses.get('Experience Level', '')
                 review_request.preferred_times = self._extract_availability(responses)
                 review_request.save()
+            replace_slots(review_request, review_request.preferred_times)
 
             return Response({
                 "status": "success",
@@ -3474,6 +3068,7 @@ class ProfessionalAvailabilityFormView(APIView):
                     'is_active': True
                 }
             )
+            replace_slots(availability, availability_slots)
 
             return Response({
                 "status": "success",
@@ -3509,8 +3104,8 @@ class DiscordValidationView(APIView):
         
         discord_username = serializer.validated_data['discord_username']
         
-        # Call the bot to validate server membership
-        validation_result = self._validate_with_bot(discord_username)
+        # Local guild member directory first; Discord's member search only while it is stale
+        validation_result = validate_discord_username(discord_username)
         
         if validation_result['success']:
             response_data = {
@@ -3526,131 +3121,6 @@ class DiscordValidationView(APIView):
                 'message': validation_result['message'],
                 'discord_username': discord_username
             }, status=status.HTTP_200_OK)
-    
-    def _validate_with_bot(self, discord_username):
-        """Call Discord REST API directly to validate username against server membership"""
-        import requests
-        from django.conf import settings
-        
-        try:
-            return self._validate_with_discord_api(discord_username)
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error validating Discord username with Discord API: {e}")
-            return {
-                'success': False,
-                'message': 'Unable to validate Discord username at this time. Please try again later.'
-            }
-    
-    def _validate_with_discord_api(self, discord_username):
-        """Direct call to Discord REST API for username validation"""
-        from django.conf import settings
-        import requests
-        
-        discord_token = getattr(settings, 'DISCORD_TOKEN', '')
-        guild_id = getattr(settings, 'DISCORD_GUILD_ID', '')
-        
-        if not discord_token:
-            return {
-                'success': False,
-                'message': 'Discord integration not configured.'
-            }
-        
-        if not guild_id:
-            return {
-                'success': False,
-                'message': 'Discord server not configured.'
-            }
-        
-        # Search for the user by username (can include discriminator)
-        username_parts = discord_username.split('#')
-        base_username = username_parts[0]
-        discriminator = username_parts[1] if len(username_parts) > 1 else None
-        
-        try:
-            # Call Discord API to search guild members
-            headers = {
-                "Authorization": f"Bot {discord_token}",
-                "Content-Type": "application/json"
-            }
-            
-            # Search for members with the username
-            response = requests.get(
-                f"https://discord.com/api/v10/guilds/{guild_id}/members/search",
-                params={"query": base_username, "limit": 100},
-                headers=headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                members = response.json()
-                
-                # Search through results for exact username match
-                for member in members:
-                    user = member.get('user', {})
-                    member_username = user.get('username', '')
-                    member_discriminator = user.get('discriminator', '0000')
-                    
-                    # Check against unique Discord username
-                    if member_username.lower() == base_username.lower():
-                        # If discriminator provided, verify it matches
-                        if discriminator is not None:
-                            if member_discriminator == discriminator:
-                                return {
-                                    'success': True,
-                                    'valid': True,
-                                    'message': f"User found in Discord server",
-                                    'discord_id': user.get('id'),
-                                    'discord_username': f"{member_username}#{member_discriminator}"
-                                }
-                        else:
-                            # No discriminator provided, username match is sufficient
-                            return {
-                                'success': True,
-                                'valid': True,
-                                'message': f"User found in Discord server",
-                                'discord_id': user.get('id'),
-                                'discord_username': f"{member_username}#{member_discriminator}"
-                            }
-                
-                return {
-                    'success': True,
-                    'valid': False,
-                    'message': f"User '{discord_username}' not found in Discord server"
-                }
-                
-            elif response.status_code == 401:
-                logger.error("Discord API authentication failed - invalid bot token")
-                return {
-                    'success': False,
-                    'message': 'Discord authentication failed. Please check configuration.'
-                }
-            elif response.status_code == 403:
-                logger.error("Discord API forbidden - bot lacks permissions")
-                return {
-                    'success': False,
-                    'message': 'Discord bot lacks required permissions.'
-                }
-            else:
-                logger.error(f"Discord API error {response.status_code}: {response.text}")
-                return {
-                    'success': False,
-                    'message': f'Discord API error (status {response.status_code})'
-                }
-                
-        except requests.exceptions.Timeout:
-            logger.error("Discord API validation timed out")
-            return {
-                'success': False,
-                'message': 'Discord validation timed out. Please try again.'
-            }
-        except Exception as e:
-            logger.error(f"Error calling Discord API: {e}")
-            return {
-                'success': False,
-                'message': 'Unable to connect to Discord API.'
-            }
 
 
 @api_view(['GET'])
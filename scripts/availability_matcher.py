@@ -75,14 +75,14 @@ class AvailabilityMatcher:
         'night': (time(22, 0), time(6, 0))
     }
     
-    # Common time patterns
-    TIME_PATTERNS = [
+    # Common time patterns, compiled once
+    TIME_PATTERNS = [re.compile(pattern) for pattern in (
         r'(\d{1,2}):(\d{2})\s*(am|pm)',                    # 2:30 PM
         r'(\d{1,2})\s*(am|pm)',                            # 2 PM
         r'(\d{1,2}):(\d{2})',                              # 14:30
         r'(\d{1,2})-(\d{1,2})\s*(am|pm)',                  # 2-3 PM
         r'(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})',           # 2:30-3:30
-    ]
+    )]
     
     def __init__(self, strategy: MatchStrategy = MatchStrategy.FLEXIBLE):
         """
@@ -165,7 +165,7 @@ class AvailabilityMatcher:
     def _extract_times(self, text: str) -> Tuple[Optional[time], Optional[time]]:
         """Extract start and end times from text"""
         for pattern in self.TIME_PATTERNS:
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if match:
                 return self._parse_time_match(match)
         return None, None
@@ -11,21 +11,32 @@ export RENDER=true
 # Run Django migrations
 echo "📦 Running Django migrations..."
 python manage.py migrate
+# Creates the table for CACHE_URL=dbcache://...; does nothing for other caches
+python manage.py createcachetable
 
 # Start Discord bot in background
+# It posts bot actions to the web server; BOT_TRANSPORT=inprocess runs them in the bot's
+# own process instead, and needs CACHE_URL so its cache writes reach the web workers
 echo "🤖 Starting Discord bot..."
 python bot.py &
 BOT_PID=$!
 
-# Start Django with gunicorn (this blocks and handles the port)
+# Start the outbox worker (calendar events, unlocks, notifications) in background
+echo "📬 Starting outbox worker..."
+python manage.py run_outbox_worker &
+WORKER_PID=$!
+
+# Start Django under ASGI: gunicorn manages Uvicorn workers (WEB_CONCURRENCY sets the count).
+# ASGI request threads cannot reuse persistent connections, so the web server pools them
 echo "🌐 Starting Django server..."
-gunicorn backend.wsgi:application --bind 0.0.0.0:${PORT:-8000} &
+DB_POOL=${DB_POOL:-true} gunicorn backend.asgi:application --worker-class uvicorn.workers.UvicornWorker --bind 0.0.0.0:${PORT:-8000} &
 DJANGO_PID=$!
 
 # Function to clean up processes on exit
 cleanup() {
     echo "🛑 Cleaning up..."
     kill $BOT_PID 2>/dev/null || true
+    kill $WORKER_PID 2>/dev/null || true
     kill $DJANGO_PID 2>/dev/null || true
     exit 0
 }